@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """The artifact definition."""
 
+import sys
+
 from artifacts import errors
 from artifacts import registry
 
@@ -8,15 +10,24 @@ from artifacts import registry
 class ArtifactDefinition(object):
   """Artifact definition interface.
 
+  Artifact definitions do not have a per-instance dictionary of attributes
+  and their name is interned, since many artifact definitions are held in
+  memory at the same time.
+
   Attributes:
     aliases (list[str]): aliases that identify the artifact definition.
     description (str): description.
     name (str): name that uniquely identifiers the artifact definition.
     sources (list[SourceType]): sources.
-    supported_os (list[str]): supported operating systems.
-    urls (list[str]): URLs with more information about the artifact definition.
+    supported_os (tuple[str]): supported operating systems.
+    urls (tuple[str]): URLs with more information about the artifact
+        definition.
   """
 
+  __slots__ = (
+      '__weakref__', 'aliases', 'description', 'name', 'sources',
+      'supported_os', 'urls')
+
   def __init__(self, name, aliases=None, description=None):
     """Initializes an artifact definition.
 
@@ -28,10 +39,10 @@ class ArtifactDefinition(object):
     super(ArtifactDefinition, self).__init__()
     self.aliases = aliases or []
     self.description = description
-    self.name = name
+    self.name = sys.intern(name) if isinstance(name, str) else name
     self.sources = []
-    self.supported_os = []
-    self.urls = []
+    self.supported_os = ()
+    self.urls = ()
 
   def AppendSource(self, type_indicator, attributes):
     """Appends a source.
@@ -79,7 +90,7 @@ class ArtifactDefinition(object):
           'attributes': source.AsDict()
       }
       if source.supported_os:
-        source_definition['supported_os'] = source.supported_os
+        source_definition['supported_os'] = list(source.supported_os)
       sources.append(source_definition)
 
     artifact_definition = {
@@ -88,9 +99,9 @@ class ArtifactDefinition(object):
         'sources': sources,
     }
     if self.aliases:
-      artifact_definition['aliases'] = self.aliases
+      artifact_definition['aliases'] = list(self.aliases)
     if self.supported_os:
-      artifact_definition['supported_os'] = self.supported_os
+      artifact_definition['supported_os'] = list(self.supported_os)
     if self.urls:
-      artifact_definition['urls'] = self.urls
+      artifact_definition['urls'] = list(self.urls)
     return artifact_definition
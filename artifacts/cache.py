@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions cache."""
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+
+
+class ArtifactDefinitionsCache(object):
+  """On-disk cache of artifact definition values.
+
+  The cache stores the validated artifact definition values of a file, as
+  produced by ArtifactDefinition.AsDict(), so that the artifact definitions
+  can be rebuilt without parsing the file. Entries are keyed by path, size,
+  modification time and SHA-256 digest of the file content. An entry is
+  stale when the size and modification time differ and the digest of the
+  current content no longer matches. The number of entries is bounded, when
+  exceeded the least recently used entries are evicted.
+
+  Changes to the index, including access order, are kept in memory until the
+  cache is flushed, which the readers do once per read.
+  """
+
+  _FORMAT_VERSION = 2
+
+  _INDEX_FILENAME = 'index.json'
+
+  def __init__(self, path, maximum_number_of_entries=256):
+    """Initializes an artifact definitions cache.
+
+    Args:
+      path (str): path of the cache directory, which is created if it does
+          not exist.
+      maximum_number_of_entries (Optional[int]): maximum number of entries
+          in the cache.
+
+    Raises:
+      ValueError: if the maximum number of entries is less than 1.
+    """
+    if maximum_number_of_entries < 1:
+      raise ValueError(
+          f'Unsupported maximum number of entries: '
+          f'{maximum_number_of_entries:d}')
+
+    super(ArtifactDefinitionsCache, self).__init__()
+    self._entries = collections.OrderedDict()
+    self._index_changed = False
+    self._maximum_number_of_entries = maximum_number_of_entries
+    self._path = path
+
+    os.makedirs(path, exist_ok=True)
+    self._ReadIndex()
+
+  @property
+  def number_of_entries(self):
+    """int: number of entries in the cache."""
+    return len(self._entries)
+
+  def _GetEntryKey(self, namespace, filename):
+    """Retrieves the key of an entry.
+
+    Args:
+      namespace (str): namespace of the entry, such as the name of the reader
+          that produced the artifact definition values.
+      filename (str): name of the artifact definitions file.
+
+    Returns:
+      str: entry key.
+    """
+    absolute_path = os.path.abspath(filename)
+    return f'{namespace:s}:{absolute_path:s}'
+
+  def _GetValuesPath(self, namespace, digest):
+    """Retrieves the path of the file that stores definition values.
+
+    Args:
+      namespace (str): namespace of the entry.
+      digest (str): hexadecimal SHA-256 digest of the file content.
+
+    Returns:
+      str: path of the values file.
+    """
+    return os.path.join(self._path, f'{namespace:s}-{digest:s}.json')
+
+  def _ReadIndex(self):
+    """Reads the cache index.
+
+    A missing, corrupt or incompatible index results in an empty cache. The
+    entries in the index are stored from least to most recently used.
+    """
+    index_path = os.path.join(self._path, self._INDEX_FILENAME)
+    try:
+      with open(index_path, 'r', encoding='utf-8') as file_object:
+        index = json.load(file_object)
+
+    except (OSError, ValueError):
+      return
+
+    if not isinstance(index, dict) or (
+        index.get('version', None) != self._FORMAT_VERSION):
+      return
+
+    entries = index.get('entries', None) or []
+    if isinstance(entries, list):
+      self._entries = collections.OrderedDict(
+          (entry['key'], entry) for entry in entries
+          if isinstance(entry, dict) and 'key' in entry)
+
+  def _ReadValues(self, namespace, digest):
+    """Reads definition values.
+
+    Args:
+      namespace (str): namespace of the entry.
+      digest (str): hexadecimal SHA-256 digest of the file content.
+
+    Returns:
+      list[dict[str, object]]: artifact definition values or None if not
+          available.
+    """
+    values_path = self._GetValuesPath(namespace, digest)
+    try:
+      with open(values_path, 'r', encoding='utf-8') as file_object:
+        definition_values = json.load(file_object)
+
+    except (OSError, ValueError):
+      return None
+
+    if not isinstance(definition_values, list):
+      return None
+
+    return definition_values
+
+  def _RemoveEntry(self, entry_key):
+    """Removes an entry and its values file if no longer referenced.
+
+    Args:
+      entry_key (str): entry key.
+    """
+    entry = self._entries.pop(entry_key)
+    self._index_changed = True
+
+    for other_entry in self._entries.values():
+      if (other_entry['namespace'] == entry['namespace'] and
+          other_entry['digest'] == entry['digest']):
+        return
+
+    values_path = self._GetValuesPath(entry['namespace'], entry['digest'])
+    try:
+      os.remove(values_path)
+    except OSError:
+      pass
+
+  def _WriteFile(self, path, data):
+    """Writes a file atomically.
+
+    Args:
+      path (str): path of the file.
+      data (object): JSON serializable data.
+
+    Raises:
+      TypeError: if the data is not JSON serializable.
+    """
+    encoded_data = json.dumps(data)
+
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=self._path, suffix='.tmp')
+    try:
+      with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file_object:
+        file_object.write(encoded_data)
+
+      os.replace(temporary_path, path)
+
+    except BaseException:
+      os.remove(temporary_path)
+      raise
+
+  def _WriteIndex(self):
+    """Writes the cache index."""
+    index = {
+        'entries': list(self._entries.values()),
+        'version': self._FORMAT_VERSION}
+
+    index_path = os.path.join(self._path, self._INDEX_FILENAME)
+    self._WriteFile(index_path, index)
+
+  def Flush(self):
+    """Writes the cache index if it changed since it was last written."""
+    if self._index_changed:
+      self._WriteIndex()
+      self._index_changed = False
+
+  def GetDefinitionValues(self, namespace, filename):
+    """Retrieves the cached definition values of a file.
+
+    The content of the file is only read and hashed when its size or
+    modification time differs from the cached entry.
+
+    Args:
+      namespace (str): namespace of the entry, such as the name of the reader
+          that produced the artifact definition values.
+      filename (str): name of the artifact definitions file.
+
+    Returns:
+      list[dict[str, object]]: artifact definition values or None if not
+          available or stale.
+    """
+    entry_key = self._GetEntryKey(namespace, filename)
+    entry = self._entries.get(entry_key, None)
+    if not entry:
+      return None
+
+    try:
+      stat_object = os.stat(filename)
+    except OSError:
+      return None
+
+    if (entry['size'] != stat_object.st_size or
+        entry['modification_time'] != stat_object.st_mtime_ns):
+      try:
+        with open(filename, 'rb') as file_object:
+          digest = hashlib.sha256(file_object.read()).hexdigest()
+      except OSError:
+        return None
+
+      if digest != entry['digest']:
+        self._RemoveEntry(entry_key)
+        return None
+
+      entry['modification_time'] = stat_object.st_mtime_ns
+      entry['size'] = stat_object.st_size
+
+    definition_values = self._ReadValues(namespace, entry['digest'])
+    if definition_values is None:
+      self._RemoveEntry(entry_key)
+      return None
+
+    self._entries.move_to_end(entry_key)
+    self._index_changed = True
+
+    return definition_values
+
+  def SetDefinitionValues(
+      self, namespace, filename, modification_time, file_data,
+      definition_values):
+    """Sets the cached definition values of a file.
+
+    Args:
+      namespace (str): namespace of the entry, such as the name of the reader
+          that produced the artifact definition values.
+      filename (str): name of the artifact definitions file.
+      modification_time (int): modification time of the file in nanoseconds,
+          as determined before the file data was read.
+      file_data (bytes): content of the file.
+      definition_values (list[dict[str, object]]): artifact definition values
+          of the artifact definitions in the file.
+
+    Returns:
+      bool: True if the definition values were cached, False if they are not
+          JSON serializable.
+    """
+    digest = hashlib.sha256(file_data).hexdigest()
+
+    entry_key = self._GetEntryKey(namespace, filename)
+    if entry_key in self._entries:
+      self._RemoveEntry(entry_key)
+
+    try:
+      self._WriteFile(self._GetValuesPath(namespace, digest), definition_values)
+    except TypeError:
+      return False
+
+    self._entries[entry_key] = {
+        'digest': digest,
+        'key': entry_key,
+        'modification_time': modification_time,
+        'namespace': namespace,
+        'size': len(file_data)}
+    self._index_changed = True
+
+    while len(self._entries) > self._maximum_number_of_entries:
+      least_recently_used_key = next(iter(self._entries))
+      self._RemoveEntry(least_recently_used_key)
+
+    return True
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions diff engine."""
+
+import json
+
+from artifacts import definitions
+from artifacts import reader
+from artifacts import registry
+
+
+CHANGE_ADDED = 'added'
+CHANGE_CHANGED = 'changed'
+CHANGE_REMOVED = 'removed'
+
+
+class SourceChange(object):
+  """Change of a source.
+
+  Attributes:
+    added_values (list[object]): values that were added to the source, such
+        as paths, of a changed source.
+    attributes (dict[str, object]): attributes of the source, as of the
+        other registry unless the source was removed.
+    change (str): change, such as "added".
+    changed_attributes (list[str]): names of the attributes of a changed
+        source that changed, other than its values, and "values_order" if
+        only the order of its values changed.
+    removed_values (list[object]): values that were removed from the source,
+        such as paths, of a changed source.
+    supported_os (list[str]): supported operating systems of the source.
+    type_indicator (str): source type indicator.
+    values_attribute (str): name of the attribute with the values of the
+        source, such as "paths", or None if the source type has no values.
+  """
+
+  def __init__(self, change, type_indicator, attributes, supported_os):
+    """Initializes a change of a source.
+
+    Args:
+      change (str): change, such as "added".
+      type_indicator (str): source type indicator.
+      attributes (dict[str, object]): attributes of the source.
+      supported_os (list[str]): supported operating systems of the source.
+    """
+    super(SourceChange, self).__init__()
+    self.added_values = []
+    self.attributes = attributes
+    self.change = change
+    self.changed_attributes = []
+    self.removed_values = []
+    self.supported_os = supported_os
+    self.type_indicator = type_indicator
+    self.values_attribute = None
+
+  def AsDict(self):
+    """Represents the change of a source as a dictionary.
+
+    Returns:
+      dict[str, object]: change of the source.
+    """
+    source_change = {
+        'attributes': self.attributes,
+        'change': self.change,
+        'type': self.type_indicator}
+
+    if self.supported_os:
+      source_change['supported_os'] = self.supported_os
+    if self.changed_attributes:
+      source_change['changed_attributes'] = self.changed_attributes
+    if self.added_values:
+      source_change['added'] = {self.values_attribute: self.added_values}
+    if self.removed_values:
+      source_change['removed'] = {self.values_attribute: self.removed_values}
+
+    return source_change
+
+
+class ArtifactDefinitionChange(object):
+  """Change of an artifact definition.
+
+  Attributes:
+    change (str): change, such as "added".
+    changed_attributes (list[str]): names of the attributes of a changed
+        artifact definition that changed, other than its sources, such as
+        "doc", and "sources_order" if the order of its identical sources
+        changed.
+    name (str): name of the artifact definition.
+    source_changes (list[SourceChange]): changes of the sources.
+  """
+
+  def __init__(self, change, name):
+    """Initializes a change of an artifact definition.
+
+    Args:
+      change (str): change, such as "added".
+      name (str): name of the artifact definition.
+    """
+    super(ArtifactDefinitionChange, self).__init__()
+    self.change = change
+    self.changed_attributes = []
+    self.name = name
+    self.source_changes = []
+
+  def AsDict(self):
+    """Represents the change of an artifact definition as a dictionary.
+
+    Returns:
+      dict[str, object]: change of the artifact definition.
+    """
+    definition_change = {
+        'change': self.change,
+        'name': self.name,
+        'sources': [
+            source_change.AsDict() for source_change in self.source_changes]}
+
+    if self.changed_attributes:
+      definition_change['changed_attributes'] = self.changed_attributes
+
+    return definition_change
+
+
+class ArtifactDefinitionsChangeSet(object):
+  """Changes between two artifact definitions registries.
+
+  Attributes:
+    definition_changes (list[ArtifactDefinitionChange]): changes of the
+        artifact definitions, sorted by name.
+    number_of_unchanged_definitions (int): number of artifact definitions
+        that did not change.
+  """
+
+  def __init__(self):
+    """Initializes a change set."""
+    super(ArtifactDefinitionsChangeSet, self).__init__()
+    self.definition_changes = []
+    self.number_of_unchanged_definitions = 0
+
+  def AsDict(self):
+    """Represents the change set as a dictionary.
+
+    Returns:
+      dict[str, object]: change set.
+    """
+    names_by_change = {
+        CHANGE_ADDED: [], CHANGE_CHANGED: [], CHANGE_REMOVED: []}
+    for definition_change in self.definition_changes:
+      names_by_change[definition_change.change].append(definition_change.name)
+
+    change_set = {
+        'changes': [
+            definition_change.AsDict()
+            for definition_change in self.definition_changes],
+        'number_of_unchanged_definitions': (
+            self.number_of_unchanged_definitions)}
+    change_set.update(names_by_change)
+
+    return change_set
+
+  def GetChangedValues(self):
+    """Retrieves the values, such as paths, that were added or removed.
+
+    The values of the sources of added and removed artifact definitions, and
+    of added and removed sources, are included.
+
+    Returns:
+      dict[str, list[object]]: values that were added or removed per name of
+          the attribute of the values, such as "paths".
+    """
+    changed_values = {}
+    for definition_change in self.definition_changes:
+      for source_change in definition_change.source_changes:
+        if not source_change.values_attribute:
+          continue
+
+        values = changed_values.setdefault(source_change.values_attribute, [])
+        if source_change.change == CHANGE_CHANGED:
+          values.extend(source_change.added_values)
+          values.extend(source_change.removed_values)
+        else:
+          values.extend(
+              source_change.attributes.get(source_change.values_attribute, []))
+
+    return changed_values
+
+
+class ArtifactDefinitionsDiffer(object):
+  """Determines the changes between two artifact definitions registries.
+
+  The registries are compared as frozen snapshots, of which the content
+  digest of every artifact definition is compared first, hence unchanged
+  artifact definitions are skipped without comparing their content.
+
+  Artifact definitions are identified by their lower case name, so that a
+  renamed artifact definition is reported as removed and added. The sources
+  of a changed artifact definition that are identical in both registries
+  are skipped, the remaining sources are paired by type, supported
+  operating systems and separator, in order of definition, and compared at
+  the granularity of their values, such as paths and key paths.
+  """
+
+  # Names of the attributes that contain the values of a source.
+  _VALUES_ATTRIBUTES = {
+      definitions.TYPE_INDICATOR_ARTIFACT_GROUP: 'names',
+      definitions.TYPE_INDICATOR_DIRECTORY: 'paths',
+      definitions.TYPE_INDICATOR_FILE: 'paths',
+      definitions.TYPE_INDICATOR_PATH: 'paths',
+      definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY: 'keys',
+      definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE: 'key_value_pairs'}
+
+  def _CompareDefinitions(self, artifact_definition, other_artifact_definition):
+    """Compares two versions of an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+      other_artifact_definition (ArtifactDefinition): other version of the
+          artifact definition.
+
+    Returns:
+      ArtifactDefinitionChange: change of the artifact definition.
+    """
+    definition_change = ArtifactDefinitionChange(
+        CHANGE_CHANGED, other_artifact_definition.name)
+
+    values = artifact_definition.AsDict()
+    other_values = other_artifact_definition.AsDict()
+    for key in sorted(set(values).union(other_values)):
+      if key != 'sources' and values.get(key, None) != other_values.get(
+          key, None):
+        definition_change.changed_attributes.append(key)
+
+    # Skip the sources that are identical in both versions.
+    other_sources = list(enumerate(other_artifact_definition.sources))
+    identical_source_indexes = []
+    sources = []
+    for source in artifact_definition.sources:
+      source_key = self._GetSourceKey(source)
+      for index, (other_index, other_source) in enumerate(other_sources):
+        if self._GetSourceKey(other_source) == source_key:
+          del other_sources[index]
+          identical_source_indexes.append(other_index)
+          break
+      else:
+        sources.append(source)
+
+    # The identical sources are in the same relative order in both versions
+    # unless they were reordered.
+    if identical_source_indexes != sorted(identical_source_indexes):
+      definition_change.changed_attributes.append('sources_order')
+
+    for _, other_source in other_sources:
+      pairing_key = self._GetSourcePairingKey(other_source)
+      for index, source in enumerate(sources):
+        if self._GetSourcePairingKey(source) == pairing_key:
+          del sources[index]
+          definition_change.source_changes.append(
+              self._CompareSources(source, other_source))
+          break
+      else:
+        definition_change.source_changes.append(
+            self._CreateSourceChange(CHANGE_ADDED, other_source))
+
+    for source in sources:
+      definition_change.source_changes.append(
+          self._CreateSourceChange(CHANGE_REMOVED, source))
+
+    return definition_change
+
+  def _CompareSources(self, source, other_source):
+    """Compares two versions of a source.
+
+    Args:
+      source (SourceType): source.
+      other_source (SourceType): other version of the source.
+
+    Returns:
+      SourceChange: change of the source.
+    """
+    source_change = self._CreateSourceChange(CHANGE_CHANGED, other_source)
+
+    attributes = source.AsDict()
+    other_attributes = source_change.attributes
+    values_attribute = source_change.values_attribute
+
+    for key in sorted(set(attributes).union(other_attributes)):
+      if key != values_attribute and attributes.get(
+          key, None) != other_attributes.get(key, None):
+        source_change.changed_attributes.append(key)
+
+    # The sources are paired by their sorted supported operating systems.
+    if list(source.supported_os or []) != source_change.supported_os:
+      source_change.changed_attributes.append('supported_os')
+
+    if values_attribute:
+      values = attributes.get(values_attribute, None) or []
+      other_values = other_attributes.get(values_attribute, None) or []
+
+      value_keys = set(self._GetValueKey(value) for value in values)
+      other_value_keys = set(
+          self._GetValueKey(value) for value in other_values)
+
+      source_change.added_values = [
+          value for value in other_values
+          if self._GetValueKey(value) not in value_keys]
+      source_change.removed_values = [
+          value for value in values
+          if self._GetValueKey(value) not in other_value_keys]
+
+      if (values != other_values and not source_change.added_values and
+          not source_change.removed_values):
+        source_change.changed_attributes.append('values_order')
+
+    return source_change
+
+  def _CreateDefinitionChange(self, change, artifact_definition):
+    """Creates the change of an artifact definition that was added or removed.
+
+    Args:
+      change (str): change, such as "added".
+      artifact_definition (ArtifactDefinition): artifact definition.
+
+    Returns:
+      ArtifactDefinitionChange: change of the artifact definition.
+    """
+    definition_change = ArtifactDefinitionChange(
+        change, artifact_definition.name)
+    for source in artifact_definition.sources:
+      definition_change.source_changes.append(
+          self._CreateSourceChange(change, source))
+
+    return definition_change
+
+  def _CreateSourceChange(self, change, source):
+    """Creates the change of a source.
+
+    Args:
+      change (str): change, such as "added".
+      source (SourceType): source.
+
+    Returns:
+      SourceChange: change of the source.
+    """
+    source_change = SourceChange(
+        change, source.type_indicator, source.AsDict(),
+        list(source.supported_os or []))
+    source_change.values_attribute = self._VALUES_ATTRIBUTES.get(
+        source.type_indicator, None)
+
+    return source_change
+
+  def _GetSourceKey(self, source):
+    """Retrieves a key that identifies the content of a source.
+
+    Args:
+      source (SourceType): source.
+
+    Returns:
+      str: key of the source.
+    """
+    return json.dumps([
+        source.type_indicator, source.AsDict(),
+        list(source.supported_os or [])], sort_keys=True)
+
+  def _GetSourcePairingKey(self, source):
+    """Retrieves a key that identifies the versions of a source.
+
+    Args:
+      source (SourceType): source.
+
+    Returns:
+      tuple[str, tuple[str], str]: type indicator, supported operating
+          systems and separator of the source.
+    """
+    return (
+        source.type_indicator, tuple(sorted(source.supported_os or [])),
+        getattr(source, 'separator', None))
+
+  def _GetValueKey(self, value):
+    """Retrieves a hashable key of a value of a source.
+
+    Args:
+      value (object): value, such as a path or a key value pair.
+
+    Returns:
+      object: hashable key of the value.
+    """
+    if isinstance(value, dict):
+      return tuple(sorted(value.items()))
+
+    return value
+
+  def CompareDirectories(self, path, other_path, artifacts_reader=None):
+    """Determines the changes between two directories of definitions files.
+
+    Args:
+      path (str): path of the directory with the artifact definitions files.
+      other_path (str): path of the directory with the other version of the
+          artifact definitions files.
+      artifacts_reader (Optional[ArtifactsReader]): artifacts reader, where
+          None represents a YAML artifacts reader.
+
+    Returns:
+      ArtifactDefinitionsChangeSet: changes from the artifact definitions
+          in the directory to those in the other directory.
+
+    Raises:
+      FormatError: if the format of an artifact definition is not set or
+          incorrect.
+      KeyError: if a duplicate artifact definition is encountered.
+    """
+    artifacts_reader = artifacts_reader or reader.YamlArtifactsReader()
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(artifacts_reader, path)
+
+    other_artifact_registry = registry.ArtifactDefinitionsRegistry()
+    other_artifact_registry.ReadFromDirectory(artifacts_reader, other_path)
+
+    return self.CompareRegistries(artifact_registry, other_artifact_registry)
+
+  def CompareRegistries(self, artifact_registry, other_artifact_registry):
+    """Determines the changes between two artifact definitions registries.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+      other_artifact_registry (ArtifactDefinitionsRegistry): other version
+          of the artifact definitions registry.
+
+    Returns:
+      ArtifactDefinitionsChangeSet: changes from the artifact definitions in
+          the registry to those in the other registry.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    frozen_registry = artifact_registry.Freeze()
+    other_frozen_registry = other_artifact_registry.Freeze()
+
+    change_set = ArtifactDefinitionsChangeSet()
+
+    definitions_by_name = {
+        artifact_definition.name.lower(): artifact_definition
+        for artifact_definition in frozen_registry.GetDefinitions()}
+
+    for other_artifact_definition in other_frozen_registry.GetDefinitions():
+      name = other_artifact_definition.name.lower()
+      artifact_definition = definitions_by_name.pop(name, None)
+
+      if not artifact_definition:
+        definition_change = self._CreateDefinitionChange(
+            CHANGE_ADDED, other_artifact_definition)
+
+      elif frozen_registry.GetDefinitionDigest(name) == (
+          other_frozen_registry.GetDefinitionDigest(name)):
+        change_set.number_of_unchanged_definitions += 1
+        continue
+
+      else:
+        definition_change = self._CompareDefinitions(
+            artifact_definition, other_artifact_definition)
+
+      change_set.definition_changes.append(definition_change)
+
+    for artifact_definition in definitions_by_name.values():
+      change_set.definition_changes.append(self._CreateDefinitionChange(
+          CHANGE_REMOVED, artifact_definition))
+
+    change_set.definition_changes.sort(
+        key=lambda definition_change: definition_change.name.lower())
+
+    return change_set
@@ -10,6 +10,10 @@ class CodeStyleError(Error):
   """Error that is raised when code formatting fails style checks."""
 
 
+class CyclicDependencyError(Error):
+  """Artifact group references itself directly or indirectly."""
+
+
 class FormatError(Error):
   """Error that is raised when the format is incorrect."""
 
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions index."""
+
+import glob
+import json
+import os
+import tempfile
+
+
+class ArtifactDefinitionLocation(object):
+  """Location of an artifact definition in a file.
+
+  Attributes:
+    aliases (list[str]): aliases of the artifact definition.
+    filename (str): name of the file that contains the artifact definition.
+    line_offset (int): number of lines that precede the artifact definition.
+    name (str): name of the artifact definition.
+    offset (int): offset of the artifact definition in the file.
+    size (int): size of the artifact definition in the file.
+  """
+
+  def __init__(
+      self, filename, name, offset, size, aliases=None, line_offset=0):
+    """Initializes an artifact definition location.
+
+    Args:
+      filename (str): name of the file that contains the artifact definition.
+      name (str): name of the artifact definition.
+      offset (int): offset of the artifact definition in the file.
+      size (int): size of the artifact definition in the file.
+      aliases (Optional[list[str]]): aliases of the artifact definition.
+      line_offset (Optional[int]): number of lines that precede the artifact
+          definition.
+    """
+    super(ArtifactDefinitionLocation, self).__init__()
+    self.aliases = aliases or []
+    self.filename = filename
+    self.line_offset = line_offset
+    self.name = name
+    self.offset = offset
+    self.size = size
+
+
+class ArtifactDefinitionsIndex(object):
+  """Index of the locations of artifact definitions in files.
+
+  The locations are determined by scanning the files with an artifacts
+  reader, which does not parse and validate the artifact definitions.
+  The index can be persisted to disk, in which case only files that were
+  changed are scanned again.
+  """
+
+  _FORMAT_VERSION = 1
+
+  def __init__(self, path=None):
+    """Initializes an artifact definitions index.
+
+    Args:
+      path (Optional[str]): path of the file the index is persisted to, where
+          None represents the index is not persisted.
+    """
+    super(ArtifactDefinitionsIndex, self).__init__()
+    self._entries = {}
+    self._is_changed = False
+    self._path = path
+
+    if path:
+      self._ReadIndex()
+
+  def _ReadIndex(self):
+    """Reads the index.
+
+    A missing, corrupt or incompatible index results in an empty index.
+    """
+    try:
+      with open(self._path, 'r', encoding='utf-8') as file_object:
+        index = json.load(file_object)
+
+    except (OSError, ValueError):
+      return
+
+    if not isinstance(index, dict) or (
+        index.get('version', None) != self._FORMAT_VERSION):
+      return
+
+    self._entries = index.get('entries', None) or {}
+
+  def _WriteIndex(self):
+    """Writes the index atomically."""
+    index = {
+        'entries': self._entries,
+        'version': self._FORMAT_VERSION}
+
+    encoded_data = json.dumps(index)
+
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(self._path)), suffix='.tmp')
+    try:
+      with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file_object:
+        file_object.write(encoded_data)
+
+      os.replace(temporary_path, self._path)
+
+    except BaseException:
+      os.remove(temporary_path)
+      raise
+
+  def ScanDirectory(self, artifacts_reader, path, extension='yaml'):
+    """Scans the files in a directory for artifact definition locations.
+
+    This function does not recurse sub directories. The files are scanned
+    in sorted filename order. The index is persisted when it was changed.
+
+    Args:
+      artifacts_reader (ArtifactsReader): artifacts reader.
+      path (str): path of the directory to scan.
+      extension (Optional[str]): extension of the filenames to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if a file cannot be scanned.
+    """
+    if extension:
+      glob_spec = os.path.join(path, f'*.{extension:s}')
+    else:
+      glob_spec = os.path.join(path, '*')
+
+    locations = []
+    for filename in sorted(glob.glob(glob_spec)):
+      locations.extend(self.ScanFile(artifacts_reader, filename))
+
+    if self._path and self._is_changed:
+      self._WriteIndex()
+      self._is_changed = False
+
+    return locations
+
+  def ScanFile(self, artifacts_reader, filename):
+    """Scans a file for artifact definition locations.
+
+    The file is only scanned when its size or modification time differs
+    from the indexed entry.
+
+    Args:
+      artifacts_reader (ArtifactsReader): artifacts reader.
+      filename (str): name of the file to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if the file cannot be scanned.
+    """
+    namespace = artifacts_reader.__class__.__name__
+    entry_key = f'{namespace:s}:{os.path.abspath(filename):s}'
+
+    stat_object = os.stat(filename)
+
+    entry = self._entries.get(entry_key, None)
+    if (entry and entry['size'] == stat_object.st_size and
+        entry['modification_time'] == stat_object.st_mtime_ns):
+      return [
+          ArtifactDefinitionLocation(
+              filename, name, offset, size, aliases=aliases,
+              line_offset=line_offset)
+          for name, aliases, offset, size, line_offset in entry['locations']]
+
+    locations = artifacts_reader.ScanFile(filename)
+
+    self._entries[entry_key] = {
+        'locations': [
+            (location.name, location.aliases, location.offset, location.size,
+             location.line_offset) for location in locations],
+        'modification_time': stat_object.st_mtime_ns,
+        'size': stat_object.st_size}
+    self._is_changed = True
+
+    return locations
@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""Knowledge base and parameter expansion of artifact definition sources."""
+
+import collections
+import hashlib
+import itertools
+import json
+import re
+
+from artifacts import definitions
+
+
+class UserAccount(object):
+  """User account.
+
+  Attributes:
+    appdata (str): user specific %AppData% environment variable, such as
+        "C:\\Users\\user\\AppData\\Roaming".
+    homedir (str): home directory, such as "/home/user".
+    localappdata (str): user specific %LocalAppData% environment variable.
+    localappdata_low (str): user specific LocalLow application data
+        directory.
+    sid (str): security identifier (SID).
+    temp (str): temporary files directory.
+    username (str): username.
+    userprofile (str): (local) profile directory, such as "C:\\Users\\user".
+  """
+
+  ATTRIBUTE_NAMES = frozenset([
+      'appdata', 'homedir', 'localappdata', 'localappdata_low', 'sid', 'temp',
+      'username', 'userprofile'])
+
+  def __init__(
+      self, appdata=None, homedir=None, localappdata=None,
+      localappdata_low=None, sid=None, temp=None, username=None,
+      userprofile=None):
+    """Initializes an user account.
+
+    Args:
+      appdata (Optional[str]): user specific %AppData% environment variable.
+      homedir (Optional[str]): home directory.
+      localappdata (Optional[str]): user specific %LocalAppData% environment
+          variable.
+      localappdata_low (Optional[str]): user specific LocalLow application
+          data directory.
+      sid (Optional[str]): security identifier (SID).
+      temp (Optional[str]): temporary files directory.
+      username (Optional[str]): username.
+      userprofile (Optional[str]): (local) profile directory.
+    """
+    super(UserAccount, self).__init__()
+    self.appdata = appdata
+    self.homedir = homedir
+    self.localappdata = localappdata
+    self.localappdata_low = localappdata_low
+    self.sid = sid
+    self.temp = temp
+    self.username = username
+    self.userprofile = userprofile
+
+  def AsDict(self):
+    """Represents an user account as a dictionary.
+
+    Returns:
+      dict[str, str]: attribute values of the user account that are set.
+    """
+    return {
+        name: getattr(self, name) for name in sorted(self.ATTRIBUTE_NAMES)
+        if getattr(self, name) is not None}
+
+
+class KnowledgeBase(object):
+  """Knowledge base of the values of artifact definition parameters.
+
+  The knowledge base contains Windows environment variables, such as
+  "SystemRoot", which provide the values of %%environ_systemroot%%, and user
+  accounts, which provide the values of the users parameters, such as
+  %%users.homedir%%.
+  """
+
+  def __init__(self, environment_variables=None, user_accounts=None):
+    """Initializes a knowledge base.
+
+    Args:
+      environment_variables (Optional[dict[str, str]]): values of Windows
+          environment variables per name, such as "SystemRoot".
+      user_accounts (Optional[list[UserAccount]]): user accounts.
+    """
+    super(KnowledgeBase, self).__init__()
+    self._environment_variables = {}
+    self._fingerprint = None
+    self._user_accounts = []
+
+    for name, value in (environment_variables or {}).items():
+      self.SetEnvironmentVariable(name, value)
+
+    for user_account in user_accounts or []:
+      self.AddUserAccount(user_account)
+
+  @property
+  def fingerprint(self):
+    """str: hexadecimal SHA-256 digest of the content of the knowledge base.
+
+    Note that user accounts must not be changed after they have been added,
+    since the fingerprint is only recalculated when the knowledge base
+    changes.
+    """
+    if self._fingerprint is None:
+      content = json.dumps([
+          sorted(self._environment_variables.items()),
+          [user_account.AsDict() for user_account in self._user_accounts]])
+      self._fingerprint = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    return self._fingerprint
+
+  @property
+  def user_accounts(self):
+    """list[UserAccount]: user accounts."""
+    return list(self._user_accounts)
+
+  def AddUserAccount(self, user_account):
+    """Adds an user account.
+
+    Args:
+      user_account (UserAccount): user account.
+    """
+    self._user_accounts.append(user_account)
+    self._fingerprint = None
+
+  def GetEnvironmentVariable(self, name):
+    """Retrieves the value of a Windows environment variable.
+
+    Args:
+      name (str): name of the environment variable, which is case-insensitive.
+
+    Returns:
+      str: value of the environment variable or None if not set.
+    """
+    return self._environment_variables.get(name.lower(), None)
+
+  def SetEnvironmentVariable(self, name, value):
+    """Sets the value of a Windows environment variable.
+
+    Args:
+      name (str): name of the environment variable, which is case-insensitive.
+      value (str): value of the environment variable.
+    """
+    self._environment_variables[name.lower()] = value
+    self._fingerprint = None
+
+
+class ParameterExpansion(object):
+  """Expansion of the parameters in a pattern, such as a path.
+
+  The expanded patterns are generated lazily, per user account, as the
+  cartesian product of the values of the parameters.
+
+  Attributes:
+    pattern (str): pattern, such as "%%users.homedir%%/.bash_history".
+    unresolved_parameters (frozenset[str]): names of the parameters, such as
+        "users.homedir", that have no value for one or more user accounts.
+        Expanded patterns that depend on unresolved parameters are omitted.
+  """
+
+  def __init__(self, pattern, parts, user_part_indexes, unresolved_parameters):
+    """Initializes a parameter expansion.
+
+    Args:
+      pattern (str): pattern.
+      parts (list[object]): parts of the pattern, where a part is a list of
+          values, or a list of lists of values per user account for a users
+          parameter.
+      user_part_indexes (list[int]): indexes of the parts of users parameters.
+      unresolved_parameters (frozenset[str]): names of the parameters that
+          have no value for one or more user accounts.
+    """
+    super(ParameterExpansion, self).__init__()
+    self._parts = parts
+    self._user_part_indexes = user_part_indexes
+    self.pattern = pattern
+    self.unresolved_parameters = unresolved_parameters
+
+  def __iter__(self):
+    """Iterates over the expanded patterns.
+
+    Yields:
+      str: expanded pattern.
+    """
+    for parts in self._GetPartsPerUserAccount():
+      yield from map(''.join, itertools.product(*parts))
+
+  @property
+  def number_of_expansions(self):
+    """int: number of expanded patterns, which are not generated."""
+    number_of_expansions = 0
+    for parts in self._GetPartsPerUserAccount():
+      number_of_user_expansions = 1
+      for values in parts:
+        number_of_user_expansions *= len(values)
+      number_of_expansions += number_of_user_expansions
+
+    return number_of_expansions
+
+  def _GetPartsPerUserAccount(self):
+    """Retrieves the parts of the pattern per user account.
+
+    Yields:
+      list[list[str]]: values of the parts of the pattern for an user account
+          or for all user accounts if the pattern contains no users
+          parameters.
+    """
+    if not self._user_part_indexes:
+      yield self._parts
+      return
+
+    number_of_user_accounts = len(self._parts[self._user_part_indexes[0]])
+    parts = list(self._parts)
+    for user_index in range(number_of_user_accounts):
+      for part_index in self._user_part_indexes:
+        parts[part_index] = self._parts[part_index][user_index]
+      yield parts
+
+
+class ParameterExpander(object):
+  """Expands the parameters in artifact definition sources.
+
+  Parameters, such as %%users.homedir%%, are expanded with the values in a
+  knowledge base. Parameters without a value in the knowledge base are
+  expanded with the fallbacks and decomposition rules of the format
+  specification, for example %%users.appdata%% is expanded into both
+  "%%users.userprofile%%\\AppData\\Roaming" and
+  "%%users.userprofile%%\\Application Data".
+
+  Expansions are cached per pattern and knowledge base fingerprint, the
+  values of the parameters per name and knowledge base fingerprint. When a
+  cache is full the least recently used entry is evicted.
+  """
+
+  # Parameters of which the name differs from that of the Windows environment
+  # variable.
+  _ENVIRONMENT_VARIABLE_NAMES = {
+      'environ_programfilesx86': 'programfiles(x86)'}
+
+  # Parameters that, if not defined, are expanded into the first of the
+  # alternatives that is defined.
+  _FALLBACKS = {
+      'environ_allusersappdata': ['%%environ_programdata%%'],
+      'environ_programdata': [
+          '%%environ_allusersappdata%%',
+          '%%environ_allusersprofile%%\\Application Data'],
+      'environ_systemroot': ['%%environ_windir%%'],
+      'environ_windir': ['%%environ_systemroot%%'],
+      'users.homedir': ['%%users.userprofile%%'],
+      'users.userprofile': ['%%users.homedir%%']}
+
+  # Parameters that, if not defined, are expanded into all of the
+  # decompositions that are defined.
+  _DECOMPOSITIONS = {
+      'users.appdata': [
+          '%%users.userprofile%%\\AppData\\Roaming',
+          '%%users.userprofile%%\\Application Data'],
+      'users.localappdata': [
+          '%%users.userprofile%%\\AppData\\Local',
+          '%%users.userprofile%%\\Local Settings\\Application Data'],
+      'users.localappdata_low': ['%%users.userprofile%%\\AppData\\LocalLow'],
+      'users.temp': ['%%users.localappdata%%\\Temp']}
+
+  _MAXIMUM_NUMBER_OF_CACHED_EXPANSIONS = 65536
+
+  _VARIABLE_RE = re.compile(r'%%([^%]+)%%')
+
+  def __init__(self):
+    """Initializes a parameter expander."""
+    super(ParameterExpander, self).__init__()
+    self._expansions = collections.OrderedDict()
+    self._parameter_values = collections.OrderedDict()
+    self._pattern_parts = collections.OrderedDict()
+
+  def _CacheValue(self, cache, lookup_key, value):
+    """Caches a value and evicts the least recently used value if full.
+
+    Args:
+      cache (collections.OrderedDict[object, object]): cache in order of
+          least to most recently used.
+      lookup_key (object): lookup key of the value.
+      value (object): value.
+    """
+    if len(cache) >= self._MAXIMUM_NUMBER_OF_CACHED_EXPANSIONS:
+      cache.popitem(last=False)
+
+    cache[lookup_key] = value
+
+  def _GetParameterValues(self, name, knowledge_base):
+    """Retrieves the values of a parameter.
+
+    Args:
+      name (str): lower case name of the parameter, such as "users.homedir".
+      knowledge_base (KnowledgeBase): knowledge base.
+
+    Returns:
+      list[object]: values of the parameter, or for a users parameter a list
+          of the values per user account.
+    """
+    lookup_key = (name, knowledge_base.fingerprint)
+    values = self._parameter_values.get(lookup_key, None)
+    if values is not None:
+      self._parameter_values.move_to_end(lookup_key)
+    else:
+      if name.startswith('users.'):
+        values = [
+            self._ResolveParameter(name, knowledge_base, user_account, set())
+            for user_account in knowledge_base.user_accounts]
+      else:
+        values = self._ResolveParameter(name, knowledge_base, None, set())
+
+      self._CacheValue(self._parameter_values, lookup_key, values)
+
+    return values
+
+  def _GetPatternParts(self, pattern):
+    """Splits a pattern into literals and parameter names.
+
+    Args:
+      pattern (str): pattern.
+
+    Returns:
+      list[str]: literals, at even indexes, and lower case parameter names,
+          at odd indexes.
+    """
+    parts = self._pattern_parts.get(pattern, None)
+    if parts is not None:
+      self._pattern_parts.move_to_end(pattern)
+    else:
+      parts = self._VARIABLE_RE.split(pattern)
+      for index in range(1, len(parts), 2):
+        parts[index] = parts[index].lower()
+
+      self._CacheValue(self._pattern_parts, pattern, parts)
+
+    return parts
+
+  def _ResolveParameter(self, name, knowledge_base, user_account, resolving):
+    """Resolves the values of a parameter.
+
+    Args:
+      name (str): lower case name of the parameter, such as "users.homedir".
+      knowledge_base (KnowledgeBase): knowledge base.
+      user_account (UserAccount): user account to resolve users parameters
+          for or None if not available.
+      resolving (set[str]): names of the parameters that are being resolved,
+          used to stop the resolution of parameters that are defined in terms
+          of themselves.
+
+    Returns:
+      list[str]: values of the parameter, which is empty if the parameter
+          cannot be resolved.
+    """
+    if name in resolving:
+      return []
+
+    value = None
+    if name.startswith('environ_'):
+      variable_name = self._ENVIRONMENT_VARIABLE_NAMES.get(name, name[8:])
+      value = knowledge_base.GetEnvironmentVariable(variable_name)
+
+    elif name.startswith('users.') and user_account:
+      attribute_name = name[6:]
+      if attribute_name in UserAccount.ATTRIBUTE_NAMES:
+        value = getattr(user_account, attribute_name)
+
+    if value is not None:
+      return [value]
+
+    resolving.add(name)
+    try:
+      values = []
+      for template in self._FALLBACKS.get(name, []):
+        values = self._ResolveTemplate(
+            template, knowledge_base, user_account, resolving)
+        if values:
+          break
+
+      for template in self._DECOMPOSITIONS.get(name, []):
+        values.extend(self._ResolveTemplate(
+            template, knowledge_base, user_account, resolving))
+
+    finally:
+      resolving.remove(name)
+
+    return values
+
+  def _ResolveTemplate(self, template, knowledge_base, user_account, resolving):
+    """Resolves the values of a template of a fallback or decomposition rule.
+
+    Args:
+      template (str): template, such as "%%users.userprofile%%\\AppData".
+      knowledge_base (KnowledgeBase): knowledge base.
+      user_account (UserAccount): user account to resolve users parameters
+          for or None if not available.
+      resolving (set[str]): names of the parameters that are being resolved.
+
+    Returns:
+      list[str]: values of the template, which is empty if a parameter in
+          the template cannot be resolved.
+    """
+    parts = []
+    for index, part in enumerate(self._GetPatternParts(template)):
+      if index % 2 == 0:
+        parts.append([part])
+      else:
+        parts.append(self._ResolveParameter(
+            part, knowledge_base, user_account, resolving))
+
+    return [''.join(values) for values in itertools.product(*parts)]
+
+  def ExpandPattern(self, pattern, knowledge_base):
+    """Expands the parameters in a pattern.
+
+    Args:
+      pattern (str): pattern, such as "%%users.homedir%%/.bash_history".
+      knowledge_base (KnowledgeBase): knowledge base.
+
+    Returns:
+      ParameterExpansion: expansion of the pattern.
+    """
+    lookup_key = (pattern, knowledge_base.fingerprint)
+    expansion = self._expansions.get(lookup_key, None)
+    if expansion:
+      self._expansions.move_to_end(lookup_key)
+      return expansion
+
+    parts = []
+    unresolved_parameters = set()
+    user_part_indexes = []
+    for index, part in enumerate(self._GetPatternParts(pattern)):
+      if index % 2 == 0:
+        parts.append([part])
+        continue
+
+      values = self._GetParameterValues(part, knowledge_base)
+      if part.startswith('users.'):
+        user_part_indexes.append(index)
+        if not values or not all(values):
+          unresolved_parameters.add(part)
+
+      elif not values:
+        unresolved_parameters.add(part)
+
+      parts.append(values)
+
+    expansion = ParameterExpansion(
+        pattern, parts, user_part_indexes, frozenset(unresolved_parameters))
+
+    self._CacheValue(self._expansions, lookup_key, expansion)
+
+    return expansion
+
+  def ExpandSource(self, source, knowledge_base):
+    """Expands the parameters in the patterns of a source.
+
+    The patterns of a source are the paths of directory, file and path
+    sources, the key paths of Windows Registry key and value sources and
+    the query of WMI query sources.
+
+    Args:
+      source (SourceType): source.
+      knowledge_base (KnowledgeBase): knowledge base.
+
+    Returns:
+      list[ParameterExpansion]: expansions of the patterns of the source.
+    """
+    if source.type_indicator in (
+        definitions.TYPE_INDICATOR_DIRECTORY, definitions.TYPE_INDICATOR_FILE,
+        definitions.TYPE_INDICATOR_PATH):
+      patterns = source.paths or []
+
+    elif source.type_indicator == (
+        definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY):
+      patterns = source.keys or []
+
+    elif source.type_indicator == (
+        definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE):
+      patterns = [
+          key_value_pair['key']
+          for key_value_pair in source.key_value_pairs or []]
+
+    elif source.type_indicator == definitions.TYPE_INDICATOR_WMI_QUERY:
+      patterns = [source.query] if source.query else []
+
+    else:
+      patterns = []
+
+    return [
+        self.ExpandPattern(pattern, knowledge_base) for pattern in patterns]
@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions path and Windows Registry key path matchers."""
+
+import abc
+import fnmatch
+import re
+
+from artifacts import definitions
+
+
+class PathSegmentNode(object):
+  """Node of a path segment trie.
+
+  Attributes:
+    glob_children (dict[tuple[str, bool], tuple[str, re.Pattern,
+        PathSegmentNode]]): literal prefix, compiled regular expression and
+        child node per glob path segment and case-insensitive indicator.
+    globstar_children (dict[int, PathSegmentNode]): child node per maximum
+        recursion depth of globstar path segments.
+    literal_children (dict[str, PathSegmentNode]): child node per literal
+        path segment that is matched case-sensitive.
+    literal_children_lower (dict[str, PathSegmentNode]): child node per lower
+        case literal path segment that is matched case-insensitive.
+    matches (list[tuple[object]]): matches of the paths that end at the node,
+        where the values of a match are defined by the matcher.
+  """
+
+  def __init__(self):
+    """Initializes a path segment node."""
+    super(PathSegmentNode, self).__init__()
+    self.glob_children = {}
+    self.globstar_children = {}
+    self.literal_children = {}
+    self.literal_children_lower = {}
+    self.matches = []
+
+
+class PathSegmentTrieMatcher(object):
+  """Matcher of paths compiled into a path segment trie.
+
+  Literal path segments are matched by dictionary look up. Glob path segments
+  are matched with a precompiled regular expression, after their literal
+  prefix was compared. A globstar "**", or "**N", matches 1 up to N path
+  segments, where N is 10 by default.
+
+  Attributes:
+    number_of_paths (int): number of expanded paths in the trie.
+  """
+
+  _DEFAULT_GLOBSTAR_DEPTH = 10
+
+  _GLOB_CHARACTERS_RE = re.compile(r'[*?[]')
+
+  _GLOBSTAR_RE = re.compile(r'^\*\*([0-9]*)$')
+
+  # Literal prefix and regular expression of path segments that are matched
+  # by pattern, with the lower case path segment as key.
+  _PATTERN_SEGMENTS = {}
+
+  _SOURCE_TYPE_INDICATORS = frozenset()
+
+  _VARIABLE_RE = re.compile(r'%%([^%]+)%%')
+
+  def __init__(self):
+    """Initializes a path segment trie matcher."""
+    super(PathSegmentTrieMatcher, self).__init__()
+    self._root_node = PathSegmentNode()
+
+    self.number_of_paths = 0
+
+  def _AddPathSegments(self, path_segments, case_insensitive, match):
+    """Adds path segments to the trie.
+
+    Args:
+      path_segments (list[str]): path segments.
+      case_insensitive (bool): True if the path segments should be matched
+          case-insensitive.
+      match (tuple[object]): match of the path.
+    """
+    node = self._root_node
+    for path_segment in path_segments:
+      globstar_match = self._GLOBSTAR_RE.match(path_segment)
+      if globstar_match:
+        depth = int(globstar_match.group(1) or self._DEFAULT_GLOBSTAR_DEPTH)
+        node = node.globstar_children.setdefault(depth, PathSegmentNode())
+        continue
+
+      path_segment_lower = path_segment.lower()
+      if path_segment_lower in self._PATTERN_SEGMENTS:
+        glob_key = (path_segment_lower, True)
+        glob_child = node.glob_children.get(glob_key, None)
+        if not glob_child:
+          prefix, regex = self._PATTERN_SEGMENTS[path_segment_lower]
+          glob_child = (prefix, regex, PathSegmentNode())
+          node.glob_children[glob_key] = glob_child
+
+        node = glob_child[2]
+
+      elif self._GLOB_CHARACTERS_RE.search(path_segment):
+        glob_key = (path_segment, case_insensitive)
+        glob_child = node.glob_children.get(glob_key, None)
+        if not glob_child:
+          glob_child = self._CompileGlob(path_segment, case_insensitive)
+          node.glob_children[glob_key] = glob_child
+
+        node = glob_child[2]
+
+      elif case_insensitive:
+        node = node.literal_children_lower.setdefault(
+            path_segment_lower, PathSegmentNode())
+
+      else:
+        node = node.literal_children.setdefault(
+            path_segment, PathSegmentNode())
+
+    node.matches.append(match)
+    self.number_of_paths += 1
+
+  def _CompileGlob(self, path_segment, case_insensitive):
+    """Compiles a glob path segment.
+
+    Args:
+      path_segment (str): glob path segment.
+      case_insensitive (bool): True if the path segment should be matched
+          case-insensitive.
+
+    Returns:
+      tuple[str, re.Pattern, PathSegmentNode]: literal prefix, compiled
+          regular expression, where None represents the path segment matches
+          any value, and child node of the glob path segment.
+    """
+    prefix = self._GLOB_CHARACTERS_RE.split(path_segment, maxsplit=1)[0]
+    suffix = path_segment[len(prefix):]
+
+    if suffix == '*':
+      regex = None
+    else:
+      flags = re.IGNORECASE if case_insensitive else 0
+      regex = re.compile(fnmatch.translate(path_segment), flags)
+
+    if case_insensitive:
+      prefix = prefix.lower()
+
+    return prefix, regex, PathSegmentNode()
+
+  def _GetMatchingNodes(self, path_segments):
+    """Retrieves the nodes where paths that match the path segments end.
+
+    Args:
+      path_segments (list[str]): path segments.
+
+    Yields:
+      PathSegmentNode: node where paths that match the path segments end.
+    """
+    path_segments_lower = [
+        path_segment.lower() for path_segment in path_segments]
+    number_of_path_segments = len(path_segments)
+
+    visited = set()
+    states = [(self._root_node, 0)]
+    while states:
+      node, segment_index = states.pop()
+
+      state_key = (id(node), segment_index)
+      if state_key in visited:
+        continue
+      visited.add(state_key)
+
+      if segment_index == number_of_path_segments:
+        if node.matches:
+          yield node
+        continue
+
+      path_segment = path_segments[segment_index]
+      path_segment_lower = path_segments_lower[segment_index]
+      next_segment_index = segment_index + 1
+
+      child_node = node.literal_children.get(path_segment, None)
+      if child_node:
+        states.append((child_node, next_segment_index))
+
+      child_node = node.literal_children_lower.get(path_segment_lower, None)
+      if child_node:
+        states.append((child_node, next_segment_index))
+
+      for (_, case_insensitive), (prefix, regex, child_node) in (
+          node.glob_children.items()):
+        if case_insensitive:
+          value = path_segment_lower
+        else:
+          value = path_segment
+
+        if value.startswith(prefix) and (
+            regex is None or regex.match(path_segment)):
+          states.append((child_node, next_segment_index))
+
+      for depth, child_node in node.globstar_children.items():
+        last_segment_index = min(
+            segment_index + depth, number_of_path_segments)
+        for end_segment_index in range(
+            next_segment_index, last_segment_index + 1):
+          states.append((child_node, end_segment_index))
+
+  @abc.abstractmethod
+  def AddSource(self, artifact_definition, source):
+    """Adds the paths of a source.
+
+    Sources that are not supported by the matcher are ignored.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+      source (SourceType): source.
+    """
+
+  def AddSourcesFromRegistry(self, artifact_registry, supported_os=None):
+    """Adds the paths of the sources in an artifact definitions registry.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    for type_indicator in sorted(self._SOURCE_TYPE_INDICATORS):
+      for artifact_definition, source in (
+          artifact_registry.GetSourcesByTypeIndicator(
+              type_indicator, supported_os=supported_os)):
+        self.AddSource(artifact_definition, source)
+
+
+class PathMatcher(PathSegmentTrieMatcher):
+  """Matches paths against the paths of artifact definition sources.
+
+  The paths of the file, path and directory sources are split into path
+  segments, using the separator of the source, and compiled into a trie.
+  Paths of sources that apply to Windows, or use "\\" as separator, are
+  matched case-insensitive.
+
+  Parameters, such as %%users.homedir%%, are expanded into the values defined
+  by the decomposition rules of the format specification or the values
+  provided by the caller. Parameters without values match any value within
+  their path segment.
+
+  Paths are relative to the root of the file system and a drive letter,
+  such as "C:", at the start of a path is ignored.
+  """
+
+  # Values of the parameters based on the decomposition rules in the format
+  # specification.
+  _DEFAULT_VARIABLES = {
+      'environ_allusersappdata': ['/ProgramData'],
+      'environ_allusersprofile': [
+          '/ProgramData', '/Documents and Settings/All Users'],
+      'environ_programdata': [
+          '/ProgramData', '/Documents and Settings/All Users/Application Data'],
+      'environ_programfiles': ['/Program Files'],
+      'environ_programfilesx86': ['/Program Files (x86)'],
+      'environ_systemdrive': ['/'],
+      'environ_systemroot': ['/Windows', '/WINNT'],
+      'environ_windir': ['/Windows', '/WINNT'],
+      'users.appdata': [
+          '%%users.userprofile%%/AppData/Roaming',
+          '%%users.userprofile%%/Application Data'],
+      'users.homedir': ['/Users/*', '/home/*', '/root'],
+      'users.localappdata': [
+          '%%users.userprofile%%/AppData/Local',
+          '%%users.userprofile%%/Local Settings/Application Data'],
+      'users.localappdata_low': ['%%users.userprofile%%/AppData/LocalLow'],
+      'users.temp': ['%%users.localappdata%%/Temp'],
+      'users.userprofile': ['/Documents and Settings/*', '/Users/*']}
+
+  _DRIVE_LETTER_RE = re.compile(r'^[A-Za-z]:$')
+
+  _MAXIMUM_VARIABLE_EXPANSION_DEPTH = 10
+
+  _PATH_SEPARATORS_RE = re.compile(r'[/\\]')
+
+  _SOURCE_TYPE_INDICATORS = frozenset([
+      definitions.TYPE_INDICATOR_DIRECTORY,
+      definitions.TYPE_INDICATOR_FILE,
+      definitions.TYPE_INDICATOR_PATH])
+
+  def __init__(self, variables=None):
+    """Initializes a path matcher.
+
+    Args:
+      variables (Optional[dict[str, list[str]]]): values per parameter name,
+          such as "users.homedir", that override the default values.
+    """
+    super(PathMatcher, self).__init__()
+    self._variables = dict(self._DEFAULT_VARIABLES)
+    self._variables.update(variables or {})
+
+  def _ExpandPath(self, path, separator, depth=0):
+    """Expands the parameters in a path and splits it into path segments.
+
+    Args:
+      path (str): path.
+      separator (str): path segment separator, where None represents both
+          "/" and "\\".
+      depth (Optional[int]): parameter expansion depth, used to stop the
+          expansion of parameters that are defined in terms of themselves.
+
+    Returns:
+      list[list[str]]: path segments of the expanded paths.
+    """
+    if separator:
+      path_segments = path.split(separator)
+    else:
+      path_segments = self._PATH_SEPARATORS_RE.split(path)
+
+    expanded_paths = [[]]
+    for path_segment in path_segments:
+      if not path_segment:
+        continue
+
+      variable_match = self._VARIABLE_RE.fullmatch(path_segment)
+      values = None
+      if variable_match and depth < self._MAXIMUM_VARIABLE_EXPANSION_DEPTH:
+        values = self._variables.get(variable_match.group(1), None)
+
+      if values:
+        expanded_values = []
+        for value in values:
+          expanded_values.extend(self._ExpandPath(value, None, depth=depth + 1))
+
+        expanded_paths = [
+            expanded_path + expanded_value
+            for expanded_path in expanded_paths
+            for expanded_value in expanded_values]
+
+      else:
+        path_segment = self._VARIABLE_RE.sub('*', path_segment)
+        for expanded_path in expanded_paths:
+          expanded_path.append(path_segment)
+
+    for expanded_path in expanded_paths:
+      if expanded_path and self._DRIVE_LETTER_RE.match(expanded_path[0]):
+        del expanded_path[0]
+
+    return expanded_paths
+
+  def AddSource(self, artifact_definition, source):
+    """Adds the paths of a source.
+
+    Sources that do not define paths are ignored.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+      source (SourceType): source.
+    """
+    if source.type_indicator not in self._SOURCE_TYPE_INDICATORS:
+      return
+
+    supported_os = source.supported_os or artifact_definition.supported_os
+    case_insensitive = source.separator == '\\' or 'Windows' in (
+        supported_os or [])
+
+    for path in source.paths:
+      for path_segments in self._ExpandPath(path, source.separator):
+        self._AddPathSegments(
+            path_segments, case_insensitive,
+            (artifact_definition, source, path))
+
+  def Match(self, path, separator='/'):
+    """Matches a path.
+
+    Args:
+      path (str): path, relative to the root of the file system or prefixed
+          with a drive letter.
+      separator (Optional[str]): path segment separator of the path.
+
+    Returns:
+      list[tuple[ArtifactDefinition, SourceType, str]]: artifact definition,
+          source and path as defined by the source, of the source paths that
+          match the path.
+    """
+    path_segments = [
+        path_segment for path_segment in path.split(separator) if path_segment]
+    if path_segments and self._DRIVE_LETTER_RE.match(path_segments[0]):
+      del path_segments[0]
+
+    matches = {}
+    for node in self._GetMatchingNodes(path_segments):
+      for artifact_definition, source, source_path in node.matches:
+        match_key = (id(source), source_path)
+        if match_key not in matches:
+          matches[match_key] = (artifact_definition, source, source_path)
+
+    return list(matches.values())
+
+
+class WindowsRegistryKeyMatcher(PathSegmentTrieMatcher):
+  """Matches Windows Registry key paths against those of artifact definitions.
+
+  The key paths of the Windows Registry key and value sources are compiled
+  into a trie and are matched case-insensitive. The %%users.sid%% parameter
+  matches a security identifier (SID) and the CurrentControlSet key matches
+  both CurrentControlSet and the ControlSet### keys it links to. A key path
+  that starts with HKEY_USERS\\%%users.sid%% is also matched as a key path
+  that starts with HKEY_CURRENT_USER. Other parameters match any value within
+  their key path segment.
+
+  Since the last key path segment of a Windows Registry key source can refer
+  to values, such as "CurrentVersion\\Run\\*", a value name is also matched as
+  the last segment of these key paths.
+  """
+
+  _PATTERN_SEGMENTS = {
+      '%%users.sid%%': (
+          's-1-', re.compile(r'S-1-[0-9]+(-[0-9]+)*$', re.IGNORECASE)),
+      'currentcontrolset': (
+          '', re.compile(
+              r'(CurrentControlSet|ControlSet[0-9]{3})$', re.IGNORECASE))}
+
+  _SOURCE_TYPE_INDICATORS = frozenset([
+      definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY,
+      definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE])
+
+  _VARIABLES = {
+      '%%current_control_set%%': [
+          'HKEY_LOCAL_MACHINE', 'System', 'CurrentControlSet']}
+
+  def _AddKeyPath(self, artifact_definition, source, key_path, value_name):
+    """Adds a key path.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+      source (SourceType): source that defines the key path.
+      key_path (str): key path as defined by the source.
+      value_name (str): value name as defined by the source, where None
+          represents all values of the key.
+    """
+    path_segments = []
+    for path_segment in key_path.split('\\'):
+      if not path_segment:
+        continue
+
+      values = self._VARIABLES.get(path_segment.lower(), None)
+      if values:
+        path_segments.extend(values)
+      elif path_segment.lower() in self._PATTERN_SEGMENTS:
+        path_segments.append(path_segment)
+      else:
+        path_segments.append(self._VARIABLE_RE.sub('*', path_segment))
+
+    value_name_regex = None
+    if value_name is not None:
+      value_name_regex = re.compile(
+          fnmatch.translate(value_name), re.IGNORECASE)
+
+    match = (artifact_definition, source, key_path, value_name,
+             value_name_regex)
+
+    self._AddPathSegments(path_segments, True, match)
+
+    if [path_segment.lower() for path_segment in path_segments[:2]] == [
+        'hkey_users', '%%users.sid%%']:
+      self._AddPathSegments(
+          ['HKEY_CURRENT_USER'] + path_segments[2:], True, match)
+
+  def AddSource(self, artifact_definition, source):
+    """Adds the key paths of a source.
+
+    Sources that do not define key paths are ignored.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+      source (SourceType): source.
+    """
+    if source.type_indicator == (
+        definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY):
+      for key_path in source.keys:
+        self._AddKeyPath(artifact_definition, source, key_path, None)
+
+    elif source.type_indicator == (
+        definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE):
+      for key_value_pair in source.key_value_pairs:
+        self._AddKeyPath(
+            artifact_definition, source, key_value_pair['key'],
+            key_value_pair['value'])
+
+  def Match(self, key_path, value_name=None):
+    """Matches a key path and optionally a value name.
+
+    Args:
+      key_path (str): key path, such as "HKEY_LOCAL_MACHINE\\System".
+      value_name (Optional[str]): value name, where None represents the key
+          itself. A key matches the Windows Registry value sources of the
+          values it contains.
+
+    Returns:
+      list[tuple[ArtifactDefinition, SourceType, str, str]]: artifact
+          definition, source, key path and value name, as defined by the
+          source, of the source key paths that match, where the value name
+          is None for Windows Registry key sources.
+    """
+    path_segments = [
+        path_segment for path_segment in key_path.split('\\') if path_segment]
+
+    matches = {}
+    for node in self._GetMatchingNodes(path_segments):
+      for (artifact_definition, source, source_key_path, source_value_name,
+           value_name_regex) in node.matches:
+        if value_name is not None and value_name_regex and (
+            not value_name_regex.match(value_name)):
+          continue
+
+        match_key = (id(source), source_key_path, source_value_name)
+        if match_key not in matches:
+          matches[match_key] = (
+              artifact_definition, source, source_key_path, source_value_name)
+
+    if value_name:
+      for node in self._GetMatchingNodes(path_segments + [value_name]):
+        for (artifact_definition, source, source_key_path, source_value_name,
+             _) in node.matches:
+          if source_value_name is not None:
+            continue
+
+          match_key = (id(source), source_key_path, None)
+          if match_key not in matches:
+            matches[match_key] = (
+                artifact_definition, source, source_key_path, None)
+
+    return list(matches.values())
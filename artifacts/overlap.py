@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions glob subsumption and overlap analysis."""
+
+import fnmatch
+import re
+
+
+RELATION_EQUIVALENT = 'equivalent'
+RELATION_OVERLAPS = 'overlaps'
+RELATION_SUBSUMED = 'subsumed'
+RELATION_SUBSUMES = 'subsumes'
+
+
+class GlobPattern(object):
+  """Path or key path glob.
+
+  Attributes:
+    case_insensitive (bool): True if the glob is matched case-insensitive.
+    key_segments (tuple[str]): path segments of the glob, in lower case if
+        the glob is matched case-insensitive.
+    path (str): path of the glob.
+    path_segments (list[str]): path segments of the glob.
+    separator (str): path segment separator of the glob.
+  """
+
+  def __init__(self, path, separator='/', case_insensitive=False):
+    """Initializes a glob.
+
+    Args:
+      path (str): path of the glob.
+      separator (Optional[str]): path segment separator of the glob.
+      case_insensitive (Optional[bool]): True if the glob is matched
+          case-insensitive.
+    """
+    path_segments = [
+        path_segment for path_segment in path.split(separator)
+        if path_segment]
+
+    super(GlobPattern, self).__init__()
+    self.case_insensitive = case_insensitive
+    self.key_segments = tuple(
+        path_segment.lower() if case_insensitive else path_segment
+        for path_segment in path_segments)
+    self.path = path
+    self.path_segments = path_segments
+    self.separator = separator
+
+
+class GlobTrieNode(object):
+  """Node in the prefix trie of globs.
+
+  Attributes:
+    children (dict[str, GlobTrieNode]): child nodes per path segment, in
+        lower case.
+    patterns (list[GlobPattern]): globs of which the path segments without a
+        glob at the start end at the node.
+  """
+
+  def __init__(self):
+    """Initializes a node in the prefix trie of globs."""
+    super(GlobTrieNode, self).__init__()
+    self.children = {}
+    self.patterns = []
+
+
+class GlobOverlapAnalyzer(object):
+  """Analyzes subsumption and overlap of path and key path globs.
+
+  A glob subsumes another glob if every path matched by the other glob is
+  also matched by the glob, such as "/var/log/**" that subsumes
+  "/var/log/apt/*.log", and overlaps another glob if one or more paths are
+  matched by both. Only globs with the same path segment separator are
+  compared.
+
+  Parameters, such as %%users.homedir%%, are compared by name, hence a
+  parameter only subsumes and overlaps the same parameter. Subsumption is
+  determined conservatively, it can fail to detect subsumption of complex
+  globs but never reports subsumption that does not hold.
+
+  The globs are indexed in a prefix trie by their path segments without a
+  glob at the start. Two globs can only overlap if the path segments at the
+  start of one are a prefix of those of the other, hence a glob is only
+  compared to the globs at the nodes on its path and below its node.
+
+  Attributes:
+    number_of_comparisons (int): number of pairs of globs that were compared.
+  """
+
+  _DEFAULT_GLOBSTAR_DEPTH = 10
+
+  _GLOB_CHARACTERS_RE = re.compile(r'[*?[]')
+
+  _GLOBSTAR_RE = re.compile(r'^\*\*([0-9]*)$')
+
+  # Globstars and parameters can match multiple path segments.
+  _VARIABLE_LENGTH_RE = re.compile(r'\*\*|%%')
+
+  def __init__(self):
+    """Initializes a glob subsumption and overlap analyzer."""
+    super(GlobOverlapAnalyzer, self).__init__()
+    self._root_nodes = {}
+    self.number_of_comparisons = 0
+
+  def _GetComparableSegments(self, pattern, other_pattern):
+    """Retrieves the path segments of two globs to compare.
+
+    Args:
+      pattern (GlobPattern): glob.
+      other_pattern (GlobPattern): other glob.
+
+    Returns:
+      tuple[tuple[str], tuple[str]]: path segments of the glob and of the
+          other glob, in lower case if either glob is matched
+          case-insensitive.
+    """
+    if pattern.case_insensitive == other_pattern.case_insensitive:
+      return pattern.key_segments, other_pattern.key_segments
+
+    return (
+        tuple(path_segment.lower() for path_segment in pattern.key_segments),
+        tuple(path_segment.lower()
+              for path_segment in other_pattern.key_segments))
+
+  def _GetGlobstarDepth(self, path_segment):
+    """Determines the maximum number of path segments of a globstar.
+
+    Args:
+      path_segment (str): path segment.
+
+    Returns:
+      int: maximum number of path segments matched by the globstar or 0 if
+          the path segment is not a globstar.
+    """
+    globstar_match = self._GLOBSTAR_RE.match(path_segment)
+    if not globstar_match:
+      return 0
+
+    return int(globstar_match.group(1) or self._DEFAULT_GLOBSTAR_DEPTH)
+
+  def _GetPrefixSegments(self, pattern):
+    """Retrieves the path segments without a glob at the start of a glob.
+
+    Args:
+      pattern (GlobPattern): glob.
+
+    Returns:
+      list[str]: path segments without a glob at the start, in lower case.
+    """
+    prefix_segments = []
+    for path_segment in pattern.key_segments:
+      if self._GLOB_CHARACTERS_RE.search(path_segment):
+        break
+
+      prefix_segments.append(path_segment.lower())
+
+    return prefix_segments
+
+  def _GetSegmentRange(self, path_segment):
+    """Determines the number of path segments a path segment can match.
+
+    Args:
+      path_segment (str): path segment.
+
+    Returns:
+      tuple[int, int]: minimum and maximum number of path segments, where a
+          maximum of None represents the number is unknown.
+    """
+    depth = self._GetGlobstarDepth(path_segment)
+    if depth:
+      return 1, depth
+
+    # Parameters, such as %%users.homedir%%, can expand into multiple path
+    # segments.
+    if '%%' in path_segment:
+      return 1, None
+
+    return 1, 1
+
+  def _SegmentOverlaps(self, path_segment, other_path_segment):
+    """Determines if a path segment overlaps another path segment.
+
+    Two globs are considered to overlap if their literal prefixes and
+    suffixes are compatible, which can report overlap of complex globs that
+    does not hold.
+
+    Args:
+      path_segment (str): path segment, that is not a globstar.
+      other_path_segment (str): other path segment, that is not a globstar.
+
+    Returns:
+      bool: True if one or more values are matched by both path segments.
+    """
+    if path_segment == other_path_segment:
+      return True
+
+    if '%%' in path_segment or '%%' in other_path_segment:
+      return False
+
+    is_glob = bool(self._GLOB_CHARACTERS_RE.search(path_segment))
+    other_is_glob = bool(self._GLOB_CHARACTERS_RE.search(other_path_segment))
+    if not is_glob and not other_is_glob:
+      return False
+
+    if not other_is_glob:
+      return fnmatch.fnmatchcase(other_path_segment, path_segment)
+
+    if not is_glob:
+      return fnmatch.fnmatchcase(path_segment, other_path_segment)
+
+    prefix = self._GLOB_CHARACTERS_RE.split(path_segment, maxsplit=1)[0]
+    other_prefix = self._GLOB_CHARACTERS_RE.split(
+        other_path_segment, maxsplit=1)[0]
+    if not (prefix.startswith(other_prefix) or
+            other_prefix.startswith(prefix)):
+      return False
+
+    suffix = re.split(r'[*?\]]', path_segment)[-1]
+    other_suffix = re.split(r'[*?\]]', other_path_segment)[-1]
+    return suffix.endswith(other_suffix) or other_suffix.endswith(suffix)
+
+  def _SegmentSubsumes(self, path_segment, other_path_segment):
+    """Determines if a path segment subsumes another path segment.
+
+    Args:
+      path_segment (str): path segment, that is not a globstar.
+      other_path_segment (str): other path segment, that is not a globstar.
+
+    Returns:
+      bool: True if every value matched by the other path segment is also
+          matched by the path segment.
+    """
+    if path_segment == other_path_segment:
+      return True
+
+    if '%%' in path_segment or '%%' in other_path_segment:
+      return False
+
+    if not self._GLOB_CHARACTERS_RE.search(path_segment):
+      return False
+
+    if not self._GLOB_CHARACTERS_RE.search(other_path_segment):
+      return fnmatch.fnmatchcase(other_path_segment, path_segment)
+
+    if path_segment == '*':
+      return True
+
+    prefix = path_segment[:-1]
+    return bool(
+        path_segment.endswith('*') and
+        not self._GLOB_CHARACTERS_RE.search(prefix) and
+        other_path_segment.startswith(prefix))
+
+  def AddPattern(self, pattern):
+    """Adds a glob to the index.
+
+    Args:
+      pattern (GlobPattern): glob.
+    """
+    node = self._root_nodes.get(pattern.separator, None)
+    if not node:
+      node = GlobTrieNode()
+      self._root_nodes[pattern.separator] = node
+
+    for path_segment in self._GetPrefixSegments(pattern):
+      child_node = node.children.get(path_segment, None)
+      if not child_node:
+        child_node = GlobTrieNode()
+        node.children[path_segment] = child_node
+
+      node = child_node
+
+    node.patterns.append(pattern)
+
+  def Compare(self, pattern, other_pattern):
+    """Determines the relation between two globs.
+
+    Args:
+      pattern (GlobPattern): glob.
+      other_pattern (GlobPattern): other glob.
+
+    Returns:
+      str: relation of the glob to the other glob, such as "subsumes" if the
+          glob subsumes the other glob, or None if the globs do not overlap.
+    """
+    self.number_of_comparisons += 1
+
+    subsumes = self.Subsumes(pattern, other_pattern)
+    # The arguments are swapped to determine if the other glob subsumes the
+    # glob.
+    subsumed = self.Subsumes(  # pylint: disable=arguments-out-of-order
+        other_pattern, pattern)
+    if subsumes and subsumed:
+      return RELATION_EQUIVALENT
+
+    if subsumes:
+      return RELATION_SUBSUMES
+
+    if subsumed:
+      return RELATION_SUBSUMED
+
+    if self.Overlaps(pattern, other_pattern):
+      return RELATION_OVERLAPS
+
+    return None
+
+  def GetOverlaps(self):
+    """Retrieves the pairs of indexed globs that overlap.
+
+    Every pair is compared once, where the first glob of the pair is the glob
+    that was indexed at the node closest to the root of the trie, or that
+    was indexed first.
+
+    Yields:
+      tuple[GlobPattern, GlobPattern, str]: glob, other glob and relation of
+          the glob to the other glob.
+    """
+    for _, root_node in sorted(self._root_nodes.items()):
+      nodes = [(root_node, [])]
+      while nodes:
+        node, ancestor_patterns = nodes.pop()
+
+        for index, other_pattern in enumerate(node.patterns):
+          for pattern in ancestor_patterns + node.patterns[:index]:
+            relation = self.Compare(pattern, other_pattern)
+            if relation:
+              yield pattern, other_pattern, relation
+
+        if node.children:
+          ancestor_patterns = ancestor_patterns + node.patterns
+          for _, child_node in sorted(node.children.items(), reverse=True):
+            nodes.append((child_node, ancestor_patterns))
+
+  def GetSubsumingPatterns(self, pattern):
+    """Retrieves the indexed globs that subsume a glob.
+
+    Args:
+      pattern (GlobPattern): glob.
+
+    Yields:
+      GlobPattern: indexed glob, other than the glob, that subsumes the glob.
+    """
+    node = self._root_nodes.get(pattern.separator, None)
+    path_segments = [path_segment.lower() for path_segment in (
+        pattern.key_segments)]
+
+    for path_segment in path_segments + [None]:
+      if not node:
+        break
+
+      for indexed_pattern in node.patterns:
+        if indexed_pattern is not pattern:
+          self.number_of_comparisons += 1
+          if self.Subsumes(indexed_pattern, pattern):
+            yield indexed_pattern
+
+      node = node.children.get(path_segment, None)
+
+  def Overlaps(self, pattern, other_pattern):
+    """Determines if a glob overlaps another glob.
+
+    Args:
+      pattern (GlobPattern): glob.
+      other_pattern (GlobPattern): other glob.
+
+    Returns:
+      bool: True if one or more paths are matched by both globs.
+    """
+    if pattern.separator != other_pattern.separator:
+      return False
+
+    path_segments, other_path_segments = self._GetComparableSegments(
+        pattern, other_pattern)
+
+    number_of_segments = len(path_segments)
+    number_of_other_segments = len(other_path_segments)
+
+    # Globs without globstars only overlap globs of the same length.
+    depths = [self._GetGlobstarDepth(segment) for segment in path_segments]
+    other_depths = [
+        self._GetGlobstarDepth(segment) for segment in other_path_segments]
+    if (number_of_segments != number_of_other_segments and
+        not any(depths) and not any(other_depths)):
+      return False
+
+    # A state consists of the index of the path segment of both globs and
+    # the number of path segments matched by the globstar at the index.
+    states = [(0, 0, 0, 0)]
+    visited = set()
+    while states:
+      state = states.pop()
+      if state in visited:
+        continue
+      visited.add(state)
+
+      segment_index, count, other_segment_index, other_count = state
+      if (segment_index == number_of_segments and
+          other_segment_index == number_of_other_segments):
+        return True
+
+      if (segment_index == number_of_segments or
+          other_segment_index == number_of_other_segments):
+        continue
+
+      next_indexes = []
+      depth = depths[segment_index]
+      if depth and count + 1 < depth:
+        next_indexes.append((segment_index, count + 1))
+      next_indexes.append((segment_index + 1, 0))
+
+      other_next_indexes = []
+      other_depth = other_depths[other_segment_index]
+      if other_depth and other_count + 1 < other_depth:
+        other_next_indexes.append((other_segment_index, other_count + 1))
+      other_next_indexes.append((other_segment_index + 1, 0))
+
+      if not depth and not other_depth and not self._SegmentOverlaps(
+          path_segments[segment_index],
+          other_path_segments[other_segment_index]):
+        continue
+
+      for next_index, next_count in next_indexes:
+        for other_next_index, other_next_count in other_next_indexes:
+          states.append((
+              next_index, next_count, other_next_index, other_next_count))
+
+    return False
+
+  def Subsumes(self, pattern, other_pattern):
+    """Determines if a glob subsumes another glob.
+
+    Args:
+      pattern (GlobPattern): glob.
+      other_pattern (GlobPattern): other glob.
+
+    Returns:
+      bool: True if every path matched by the other glob is also matched by
+          the glob.
+    """
+    if pattern.separator != other_pattern.separator:
+      return False
+
+    if other_pattern.case_insensitive and not pattern.case_insensitive:
+      return False
+
+    path_segments, other_path_segments = self._GetComparableSegments(
+        pattern, other_pattern)
+    if not path_segments or not other_path_segments:
+      return path_segments == other_path_segments
+
+    # Globs of which every path segment matches a single path segment only
+    # subsume globs of the same length, and the last path segments are
+    # matched against each other unless either can match multiple path
+    # segments, which rules out most globs cheaply.
+    if (len(path_segments) != len(other_path_segments) and
+        not self._VARIABLE_LENGTH_RE.search(pattern.path) and
+        not self._VARIABLE_LENGTH_RE.search(other_pattern.path)):
+      return False
+
+    last_path_segment = path_segments[-1]
+    other_last_path_segment = other_path_segments[-1]
+    if (not self._GLOBSTAR_RE.match(last_path_segment) and
+        self._GetSegmentRange(other_last_path_segment) == (1, 1) and
+        not self._SegmentSubsumes(
+            last_path_segment, other_last_path_segment)):
+      return False
+
+    other_ranges = [
+        self._GetSegmentRange(segment) for segment in other_path_segments]
+
+    number_of_segments = len(path_segments)
+    number_of_other_segments = len(other_path_segments)
+
+    states = [(0, 0)]
+    visited = set()
+    while states:
+      state = states.pop()
+      if state in visited:
+        continue
+      visited.add(state)
+
+      segment_index, other_segment_index = state
+      if segment_index == number_of_segments:
+        if other_segment_index == number_of_other_segments:
+          return True
+        continue
+
+      if other_segment_index == number_of_other_segments:
+        continue
+
+      path_segment = path_segments[segment_index]
+      depth = self._GetGlobstarDepth(path_segment)
+      if depth:
+        # A globstar subsumes the consecutive other path segments of which
+        # the combined maximum number of matched path segments does not
+        # exceed its depth.
+        maximum_number_of_segments = 0
+        for end_index in range(
+            other_segment_index, number_of_other_segments):
+          _, maximum = other_ranges[end_index]
+          if maximum is None:
+            break
+          maximum_number_of_segments += maximum
+          if maximum_number_of_segments > depth:
+            break
+          states.append((segment_index + 1, end_index + 1))
+
+        continue
+
+      other_path_segment = other_path_segments[other_segment_index]
+      if other_ranges[other_segment_index] != (1, 1) and (
+          path_segment != other_path_segment):
+        continue
+
+      if self._SegmentSubsumes(path_segment, other_path_segment):
+        states.append((segment_index + 1, other_segment_index + 1))
+
+    return False
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions collection planner."""
+
+import re
+
+from artifacts import definitions
+from artifacts import knowledge_base as artifacts_knowledge_base
+from artifacts import overlap
+
+
+class CollectionPattern(overlap.GlobPattern):
+  """Path pattern to collect.
+
+  Attributes:
+    source_paths (list[tuple[str, str]]): name of the artifact definition and
+        path as defined by the source, of the source paths the pattern is
+        collected for, including those of the subsumed patterns.
+    subsumed_patterns (list[CollectionPattern]): patterns of which all
+        matches are also matched by this pattern.
+  """
+
+  def __init__(self, path, separator, case_insensitive):
+    """Initializes a path pattern to collect.
+
+    Args:
+      path (str): path of the pattern.
+      separator (str): path segment separator of the pattern.
+      case_insensitive (bool): True if the pattern is matched
+          case-insensitive.
+    """
+    super(CollectionPattern, self).__init__(
+        path, separator=separator, case_insensitive=case_insensitive)
+    self.source_paths = []
+    self.subsumed_patterns = []
+
+  @property
+  def artifact_names(self):
+    """list[str]: names of the artifact definitions of the source paths."""
+    return sorted(set(name for name, _ in self.source_paths))
+
+
+class CollectionWorkUnit(object):
+  """Directory to traverse with the patterns to collect within it.
+
+  Attributes:
+    directory (str): path of the directory.
+    patterns (list[CollectionPattern]): patterns of which the path segments
+        before the first glob are the directory.
+  """
+
+  def __init__(self, directory):
+    """Initializes a collection work unit.
+
+    Args:
+      directory (str): path of the directory.
+    """
+    super(CollectionWorkUnit, self).__init__()
+    self.directory = directory
+    self.patterns = []
+
+
+class CollectionPlan(object):
+  """Plan to collect artifacts.
+
+  Attributes:
+    number_of_duplicate_paths (int): number of source paths that are
+        identical to another source path, after case folding of
+        case-insensitive paths.
+    number_of_source_paths (int): number of source paths of the requested
+        artifact definitions, after parameter expansion.
+    number_of_subsumed_paths (int): number of unique source paths that are
+        subsumed by another source path.
+    patterns (list[CollectionPattern]): patterns to collect.
+    undefined_artifacts (list[str]): names of the requested artifact
+        definitions that are not defined.
+    unresolved_parameters (set[str]): names of the parameters that could not
+        be resolved with the knowledge base.
+    work_units (list[CollectionWorkUnit]): directories to traverse.
+  """
+
+  def __init__(self):
+    """Initializes a collection plan."""
+    super(CollectionPlan, self).__init__()
+    self.number_of_duplicate_paths = 0
+    self.number_of_source_paths = 0
+    self.number_of_subsumed_paths = 0
+    self.patterns = []
+    self.undefined_artifacts = []
+    self.unresolved_parameters = set()
+    self.work_units = []
+
+  def GetProvenance(self):
+    """Retrieves the artifact definitions each pattern is collected for.
+
+    Returns:
+      dict[str, list[str]]: names of the artifact definitions per path of
+          the pattern.
+    """
+    return {pattern.path: pattern.artifact_names for pattern in self.patterns}
+
+  def GetReductionDescription(self):
+    """Retrieves a description of the reduction in traversal work.
+
+    Returns:
+      str: description of the number of source paths, the number of unique
+          and not subsumed patterns and the number of work units.
+    """
+    return (
+        f'source paths: {self.number_of_source_paths:d} duplicates: '
+        f'{self.number_of_duplicate_paths:d} subsumed: '
+        f'{self.number_of_subsumed_paths:d} patterns: '
+        f'{len(self.patterns):d} work units: {len(self.work_units):d}')
+
+
+class CollectionPlanner(object):
+  """Plans the collection of the path sources of artifact definitions.
+
+  The paths of the directory, file and path sources of the requested
+  artifact definitions, with artifact groups expanded, are:
+  * optionally expanded with a knowledge base;
+  * deduplicated, where paths of sources that apply to Windows, or use "\\"
+    as separator, are compared case-insensitive;
+  * dropped if subsumed by a broader glob, such as "/var/log/**" that
+    subsumes "/var/log/apt/*.log";
+  * grouped into work units by the directory of the path segments before
+    their first glob, which can contain parameters if the paths are not
+    expanded.
+
+  Subsumption is determined with the glob overlap analyzer, hence paths are
+  only compared to the globs that are indexed by a prefix of the path.
+  """
+
+  _GLOB_CHARACTERS_RE = re.compile(r'[*?[]')
+
+  _SOURCE_TYPE_INDICATORS = frozenset([
+      definitions.TYPE_INDICATOR_DIRECTORY,
+      definitions.TYPE_INDICATOR_FILE,
+      definitions.TYPE_INDICATOR_PATH])
+
+  def __init__(self, artifact_registry):
+    """Initializes a collection planner.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+    """
+    super(CollectionPlanner, self).__init__()
+    self._artifact_registry = artifact_registry
+    self._parameter_expander = artifacts_knowledge_base.ParameterExpander()
+
+  def _GetPrefixLength(self, path_segments):
+    """Determines the number of path segments without a glob at the start.
+
+    Args:
+      path_segments (list[str]): path segments.
+
+    Returns:
+      int: number of path segments without a glob, which excludes the last
+          path segment, since that is not a directory.
+    """
+    for index, path_segment in enumerate(path_segments[:-1]):
+      if self._GLOB_CHARACTERS_RE.search(path_segment):
+        return index
+
+    return max(len(path_segments) - 1, 0)
+
+  def _GetSourcePaths(self, source, knowledge_base, collection_plan):
+    """Retrieves the paths of a source.
+
+    Args:
+      source (SourceType): source.
+      knowledge_base (KnowledgeBase): knowledge base to expand the paths with
+          or None to not expand the paths.
+      collection_plan (CollectionPlan): collection plan to record unresolved
+          parameters in.
+
+    Yields:
+      tuple[str, str]: path as defined by the source and expanded path.
+    """
+    for source_path in source.paths or []:
+      if not knowledge_base:
+        yield source_path, source_path
+        continue
+
+      expansion = self._parameter_expander.ExpandPattern(
+          source_path, knowledge_base)
+      collection_plan.unresolved_parameters.update(
+          expansion.unresolved_parameters)
+      for path in expansion:
+        yield source_path, path
+
+  def CreatePlan(self, artifact_names, supported_os=None, knowledge_base=None):
+    """Creates a collection plan.
+
+    Args:
+      artifact_names (list[str]): names or aliases of the artifact
+          definitions to collect, where artifact groups are expanded.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+      knowledge_base (Optional[KnowledgeBase]): knowledge base to expand the
+          parameters in the paths with, where None represents the paths are
+          planned with their parameters.
+
+    Returns:
+      CollectionPlan: collection plan.
+
+    Raises:
+      CyclicDependencyError: if an artifact group references itself directly
+          or indirectly.
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    collection_plan = CollectionPlan()
+
+    patterns_by_key = {}
+    for name in artifact_names:
+      if not (self._artifact_registry.GetDefinitionByName(name) or
+              self._artifact_registry.GetDefinitionByAlias(name)):
+        collection_plan.undefined_artifacts.append(name)
+        continue
+
+      for artifact_definition, source in (
+          self._artifact_registry.GetExpandedSources(
+              name, supported_os=supported_os)):
+        if source.type_indicator not in self._SOURCE_TYPE_INDICATORS:
+          continue
+
+        source_supported_os = (
+            source.supported_os or artifact_definition.supported_os or [])
+        case_insensitive = (
+            source.separator == '\\' or 'Windows' in source_supported_os)
+
+        for source_path, path in self._GetSourcePaths(
+            source, knowledge_base, collection_plan):
+          collection_plan.number_of_source_paths += 1
+
+          pattern = CollectionPattern(
+              path, source.separator, case_insensitive)
+
+          pattern_key = (case_insensitive, pattern.key_segments)
+          if pattern_key in patterns_by_key:
+            pattern = patterns_by_key[pattern_key]
+            collection_plan.number_of_duplicate_paths += 1
+          else:
+            patterns_by_key[pattern_key] = pattern
+
+          source_path_key = (artifact_definition.name, source_path)
+          if source_path_key not in pattern.source_paths:
+            pattern.source_paths.append(source_path_key)
+
+    # Only patterns that contain a glob can subsume another pattern, since
+    # identical patterns have already been deduplicated.
+    patterns = list(patterns_by_key.values())
+    overlap_analyzer = overlap.GlobOverlapAnalyzer()
+    prefix_lengths = {}
+    for pattern in patterns:
+      prefix_lengths[id(pattern)] = self._GetPrefixLength(
+          pattern.path_segments)
+      if self._GLOB_CHARACTERS_RE.search(pattern.path):
+        overlap_analyzer.AddPattern(pattern)
+
+    subsumed_by = {}
+    for pattern in patterns:
+      for glob_pattern in overlap_analyzer.GetSubsumingPatterns(pattern):
+        if id(glob_pattern) not in subsumed_by:
+          subsumed_by[id(pattern)] = glob_pattern
+          break
+
+    work_units_by_directory = {}
+    for pattern in patterns:
+      subsuming_pattern = subsumed_by.get(id(pattern), None)
+      if subsuming_pattern:
+        while id(subsuming_pattern) in subsumed_by:
+          subsuming_pattern = subsumed_by[id(subsuming_pattern)]
+
+        subsuming_pattern.subsumed_patterns.append(pattern)
+        for source_path_key in pattern.source_paths:
+          if source_path_key not in subsuming_pattern.source_paths:
+            subsuming_pattern.source_paths.append(source_path_key)
+
+        collection_plan.number_of_subsumed_paths += 1
+        continue
+
+      collection_plan.patterns.append(pattern)
+
+      prefix_length = prefix_lengths[id(pattern)]
+      directory_segments = pattern.path_segments[:prefix_length]
+      directory_key = (pattern.case_insensitive, tuple(
+          path_segment.lower() if pattern.case_insensitive else path_segment
+          for path_segment in directory_segments))
+
+      work_unit = work_units_by_directory.get(directory_key, None)
+      if not work_unit:
+        directory = pattern.separator.join(directory_segments)
+        if pattern.path.startswith(pattern.separator):
+          directory = ''.join([pattern.separator, directory])
+
+        work_unit = CollectionWorkUnit(directory)
+        work_units_by_directory[directory_key] = work_unit
+        collection_plan.work_units.append(work_unit)
+
+      work_unit.patterns.append(pattern)
+
+    return collection_plan
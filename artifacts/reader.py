@@ -2,15 +2,47 @@
 """The artifact reader objects."""
 
 import abc
+import codecs
+import concurrent.futures
 import glob
+import hashlib
 import io
+import mmap
 import os
 import json
+import re
+import sys
 import yaml
 
 from artifacts import artifact
 from artifacts import definitions
 from artifacts import errors
+from artifacts import index
+
+
+def _ReadDefinitionValuesFromFileRange(
+    artifacts_reader, filename, start_offset, end_offset, supported_os):
+  """Reads artifact definition values from a file range in a worker process.
+
+  Args:
+    artifacts_reader (ArtifactsReader): artifacts reader.
+    filename (str): name of the file to read from.
+    start_offset (int): offset of the start of the range.
+    end_offset (int): offset of the end of the range or None to read up to
+        the end of the file.
+    supported_os (set[str]): operating systems to read artifact definitions
+        for, where None represents all.
+
+  Returns:
+    tuple[list[dict[str, object]], str, str, set[str]]: values of the
+        artifact definitions in the range, read before a format error was
+        encountered, the message of the format error, without location, or
+        None, the hexadecimal SHA-256 digest of the data of the range and
+        the names and aliases of the filtered artifact definitions.
+  """
+  # pylint: disable=protected-access
+  return artifacts_reader._ReadFileRange(
+      filename, start_offset, end_offset, supported_os=supported_os)
 
 
 class BaseArtifactsReader(object):
@@ -42,7 +74,8 @@ class BaseArtifactsReader(object):
     """
 
   @abc.abstractmethod
-  def ReadDirectory(self, path, extension=None):
+  def ReadDirectory(
+      self, path, extension=None, number_of_workers=1, supported_os=None):
     """Reads artifact definitions from a directory.
 
     This function does not recurse sub directories.
@@ -50,28 +83,40 @@ class BaseArtifactsReader(object):
     Args:
       path (str): path of the directory to read from.
       extension (Optional[str]): extension of the filenames to read.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the files, where 1 represents the files are parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
     """
 
   @abc.abstractmethod
-  def ReadFile(self, filename):
+  def ReadFile(self, filename, number_of_workers=1, supported_os=None):
     """Reads artifact definitions from a file.
 
     Args:
       filename (str): name of the file to read from.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the file, where 1 represents the file is parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
     """
 
   @abc.abstractmethod
-  def ReadFileObject(self, file_object):
+  def ReadFileObject(self, file_object, supported_os=None):
     """Reads artifact definitions from a file-like object.
 
     Args:
       file_object (file): file-like object to read from.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
@@ -83,13 +128,264 @@ class BaseArtifactsReader(object):
 
 
 class ArtifactsReader(BaseArtifactsReader):
-  """Artifacts reader common functionality."""
+  """Artifacts reader common functionality.
 
-  def __init__(self):
-    """Initializes an artifacts reader."""
+  The artifact definitions can be filtered by supported operating system.
+  Artifact definitions that do not apply to any of the operating systems
+  are skipped before the artifact definition objects are built and hence
+  are not validated. Sources of the remaining artifact definitions that
+  do not apply to any of the operating systems are removed.
+
+  Attributes:
+    filtered_artifact_names (set[str]): names and aliases of the artifact
+        definitions that were skipped by the supported operating system
+        filter during the last read.
+  """
+
+  # Size of the blocks in which data is read to count lines.
+  _LINE_COUNT_BLOCK_SIZE = 1024 * 1024
+
+  def __init__(self, cache=None):
+    """Initializes an artifacts reader.
+
+    Args:
+      cache (Optional[ArtifactDefinitionsCache]): cache of artifact definition
+          values, where None represents no cache should be used.
+    """
     super(ArtifactsReader, self).__init__()
+    self._cache = cache
+    self.filtered_artifact_names = set()
     self.supported_os = set(definitions.SUPPORTED_OS)
 
+  def __getstate__(self):
+    """Retrieves the state of the reader for pickling.
+
+    The cache is not part of the state since it is only used by the process
+    that owns the reader.
+
+    Returns:
+      dict[str, object]: state of the reader.
+    """
+    state = dict(self.__dict__)
+    state['_cache'] = None
+    return state
+
+  def _FilterDefinitionValues(self, artifact_definition_values, supported_os):
+    """Filters artifact definition values by supported operating system.
+
+    Artifact definition values without supported operating systems apply
+    to all operating systems. Invalid values are not filtered, so that they
+    are reported by the validation.
+
+    Args:
+      artifact_definition_values (dict[str, object]): artifact definition
+          values.
+      supported_os (set[str]): operating systems to read artifact definitions
+          for, where None represents all.
+
+    Returns:
+      dict[str, object]: artifact definition values, a copy if sources were
+          removed, or None if the artifact definition does not apply to any
+          of the operating systems.
+    """
+    if not supported_os:
+      return artifact_definition_values
+
+    if not isinstance(supported_os, (set, frozenset)):
+      supported_os = set(supported_os)
+
+    definition_supported_os = artifact_definition_values.get(
+        'supported_os', None)
+    is_filtered = bool(
+        definition_supported_os and
+        isinstance(definition_supported_os, list) and
+        not supported_os.intersection(definition_supported_os))
+
+    sources = artifact_definition_values.get('sources', None)
+    if not is_filtered and sources and isinstance(sources, list):
+      filtered_sources = []
+      for source in sources:
+        source_supported_os = None
+        if isinstance(source, dict):
+          source_supported_os = source.get('supported_os', None)
+
+        if (not source_supported_os or
+            not isinstance(source_supported_os, list) or
+            supported_os.intersection(source_supported_os)):
+          filtered_sources.append(source)
+
+      if not filtered_sources:
+        is_filtered = True
+
+      elif len(filtered_sources) < len(sources):
+        artifact_definition_values = dict(artifact_definition_values)
+        artifact_definition_values['sources'] = filtered_sources
+
+    if is_filtered:
+      name = artifact_definition_values.get('name', None)
+      if name and isinstance(name, str):
+        self.filtered_artifact_names.add(name)
+
+      aliases = artifact_definition_values.get('aliases', None) or []
+      if isinstance(aliases, list):
+        self.filtered_artifact_names.update(
+            alias for alias in aliases if isinstance(alias, str))
+
+      return None
+
+    return artifact_definition_values
+
+  def _GetErrorLocation(self, last_artifact_definition):
+    """Retrieves the location of an error for an error message.
+
+    Args:
+      last_artifact_definition (ArtifactDefinition): artifact definition read
+          before the error was encountered or None if not available.
+
+    Returns:
+      str: location of the error.
+    """
+    if not last_artifact_definition:
+      return 'At start'
+
+    return f'After: {last_artifact_definition.name:s}'
+
+  def _GetScannedLocation(
+      self, filename, definition_values, offset, size, line_offset):
+    """Retrieves an artifact definition location from scanned values.
+
+    Args:
+      filename (str): name of the file that was scanned.
+      definition_values (dict[str, object]): name and aliases of the artifact
+          definition, as scanned from the file.
+      offset (int): offset of the artifact definition in the file.
+      size (int): size of the artifact definition in the file.
+      line_offset (int): number of lines that precede the artifact definition.
+
+    Returns:
+      ArtifactDefinitionLocation: artifact definition location.
+
+    Raises:
+      FormatError: if the name of the artifact definition is missing.
+    """
+    name = None
+    if isinstance(definition_values, dict):
+      name = definition_values.get('name', None)
+
+    if not name or not isinstance(name, str):
+      line_number = line_offset + 1
+      raise errors.FormatError((
+          f'Unable to determine name of artifact definition in: '
+          f'{filename:s} at line: {line_number:d}.'))
+
+    # Invalid aliases are reported when the artifact definition is read.
+    aliases = definition_values.get('aliases', None)
+    if not isinstance(aliases, list):
+      aliases = []
+
+    aliases = [alias for alias in aliases if isinstance(alias, str)]
+
+    return index.ArtifactDefinitionLocation(
+        filename, name, offset, size, aliases=aliases, line_offset=line_offset)
+
+  def _GetFileRanges(self, filename, maximum_number_of_ranges):
+    """Retrieves ranges of a file that can be read independently.
+
+    Args:
+      filename (str): name of the file.
+      maximum_number_of_ranges (int): maximum number of ranges.
+
+    Returns:
+      list[tuple[int, int]]: start and end offsets of the ranges, where an end
+          offset of None represents the end of the file.
+    """
+    # pylint: disable=unused-argument
+    return [(0, None)]
+
+  def _GetLineOffset(self, file_object, offset):
+    """Retrieves the number of lines that precede an offset.
+
+    The data is read in blocks so that memory usage does not depend on
+    the offset.
+
+    Args:
+      file_object (file): binary file-like object. After the call the current
+          offset of the file-like object is the offset.
+      offset (int): offset.
+
+    Returns:
+      int: number of lines that precede the offset.
+    """
+    file_object.seek(0, os.SEEK_SET)
+
+    line_offset = 0
+    remaining_size = offset
+    while remaining_size > 0:
+      data = file_object.read(min(remaining_size, self._LINE_COUNT_BLOCK_SIZE))
+      if not data:
+        break
+
+      line_offset += data.count(b'\n')
+      remaining_size -= len(data)
+
+    return line_offset
+
+  def _GetLocationFileObject(self, data):
+    """Retrieves a file-like object of the data of a location.
+
+    Args:
+      data (bytes): data of an artifact definition location, as determined
+          by ScanFile().
+
+    Returns:
+      file: text file-like object of the artifact definition.
+    """
+    return io.StringIO(data.decode('utf-8'), newline=None)
+
+  def _ReadArtifactDefinitions(
+      self, file_object, line_offset=0, supported_os=None):
+    """Reads artifact definitions from a file-like object.
+
+    Args:
+      file_object (file): file-like object to read from.
+      line_offset (Optional[int]): number of lines that precede the data of
+          the file-like object, used in error messages.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+
+    Raises:
+      FormatError: if the format of the artifact definition is not set
+          or incorrect. The error message does not contain the location
+          of the artifact definition.
+    """
+    for artifact_definition_values in self._ReadDefinitionValues(
+        file_object, line_offset=line_offset):
+      artifact_definition = self._ReadFilteredArtifactDefinitionValues(
+          artifact_definition_values, supported_os)
+      if artifact_definition:
+        yield artifact_definition
+
+  @abc.abstractmethod
+  def _ReadDefinitionValues(self, file_object, line_offset=0):
+    """Reads artifact definition values from a file-like object.
+
+    Args:
+      file_object (file): file-like object to read from.
+      line_offset (Optional[int]): number of lines that precede the data of
+          the file-like object, used in error messages.
+
+    Yields:
+      dict[str, object]: artifact definition values.
+
+    Raises:
+      FormatError: if the markup is invalid or does not produce a dictionary.
+          The error message does not contain the location of the artifact
+          definition.
+    """
+
   # Pylint fails on detecting the type of definition_object based on
   # the docstring.
   # pylint: disable=missing-type-doc
@@ -117,7 +413,8 @@ class ArtifactsReader(BaseArtifactsReader):
           f'Artifact definition: {name:s} undefined supported operating '
           f'system: {undefined_supported_os:s}.'))
 
-    definition_object.supported_os = supported_os
+    definition_object.supported_os = tuple(
+        sys.intern(operating_system) for operating_system in supported_os)
 
   def _ReadSources(self, artifact_definition_values, artifact_definition, name):
     """Reads the artifact definition sources.
@@ -166,6 +463,345 @@ class ArtifactsReader(BaseArtifactsReader):
               f'Invalid artifact definition: {name:s} missing '
               f'supported_os.'))
 
+  def _ReadFile(self, filename, number_of_workers=1, supported_os=None):
+    """Reads artifact definitions from a file without flushing the cache.
+
+    Worker processes are only used if the file can be split into multiple
+    ranges, since otherwise there is no parallelism to gain.
+
+    Args:
+      filename (str): name of the file to read from.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the file, where 1 represents the file is parsed in the
+          current process.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+    """
+    if number_of_workers > 1 and len(self._GetFileRanges(
+        filename, number_of_workers)) > 1:
+      yield from self._ReadFilesInParallel(
+          [filename], number_of_workers, supported_os=supported_os)
+
+    elif self._cache:
+      yield from self._ReadFileWithCache(filename, supported_os=supported_os)
+
+    else:
+      with io.open(filename, 'r', encoding='utf-8') as file_object:
+        yield from self._ReadWithErrorLocation(self._ReadArtifactDefinitions(
+            file_object, supported_os=supported_os))
+
+  def _ReadFileData(self, filename):
+    """Reads the content of a file.
+
+    Args:
+      filename (str): name of the file to read from.
+
+    Returns:
+      tuple[int, bytes]: modification time of the file in nanoseconds, as
+          determined before the content was read, and content of the file.
+    """
+    with io.open(filename, 'rb') as file_object:
+      modification_time = os.fstat(file_object.fileno()).st_mtime_ns
+      file_data = file_object.read()
+
+    return modification_time, file_data
+
+  def _ReadFileDataObject(self, file_data):
+    """Reads artifact definitions from the content of a file.
+
+    Args:
+      file_data (bytes): content of the file.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+    """
+    file_object = io.StringIO(file_data.decode('utf-8'), newline=None)
+    yield from self._ReadWithErrorLocation(
+        self._ReadArtifactDefinitions(file_object))
+
+  def _ReadFileRange(
+      self, filename, start_offset, end_offset, supported_os=None):
+    """Reads artifact definition values from a file range.
+
+    Artifact definitions that do not apply to the supported operating systems
+    are skipped before they are built.
+
+    Args:
+      filename (str): name of the file to read from.
+      start_offset (int): offset of the start of the range.
+      end_offset (int): offset of the end of the range or None to read up to
+          the end of the file.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
+
+    Returns:
+      tuple[list[dict[str, object]], str, str, set[str]]: values of the
+          artifact definitions in the range, read before a format error was
+          encountered, the message of the format error, without location, or
+          None, the hexadecimal SHA-256 digest of the data of the range and
+          the names and aliases of the filtered artifact definitions.
+    """
+    with io.open(filename, 'rb') as file_object:
+      line_offset = self._GetLineOffset(file_object, start_offset)
+
+      if end_offset is None:
+        range_data = file_object.read()
+      else:
+        range_data = file_object.read(end_offset - start_offset)
+
+    range_digest = hashlib.sha256(range_data).hexdigest()
+    file_object = io.StringIO(range_data.decode('utf-8'), newline=None)
+
+    # The reader is a copy in the worker process, hence only the names
+    # filtered in the range are returned.
+    self.filtered_artifact_names = set()
+
+    definition_values = []
+    try:
+      for artifact_definition in self._ReadArtifactDefinitions(
+          file_object, line_offset=line_offset, supported_os=supported_os):
+        definition_values.append(artifact_definition.AsDict())
+
+    except errors.FormatError as exception:
+      return (
+          definition_values, str(exception), range_digest,
+          self.filtered_artifact_names)
+
+    return definition_values, None, range_digest, self.filtered_artifact_names
+
+  def _ReadFilesInParallel(
+      self, filenames, number_of_workers, supported_os=None):
+    """Reads artifact definitions from files using worker processes.
+
+    The files, or ranges of documents within the files, are parsed and
+    validated by the worker processes, which return the artifact definition
+    values. The artifact definitions are yielded in the order of the
+    filenames and of the definitions within each file. The worker processes
+    skip the artifact definitions that do not apply to the supported
+    operating systems before they are built.
+
+    If a cache is used the content of a file is read before the workers are
+    started and the artifact definition values are only cached if the data
+    parsed by the workers matches that content, so that a file that changes
+    while it is being read is not cached with values of other content. The
+    cache contains the values of all artifact definitions in a file, hence
+    it is only filled by reads without supported operating systems.
+
+    Args:
+      filenames (list[str]): names of the files to read from.
+      number_of_workers (int): number of worker processes.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+
+    Raises:
+      FormatError: if the format of an artifact definition is not set
+          or incorrect.
+    """
+    namespace = self.__class__.__name__
+
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=number_of_workers)
+    try:
+      file_work = []
+      for filename in filenames:
+        definition_values = None
+        if self._cache:
+          definition_values = self._cache.GetDefinitionValues(
+              namespace, filename)
+
+        if definition_values is not None:
+          file_work.append((filename, definition_values, None, None))
+          continue
+
+        file_data_tuple = None
+        if self._cache and not supported_os:
+          file_data_tuple = self._ReadFileData(filename)
+
+        futures = [
+            (start_offset, end_offset, executor.submit(
+                _ReadDefinitionValuesFromFileRange, self, filename,
+                start_offset, end_offset, supported_os))
+            for start_offset, end_offset in self._GetFileRanges(
+                filename, number_of_workers)]
+        file_work.append((filename, None, futures, file_data_tuple))
+
+      for filename, definition_values, futures, file_data_tuple in file_work:
+        if definition_values is not None:
+          for artifact_definition_values in definition_values:
+            artifact_definition = self._ReadFilteredArtifactDefinitionValues(
+                artifact_definition_values, supported_os)
+            if artifact_definition:
+              yield artifact_definition
+          continue
+
+        file_definition_values = []
+        is_cacheable = file_data_tuple is not None
+        last_artifact_definition = None
+        for start_offset, end_offset, future in futures:
+          (definition_values, error_message, range_digest,
+           filtered_artifact_names) = future.result()
+
+          self.filtered_artifact_names.update(filtered_artifact_names)
+
+          for artifact_definition_values in definition_values:
+            last_artifact_definition = self.ReadArtifactDefinitionValues(
+                artifact_definition_values)
+            yield last_artifact_definition
+
+          if error_message:
+            error_location = self._GetErrorLocation(last_artifact_definition)
+            raise errors.FormatError(f'{error_location:s} {error_message:s}')
+
+          file_definition_values.extend(definition_values)
+
+          if is_cacheable:
+            range_data = file_data_tuple[1][start_offset:end_offset]
+            if hashlib.sha256(range_data).hexdigest() != range_digest:
+              is_cacheable = False
+
+        if is_cacheable:
+          modification_time, file_data = file_data_tuple
+          self._cache.SetDefinitionValues(
+              namespace, filename, modification_time, file_data,
+              file_definition_values)
+
+    finally:
+      executor.shutdown(wait=True, cancel_futures=True)
+
+  def _ReadFileWithCache(self, filename, supported_os=None):
+    """Reads artifact definitions from a file using the cache.
+
+    On a cache hit the artifact definitions are rebuilt from the cached
+    artifact definition values without parsing the file. The cache contains
+    the values of all artifact definitions in the file, the supported
+    operating system filter is applied to these values. On a cache miss with
+    supported operating systems the file is read without filling the cache,
+    so that artifact definitions that do not apply are not built.
+
+    Args:
+      filename (str): name of the file to read from.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+    """
+    namespace = self.__class__.__name__
+
+    definition_values = self._cache.GetDefinitionValues(namespace, filename)
+    if definition_values is not None:
+      for artifact_definition_values in definition_values:
+        artifact_definition = self._ReadFilteredArtifactDefinitionValues(
+            artifact_definition_values, supported_os)
+        if artifact_definition:
+          yield artifact_definition
+      return
+
+    if supported_os:
+      with io.open(filename, 'r', encoding='utf-8') as file_object:
+        yield from self._ReadWithErrorLocation(self._ReadArtifactDefinitions(
+            file_object, supported_os=supported_os))
+      return
+
+    modification_time, file_data = self._ReadFileData(filename)
+    artifact_definitions = list(self._ReadFileDataObject(file_data))
+
+    definition_values = [
+        artifact_definition.AsDict()
+        for artifact_definition in artifact_definitions]
+    self._cache.SetDefinitionValues(
+        namespace, filename, modification_time, file_data, definition_values)
+
+    yield from artifact_definitions
+
+  def _ReadFilteredArtifactDefinitionValues(
+      self, artifact_definition_values, supported_os):
+    """Reads an artifact definition from a dictionary if not filtered.
+
+    Args:
+      artifact_definition_values (dict[str, object]): artifact definition
+          values.
+      supported_os (set[str]): operating systems to read artifact definitions
+          for, where None represents all.
+
+    Returns:
+      ArtifactDefinition: an artifact definition or None if the artifact
+          definition does not apply to any of the operating systems.
+
+    Raises:
+      FormatError: if the format of the artifact definition is not set
+          or incorrect.
+    """
+    artifact_definition_values = self._FilterDefinitionValues(
+        artifact_definition_values, supported_os)
+    if not artifact_definition_values:
+      return None
+
+    return self.ReadArtifactDefinitionValues(artifact_definition_values)
+
+  def _ReadWithErrorLocation(self, artifact_definitions):
+    """Adds the location of an error to format errors of a generator.
+
+    Args:
+      artifact_definitions (generator[ArtifactDefinition]): generator of
+          artifact definitions of which the format errors do not contain
+          the location.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+
+    Raises:
+      FormatError: if the format of the artifact definition is not set
+          or incorrect.
+    """
+    last_artifact_definition = None
+    try:
+      for artifact_definition in artifact_definitions:
+        yield artifact_definition
+        last_artifact_definition = artifact_definition
+
+    except errors.FormatError as exception:
+      error_location = self._GetErrorLocation(last_artifact_definition)
+      raise errors.FormatError(f'{error_location:s} {exception!s}')
+
+  def ReadArtifactDefinitionAtLocation(self, location):
+    """Reads an artifact definition at a location in a file.
+
+    Args:
+      location (ArtifactDefinitionLocation): location of the artifact
+          definition, as determined by ScanFile().
+
+    Returns:
+      ArtifactDefinition: an artifact definition.
+
+    Raises:
+      FormatError: if the format of the artifact definition is not set
+          or incorrect, or if the location does not contain the artifact
+          definition.
+    """
+    with io.open(location.filename, 'rb') as file_object:
+      file_object.seek(location.offset, os.SEEK_SET)
+      data = file_object.read(location.size)
+
+    file_object = self._GetLocationFileObject(data)
+    artifact_definitions = list(self._ReadWithErrorLocation(
+        self._ReadArtifactDefinitions(
+            file_object, line_offset=location.line_offset)))
+
+    if (len(artifact_definitions) != 1 or
+        artifact_definitions[0].name != location.name):
+      raise errors.FormatError((
+          f'Artifact definition: {location.name:s} not found at offset: '
+          f'{location.offset:d} in file: {location.filename:s}.'))
+
+    return artifact_definitions[0]
+
   def ReadArtifactDefinitionValues(self, artifact_definition_values):
     """Reads an artifact definition from a dictionary.
 
@@ -214,19 +850,30 @@ class ArtifactsReader(BaseArtifactsReader):
           f'Invalid artifact definition: {name:s} urls is not a list.')
 
     self._ReadSupportedOS(artifact_definition_values, artifact_definition, name)
-    artifact_definition.urls = urls
+    artifact_definition.urls = tuple(urls)
     self._ReadSources(artifact_definition_values, artifact_definition, name)
 
     return artifact_definition
 
-  def ReadDirectory(self, path, extension='yaml'):
+  def ReadDirectory(
+      self, path, extension='yaml', number_of_workers=1, supported_os=None):
     """Reads artifact definitions from a directory.
 
-    This function does not recurse sub directories.
+    This function does not recurse sub directories. The files are read in
+    sorted filename order, also when worker processes are used.
+
+    Note that worker processes only know about custom source types that were
+    registered before they were started, which requires the "fork" start
+    method of multiprocessing.
 
     Args:
       path (str): path of the directory to read from.
       extension (Optional[str]): extension of the filenames to read.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the files, where 1 represents the files are parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
@@ -236,27 +883,61 @@ class ArtifactsReader(BaseArtifactsReader):
     else:
       glob_spec = os.path.join(path, '*')
 
-    for artifact_file in glob.glob(glob_spec):
-      yield from self.ReadFile(artifact_file)
+    filenames = sorted(glob.glob(glob_spec))
+
+    self.filtered_artifact_names = set()
 
-  def ReadFile(self, filename):
+    if number_of_workers is None:
+      number_of_workers = os.cpu_count() or 1
+
+    try:
+      if number_of_workers > 1 and filenames:
+        yield from self._ReadFilesInParallel(
+            filenames, number_of_workers, supported_os=supported_os)
+
+      else:
+        for artifact_file in filenames:
+          yield from self._ReadFile(artifact_file, supported_os=supported_os)
+
+    finally:
+      if self._cache:
+        self._cache.Flush()
+
+  def ReadFile(self, filename, number_of_workers=1, supported_os=None):
     """Reads artifact definitions from a file.
 
     Args:
       filename (str): name of the file to read from.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the file, where 1 represents the file is parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
     """
-    with io.open(filename, 'r', encoding='utf-8') as file_object:
-      yield from self.ReadFileObject(file_object)
+    if number_of_workers is None:
+      number_of_workers = os.cpu_count() or 1
 
-  @abc.abstractmethod
-  def ReadFileObject(self, file_object):
+    self.filtered_artifact_names = set()
+
+    try:
+      yield from self._ReadFile(
+          filename, number_of_workers=number_of_workers,
+          supported_os=supported_os)
+
+    finally:
+      if self._cache:
+        self._cache.Flush()
+
+  def ReadFileObject(self, file_object, supported_os=None):
     """Reads artifact definitions from a file-like object.
 
     Args:
       file_object (file): file-like object to read from.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
@@ -265,75 +946,787 @@ class ArtifactsReader(BaseArtifactsReader):
       FormatError: if the format of the artifact definition is not set
           or incorrect.
     """
+    self.filtered_artifact_names = set()
+
+    yield from self._ReadWithErrorLocation(self._ReadArtifactDefinitions(
+        file_object, supported_os=supported_os))
+
+  @abc.abstractmethod
+  def ScanFile(self, filename):
+    """Scans a file for the locations of the artifact definitions.
+
+    Scanning only determines the names and aliases of the artifact
+    definitions, the artifact definitions are not parsed and validated
+    until they are read with ReadArtifactDefinitionAtLocation().
+
+    Args:
+      filename (str): name of the file to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if the file cannot be scanned.
+    """
 
 
 class JsonArtifactsReader(ArtifactsReader):
-  """JSON artifacts reader."""
+  """JSON artifacts reader.
+
+  The top-level JSON array is decoded incrementally, element by element,
+  hence memory usage is bounded by the size of the largest artifact
+  definition instead of the size of the file.
+  """
+
+  # Number of characters read from the file-like object at once.
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  _WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+  def _GetLocationFileObject(self, data):
+    """Retrieves a file-like object of the data of a location.
+
+    Args:
+      data (bytes): data of an artifact definition location, as determined
+          by ScanFile(), which is an element of the top-level JSON array.
+
+    Returns:
+      file: text file-like object of a JSON array that contains the artifact
+          definition.
+    """
+    return io.StringIO(
+        ''.join(['[', data.decode('utf-8'), ']']), newline=None)
+
+  def _ReadDefinitionValues(self, file_object, line_offset=0):
+    """Reads artifact definition values from a file-like object.
+
+    Args:
+      file_object (file): file-like object to read from.
+      line_offset (Optional[int]): number of lines that precede the data of
+          the file-like object, used in error messages.
+
+    Yields:
+      dict[str, object]: artifact definition values.
+
+    Raises:
+      FormatError: if the JSON markup is invalid or does not produce
+          a dictionary. The error message does not contain the location
+          of the artifact definition.
+    """
+    for json_definition in self._ReadJSONArrayElements(file_object):
+      if not isinstance(json_definition, dict):
+        raise errors.FormatError(
+            f'JSON markup did not produce a dictionary: {json_definition!r}')
+
+      yield json_definition
+
+  def _ReadJSONArrayElements(self, file_object):
+    """Reads the elements of a top-level JSON array incrementally.
+
+    The elements are decoded with JSONDecoder.raw_decode() from a sliding
+    buffer. Decoded data is discarded from the buffer before more data is
+    read. When an element is not complete, the buffer is extended with a
+    read of the size of the buffer, so that decoding large elements takes
+    linear time.
+
+    Bytes are decoded with an incremental decoder, of which the encoding is
+    detected from the first 4 bytes, so that characters can be split across
+    reads.
+
+    Args:
+      file_object (file): file-like object to read from, which can either
+          return bytes or strings.
+
+    Yields:
+      object: JSON array element.
+
+    Raises:
+      FormatError: if the JSON data is invalid, cannot be decoded or is not
+          an array.
+    """
+    json_decoder = json.JSONDecoder()
+    text_decoder = None
+
+    encoded_prefix = b''
+    buffer = ''
+    buffer_offset = 0
+    end_of_file = False
+    expected_characters = '['
+
+    while True:
+      buffer_offset = self._WHITESPACE_RE.match(buffer, buffer_offset).end()
+
+      if expected_characters is None:
+        # Only whitespace is allowed after the end of the array.
+        if buffer_offset < len(buffer):
+          raise errors.FormatError(
+              'Invalid JSON data: unexpected data after end of array.')
+
+      elif buffer_offset < len(buffer):
+        character = buffer[buffer_offset]
+
+        if character in expected_characters:
+          buffer_offset += 1
+          if character == '[':
+            expected_characters = ']'
+          elif character == ',':
+            expected_characters = ''
+          elif character == ']':
+            expected_characters = None
+          continue
+
+        if expected_characters not in (']', ''):
+          expected_characters = ', '.join(
+              f'"{expected_character:s}"'
+              for expected_character in expected_characters)
+          raise errors.FormatError((
+              f'Invalid JSON data: expected {expected_characters:s} but '
+              f'found "{character:s}".'))
+
+        try:
+          json_element, element_end_offset = json_decoder.raw_decode(
+              buffer, buffer_offset)
+        except json.JSONDecodeError as exception:
+          if end_of_file:
+            raise errors.FormatError(f'Invalid JSON data: {exception.msg:s}.')
+
+          element_end_offset = None
+
+        # An element that ends at the end of the buffer could be incomplete,
+        # for example a number.
+        if element_end_offset is not None and (
+            element_end_offset < len(buffer) or end_of_file):
+          yield json_element
+
+          buffer_offset = element_end_offset
+          expected_characters = ',]'
+          continue
+
+      if end_of_file:
+        if expected_characters is not None:
+          raise errors.FormatError('Invalid JSON data: unexpected end of data.')
+        break
+
+      buffer = buffer[buffer_offset:]
+      buffer_offset = 0
+
+      read_size = max(self._READ_BUFFER_SIZE, len(buffer))
+      data = file_object.read(read_size)
+
+      # Only a read that returns no data indicates the end of the file, since
+      # a short read of bytes can end within a character.
+      end_of_file = not data
+
+      if isinstance(data, bytes):
+        if not text_decoder:
+          # The encoding is detected from the first 4 bytes of the data.
+          encoded_prefix = b''.join([encoded_prefix, data])
+          if len(encoded_prefix) < 4 and not end_of_file:
+            continue
+
+          encoding = json.detect_encoding(encoded_prefix)
+          text_decoder = codecs.getincrementaldecoder(encoding)()
+          data = encoded_prefix
+
+        try:
+          data = text_decoder.decode(data, final=end_of_file)
+        except UnicodeDecodeError as exception:
+          raise errors.FormatError(f'Invalid JSON data: {exception!s}.')
+
+      buffer = ''.join([buffer, data])
+
+  def ScanFile(self, filename):
+    """Scans a file for the locations of the artifact definitions.
+
+    Scanning only determines the names and aliases of the artifact
+    definitions, the artifact definitions are not validated until they are
+    read with ReadArtifactDefinitionAtLocation(). The location of an
+    artifact definition is the element of the top-level JSON array. Only
+    UTF-8 encoded files can be scanned and, unlike reading, scanning reads
+    the entire file into memory.
+
+    Args:
+      filename (str): name of the file to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if the file cannot be scanned.
+    """
+    with io.open(filename, 'rb') as file_object:
+      data = file_object.read()
+
+    offset = 0
+    if data.startswith(codecs.BOM_UTF8):
+      offset = len(codecs.BOM_UTF8)
+
+    try:
+      text = data[offset:].decode('utf-8')
+    except UnicodeDecodeError as exception:
+      raise errors.FormatError((
+          f'Unable to scan: {filename:s} with error: {exception!s}.'))
+
+    json_decoder = json.JSONDecoder()
+
+    locations = []
+    line_offset = 0
+    text_offset = 0
+    expected_characters = '['
+
+    while expected_characters is not None:
+      element_offset = self._WHITESPACE_RE.match(text, text_offset).end()
+      if element_offset >= len(text):
+        raise errors.FormatError((
+            f'Invalid JSON data in: {filename:s}: unexpected end of data.'))
+
+      character = text[element_offset]
+      element_end_offset = element_offset + 1
+      is_element = False
+      json_definition = None
+
+      if character in expected_characters:
+        if character == '[':
+          expected_characters = ']'
+        elif character == ',':
+          expected_characters = ''
+        else:
+          expected_characters = None
+
+      elif expected_characters in (']', ''):
+        try:
+          json_definition, element_end_offset = json_decoder.raw_decode(
+              text, element_offset)
+        except json.JSONDecodeError as exception:
+          raise errors.FormatError((
+              f'Invalid JSON data in: {filename:s} at line: '
+              f'{exception.lineno:d}: {exception.msg:s}.'))
+
+        expected_characters = ',]'
+        is_element = True
+
+      else:
+        raise errors.FormatError((
+            f'Invalid JSON data in: {filename:s}: unexpected character: '
+            f'"{character:s}".'))
+
+      offset += len(text[text_offset:element_offset].encode('utf-8'))
+      line_offset += text.count('\n', text_offset, element_offset)
+
+      element_data = text[element_offset:element_end_offset]
+      element_size = len(element_data.encode('utf-8'))
+
+      if is_element:
+        location = self._GetScannedLocation(
+            filename, json_definition, offset, element_size, line_offset)
+        locations.append(location)
+
+      offset += element_size
+      line_offset += element_data.count('\n')
+      text_offset = element_end_offset
+
+    if self._WHITESPACE_RE.match(text, text_offset).end() < len(text):
+      raise errors.FormatError((
+          f'Invalid JSON data in: {filename:s}: unexpected data after end of '
+          f'array.'))
+
+    return locations
 
-  def ReadFileObject(self, file_object):
-    """Reads artifact definitions from a file-like object.
+
+class JsonLinesArtifactsReader(ArtifactsReader):
+  """JSON Lines artifacts reader.
+
+  Every line contains the JSON object of one artifact definition, empty lines
+  are ignored. Since every line starts a new artifact definition, a file can
+  be split at line boundaries into shards that are read independently, for
+  example by different worker processes.
+  """
+
+  # Minimum size of a shard that is read by a worker process.
+  _MINIMUM_RANGE_SIZE = 32 * 1024
+
+  def _GetFileRanges(self, filename, maximum_number_of_ranges):
+    """Retrieves ranges of a file that can be read independently.
+
+    Args:
+      filename (str): name of the file.
+      maximum_number_of_ranges (int): maximum number of ranges.
+
+    Returns:
+      list[tuple[int, int]]: start and end offsets of the ranges, where an end
+          offset of None represents the end of the file.
+    """
+    file_size = os.stat(filename).st_size
+    number_of_ranges = min(
+        maximum_number_of_ranges, file_size // self._MINIMUM_RANGE_SIZE)
+    return self.GetFileShards(filename, max(number_of_ranges, 1))
+
+  def _ReadDefinitionValues(self, file_object, line_offset=0):
+    """Reads artifact definition values from a file-like object.
 
     Args:
       file_object (file): file-like object to read from.
+      line_offset (Optional[int]): number of lines that precede the data of
+          the file-like object, used in error messages.
+
+    Yields:
+      dict[str, object]: artifact definition values.
+
+    Raises:
+      FormatError: if the JSON markup is invalid or does not produce
+          a dictionary. The error message does not contain the location
+          of the artifact definition.
+    """
+    for line_number, line in enumerate(file_object, start=line_offset + 1):
+      line = line.strip()
+      if not line:
+        continue
+
+      try:
+        json_definition = json.loads(line)
+      except json.JSONDecodeError as exception:
+        raise errors.FormatError((
+            f'Invalid JSON data at line: {line_number:d}: '
+            f'{exception.msg:s}.'))
+
+      if not isinstance(json_definition, dict):
+        raise errors.FormatError((
+            f'JSON markup at line: {line_number:d} did not produce a '
+            f'dictionary: {json_definition!r}'))
+
+      yield json_definition
+
+  def _ReadLines(self, file_object, end_offset):
+    """Reads lines from a binary file-like object.
+
+    Args:
+      file_object (file): binary file-like object to read from, positioned at
+          the start of a line.
+      end_offset (int): offset where no more lines start or None to read up
+          to the end of the file.
+
+    Yields:
+      str: line.
+    """
+    while end_offset is None or file_object.tell() < end_offset:
+      line = file_object.readline()
+      if not line:
+        break
+
+      yield line.decode('utf-8')
+
+  def GetFileShards(self, filename, number_of_shards):
+    """Splits a file into shards at line boundaries.
+
+    Only the data around the split points is read, hence the cost does not
+    depend on the size of the file. The shards are of approximately the same
+    size, except when lines are larger than the size of a shard, in which
+    case fewer shards are returned.
+
+    Args:
+      filename (str): name of the file.
+      number_of_shards (int): maximum number of shards.
+
+    Returns:
+      list[tuple[int, int]]: start and end offsets of the shards, where an end
+          offset of None represents the end of the file.
+
+    Raises:
+      ValueError: if the number of shards is less than 1.
+    """
+    if number_of_shards < 1:
+      raise ValueError(f'Unsupported number of shards: {number_of_shards:d}')
+
+    with io.open(filename, 'rb') as file_object:
+      file_size = os.fstat(file_object.fileno()).st_size
+      shard_size = file_size // number_of_shards
+
+      shard_offsets = [0]
+      for shard_index in range(1, number_of_shards):
+        split_offset = shard_index * shard_size
+        if not shard_size or split_offset <= shard_offsets[-1]:
+          continue
+
+        # A line starts at the split offset if the preceding byte is the
+        # end of a line, otherwise the partial line is skipped.
+        file_object.seek(split_offset - 1, os.SEEK_SET)
+        file_object.readline()
+
+        shard_offset = file_object.tell()
+        if shard_offset >= file_size:
+          break
+
+        if shard_offset > shard_offsets[-1]:
+          shard_offsets.append(shard_offset)
+
+    shard_offsets.append(None)
+    return list(zip(shard_offsets[:-1], shard_offsets[1:]))
+
+  def ReadFileShard(
+      self, filename, start_offset, end_offset=None, supported_os=None):
+    """Reads artifact definitions from a shard of a file.
+
+    A shard contains the lines that start at or after the start offset and
+    before the end offset. Hence the offsets do not need to be at line
+    boundaries and consecutive shards never contain the same line.
+
+    Args:
+      filename (str): name of the file to read from.
+      start_offset (int): offset of the start of the shard.
+      end_offset (Optional[int]): offset of the end of the shard or None to
+          read up to the end of the file.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
 
     Yields:
       ArtifactDefinition: an artifact definition.
 
     Raises:
-      FormatError: if the format of the JSON artifact definition is not set
+      FormatError: if the format of the artifact definition is not set
           or incorrect.
     """
-    # TODO: add try, except?
-    json_definitions = json.loads(file_object.read())
+    with io.open(filename, 'rb') as file_object:
+      line_offset = 0
+      if start_offset > 0:
+        line_offset = self._GetLineOffset(file_object, start_offset - 1)
 
-    last_artifact_definition = None
-    for json_definition in json_definitions:
-      try:
-        artifact_definition = self.ReadArtifactDefinitionValues(json_definition)
-      except errors.FormatError as exception:
-        error_location = 'At start'
-        if last_artifact_definition:
-          error_location = f'After: {last_artifact_definition.name:s}'
+        # Skip the remainder of the line that contains the byte preceding
+        # the start offset.
+        if file_object.readline().endswith(b'\n'):
+          line_offset += 1
+
+      lines = self._ReadLines(file_object, end_offset)
+      yield from self._ReadWithErrorLocation(self._ReadArtifactDefinitions(
+          lines, line_offset=line_offset, supported_os=supported_os))
 
-        raise errors.FormatError(f'{error_location:s} {exception!s}')
+  def ScanFile(self, filename):
+    """Scans a file for the locations of the artifact definitions.
 
-      yield artifact_definition
-      last_artifact_definition = artifact_definition
+    Scanning only determines the names and aliases of the artifact
+    definitions, the artifact definitions are not validated until they are
+    read with ReadArtifactDefinitionAtLocation().
+
+    Args:
+      filename (str): name of the file to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if the file cannot be scanned.
+    """
+    locations = []
+    with io.open(filename, 'rb') as file_object:
+      offset = 0
+      for line_offset, line in enumerate(file_object):
+        line_size = len(line)
+        line = line.strip()
+
+        if line:
+          try:
+            json_definition = json.loads(line)
+          except ValueError as exception:
+            line_number = line_offset + 1
+            raise errors.FormatError((
+                f'Invalid JSON data in: {filename:s} at line: '
+                f'{line_number:d}: {exception!s}.'))
+
+          location = self._GetScannedLocation(
+              filename, json_definition, offset, line_size, line_offset)
+          locations.append(location)
+
+        offset += line_size
+
+    return locations
 
 
 class YamlArtifactsReader(ArtifactsReader):
-  """YAML artifacts reader."""
+  """YAML artifacts reader.
 
-  def ReadFileObject(self, file_object):
-    """Reads artifact definitions from a file-like object.
+  The reader uses the libyaml based C loader when PyYAML was built with
+  libyaml support and falls back to the pure Python loader otherwise. Both
+  loaders produce the same artifact definitions.
+
+  Attributes:
+    yaml_backend (str): YAML parser backend, either "libyaml" or "python".
+  """
+
+  YAML_BACKEND_LIBYAML = 'libyaml'
+  YAML_BACKEND_PYTHON = 'python'
+
+  # Minimum size of a range of documents that is parsed by a worker process.
+  _MINIMUM_RANGE_SIZE = 32 * 1024
+
+  _WHITESPACE = frozenset([b' ', b'\t', b'\r', b'\n'])
+
+  # Lines of content, other than comments and document markers.
+  _CONTENT_RE = re.compile(rb'^(?!---|\.\.\.)[ \t]*[^#\s]', re.MULTILINE)
+
+  # Top-level name and aliases, including continuation lines.
+  _NAME_AND_ALIASES_RE = re.compile(
+      rb'^(?:aliases|name):.*\n?(?:[ \t-].*\n?)*', re.MULTILINE)
+
+  _YAML_LOADERS = {
+      YAML_BACKEND_LIBYAML: getattr(yaml, 'CSafeLoader', None),
+      YAML_BACKEND_PYTHON: yaml.SafeLoader}
+
+  def __init__(self, cache=None, use_libyaml=True):
+    """Initializes a YAML artifacts reader.
+
+    Args:
+      cache (Optional[ArtifactDefinitionsCache]): cache of artifact definition
+          values, where None represents no cache should be used.
+      use_libyaml (Optional[bool]): True if the libyaml based loader should
+          be used when available.
+    """
+    super(YamlArtifactsReader, self).__init__(cache=cache)
+    self.yaml_backend = self.YAML_BACKEND_PYTHON
+    if use_libyaml and self._YAML_LOADERS[self.YAML_BACKEND_LIBYAML]:
+      self.yaml_backend = self.YAML_BACKEND_LIBYAML
+
+    self._yaml_loader = self._YAML_LOADERS[self.yaml_backend]
+
+  def _FormatYAMLError(self, exception, line_offset=0):
+    """Formats a YAML error independent of the YAML parser backend.
+
+    The libyaml and pure Python loaders describe the same problem with
+    different wording, hence only the context and location are used.
+
+    Args:
+      exception (yaml.YAMLError): YAML error.
+      line_offset (Optional[int]): number of lines that precede the data in
+          which the error was encountered.
+
+    Returns:
+      str: error message.
+    """
+    error_message = 'Invalid YAML markup'
+
+    context = getattr(exception, 'context', None)
+    if context:
+      error_message = f'{error_message:s} {context:s}'
+
+    problem_mark = getattr(exception, 'problem_mark', None)
+    if problem_mark:
+      line_number = line_offset + problem_mark.line + 1
+      column_number = problem_mark.column + 1
+      error_message = (
+          f'{error_message:s} at line: {line_number:d}, column: '
+          f'{column_number:d}')
+
+    return f'{error_message:s}.'
+
+  def _ReadYAMLDocuments(self, file_object):
+    """Reads YAML documents from a file-like object.
+
+    libyaml is stricter than the pure Python loader for some constructs, for
+    example "{key:value}" in flow context. To produce the same results with
+    both backends, the remainder of a seekable file-like object is read with
+    the pure Python loader when the libyaml based loader fails.
 
     Args:
       file_object (file): file-like object to read from.
 
     Yields:
-      ArtifactDefinition: an artifact definition.
+      object: YAML document.
 
     Raises:
-      FormatError: if the format of the YAML artifact definition is not set
-          or incorrect.
+      YAMLError: if the YAML markup is invalid.
     """
-    # TODO: add try, except?
-    yaml_generator = yaml.safe_load_all(file_object)
+    if (self.yaml_backend == self.YAML_BACKEND_PYTHON or
+        not file_object.seekable()):
+      yield from yaml.load_all(file_object, Loader=self._yaml_loader)
+      return
 
-    last_artifact_definition = None
-    for yaml_definition in yaml_generator:
-      if not isinstance(yaml_definition, dict):
-        raise errors.FormatError(
-            f'YAML markup did not produce a dictionary: {yaml_definition!r}')
+    start_offset = file_object.tell()
+    number_of_documents = 0
 
-      try:
-        artifact_definition = self.ReadArtifactDefinitionValues(yaml_definition)
-      except errors.FormatError as exception:
-        error_location = 'At start'
-        if last_artifact_definition:
-          error_location = f'After: {last_artifact_definition.name:s}'
+    try:
+      for yaml_document in yaml.load_all(
+          file_object, Loader=self._yaml_loader):
+        yield yaml_document
+        number_of_documents += 1
+
+    except yaml.YAMLError:
+      file_object.seek(start_offset, os.SEEK_SET)
+
+      yaml_generator = yaml.load_all(
+          file_object, Loader=self._YAML_LOADERS[self.YAML_BACKEND_PYTHON])
+      for document_index, yaml_document in enumerate(yaml_generator):
+        if document_index >= number_of_documents:
+          yield yaml_document
+
+  def _GetDocumentOffsets(self, data):
+    """Retrieves the offsets of the YAML documents.
+
+    A document start marker ("---") at the start of a line always starts
+    a new document since YAML forbids it as part of content. Streams that
+    contain directives, such as "%YAML", are not split.
+
+    Args:
+      data (bytes|mmap.mmap): data of the YAML stream.
+
+    Returns:
+      list[int]: offsets of the document start markers or an empty list if
+          the stream cannot be split.
+    """
+    if self._HasDirectives(data):
+      return []
+
+    data_size = len(data)
+
+    document_offsets = []
+    marker_offset = -1
+    if data[0:3] == b'---':
+      marker_offset = 0
+    else:
+      marker_offset = data.find(b'\n---')
+      if marker_offset != -1:
+        marker_offset += 1
+
+    while marker_offset != -1:
+      marker_end_offset = marker_offset + 3
+      if (marker_end_offset == data_size or
+          data[marker_end_offset:marker_end_offset + 1] in self._WHITESPACE):
+        document_offsets.append(marker_offset)
+
+      marker_offset = data.find(b'\n---', marker_end_offset)
+      if marker_offset != -1:
+        marker_offset += 1
+
+    return document_offsets
+
+  def _HasDirectives(self, data):
+    """Determines if a YAML stream contains directives, such as "%YAML".
+
+    Args:
+      data (bytes|mmap.mmap): data of the YAML stream.
+
+    Returns:
+      bool: True if the YAML stream contains directives.
+    """
+    return data[0:1] == b'%' or data.find(b'\n%') != -1
+
+  def _GetFileRanges(self, filename, maximum_number_of_ranges):
+    """Retrieves ranges of a file that can be read independently.
+
+    The file is memory mapped and scanned for document start markers. The
+    ranges contain consecutive documents and are of approximately the same
+    size, but not smaller than _MINIMUM_RANGE_SIZE.
+
+    Args:
+      filename (str): name of the file.
+      maximum_number_of_ranges (int): maximum number of ranges.
+
+    Returns:
+      list[tuple[int, int]]: start and end offsets of the ranges, where an end
+          offset of None represents the end of the file.
+    """
+    with io.open(filename, 'rb') as file_object:
+      file_size = os.fstat(file_object.fileno()).st_size
+
+      number_of_ranges = min(
+          maximum_number_of_ranges, file_size // self._MINIMUM_RANGE_SIZE)
+      if number_of_ranges <= 1:
+        return [(0, None)]
+
+      with mmap.mmap(
+          file_object.fileno(), 0, access=mmap.ACCESS_READ) as mmap_object:
+        document_offsets = self._GetDocumentOffsets(mmap_object)
+
+    range_size = file_size // number_of_ranges
+
+    range_offsets = [0]
+    for document_offset in document_offsets:
+      if document_offset >= range_offsets[-1] + range_size:
+        range_offsets.append(document_offset)
+
+    range_offsets.append(None)
+    return list(zip(range_offsets[:-1], range_offsets[1:]))
+
+  def _ReadDefinitionValues(self, file_object, line_offset=0):
+    """Reads artifact definition values from a file-like object.
+
+    Args:
+      file_object (file): file-like object to read from.
+      line_offset (Optional[int]): number of lines that precede the data of
+          the file-like object, used in error messages.
+
+    Yields:
+      dict[str, object]: artifact definition values.
+
+    Raises:
+      FormatError: if the YAML markup is invalid or does not produce
+          a dictionary. The error message does not contain the location
+          of the artifact definition.
+    """
+    try:
+      for yaml_definition in self._ReadYAMLDocuments(file_object):
+        if not isinstance(yaml_definition, dict):
+          raise errors.FormatError(
+              f'YAML markup did not produce a dictionary: {yaml_definition!r}')
+
+        yield yaml_definition
+
+    except yaml.YAMLError as exception:
+      error_message = self._FormatYAMLError(
+          exception, line_offset=line_offset)
+      raise errors.FormatError(error_message)
+
+  def ScanFile(self, filename):
+    """Scans a file for the locations of the artifact definitions.
+
+    The file is split into documents at the document start markers and only
+    the top-level name and aliases of every document are parsed. The
+    artifact definitions are not validated until they are read with
+    ReadArtifactDefinitionAtLocation().
+
+    Args:
+      filename (str): name of the file to scan.
+
+    Returns:
+      list[ArtifactDefinitionLocation]: artifact definition locations.
+
+    Raises:
+      FormatError: if the file cannot be scanned.
+    """
+    with io.open(filename, 'rb') as file_object:
+      data = file_object.read()
+
+    if self._HasDirectives(data):
+      raise errors.FormatError(
+          f'Unable to scan YAML stream with directives: {filename:s}.')
+
+    document_offsets = self._GetDocumentOffsets(data)
+    if not document_offsets or document_offsets[0] != 0:
+      document_offsets.insert(0, 0)
+
+    document_offsets.append(len(data))
+
+    locations = []
+    line_offset = 0
+    for start_offset, end_offset in zip(
+        document_offsets[:-1], document_offsets[1:]):
+      document_data = data[start_offset:end_offset]
+
+      if self._CONTENT_RE.search(document_data):
+        name_and_aliases_data = b''.join(
+            self._NAME_AND_ALIASES_RE.findall(document_data))
+
+        try:
+          yaml_definition = next(self._ReadYAMLDocuments(
+              io.BytesIO(name_and_aliases_data)), None)
+        except yaml.YAMLError:
+          line_number = line_offset + 1
+          raise errors.FormatError((
+              f'Invalid YAML markup of name or aliases in: {filename:s} at '
+              f'document starting at line: {line_number:d}.'))
+
+        location = self._GetScannedLocation(
+            filename, yaml_definition, start_offset, len(document_data),
+            line_offset)
+        locations.append(location)
 
-        raise errors.FormatError(f'{error_location:s} {exception!s}')
+      line_offset += document_data.count(b'\n')
 
-      yield artifact_definition
-      last_artifact_definition = artifact_definition
+    return locations
@@ -1,13 +1,43 @@
 # -*- coding: utf-8 -*-
 """The artifact definitions registry."""
 
+import hashlib
+import json
+import sys
+import threading
+import types
+import weakref
+
 from artifacts import definitions
 from artifacts import errors
+from artifacts import index
 from artifacts import source_type
 
 
 class ArtifactDefinitionsRegistry(object):
-  """Artifact definitions registry."""
+  """Artifact definitions registry.
+
+  Artifact definitions can be read into the registry from an index of their
+  locations, in which case an artifact definition is only read when it is
+  first accessed.
+
+  The registry maintains an index of the artifact definitions and sources
+  by supported operating system. The supported operating systems of a source
+  are those of the source or, if not defined, those of the artifact
+  definition. The supported operating systems of an artifact definition are
+  those of its sources.
+
+  The registry also maintains an index of the sources by type indicator,
+  which can be combined with the supported operating system index.
+
+  Expansions of artifact groups are cached per artifact definition and only
+  the cached expansions that depend on a specific name or alias are
+  invalidated when an artifact definition is registered or deregistered.
+
+  The registry maintains a reverse index of the names referenced by artifact
+  groups, with the number of references per artifact group, which is used
+  to determine which artifact groups depend on an artifact definition.
+  """
 
   _source_type_classes = {
       definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
@@ -27,8 +57,249 @@ class ArtifactDefinitionsRegistry(object):
     super(ArtifactDefinitionsRegistry, self).__init__()
     self._artifact_definitions_by_alias = {}
     self._artifact_definitions_by_name = {}
-    self._artifact_name_references = set()
+    self._artifact_locations_by_name = {}
+    # Number of references per artifact group name per referenced name.
+    self._artifact_group_references_by_name = {}
+    self._artifact_names_by_indexed_alias = {}
     self._defined_artifact_names = set()
+    # Expanded sources and names the expansion depends on per lower case
+    # name of the artifact definition.
+    self._expanded_sources_by_name = {}
+    # Lower case names of the artifact definitions of which the expansion
+    # depends on a lower case name or alias.
+    self._expansion_dependents_by_name = {}
+    self._filtered_artifact_names = set()
+    # Dictionaries with the lower case name as key per operating system.
+    self._artifact_definitions_by_supported_os = {}
+    # Dictionaries with the lower case name and source index as key per
+    # operating system.
+    self._sources_by_supported_os = {}
+    # Dictionaries with the lower case name and source index as key per
+    # type indicator.
+    self._sources_by_type_indicator = {}
+
+  def _ExpandArtifactDefinition(self, artifact_definition, expansion_path):
+    """Expands the artifact group sources of an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+      expansion_path (list[str]): names of the artifact definitions that are
+          being expanded, used to detect cycles.
+
+    Returns:
+      tuple[dict[tuple[str, int], tuple[ArtifactDefinition, SourceType]],
+          set[str]]: expanded sources with the lower case name and source
+          index as key, and the lower case names and aliases the expansion
+          depends on.
+
+    Raises:
+      CyclicDependencyError: if an artifact group references itself directly
+          or indirectly.
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    artifact_definition_name = artifact_definition.name.lower()
+
+    cached_expansion = self._expanded_sources_by_name.get(
+        artifact_definition_name, None)
+    if cached_expansion:
+      return cached_expansion
+
+    if artifact_definition.name in expansion_path:
+      cycle = ' -> '.join(expansion_path + [artifact_definition.name])
+      raise errors.CyclicDependencyError(
+          f'Artifact group cycle detected: {cycle:s}.')
+
+    expansion_path.append(artifact_definition.name)
+
+    dependencies = set([artifact_definition_name])
+    dependencies.update([
+        alias.lower() for alias in artifact_definition.aliases])
+
+    expanded_sources = {}
+    for source_index, source in enumerate(artifact_definition.sources):
+      if source.type_indicator != definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
+        expanded_sources[(artifact_definition_name, source_index)] = (
+            artifact_definition, source)
+        continue
+
+      for name in source.names:
+        dependencies.add(name.lower())
+
+        referenced_definition = (
+            self.GetDefinitionByName(name) or self.GetDefinitionByAlias(name))
+        if referenced_definition:
+          referenced_sources, referenced_dependencies = (
+              self._ExpandArtifactDefinition(
+                  referenced_definition, expansion_path))
+          expanded_sources.update(referenced_sources)
+          dependencies.update(referenced_dependencies)
+
+    expansion_path.pop()
+
+    for name in dependencies:
+      dependents = self._expansion_dependents_by_name.setdefault(name, set())
+      dependents.add(artifact_definition_name)
+
+    cached_expansion = (expanded_sources, dependencies)
+    self._expanded_sources_by_name[artifact_definition_name] = (
+        cached_expansion)
+
+    return cached_expansion
+
+  def _GetSourcesSupportedOS(self, artifact_definition):
+    """Retrieves the supported operating systems of the sources.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+
+    Returns:
+      list[tuple[int, SourceType, set[str]]]: index, source and supported
+          operating systems of every source.
+    """
+    sources_supported_os = []
+    for source_index, source in enumerate(artifact_definition.sources):
+      supported_os = set(
+          source.supported_os or artifact_definition.supported_os or [])
+      sources_supported_os.append((source_index, source, supported_os))
+
+    return sources_supported_os
+
+  def _IndexDefinition(self, artifact_definition):
+    """Indexes an artifact definition by alias, supported OS and source type.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+    """
+    artifact_definition_name = artifact_definition.name.lower()
+
+    self._defined_artifact_names.add(artifact_definition.name)
+
+    for alias in artifact_definition.aliases:
+      self._artifact_definitions_by_alias[alias.lower()] = artifact_definition
+
+    for source_index, source, supported_os in self._GetSourcesSupportedOS(
+        artifact_definition):
+      for operating_system in supported_os:
+        artifact_definitions = (
+            self._artifact_definitions_by_supported_os.setdefault(
+                operating_system, {}))
+        artifact_definitions[artifact_definition_name] = artifact_definition
+
+        sources = self._sources_by_supported_os.setdefault(
+            operating_system, {})
+        sources[(artifact_definition_name, source_index)] = (
+            artifact_definition, source)
+
+    for source_index, source in enumerate(artifact_definition.sources):
+      sources = self._sources_by_type_indicator.setdefault(
+          source.type_indicator, {})
+      sources[(artifact_definition_name, source_index)] = (
+          artifact_definition, source)
+
+      if source.type_indicator == definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
+        for name in source.names:
+          references = self._artifact_group_references_by_name.setdefault(
+              name, {})
+          references[artifact_definition.name] = references.get(
+              artifact_definition.name, 0) + 1
+
+  def _InvalidateExpansions(self, artifact_definition):
+    """Invalidates the cached expansions that depend on an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+    """
+    names = [artifact_definition.name.lower()]
+    names.extend([alias.lower() for alias in artifact_definition.aliases])
+
+    for name in names:
+      for dependent_name in self._expansion_dependents_by_name.pop(name, []):
+        cached_expansion = self._expanded_sources_by_name.pop(
+            dependent_name, None)
+        if not cached_expansion:
+          continue
+
+        # Remove the dependent from the names its expansion depended on, so
+        # that the dependents do not accumulate.
+        _, dependencies = cached_expansion
+        for dependency_name in dependencies:
+          dependents = self._expansion_dependents_by_name.get(
+              dependency_name, None)
+          if dependents is not None:
+            dependents.discard(dependent_name)
+            if not dependents:
+              del self._expansion_dependents_by_name[dependency_name]
+
+  def _ReadIndexedDefinition(self, name):
+    """Reads an artifact definition of which the location was indexed.
+
+    Args:
+      name (str): lower case name of the artifact definition.
+
+    Returns:
+      ArtifactDefinition: an artifact definition.
+
+    Raises:
+      FormatError: if the format of the artifact definition is not set
+          or incorrect.
+    """
+    artifacts_reader, location = self._artifact_locations_by_name[name]
+    artifact_definition = artifacts_reader.ReadArtifactDefinitionAtLocation(
+        location)
+
+    del self._artifact_locations_by_name[name]
+    for alias in location.aliases:
+      self._artifact_names_by_indexed_alias.pop(alias.lower(), None)
+
+    self.RegisterDefinition(artifact_definition)
+
+    return artifact_definition
+
+  def _ReadIndexedDefinitions(self):
+    """Reads all artifact definitions of which the location was indexed.
+
+    Raises:
+      FormatError: if the format of an artifact definition is not set
+          or incorrect.
+    """
+    while self._artifact_locations_by_name:
+      name = next(iter(self._artifact_locations_by_name))
+      self._ReadIndexedDefinition(name)
+
+  def _RegisterLocation(self, artifacts_reader, location):
+    """Registers the location of an artifact definition.
+
+    Args:
+      artifacts_reader (ArtifactsReader): artifacts reader used to read the
+          artifact definition.
+      location (ArtifactDefinitionLocation): artifact definition location.
+
+    Raises:
+      KeyError: if artifact definition is already set for the corresponding
+          name or alias.
+    """
+    name = location.name.lower()
+    if (name in self._artifact_definitions_by_name or
+        name in self._artifact_locations_by_name):
+      raise KeyError(
+          f'Artifact definition already set for name: {location.name:s}.')
+
+    for alias in location.aliases:
+      alias_lower = alias.lower()
+      if (alias_lower in self._artifact_definitions_by_alias or
+          alias_lower in self._artifact_names_by_indexed_alias):
+        raise KeyError(f'Artifact definition already set for alias: {alias:s}.')
+
+      if (alias_lower in self._artifact_definitions_by_name or
+          alias_lower in self._artifact_locations_by_name):
+        raise KeyError(
+            f'Artifact definition alias: {alias:s} already used as name.')
+
+    self._artifact_locations_by_name[name] = (artifacts_reader, location)
+
+    for alias in location.aliases:
+      self._artifact_names_by_indexed_alias[alias.lower()] = name
 
   @classmethod
   def CreateSourceType(cls, type_indicator, attributes):
@@ -63,6 +334,9 @@ class ArtifactDefinitionsRegistry(object):
       KeyError: if an artifact definition is not set for the corresponding name.
     """
     artifact_definition_name = artifact_definition.name.lower()
+    if artifact_definition_name in self._artifact_locations_by_name:
+      self._ReadIndexedDefinition(artifact_definition_name)
+
     if artifact_definition_name not in self._artifact_definitions_by_name:
       raise KeyError((
           f'Artifact definition not set for name: '
@@ -73,10 +347,33 @@ class ArtifactDefinitionsRegistry(object):
         raise KeyError(f'Artifact definition not set for alias: {alias:s}.')
 
     del self._artifact_definitions_by_name[artifact_definition_name]
+    self._defined_artifact_names.discard(artifact_definition.name)
+    self._InvalidateExpansions(artifact_definition)
 
     for alias in artifact_definition.aliases:
       del self._artifact_definitions_by_alias[alias.lower()]
 
+    for source_index, _, supported_os in self._GetSourcesSupportedOS(
+        artifact_definition):
+      for operating_system in supported_os:
+        self._artifact_definitions_by_supported_os[operating_system].pop(
+            artifact_definition_name, None)
+        del self._sources_by_supported_os[operating_system][
+            (artifact_definition_name, source_index)]
+
+    for source_index, source in enumerate(artifact_definition.sources):
+      del self._sources_by_type_indicator[source.type_indicator][
+          (artifact_definition_name, source_index)]
+
+      if source.type_indicator == definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
+        for name in source.names:
+          references = self._artifact_group_references_by_name[name]
+          references[artifact_definition.name] -= 1
+          if not references[artifact_definition.name]:
+            del references[artifact_definition.name]
+          if not references:
+            del self._artifact_group_references_by_name[name]
+
   @classmethod
   def DeregisterSourceType(cls, source_type_class):
     """Deregisters a source type.
@@ -97,6 +394,20 @@ class ArtifactDefinitionsRegistry(object):
 
     del cls._source_type_classes[source_type_class.TYPE_INDICATOR]
 
+  def Freeze(self):
+    """Creates an immutable snapshot of the registry.
+
+    Artifact definitions of which the location was indexed are read first.
+
+    Returns:
+      FrozenArtifactDefinitionsRegistry: snapshot of the registry.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    return FrozenArtifactDefinitionsRegistry(self)
+
   def GetDefinitionByAlias(self, alias):
     """Retrieves a specific artifact definition by alias.
 
@@ -105,11 +416,20 @@ class ArtifactDefinitionsRegistry(object):
 
     Returns:
       ArtifactDefinition: an artifact definition or None if not available.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
     """
     if not alias:
       return None
 
-    return self._artifact_definitions_by_alias.get(alias.lower(), None)
+    alias = alias.lower()
+    name = self._artifact_names_by_indexed_alias.get(alias, None)
+    if name:
+      self._ReadIndexedDefinition(name)
+
+    return self._artifact_definitions_by_alias.get(alias, None)
 
   def GetDefinitionByName(self, name):
     """Retrieves a specific artifact definition by name.
@@ -119,27 +439,264 @@ class ArtifactDefinitionsRegistry(object):
 
     Returns:
       ArtifactDefinition: an artifact definition or None if not available.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
     """
     if not name:
       return None
 
-    return self._artifact_definitions_by_name.get(name.lower(), None)
+    name = name.lower()
+    if name in self._artifact_locations_by_name:
+      return self._ReadIndexedDefinition(name)
+
+    return self._artifact_definitions_by_name.get(name, None)
 
   def GetDefinitions(self):
     """Retrieves the artifact definitions.
 
+    Artifact definitions of which the location was indexed are read first.
+
     Yields:
       ArtifactDefinition: artifact definition.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
     """
+    self._ReadIndexedDefinitions()
+
     yield from self._artifact_definitions_by_name.values()
 
+  def GetDefinitionsBySupportedOS(self, supported_os):
+    """Retrieves the artifact definitions that apply to an operating system.
+
+    Artifact definitions of which the location was indexed are read first.
+
+    Args:
+      supported_os (str): supported operating system, such as "Windows".
+
+    Yields:
+      ArtifactDefinition: artifact definition of which at least one source
+          applies to the operating system.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    self._ReadIndexedDefinitions()
+
+    artifact_definitions = self._artifact_definitions_by_supported_os.get(
+        supported_os, None) or {}
+    yield from artifact_definitions.values()
+
+  def GetExpandedDefinitions(self, name, supported_os=None):
+    """Retrieves the leaf artifact definitions of an artifact group.
+
+    Args:
+      name (str): name or alias of the artifact definition to expand.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Yields:
+      ArtifactDefinition: artifact definition with at least one source that
+          is not an artifact group, in order of first reference.
+
+    Raises:
+      CyclicDependencyError: if an artifact group references itself directly
+          or indirectly.
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    artifact_definition_names = set()
+    for artifact_definition, _ in self.GetExpandedSources(
+        name, supported_os=supported_os):
+      if artifact_definition.name not in artifact_definition_names:
+        artifact_definition_names.add(artifact_definition.name)
+        yield artifact_definition
+
+  def GetExpandedSources(self, name, supported_os=None):
+    """Retrieves the leaf sources of an artifact group.
+
+    Artifact group sources are expanded transitively into the sources of
+    the artifact definitions they reference, where references to undefined
+    artifact definitions are ignored. The expansion is cached.
+
+    Args:
+      name (str): name or alias of the artifact definition to expand.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Yields:
+      tuple[ArtifactDefinition, SourceType]: artifact definition and source
+          that is not an artifact group, in order of first reference.
+
+    Raises:
+      CyclicDependencyError: if an artifact group references itself directly
+          or indirectly.
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    artifact_definition = (
+        self.GetDefinitionByName(name) or self.GetDefinitionByAlias(name))
+    if not artifact_definition:
+      return
+
+    expanded_sources, _ = self._ExpandArtifactDefinition(
+        artifact_definition, [])
+
+    if supported_os is None:
+      yield from expanded_sources.values()
+      return
+
+    sources_by_supported_os = self._sources_by_supported_os.get(
+        supported_os, None) or {}
+
+    for key, value in expanded_sources.items():
+      if key in sources_by_supported_os:
+        yield value
+
+  def GetFilteredArtifacts(self):
+    """Retrieves the names of filtered artifacts used by artifact groups.
+
+    Filtered artifacts are artifacts that are defined but were not read into
+    the registry since they do not apply to the supported operating systems
+    the artifact definitions were read for.
+
+    Returns:
+      set[str]: filtered artifacts names.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    self._ReadIndexedDefinitions()
+
+    return set(
+        name for name in self._artifact_group_references_by_name
+        if name in self._filtered_artifact_names and
+        name not in self._defined_artifact_names)
+
+  def GetReferencingGroups(self, name, transitive=False):
+    """Retrieves the names of the artifact groups that reference an artifact.
+
+    Artifact definitions of which the location was indexed are read first.
+
+    Args:
+      name (str): name of the referenced artifact definition. If the artifact
+          definition is defined, references to its aliases are included.
+      transitive (Optional[bool]): True if artifact groups that reference
+          the artifact indirectly, via other artifact groups, should be
+          included.
+
+    Returns:
+      set[str]: names of the artifact groups that reference the artifact.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    self._ReadIndexedDefinitions()
+
+    group_names = set()
+    names = [name]
+    while names:
+      name = names.pop()
+
+      referenced_names = [name]
+      artifact_definition = self._artifact_definitions_by_name.get(
+          name.lower(), None)
+      if artifact_definition:
+        referenced_names.extend(artifact_definition.aliases)
+
+      for referenced_name in referenced_names:
+        references = self._artifact_group_references_by_name.get(
+            referenced_name, None) or {}
+        for group_name in references:
+          if group_name not in group_names:
+            group_names.add(group_name)
+            if transitive:
+              names.append(group_name)
+
+    return group_names
+
+  def GetSourcesBySupportedOS(self, supported_os):
+    """Retrieves the sources that apply to an operating system.
+
+    Artifact definitions of which the location was indexed are read first.
+
+    Args:
+      supported_os (str): supported operating system, such as "Windows".
+
+    Yields:
+      tuple[ArtifactDefinition, SourceType]: artifact definition and source
+          that applies to the operating system.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    self._ReadIndexedDefinitions()
+
+    sources = self._sources_by_supported_os.get(supported_os, None) or {}
+    yield from sources.values()
+
+  def GetSourcesByTypeIndicator(self, type_indicator, supported_os=None):
+    """Retrieves the sources of a specific type.
+
+    Artifact definitions of which the location was indexed are read first.
+
+    Args:
+      type_indicator (str): source type indicator, such as "COMMAND".
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Yields:
+      tuple[ArtifactDefinition, SourceType]: artifact definition and source
+          of the type.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    self._ReadIndexedDefinitions()
+
+    sources = self._sources_by_type_indicator.get(type_indicator, None) or {}
+    if supported_os is None:
+      yield from sources.values()
+      return
+
+    sources_by_supported_os = self._sources_by_supported_os.get(
+        supported_os, None) or {}
+
+    # Iterate the smaller of both indexes and look up the keys in the other.
+    if len(sources_by_supported_os) < len(sources):
+      sources, sources_by_supported_os = sources_by_supported_os, sources
+
+    for key, value in sources.items():
+      if key in sources_by_supported_os:
+        yield value
+
   def GetUndefinedArtifacts(self):
     """Retrieves the names of undefined artifacts used by artifact groups.
 
+    Artifacts that were filtered by supported operating system are not
+    considered undefined, these are returned by GetFilteredArtifacts().
+
     Returns:
       set[str]: undefined artifacts names.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
     """
-    return self._artifact_name_references - self._defined_artifact_names
+    self._ReadIndexedDefinitions()
+
+    return set(
+        name for name in self._artifact_group_references_by_name
+        if name not in self._defined_artifact_names and
+        name not in self._filtered_artifact_names)
 
   def RegisterDefinition(self, artifact_definition):
     """Registers an artifact definition.
@@ -154,30 +711,27 @@ class ArtifactDefinitionsRegistry(object):
           name or alias.
     """
     artifact_definition_name = artifact_definition.name.lower()
-    if artifact_definition_name in self._artifact_definitions_by_name:
+    if (artifact_definition_name in self._artifact_definitions_by_name or
+        artifact_definition_name in self._artifact_locations_by_name):
       raise KeyError((
           f'Artifact definition already set for name: '
           f'{artifact_definition.name:s}.'))
 
     for alias in artifact_definition.aliases:
       alias_lower = alias.lower()
-      if alias_lower in self._artifact_definitions_by_alias:
+      if (alias_lower in self._artifact_definitions_by_alias or
+          alias_lower in self._artifact_names_by_indexed_alias):
         raise KeyError(f'Artifact definition already set for alias: {alias:s}.')
 
-      if alias_lower in self._artifact_definitions_by_name:
+      if (alias_lower in self._artifact_definitions_by_name or
+          alias_lower in self._artifact_locations_by_name):
         raise KeyError(
             f'Artifact definition alias: {alias:s} already used as name.')
 
     self._artifact_definitions_by_name[artifact_definition_name] = (
         artifact_definition)
-    self._defined_artifact_names.add(artifact_definition.name)
-
-    for alias in artifact_definition.aliases:
-      self._artifact_definitions_by_alias[alias.lower()] = artifact_definition
-
-    for source in artifact_definition.sources:
-      if source.type_indicator == definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
-        self._artifact_name_references.update(source.names)
+    self._InvalidateExpansions(artifact_definition)
+    self._IndexDefinition(artifact_definition)
 
   @classmethod
   def RegisterSourceType(cls, source_type_class):
@@ -212,39 +766,521 @@ class ArtifactDefinitionsRegistry(object):
     for source_type_class in source_type_classes:
       cls.RegisterSourceType(source_type_class)
 
-  def ReadFromDirectory(self, artifacts_reader, path, extension='yaml'):
+  def ReadFromDirectory(
+      self, artifacts_reader, path, extension='yaml', number_of_workers=1,
+      supported_os=None):
     """Reads artifact definitions into the registry from files in a directory.
 
-    This function does not recurse sub directories.
+    This function does not recurse sub directories. The artifact definitions
+    are registered in sorted filename order and in the order they are defined
+    within each file, also when worker processes are used.
 
     Args:
       artifacts_reader (ArtifactsReader): an artifacts reader.
       path (str): path of the directory to read from.
       extension (Optional[str]): extension of the filenames to read.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the files, where 1 represents the files are parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all. Artifact definitions
+          that do not apply to any of these operating systems are skipped
+          before they are parsed into artifact definition objects.
 
     Raises:
       KeyError: if a duplicate artifact definition is encountered.
     """
     for artifact_definition in artifacts_reader.ReadDirectory(
-        path, extension=extension):
+        path, extension=extension, number_of_workers=number_of_workers,
+        supported_os=supported_os):
       self.RegisterDefinition(artifact_definition)
 
-  def ReadFromFile(self, artifacts_reader, filename):
+    self._filtered_artifact_names.update(
+        artifacts_reader.filtered_artifact_names)
+
+  def ReadIndexFromDirectory(
+      self, artifacts_reader, path, extension='yaml', index_path=None):
+    """Reads an index of artifact definitions from files in a directory.
+
+    The files are scanned for the names, aliases and locations of the
+    artifact definitions, which is considerably cheaper than reading them.
+    An artifact definition is read, and validated, when it is first accessed
+    by name or alias. GetDefinitions(), GetFilteredArtifacts() and
+    GetUndefinedArtifacts() read all remaining artifact definitions.
+
+    This function does not recurse sub directories.
+
+    Args:
+      artifacts_reader (ArtifactsReader): an artifacts reader that supports
+          scanning files.
+      path (str): path of the directory to read from.
+      extension (Optional[str]): extension of the filenames to read.
+      index_path (Optional[str]): path of the file the index is persisted to,
+          so that only changed files are scanned again, where None represents
+          the index is not persisted.
+
+    Raises:
+      FormatError: if a file cannot be scanned.
+      KeyError: if a duplicate artifact definition is encountered.
+    """
+    definitions_index = index.ArtifactDefinitionsIndex(path=index_path)
+    for location in definitions_index.ScanDirectory(
+        artifacts_reader, path, extension=extension):
+      self._RegisterLocation(artifacts_reader, location)
+
+  def ReadFromFile(
+      self, artifacts_reader, filename, number_of_workers=1,
+      supported_os=None):
     """Reads artifact definitions into the registry from a file.
 
     Args:
       artifacts_reader (ArtifactsReader): an artifacts reader.
       filename (str): name of the file to read from.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the file, where 1 represents the file is parsed in the
+          current process and None the number of CPUs.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
     """
-    for artifact_definition in artifacts_reader.ReadFile(filename):
+    for artifact_definition in artifacts_reader.ReadFile(
+        filename, number_of_workers=number_of_workers,
+        supported_os=supported_os):
       self.RegisterDefinition(artifact_definition)
 
-  def ReadFileObject(self, artifacts_reader, file_object):
+    self._filtered_artifact_names.update(
+        artifacts_reader.filtered_artifact_names)
+
+  def ReadFileObject(self, artifacts_reader, file_object, supported_os=None):
     """Reads artifact definitions into the registry from a file-like object.
 
     Args:
       artifacts_reader (ArtifactsReader): an artifacts reader.
       file_object (file): file-like object to read from.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for, where None represents all.
     """
-    for artifact_definition in artifacts_reader.ReadFileObject(file_object):
+    for artifact_definition in artifacts_reader.ReadFileObject(
+        file_object, supported_os=supported_os):
       self.RegisterDefinition(artifact_definition)
+
+    self._filtered_artifact_names.update(
+        artifacts_reader.filtered_artifact_names)
+
+
+class _FrozenObject(object):
+  """Mix-in of which the attributes cannot be changed once frozen.
+
+  The subclasses define the _is_frozen slot, since the instance layouts of
+  multiple base classes with slots conflict.
+  """
+
+  __slots__ = ()
+
+  def __delattr__(self, name):
+    """Deletes an attribute.
+
+    Args:
+      name (str): name of the attribute.
+
+    Raises:
+      TypeError: if the object is frozen.
+    """
+    if getattr(self, '_is_frozen', False):
+      raise TypeError(f'Frozen {type(self).__name__:s} cannot be changed.')
+
+    super(_FrozenObject, self).__delattr__(name)
+
+  def __setattr__(self, name, value):
+    """Sets an attribute.
+
+    Args:
+      name (str): name of the attribute.
+      value (object): value of the attribute.
+
+    Raises:
+      TypeError: if the object is frozen.
+    """
+    if getattr(self, '_is_frozen', False):
+      raise TypeError(f'Frozen {type(self).__name__:s} cannot be changed.')
+
+    super(_FrozenObject, self).__setattr__(name, value)
+
+  def Freeze(self):
+    """Freezes the object, after which its attributes cannot be changed."""
+    self._is_frozen = True  # pylint: disable=attribute-defined-outside-init
+
+
+class FrozenArtifactDefinitionsRegistry(ArtifactDefinitionsRegistry):
+  """Immutable snapshot of an artifact definitions registry.
+
+  The snapshot contains frozen copies of the artifact definitions and
+  sources, of which the attributes cannot be changed and the lists are
+  stored as tuples and the key value pairs as read-only mappings. Copies are
+  shared, by the SHA-256 digest of their content, with all other snapshots
+  that are in memory, so that snapshots of near-identical registries cost
+  little more than one. Sources are copied by creating a source of the same
+  class from the result of AsDict().
+
+  The indexes by alias, supported operating system and source type are only
+  built when first needed, since comparing snapshots only requires the
+  artifact definitions by name.
+
+  Snapshots are hashable and compare equal if their fingerprints are equal.
+  """
+
+  # Frozen subclasses per artifact definition and source class.
+  _frozen_classes = {}
+
+  # Copies of artifact definitions and sources per digest of their content,
+  # which are shared by all snapshots.
+  _shared_definitions = weakref.WeakValueDictionary()
+  _shared_sources = weakref.WeakValueDictionary()
+  _shared_lock = threading.Lock()
+
+  def __init__(self, artifact_registry):
+    """Initializes a snapshot of an artifact definitions registry.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry to create the snapshot of.
+
+    Raises:
+      FormatError: if the format of an indexed artifact definition is not set
+          or incorrect.
+    """
+    super(FrozenArtifactDefinitionsRegistry, self).__init__()
+    self._digests_by_name = {}
+    self._fingerprint = None
+    self._has_indexes = False
+    self._indexes_lock = threading.Lock()
+
+    for artifact_definition in artifact_registry.GetDefinitions():
+      digest, shared_definition = self._GetSharedDefinition(
+          artifact_definition)
+
+      name = shared_definition.name.lower()
+      self._artifact_definitions_by_name[name] = shared_definition
+      self._digests_by_name[name] = digest
+
+    # Only the filtered artifacts that are referenced by artifact groups
+    # affect GetFilteredArtifacts() and GetUndefinedArtifacts().
+    self._filtered_artifact_names = frozenset(
+        artifact_registry.GetFilteredArtifacts())
+
+  def __eq__(self, other):
+    """Determines if the snapshot is equal to another object.
+
+    Args:
+      other (object): other object.
+
+    Returns:
+      bool: True if the other object is a snapshot with the same fingerprint.
+    """
+    if not isinstance(other, FrozenArtifactDefinitionsRegistry):
+      return NotImplemented
+
+    return self.fingerprint == other.fingerprint
+
+  def __hash__(self):
+    """Retrieves the hash of the snapshot.
+
+    Returns:
+      int: hash of the fingerprint.
+    """
+    return hash(self.fingerprint)
+
+  @property
+  def fingerprint(self):
+    """str: hexadecimal SHA-256 digest of the artifact definitions and the
+    names of the filtered artifact definitions."""
+    if self._fingerprint is None:
+      content = json.dumps([
+          sorted(self._digests_by_name.items()),
+          sorted(self._filtered_artifact_names)])
+      self._fingerprint = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    return self._fingerprint
+
+  def _GetDigest(self, values):
+    """Calculates the digest of content values.
+
+    Args:
+      values (object): JSON serializable content values.
+
+    Returns:
+      str: hexadecimal SHA-256 digest of the values.
+    """
+    content = json.dumps(values, sort_keys=True)
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    # Interning shares the digest between snapshots.
+    return sys.intern(digest)
+
+  def _GetFrozenClass(self, base_class):
+    """Retrieves the frozen subclass of an artifact definition or source class.
+
+    Args:
+      base_class (type): artifact definition or source class.
+
+    Returns:
+      type: frozen subclass of which the attributes cannot be changed once
+          frozen.
+    """
+    if issubclass(base_class, _FrozenObject):
+      return base_class
+
+    with self._shared_lock:
+      frozen_class = self._frozen_classes.get(base_class, None)
+      if frozen_class is None:
+        frozen_class = type(
+            f'Frozen{base_class.__name__:s}', (_FrozenObject, base_class),
+            {'__doc__': base_class.__doc__, '__slots__': ('_is_frozen',)})
+        self._frozen_classes[base_class] = frozen_class
+
+    return frozen_class
+
+  def _GetSharedDefinition(self, artifact_definition):
+    """Retrieves the shared copy of an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): artifact definition.
+
+    Returns:
+      tuple[str, ArtifactDefinition]: digest of the content of the artifact
+          definition and its shared copy.
+    """
+    digest = self._GetDigest(artifact_definition.AsDict())
+
+    with self._shared_lock:
+      shared_definition = self._shared_definitions.get(digest, None)
+
+    if shared_definition is None:
+      frozen_class = self._GetFrozenClass(type(artifact_definition))
+
+      shared_definition = frozen_class(
+          artifact_definition.name,
+          description=artifact_definition.description)
+      shared_definition.aliases = tuple(artifact_definition.aliases)
+      shared_definition.sources = tuple(
+          self._GetSharedSource(source)
+          for source in artifact_definition.sources)
+      shared_definition.supported_os = tuple(artifact_definition.supported_os)
+      shared_definition.urls = tuple(artifact_definition.urls)
+      shared_definition.Freeze()
+
+      with self._shared_lock:
+        shared_definition = self._shared_definitions.setdefault(
+            digest, shared_definition)
+
+    return digest, shared_definition
+
+  def _GetSharedSource(self, source):
+    """Retrieves the shared copy of a source.
+
+    Args:
+      source (SourceType): source.
+
+    Returns:
+      SourceType: shared copy of the source.
+    """
+    attributes = source.AsDict()
+    supported_os = tuple(source.supported_os or [])
+
+    digest = self._GetDigest(
+        [source.type_indicator, attributes, list(supported_os)])
+
+    with self._shared_lock:
+      shared_source = self._shared_sources.get(digest, None)
+
+    if shared_source is None:
+      frozen_class = self._GetFrozenClass(type(source))
+
+      shared_source = frozen_class(**attributes)
+      shared_source.supported_os = supported_os
+
+      if source.type_indicator == (
+          definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE):
+        shared_source.key_value_pairs = tuple(
+            types.MappingProxyType(key_value_pair)
+            for key_value_pair in shared_source.key_value_pairs)
+
+      shared_source.Freeze()
+
+      with self._shared_lock:
+        shared_source = self._shared_sources.setdefault(digest, shared_source)
+
+    return shared_source
+
+  def _ReadIndexedDefinitions(self):
+    """Builds the indexes of the artifact definitions if not already built."""
+    if self._has_indexes:
+      return
+
+    with self._indexes_lock:
+      if not self._has_indexes:
+        for artifact_definition in self._artifact_definitions_by_name.values():
+          self._IndexDefinition(artifact_definition)
+
+        self._has_indexes = True
+
+  def _RaiseFrozenError(self):
+    """Raises an error that the snapshot cannot be changed.
+
+    Raises:
+      TypeError: always.
+    """
+    raise TypeError('Frozen artifact definitions registry cannot be changed.')
+
+  def DeregisterDefinition(self, artifact_definition):
+    """Deregisters an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
+
+  def Freeze(self):
+    """Creates an immutable snapshot of the registry.
+
+    Returns:
+      FrozenArtifactDefinitionsRegistry: the snapshot itself.
+    """
+    return self
+
+  def GetDefinitionByAlias(self, alias):
+    """Retrieves a specific artifact definition by alias.
+
+    Args:
+      alias (str): alias of the artifact definition.
+
+    Returns:
+      ArtifactDefinition: an artifact definition or None if not available.
+    """
+    self._ReadIndexedDefinitions()
+
+    return super(FrozenArtifactDefinitionsRegistry, self).GetDefinitionByAlias(
+        alias)
+
+  def GetDefinitionDigest(self, name):
+    """Retrieves the digest of the content of an artifact definition.
+
+    Args:
+      name (str): name of the artifact definition.
+
+    Returns:
+      str: hexadecimal SHA-256 digest of the content of the artifact
+          definition or None if not available.
+    """
+    if not name:
+      return None
+
+    return self._digests_by_name.get(name.lower(), None)
+
+  def GetDefinitions(self):
+    """Retrieves the artifact definitions.
+
+    Yields:
+      ArtifactDefinition: artifact definition.
+    """
+    yield from self._artifact_definitions_by_name.values()
+
+  def GetExpandedSources(self, name, supported_os=None):
+    """Retrieves the leaf sources of an artifact group.
+
+    Args:
+      name (str): name or alias of the artifact definition to expand.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Yields:
+      tuple[ArtifactDefinition, SourceType]: artifact definition and source
+          that is not an artifact group, in order of first reference.
+
+    Raises:
+      CyclicDependencyError: if an artifact group references itself directly
+          or indirectly.
+    """
+    self._ReadIndexedDefinitions()
+
+    parent = super(FrozenArtifactDefinitionsRegistry, self)
+    yield from parent.GetExpandedSources(name, supported_os=supported_os)
+
+  # pylint: disable=unused-argument
+
+  def ReadFromDirectory(
+      self, artifacts_reader, path, extension='yaml', number_of_workers=1,
+      supported_os=None):
+    """Reads artifact definitions into the registry from files in a directory.
+
+    Args:
+      artifacts_reader (ArtifactsReader): an artifacts reader.
+      path (str): path of the directory to read from.
+      extension (Optional[str]): extension of the filenames to read.
+      number_of_workers (Optional[int]): number of worker processes.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
+
+  def ReadIndexFromDirectory(
+      self, artifacts_reader, path, extension='yaml', index_path=None):
+    """Reads an index of artifact definitions from files in a directory.
+
+    Args:
+      artifacts_reader (ArtifactsReader): an artifacts reader.
+      path (str): path of the directory to read from.
+      extension (Optional[str]): extension of the filenames to read.
+      index_path (Optional[str]): path of the file the index is persisted to.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
+
+  def ReadFromFile(
+      self, artifacts_reader, filename, number_of_workers=1,
+      supported_os=None):
+    """Reads artifact definitions into the registry from a file.
+
+    Args:
+      artifacts_reader (ArtifactsReader): an artifacts reader.
+      filename (str): name of the file to read from.
+      number_of_workers (Optional[int]): number of worker processes.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
+
+  def ReadFileObject(self, artifacts_reader, file_object, supported_os=None):
+    """Reads artifact definitions into the registry from a file-like object.
+
+    Args:
+      artifacts_reader (ArtifactsReader): an artifacts reader.
+      file_object (file): file-like object to read from.
+      supported_os (Optional[set[str]]): operating systems to read artifact
+          definitions for.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
+
+  def RegisterDefinition(self, artifact_definition):
+    """Registers an artifact definition.
+
+    Args:
+      artifact_definition (ArtifactDefinition): an artifact definition.
+
+    Raises:
+      TypeError: always, since the snapshot cannot be changed.
+    """
+    self._RaiseFrozenError()
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""The artifact definitions file system resolver."""
+
+import concurrent.futures
+import os
+import stat
+
+from artifacts import matcher
+
+
+class FileSystemResolver(matcher.PathMatcher):
+  """Resolves the paths of artifact definition sources in a file system.
+
+  The paths of the directory, file and path sources are compiled into a path
+  segment trie, the same way as for the path matcher, which guides a single
+  traversal of the file system for all paths. Only the directories that can
+  contain a match of one or more paths are traversed, and directories of
+  which only literal path segments are of interest are not listed, but their
+  entries are looked up. Paths of sources that apply to Windows, or use "\\"
+  as separator, are matched case-insensitive.
+
+  Directories are traversed with os.scandir() and symbolic links to
+  directories are not followed.
+
+  Attributes:
+    number_of_matched_entries (int): number of entries that matched one or
+        more paths during the last resolve.
+    number_of_pruned_directories (int): number of directories that were not
+        traversed during the last resolve, since they cannot contain a match.
+    number_of_visited_entries (int): number of entries that were visited
+        during the last resolve.
+  """
+
+  # Minimum number of directories per worker thread before the traversal is
+  # distributed over the worker threads.
+  _MINIMUM_DIRECTORIES_PER_WORKER = 4
+
+  def __init__(self, variables=None):
+    """Initializes a file system resolver.
+
+    Args:
+      variables (Optional[dict[str, list[str]]]): values per parameter name,
+          such as "users.homedir", that override the default values.
+    """
+    super(FileSystemResolver, self).__init__(variables=variables)
+    self.number_of_matched_entries = 0
+    self.number_of_pruned_directories = 0
+    self.number_of_visited_entries = 0
+
+  def _GetDirectoryEntries(self, directory_path, states):
+    """Retrieves the entries of a directory that are of interest.
+
+    If the states only contain literal path segments that are matched
+    case-sensitive the entries are looked up instead of listed.
+
+    Args:
+      directory_path (str): path of the directory.
+      states (frozenset[tuple[PathSegmentNode, int]]): states of the
+          traversal in the directory.
+
+    Returns:
+      list[tuple[str, str, bool]]: name, path and directory indicator of the
+          entries, where the directory indicator does not follow symbolic
+          links.
+    """
+    names = set()
+    for node, globstar_depth in states:
+      if (globstar_depth or node.glob_children or node.globstar_children or
+          node.literal_children_lower):
+        names = None
+        break
+
+      names.update(node.literal_children.keys())
+
+    entries = []
+    if names is None:
+      try:
+        with os.scandir(directory_path) as scandir_iterator:
+          for directory_entry in scandir_iterator:
+            try:
+              is_directory = directory_entry.is_dir(follow_symlinks=False)
+            except OSError:
+              is_directory = False
+
+            entries.append((
+                directory_entry.name, directory_entry.path, is_directory))
+
+      except OSError:
+        pass
+
+    else:
+      for name in sorted(names):
+        path = os.path.join(directory_path, name)
+        try:
+          stat_object = os.lstat(path)
+        except OSError:
+          continue
+
+        entries.append((name, path, stat.S_ISDIR(stat_object.st_mode)))
+
+    return entries
+
+  def _GetNextStates(self, states, name):
+    """Retrieves the states of the traversal after a path segment.
+
+    A state consists of a node of the path segment trie and a globstar
+    depth. A globstar depth of 0 represents the traversal is at the node,
+    otherwise the traversal is within a globstar that ends at the node, and
+    that can match up to globstar depth more path segments.
+
+    Args:
+      states (frozenset[tuple[PathSegmentNode, int]]): states of the
+          traversal.
+      name (str): path segment.
+
+    Returns:
+      frozenset[tuple[PathSegmentNode, int]]: states of the traversal after
+          the path segment.
+    """
+    name_lower = name.lower()
+
+    next_states = set()
+    for node, globstar_depth in states:
+      if globstar_depth:
+        next_states.add((node, 0))
+        if globstar_depth > 1:
+          next_states.add((node, globstar_depth - 1))
+        continue
+
+      child_node = node.literal_children.get(name, None)
+      if child_node:
+        next_states.add((child_node, 0))
+
+      child_node = node.literal_children_lower.get(name_lower, None)
+      if child_node:
+        next_states.add((child_node, 0))
+
+      for (_, case_insensitive), (prefix, regex, child_node) in (
+          node.glob_children.items()):
+        if case_insensitive:
+          value = name_lower
+        else:
+          value = name
+
+        if value.startswith(prefix) and (regex is None or regex.match(name)):
+          next_states.add((child_node, 0))
+
+      for depth, child_node in node.globstar_children.items():
+        next_states.add((child_node, 0))
+        if depth > 1:
+          next_states.add((child_node, depth - 1))
+
+    return frozenset(next_states)
+
+  def _ScanDirectory(self, directory_path, states):
+    """Scans a directory for entries that match.
+
+    Args:
+      directory_path (str): path of the directory.
+      states (frozenset[tuple[PathSegmentNode, int]]): states of the
+          traversal in the directory.
+
+    Returns:
+      tuple[list[tuple[str, list[tuple[ArtifactDefinition, SourceType, str]]]],
+          list[tuple[str, frozenset[tuple[PathSegmentNode, int]]]], int,
+          int]: matches per path, directories to traverse with their states,
+          number of visited entries and number of pruned directories.
+    """
+    matches = []
+    subdirectories = []
+    number_of_pruned_directories = 0
+
+    entries = self._GetDirectoryEntries(directory_path, states)
+    for name, path, is_directory in entries:
+      next_states = self._GetNextStates(states, name)
+
+      path_matches = {}
+      has_children = False
+      for node, globstar_depth in next_states:
+        if globstar_depth:
+          has_children = True
+          continue
+
+        if (node.literal_children or node.literal_children_lower or
+            node.glob_children or node.globstar_children):
+          has_children = True
+
+        for artifact_definition, source, source_path in node.matches:
+          match_key = (id(source), source_path)
+          if match_key not in path_matches:
+            path_matches[match_key] = (artifact_definition, source, source_path)
+
+      if path_matches:
+        matches.append((path, list(path_matches.values())))
+
+      if is_directory:
+        if has_children:
+          subdirectories.append((path, next_states))
+        else:
+          number_of_pruned_directories += 1
+
+    return matches, subdirectories, len(entries), number_of_pruned_directories
+
+  def _WalkDirectories(self, directories):
+    """Traverses directories and their subdirectories for entries that match.
+
+    Args:
+      directories (list[tuple[str, frozenset[tuple[PathSegmentNode, int]]]]):
+          directories to traverse with their states.
+
+    Returns:
+      tuple[list[tuple[str, list[tuple[ArtifactDefinition, SourceType, str]]]],
+          int, int]: matches per path, number of visited entries and number
+          of pruned directories.
+    """
+    matches = []
+    number_of_pruned_directories = 0
+    number_of_visited_entries = 0
+
+    directories = list(directories)
+    while directories:
+      directory_path, states = directories.pop()
+
+      directory_matches, subdirectories, visited_entries, pruned_directories = (
+          self._ScanDirectory(directory_path, states))
+
+      matches.extend(directory_matches)
+      directories.extend(subdirectories)
+      number_of_pruned_directories += pruned_directories
+      number_of_visited_entries += visited_entries
+
+    return matches, number_of_visited_entries, number_of_pruned_directories
+
+  def Resolve(self, root_path, number_of_workers=1):
+    """Resolves the paths of the sources in a file system.
+
+    Args:
+      root_path (str): path of the root of the file system, such as the mount
+          point of a storage media image.
+      number_of_workers (Optional[int]): number of worker threads, where None
+          represents the number of CPUs.
+
+    Returns:
+      list[tuple[str, ArtifactDefinition, SourceType, str]]: path of the
+          entry, artifact definition, source and path as defined by the
+          source, of the entries that match, sorted by path.
+    """
+    if number_of_workers is None:
+      number_of_workers = os.cpu_count() or 1
+
+    number_of_pruned_directories = 0
+    number_of_visited_entries = 0
+
+    root_states = frozenset([(self._root_node, 0)])
+    directories = [(root_path, root_states)]
+    matches = []
+
+    if number_of_workers > 1:
+      # Scan breadth first until there are enough directories to distribute
+      # over the worker threads.
+      minimum_number_of_directories = (
+          number_of_workers * self._MINIMUM_DIRECTORIES_PER_WORKER)
+      while directories and len(directories) < minimum_number_of_directories:
+        next_directories = []
+        for directory_path, states in directories:
+          (directory_matches, subdirectories, visited_entries,
+           pruned_directories) = self._ScanDirectory(directory_path, states)
+
+          matches.extend(directory_matches)
+          next_directories.extend(subdirectories)
+          number_of_pruned_directories += pruned_directories
+          number_of_visited_entries += visited_entries
+
+        directories = next_directories
+
+      with concurrent.futures.ThreadPoolExecutor(
+          max_workers=number_of_workers) as executor:
+        results = executor.map(
+            self._WalkDirectories, [
+                directories[index::number_of_workers]
+                for index in range(number_of_workers)])
+
+        for subtree_matches, visited_entries, pruned_directories in results:
+          matches.extend(subtree_matches)
+          number_of_pruned_directories += pruned_directories
+          number_of_visited_entries += visited_entries
+
+    else:
+      matches, number_of_visited_entries, number_of_pruned_directories = (
+          self._WalkDirectories(directories))
+
+    self.number_of_matched_entries = len(matches)
+    self.number_of_pruned_directories = number_of_pruned_directories
+    self.number_of_visited_entries = number_of_visited_entries
+
+    resolved_paths = []
+    for path, path_matches in sorted(matches, key=lambda match: match[0]):
+      for artifact_definition, source, source_path in path_matches:
+        resolved_paths.append((path, artifact_definition, source, source_path))
+
+    return resolved_paths
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Console script to determine the changes between artifact definitions."""
+
+import argparse
+import json
+import os
+import sys
+
+from artifacts import diff
+from artifacts import errors
+from artifacts import reader
+from artifacts import registry
+
+
+class DefinitionsDiffTool(object):
+  """Determines the changes between two versions of artifact definitions.
+
+  Attributes:
+    supported_os (str): supported operating system the artifact definitions
+        must apply to, such as "Windows", or None to compare all.
+  """
+
+  OUTPUT_FORMATS = frozenset(['json', 'text'])
+
+  _CHANGE_INDICATORS = {
+      diff.CHANGE_ADDED: '+',
+      diff.CHANGE_CHANGED: '~',
+      diff.CHANGE_REMOVED: '-'}
+
+  def __init__(self, supported_os=None):
+    """Initializes a definitions diff tool.
+
+    Args:
+      supported_os (Optional[str]): supported operating system the artifact
+          definitions must apply to, such as "Windows", where None represents
+          all.
+    """
+    super(DefinitionsDiffTool, self).__init__()
+    self._differ = diff.ArtifactDefinitionsDiffer()
+    self.supported_os = supported_os
+
+  def _FormatValue(self, value):
+    """Formats a value of a source.
+
+    Args:
+      value (object): value, such as a path or a key value pair.
+
+    Returns:
+      str: formatted value.
+    """
+    if isinstance(value, dict):
+      key = value.get('key', None) or ''
+      value_name = value.get('value', None) or ''
+      return f'{key:s} [{value_name:s}]'
+
+    return value
+
+  def _FormatValues(self, source_change):
+    """Formats the values of a change of a source.
+
+    Args:
+      source_change (SourceChange): change of a source.
+
+    Yields:
+      str: change indicator and formatted value.
+    """
+    if source_change.change == diff.CHANGE_CHANGED:
+      for attribute_name in source_change.changed_attributes:
+        yield f'~ {attribute_name:s}'
+
+      for value in source_change.added_values:
+        yield f'+ {self._FormatValue(value):s}'
+
+      for value in source_change.removed_values:
+        yield f'- {self._FormatValue(value):s}'
+
+    elif source_change.values_attribute:
+      change_indicator = self._CHANGE_INDICATORS[source_change.change]
+      for value in source_change.attributes.get(
+          source_change.values_attribute, []):
+        yield f'{change_indicator:s} {self._FormatValue(value):s}'
+
+  def _ReadRegistry(self, path):
+    """Reads artifact definitions into a registry.
+
+    Args:
+      path (str): path of the file or directory that contains the artifact
+          definitions.
+
+    Returns:
+      ArtifactDefinitionsRegistry: artifact definitions registry.
+
+    Raises:
+      FormatError: if the format of an artifact definition is not set or
+          incorrect.
+      KeyError: if a duplicate artifact definition is encountered.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    if os.path.isdir(path):
+      artifact_registry.ReadFromDirectory(artifact_reader, path)
+    else:
+      artifact_registry.ReadFromFile(artifact_reader, path)
+
+    if not self.supported_os:
+      return artifact_registry
+
+    os_artifact_registry = registry.ArtifactDefinitionsRegistry()
+    for artifact_definition in artifact_registry.GetDefinitionsBySupportedOS(
+        self.supported_os):
+      os_artifact_registry.RegisterDefinition(artifact_definition)
+
+    return os_artifact_registry
+
+  def Compare(self, path, other_path):
+    """Determines the changes between two versions of artifact definitions.
+
+    Args:
+      path (str): path of the file or directory that contains the artifact
+          definitions.
+      other_path (str): path of the file or directory that contains the other
+          version of the artifact definitions.
+
+    Returns:
+      ArtifactDefinitionsChangeSet: changes from the artifact definitions to
+          the other version of the artifact definitions.
+
+    Raises:
+      FormatError: if the format of an artifact definition is not set or
+          incorrect.
+      KeyError: if a duplicate artifact definition is encountered.
+    """
+    artifact_registry = self._ReadRegistry(path)
+    other_artifact_registry = self._ReadRegistry(other_path)
+
+    return self._differ.CompareRegistries(
+        artifact_registry, other_artifact_registry)
+
+  def FormatChangeSet(self, change_set, output_format='text'):
+    """Formats a change set.
+
+    Args:
+      change_set (ArtifactDefinitionsChangeSet): change set.
+      output_format (Optional[str]): output format, such as "json".
+
+    Returns:
+      str: formatted change set.
+    """
+    if output_format == 'json':
+      return json.dumps(change_set.AsDict(), indent=2, sort_keys=True)
+
+    lines = []
+    for definition_change in change_set.definition_changes:
+      change_indicator = self._CHANGE_INDICATORS[definition_change.change]
+      lines.append(f'{change_indicator:s} {definition_change.name:s}')
+
+      for attribute_name in definition_change.changed_attributes:
+        lines.append(f'  ~ {attribute_name:s}')
+
+      for source_change in definition_change.source_changes:
+        change_indicator = self._CHANGE_INDICATORS[source_change.change]
+        lines.append(
+            f'  {change_indicator:s} {source_change.type_indicator:s}')
+        for value_line in self._FormatValues(source_change):
+          lines.append(f'    {value_line:s}')
+
+    number_of_changes = {
+        diff.CHANGE_ADDED: 0, diff.CHANGE_CHANGED: 0, diff.CHANGE_REMOVED: 0}
+    for definition_change in change_set.definition_changes:
+      number_of_changes[definition_change.change] += 1
+
+    lines.append((
+        f'added: {number_of_changes[diff.CHANGE_ADDED]:d} changed: '
+        f'{number_of_changes[diff.CHANGE_CHANGED]:d} removed: '
+        f'{number_of_changes[diff.CHANGE_REMOVED]:d} unchanged: '
+        f'{change_set.number_of_unchanged_definitions:d}'))
+
+    return '\n'.join(lines)
+
+
+def Main():
+  """Entry point of console script to determine changes between definitions.
+
+  Returns:
+    int: exit code that is provided to sys.exit(), which is 0 if there are no
+        changes, 1 if there are changes and 2 on error.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Determines the changes between two versions of artifact definitions, '
+      'such as two data directories, at the granularity of sources and '
+      'paths.'))
+
+  argument_parser.add_argument(
+      '--format', dest='output_format', type=str, action='store',
+      choices=sorted(DefinitionsDiffTool.OUTPUT_FORMATS), default='text',
+      help='format of the changes.')
+
+  argument_parser.add_argument(
+      '--os', dest='supported_os', type=str, action='store', default=None,
+      metavar='OS', help=(
+          'only compare artifact definitions that apply to the operating '
+          'system, such as Windows.'))
+
+  argument_parser.add_argument(
+      '-o', '--output', dest='output', type=str, action='store',
+      default=None, metavar='PATH', help=(
+          'path of the file to write the changes to, by default stdout.'))
+
+  argument_parser.add_argument(
+      'source', action='store', metavar='PATH', help=(
+          'path of the file or directory that contains the artifact '
+          'definitions.'))
+
+  argument_parser.add_argument(
+      'other_source', action='store', metavar='OTHER_PATH', help=(
+          'path of the file or directory that contains the other version of '
+          'the artifact definitions.'))
+
+  options = argument_parser.parse_args()
+
+  for path in (options.source, options.other_source):
+    if not os.path.exists(path):
+      print(f'No such file or directory: {path:s}', file=sys.stderr)
+      return 2
+
+  diff_tool = DefinitionsDiffTool(supported_os=options.supported_os)
+
+  try:
+    change_set = diff_tool.Compare(options.source, options.other_source)
+  except (KeyError, errors.FormatError) as exception:
+    print(f'Unable to read artifact definitions with error: {exception!s}',
+          file=sys.stderr)
+    return 2
+
+  output_text = diff_tool.FormatChangeSet(
+      change_set, output_format=options.output_format)
+
+  if options.output:
+    with open(options.output, 'w', encoding='utf-8') as file_object:
+      file_object.write(output_text)
+      file_object.write('\n')
+  else:
+    print(output_text)
+
+  if change_set.definition_changes:
+    return 1
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
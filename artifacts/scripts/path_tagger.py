@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Console script to tag a file system listing with artifact definitions."""
+
+import argparse
+import os
+import sys
+
+from artifacts import matcher
+from artifacts import tagger
+
+
+class PathTagger(tagger.ListingTagger):
+  """Tags the paths in a file system listing with artifact definitions.
+
+  Every entry is written with the path, the names of the artifact
+  definitions of which a source path matches the path and, for listings
+  other than plain paths, the entry as read from the listing.
+
+  The supported listing formats are:
+  * bodyfile; Sleuthkit bodyfile, version 3;
+  * find; output of find -printf with tab separated fields of which the last
+    is the path, for example: find / -printf '%s\\t%T@\\t%p\\n';
+  * paths; one path per line.
+  """
+
+  INPUT_FORMATS = frozenset(['bodyfile', 'find', 'paths'])
+
+  def __init__(
+      self, definitions_path, input_format='paths', matches_only=False,
+      separator='/', supported_os=None):
+    """Initializes a path tagger.
+
+    Args:
+      definitions_path (str): path of the file or directory that contains
+          the artifact definitions.
+      input_format (Optional[str]): format of the file system listing.
+      matches_only (Optional[bool]): True if only entries that match an
+          artifact definition should be written.
+      separator (Optional[str]): path segment separator of the paths in the
+          listing.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Raises:
+      ValueError: if the input format is not supported.
+    """
+    if input_format not in self.INPUT_FORMATS:
+      raise ValueError(f'Unsupported input format: {input_format:s}')
+
+    super(PathTagger, self).__init__(
+        definitions_path, matches_only=matches_only, supported_os=supported_os)
+    self._input_format = input_format
+    self._separator = separator
+
+  def _CreateMatcher(self):
+    """Creates the matcher.
+
+    Returns:
+      PathMatcher: path matcher.
+    """
+    return matcher.PathMatcher()
+
+  def _GetPath(self, line):
+    """Retrieves the path of an entry in the listing.
+
+    Args:
+      line (str): line of the listing without end of line characters.
+
+    Returns:
+      str: path or None if the line does not contain a path.
+    """
+    if self._input_format == 'bodyfile':
+      # MD5|name|inode|mode_as_string|UID|GID|size|atime|mtime|ctime|crtime
+      # where the name can contain "|" characters.
+      _, _, line = line.partition('|')
+      values = line.rsplit('|', 9)
+      if len(values) != 10:
+        return None
+
+      path = values[0]
+      if values[2].startswith('l'):
+        path, _, _ = path.partition(' -> ')
+
+      if path.endswith(' ($FILE_NAME)'):
+        path = path[:-13]
+
+      return path
+
+    if self._input_format == 'find':
+      _, _, path = line.rpartition('\t')
+      return path
+
+    return line
+
+  def _TagLines(self, lines, output_file_object):
+    """Tags the entries of the listing.
+
+    Args:
+      lines (iterable[str]): lines of the listing.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+    path_matcher = self._GetMatcher()
+
+    number_of_entries = 0
+    number_of_tagged_entries = 0
+    for line in lines:
+      line = line.rstrip('\r\n')
+
+      path = self._GetPath(line)
+      if not path:
+        continue
+
+      number_of_entries += 1
+
+      artifact_names = sorted(set(
+          artifact_definition.name for artifact_definition, _, _ in (
+              path_matcher.Match(path, separator=self._separator))))
+      if artifact_names:
+        number_of_tagged_entries += 1
+      elif self._matches_only:
+        continue
+
+      entry = {'artifacts': artifact_names, 'path': path}
+      if self._input_format != 'paths':
+        entry['entry'] = line
+
+      self._WriteEntry(output_file_object, entry)
+
+    return number_of_entries, number_of_tagged_entries
+
+
+def Main():
+  """Entry point of console script to tag a file system listing.
+
+  Returns:
+    int: exit code that is provided to sys.exit().
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Tags the paths in a file system listing with the names of the '
+      'artifact definitions they match, as JSON Lines.'))
+
+  argument_parser.add_argument(
+      '--definitions', dest='definitions', type=str, action='store',
+      default=os.path.join(os.path.dirname(os.path.dirname(
+          os.path.abspath(__file__))), 'data'), metavar='PATH', help=(
+              'path of the file or directory that contains the artifact '
+              'definitions.'))
+
+  argument_parser.add_argument(
+      '--format', dest='input_format', type=str, action='store',
+      choices=sorted(PathTagger.INPUT_FORMATS), default='paths', help=(
+          'format of the file system listing.'))
+
+  argument_parser.add_argument(
+      '--matches_only', '--matches-only', dest='matches_only',
+      action='store_true', default=False, help=(
+          'only write entries that match an artifact definition.'))
+
+  argument_parser.add_argument(
+      '--os', dest='supported_os', type=str, action='store', default=None,
+      metavar='OS', help=(
+          'only match sources that apply to the operating system, such as '
+          'Windows.'))
+
+  argument_parser.add_argument(
+      '-o', '--output', dest='output', type=str, action='store',
+      default=None, metavar='PATH', help=(
+          'path of the file to write the tagged entries to, by default '
+          'stdout.'))
+
+  argument_parser.add_argument(
+      '--separator', dest='separator', type=str, action='store', default='/',
+      metavar='SEPARATOR', help='path segment separator of the listing.')
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes, where 0 represents the number of '
+          'CPUs. Worker processes are not supported when reading from '
+          'stdin.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH', default='-', help=(
+          'path of the file system listing, by default stdin.'))
+
+  options = argument_parser.parse_args()
+
+  if options.source != '-' and not os.path.isfile(options.source):
+    print(f'No such file: {options.source:s}', file=sys.stderr)
+    return 1
+
+  path_tagger = PathTagger(
+      options.definitions, input_format=options.input_format,
+      matches_only=options.matches_only, separator=options.separator,
+      supported_os=options.supported_os)
+
+  description = path_tagger.TagSource(
+      options.source, output_path=options.output,
+      number_of_workers=options.number_of_workers or None)
+
+  print(description, file=sys.stderr)
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
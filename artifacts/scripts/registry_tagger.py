@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Console script to tag a Windows Registry listing with artifacts."""
+
+import argparse
+import os
+import sys
+
+from artifacts import matcher
+from artifacts import tagger
+
+
+class RegistryTagger(tagger.ListingTagger):
+  """Tags the keys and values in a Windows Registry listing.
+
+  Every key and value is written with the key path, the value name, if any,
+  and the names of the artifact definitions of which a Windows Registry key
+  or value source matches the key or value.
+
+  The supported listing formats are:
+  * reg; Windows Registry Editor export (.reg), of version 4 or 5, where
+    deleted keys are ignored;
+  * text; one key path per line, optionally followed by a tab and a value
+    name, such as the output of an offline Windows Registry parser.
+
+  With worker processes a .reg listing is split into shards of keys instead
+  of lines.
+  """
+
+  INPUT_FORMATS = frozenset(['reg', 'text'])
+
+  def __init__(
+      self, definitions_path, input_format='reg', key_path_prefix=None,
+      matches_only=False, supported_os=None):
+    """Initializes a Windows Registry tagger.
+
+    Args:
+      definitions_path (str): path of the file or directory that contains
+          the artifact definitions.
+      input_format (Optional[str]): format of the Windows Registry listing.
+      key_path_prefix (Optional[str]): key path prefix that is prepended to
+          the key paths in the listing, such as "HKEY_LOCAL_MACHINE\\System"
+          for a listing of the keys in a SYSTEM Windows Registry file.
+      matches_only (Optional[bool]): True if only entries that match an
+          artifact definition should be written.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+
+    Raises:
+      ValueError: if the input format is not supported.
+    """
+    if input_format not in self.INPUT_FORMATS:
+      raise ValueError(f'Unsupported input format: {input_format:s}')
+
+    super(RegistryTagger, self).__init__(
+        definitions_path, matches_only=matches_only, supported_os=supported_os)
+    self._input_format = input_format
+    self._key_path_prefix = (key_path_prefix or '').rstrip('\\')
+
+  def _CreateMatcher(self):
+    """Creates the matcher.
+
+    Returns:
+      WindowsRegistryKeyMatcher: Windows Registry key path matcher.
+    """
+    return matcher.WindowsRegistryKeyMatcher()
+
+  def _GetEntries(self, lines):
+    """Retrieves the keys and values in the listing.
+
+    Args:
+      lines (iterable[str]): lines of the listing.
+
+    Yields:
+      tuple[str, str]: key path and value name, where the value name is None
+          for a key.
+    """
+    if self._input_format == 'text':
+      for line in lines:
+        line = line.rstrip('\r\n')
+        if line:
+          key_path, _, value_name = line.partition('\t')
+          yield key_path, value_name or None
+
+      return
+
+    key_path = None
+    is_continuation = False
+    for line in lines:
+      line = line.rstrip()
+
+      # Value data, such as hexadecimal data, can continue on the next line.
+      if is_continuation:
+        is_continuation = line.endswith('\\')
+        continue
+
+      if line.startswith('[') and line.endswith(']'):
+        key_path = line[1:-1]
+        if key_path.startswith('-'):
+          key_path = None
+        else:
+          yield key_path, None
+
+      elif key_path and line[:1] in ('"', '@'):
+        value_name = self._ParseValueName(line)
+        if value_name is not None:
+          yield key_path, value_name
+
+        is_continuation = line.endswith('\\')
+
+  def _ParseValueName(self, line):
+    """Parses the value name of a value line of a .reg listing.
+
+    Args:
+      line (str): value line, such as '"Name"="Data"' or '@="Data"'.
+
+    Returns:
+      str: value name, where an empty string represents the default value,
+          or None if the line does not contain a valid value name.
+    """
+    if line.startswith('@='):
+      return ''
+
+    characters = []
+    index = 1
+    while index < len(line):
+      character = line[index]
+      if character == '\\' and index + 1 < len(line):
+        characters.append(line[index + 1])
+        index += 2
+        continue
+
+      if character == '"':
+        if line[index + 1:index + 2] != '=':
+          return None
+
+        return ''.join(characters)
+
+      characters.append(character)
+      index += 1
+
+    return None
+
+  def _ReadShardLines(self, file_object, start_offset, end_offset, encoding):
+    """Reads the lines of a shard.
+
+    A shard of a .reg listing contains the keys of which the line starts at
+    or after the start offset and before the end offset, including their
+    values that follow the end offset.
+
+    Args:
+      file_object (file): binary file-like object to read from.
+      start_offset (int): offset of the start of the shard.
+      end_offset (int): offset of the end of the shard or None to read up to
+          the end of the file.
+      encoding (str): encoding of the listing.
+
+    Yields:
+      str: line.
+    """
+    if self._input_format != 'reg':
+      yield from super(RegistryTagger, self)._ReadShardLines(
+          file_object, start_offset, end_offset, encoding)
+      return
+
+    self._SeekShardStart(file_object, start_offset, encoding)
+
+    line_encoding = encoding
+    if encoding == 'utf-8-sig':
+      line_encoding = 'utf-8'
+
+    # Values before the first key of the shard belong to the previous shard.
+    in_key = start_offset == 0
+    while True:
+      line_offset = file_object.tell()
+      line = self._ReadLine(file_object, encoding)
+      if not line:
+        break
+
+      line = line.decode(line_encoding, errors='surrogateescape')
+
+      is_key = line.startswith('[')
+      if is_key and end_offset is not None and line_offset >= end_offset:
+        break
+
+      if not in_key:
+        if not is_key:
+          continue
+        in_key = True
+
+      yield line
+
+  def _TagLines(self, lines, output_file_object):
+    """Tags the keys and values of the listing.
+
+    Args:
+      lines (iterable[str]): lines of the listing.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+    key_matcher = self._GetMatcher()
+
+    number_of_entries = 0
+    number_of_tagged_entries = 0
+    for key_path, value_name in self._GetEntries(lines):
+      if self._key_path_prefix:
+        key_path = '\\'.join([self._key_path_prefix, key_path.lstrip('\\')])
+
+      number_of_entries += 1
+
+      artifact_names = sorted(set(
+          artifact_definition.name for artifact_definition, _, _, _ in (
+              key_matcher.Match(key_path, value_name=value_name))))
+      if artifact_names:
+        number_of_tagged_entries += 1
+      elif self._matches_only:
+        continue
+
+      entry = {'artifacts': artifact_names, 'key': key_path}
+      if value_name is not None:
+        entry['value'] = value_name
+
+      self._WriteEntry(output_file_object, entry)
+
+    return number_of_entries, number_of_tagged_entries
+
+
+def Main():
+  """Entry point of console script to tag a Windows Registry listing.
+
+  Returns:
+    int: exit code that is provided to sys.exit().
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Tags the keys and values in a Windows Registry listing with the names '
+      'of the artifact definitions they match, as JSON Lines.'))
+
+  argument_parser.add_argument(
+      '--definitions', dest='definitions', type=str, action='store',
+      default=os.path.join(os.path.dirname(os.path.dirname(
+          os.path.abspath(__file__))), 'data'), metavar='PATH', help=(
+              'path of the file or directory that contains the artifact '
+              'definitions.'))
+
+  argument_parser.add_argument(
+      '--format', dest='input_format', type=str, action='store',
+      choices=sorted(RegistryTagger.INPUT_FORMATS), default='reg', help=(
+          'format of the Windows Registry listing.'))
+
+  argument_parser.add_argument(
+      '--key_path_prefix', '--key-path-prefix', dest='key_path_prefix',
+      type=str, action='store', default=None, metavar='PREFIX', help=(
+          'key path prefix that is prepended to the key paths in the '
+          'listing, such as HKEY_LOCAL_MACHINE\\System.'))
+
+  argument_parser.add_argument(
+      '--matches_only', '--matches-only', dest='matches_only',
+      action='store_true', default=False, help=(
+          'only write entries that match an artifact definition.'))
+
+  argument_parser.add_argument(
+      '--os', dest='supported_os', type=str, action='store', default=None,
+      metavar='OS', help=(
+          'only match sources that apply to the operating system, such as '
+          'Windows.'))
+
+  argument_parser.add_argument(
+      '-o', '--output', dest='output', type=str, action='store',
+      default=None, metavar='PATH', help=(
+          'path of the file to write the tagged entries to, by default '
+          'stdout.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes, where 0 represents the number of '
+          'CPUs. Worker processes are not supported when reading from '
+          'stdin.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH', default='-', help=(
+          'path of the Windows Registry listing, by default stdin.'))
+
+  options = argument_parser.parse_args()
+
+  if options.source != '-' and not os.path.isfile(options.source):
+    print(f'No such file: {options.source:s}', file=sys.stderr)
+    return 1
+
+  registry_tagger = RegistryTagger(
+      options.definitions, input_format=options.input_format,
+      key_path_prefix=options.key_path_prefix,
+      matches_only=options.matches_only, supported_os=options.supported_os)
+
+  description = registry_tagger.TagSource(
+      options.source, output_path=options.output,
+      number_of_workers=options.number_of_workers or None)
+
+  print(description, file=sys.stderr)
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
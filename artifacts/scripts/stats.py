@@ -9,6 +9,7 @@ import time
 
 from artifacts import definitions
 from artifacts import reader
+from artifacts import registry
 
 
 class ArtifactStatistics(object):
@@ -71,9 +72,12 @@ Number of Windows Registry key paths: | {self._reg_key_count:d}
     self._source_type_counts = {}
     self._total_count = 0
 
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
     data_files_path = os.path.join('artifacts', 'data')
-    for artifact_definition in artifact_reader.ReadDirectory(data_files_path):
-      sources_supported_os = set()
+    artifact_registry.ReadFromDirectory(artifact_reader, data_files_path)
+
+    for artifact_definition in artifact_registry.GetDefinitions():
       for source in artifact_definition.sources:
         self._total_count += 1
         source_type = source.type_indicator
@@ -88,15 +92,13 @@ Number of Windows Registry key paths: | {self._reg_key_count:d}
                              definitions.TYPE_INDICATOR_DIRECTORY):
           self._path_count += len(source.paths)
 
-        sources_supported_os.update(set(source.supported_os))
-
-      # Fallback to the supported_os defined at definition level if none
-      # of the sources specified supported operating systems.
-      if not sources_supported_os:
-        sources_supported_os = set(artifact_definition.supported_os)
-
-      for os_str in sources_supported_os:
-        self._os_counts[os_str] += 1
+    # The registry falls back to the supported_os defined at definition level
+    # for sources that do not specify supported operating systems.
+    for os_str in definitions.SUPPORTED_OS:
+      number_of_definitions = len(list(
+          artifact_registry.GetDefinitionsBySupportedOS(os_str)))
+      if number_of_definitions:
+        self._os_counts[os_str] = number_of_definitions
 
   def PrintStats(self):
     """Build stats and print in MarkDown format."""
@@ -11,6 +11,7 @@ import sys
 
 from artifacts import definitions
 from artifacts import errors
+from artifacts import overlap
 from artifacts import reader
 from artifacts import registry
 
@@ -48,6 +49,28 @@ class ArtifactDefinitionsValidator(object):
     super(ArtifactDefinitionsValidator, self).__init__()
     self._artifact_registry = registry.ArtifactDefinitionsRegistry()
     self._artifact_registry_key_paths = set()
+    self._glob_pattern_definitions = {}
+    self._overlap_analyzer = overlap.GlobOverlapAnalyzer()
+
+  def _AddGlobPatterns(
+      self, filename, artifact_definition, paths, separator,
+      case_insensitive):
+    """Adds paths or key paths to the overlap analyzer.
+
+    Args:
+      filename (str): name of the artifacts definition file.
+      artifact_definition (ArtifactDefinition): artifact definition.
+      paths (list[str]): paths or key paths.
+      separator (str): path segment separator.
+      case_insensitive (bool): True if the paths are matched
+          case-insensitive.
+    """
+    for path in paths:
+      glob_pattern = overlap.GlobPattern(
+          path, separator=separator, case_insensitive=case_insensitive)
+      self._overlap_analyzer.AddPattern(glob_pattern)
+      self._glob_pattern_definitions[id(glob_pattern)] = (
+          filename, artifact_definition.name)
 
   def _CheckGlobstarInPathSegment(
       self, filename, artifact_definition, path, path_segment):
@@ -487,6 +510,14 @@ class ArtifactDefinitionsValidator(object):
               definitions.TYPE_INDICATOR_DIRECTORY,
               definitions.TYPE_INDICATOR_FILE, definitions.TYPE_INDICATOR_PATH):
 
+            if filename != self.LEGACY_PATH:
+              source_supported_os = (
+                  source.supported_os or artifact_definition.supported_os)
+              self._AddGlobPatterns(
+                  filename, artifact_definition, source.paths,
+                  source.separator, source.separator == '\\' or (
+                      definitions.SUPPORTED_OS_WINDOWS in source_supported_os))
+
             if (definitions.SUPPORTED_OS_DARWIN in source.supported_os or (
                 artifact_definition_supports_macos and
                 not source.supported_os)):
@@ -521,6 +552,10 @@ class ArtifactDefinitionsValidator(object):
                     filename, artifact_definition, source)):
               result = False
 
+            if filename != self.LEGACY_PATH:
+              self._AddGlobPatterns(
+                  filename, artifact_definition, source.keys, '\\', True)
+
             for key_path in source.keys:
               if not self._CheckWindowsRegistryKeyPath(
                   filename, artifact_definition, key_path):
@@ -546,6 +581,47 @@ class ArtifactDefinitionsValidator(object):
 
     return result
 
+  def CheckRedundantPaths(self):
+    """Checks for paths and key paths subsumed by other artifact definitions.
+
+    The paths and key paths of the legacy file are not checked, since it
+    has duplicates intentionally.
+
+    Returns:
+      int: number of paths and key paths that are subsumed by a path or key
+          path of another artifact definition.
+    """
+    number_of_redundant_paths = 0
+    for glob_pattern, other_glob_pattern, relation in (
+        self._overlap_analyzer.GetOverlaps()):
+      if relation == overlap.RELATION_OVERLAPS:
+        continue
+
+      filename, name = self._glob_pattern_definitions[id(glob_pattern)]
+      other_filename, other_name = self._glob_pattern_definitions[
+          id(other_glob_pattern)]
+      if name == other_name:
+        continue
+
+      if relation == overlap.RELATION_SUBSUMED:
+        glob_pattern, other_glob_pattern = other_glob_pattern, glob_pattern
+        filename, other_filename = other_filename, filename
+        name, other_name = other_name, name
+
+      if relation == overlap.RELATION_EQUIVALENT:
+        description = 'equivalent to'
+      else:
+        description = 'subsumed by'
+
+      logging.warning((
+          f'Artifact definition: {other_name:s} in file: '
+          f'{other_filename:s} has path: {other_glob_pattern.path:s} that '
+          f'is {description:s} path: {glob_pattern.path:s} of artifact '
+          f'definition: {name:s} in file: {filename:s}'))
+      number_of_redundant_paths += 1
+
+    return number_of_redundant_paths
+
   def GetUndefinedArtifacts(self):
     """Retrieves the names of undefined artifacts used by artifact groups.
 
@@ -595,6 +671,11 @@ def Main():
     print(f'Validating definitions in: {options.definitions:s}')
     result = validator.CheckFile(options.definitions)
 
+  if result:
+    number_of_redundant_paths = validator.CheckRedundantPaths()
+    if number_of_redundant_paths:
+      print(f'Redundant paths: {number_of_redundant_paths:d}')
+
   if not result:
     print('FAILURE')
     return 1
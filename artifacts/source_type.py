@@ -20,13 +20,27 @@ pointing to the Application Event Log file.
 """
 
 import abc
+import sys
 
 from artifacts import definitions
 from artifacts import errors
 
 
 class SourceType(object):
-  """Artifact definition source type interface."""
+  """Artifact definition source type interface.
+
+  The source types provided by this module do not have a per-instance
+  dictionary of attributes, their lists of values are stored as tuples and
+  their paths and key paths are interned, since the same values are defined
+  by many sources.
+
+  Attributes:
+    supported_os (tuple[str]): supported operating systems, where an empty
+        tuple represents the supported operating systems of the artifact
+        definition.
+  """
+
+  __slots__ = ('__weakref__', 'supported_os')
 
   TYPE_INDICATOR = None
 
@@ -41,6 +55,8 @@ class SourceType(object):
     if not self.TYPE_INDICATOR:
       raise errors.FormatError('Missing type indicator.')
 
+    self.supported_os = ()
+
   @property
   def type_indicator(self):
     """str: type indicator."""
@@ -58,6 +74,8 @@ class SourceType(object):
 class ArtifactGroupSourceType(SourceType):
   """Artifact group source type."""
 
+  __slots__ = ('names',)
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_ARTIFACT_GROUP
 
   def __init__(self, names=None):
@@ -73,7 +91,7 @@ class ArtifactGroupSourceType(SourceType):
       raise errors.FormatError('Missing names value.')
 
     super(ArtifactGroupSourceType, self).__init__()
-    self.names = names
+    self.names = tuple(sys.intern(name) for name in names)
 
   def AsDict(self):
     """Represents a source type as a dictionary.
@@ -81,12 +99,14 @@ class ArtifactGroupSourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    return {'names': self.names}
+    return {'names': list(self.names)}
 
 
 class CommandSourceType(SourceType):
   """Command source type."""
 
+  __slots__ = ('args', 'cmd')
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_COMMAND
 
   def __init__(self, args=None, cmd=None):
@@ -103,7 +123,7 @@ class CommandSourceType(SourceType):
       raise errors.FormatError('Missing args or cmd value.')
 
     super(CommandSourceType, self).__init__()
-    self.args = args
+    self.args = tuple(args)
     self.cmd = cmd
 
   def AsDict(self):
@@ -112,12 +132,14 @@ class CommandSourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    return {'cmd': self.cmd, 'args': self.args}
+    return {'cmd': self.cmd, 'args': list(self.args)}
 
 
 class DirectorySourceType(SourceType):
   """Directory source type."""
 
+  __slots__ = ('paths', 'separator')
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_DIRECTORY
 
   def __init__(self, paths=None, separator='/'):
@@ -137,7 +159,7 @@ class DirectorySourceType(SourceType):
       raise errors.FormatError('Invalid paths value, not a list.')
 
     super(DirectorySourceType, self).__init__()
-    self.paths = paths
+    self.paths = tuple(sys.intern(path) for path in paths)
     self.separator = separator
 
   def AsDict(self):
@@ -146,7 +168,7 @@ class DirectorySourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    source_type_attributes = {'paths': self.paths}
+    source_type_attributes = {'paths': list(self.paths)}
     if self.separator != '/':
       source_type_attributes['separator'] = self.separator
 
@@ -156,6 +178,8 @@ class DirectorySourceType(SourceType):
 class FileSourceType(SourceType):
   """File source type."""
 
+  __slots__ = ('paths', 'separator')
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_FILE
 
   def __init__(self, paths=None, separator='/'):
@@ -175,7 +199,7 @@ class FileSourceType(SourceType):
       raise errors.FormatError('Invalid paths value, not a list.')
 
     super(FileSourceType, self).__init__()
-    self.paths = paths
+    self.paths = tuple(sys.intern(path) for path in paths)
     self.separator = separator
 
   def AsDict(self):
@@ -184,7 +208,7 @@ class FileSourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    source_type_attributes = {'paths': self.paths}
+    source_type_attributes = {'paths': list(self.paths)}
     if self.separator != '/':
       source_type_attributes['separator'] = self.separator
 
@@ -194,6 +218,8 @@ class FileSourceType(SourceType):
 class PathSourceType(SourceType):
   """Path source type."""
 
+  __slots__ = ('paths', 'separator')
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_PATH
 
   def __init__(self, paths=None, separator='/'):
@@ -213,7 +239,7 @@ class PathSourceType(SourceType):
       raise errors.FormatError('Invalid paths value, not a list.')
 
     super(PathSourceType, self).__init__()
-    self.paths = paths
+    self.paths = tuple(sys.intern(path) for path in paths)
     self.separator = separator
 
   def AsDict(self):
@@ -222,7 +248,7 @@ class PathSourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    source_type_attributes = {'paths': self.paths}
+    source_type_attributes = {'paths': list(self.paths)}
     if self.separator != '/':
       source_type_attributes['separator'] = self.separator
 
@@ -232,6 +258,8 @@ class PathSourceType(SourceType):
 class WindowsRegistryKeySourceType(SourceType):
   """Windows Registry key source type."""
 
+  __slots__ = ('keys',)
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY
 
   VALID_PREFIXES = [
@@ -261,7 +289,7 @@ class WindowsRegistryKeySourceType(SourceType):
       self.ValidateKey(key)
 
     super(WindowsRegistryKeySourceType, self).__init__()
-    self.keys = keys
+    self.keys = tuple(sys.intern(key) for key in keys)
 
   def AsDict(self):
     """Represents a source type as a dictionary.
@@ -269,7 +297,7 @@ class WindowsRegistryKeySourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    return {'keys': self.keys}
+    return {'keys': list(self.keys)}
 
   @classmethod
   def ValidateKey(cls, key_path):
@@ -297,6 +325,8 @@ class WindowsRegistryKeySourceType(SourceType):
 class WindowsRegistryValueSourceType(SourceType):
   """Windows Registry value source type."""
 
+  __slots__ = ('key_value_pairs',)
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_VALUE
 
   def __init__(self, key_value_pairs=None):
@@ -330,7 +360,9 @@ class WindowsRegistryValueSourceType(SourceType):
       WindowsRegistryKeySourceType.ValidateKey(pair['key'])
 
     super(WindowsRegistryValueSourceType, self).__init__()
-    self.key_value_pairs = key_value_pairs
+    self.key_value_pairs = tuple(
+        {'key': sys.intern(pair['key']), 'value': pair['value']}
+        for pair in key_value_pairs)
 
   def AsDict(self):
     """Represents a source type as a dictionary.
@@ -338,7 +370,7 @@ class WindowsRegistryValueSourceType(SourceType):
     Returns:
       dict[str, str]: source type attributes.
     """
-    return {'key_value_pairs': self.key_value_pairs}
+    return {'key_value_pairs': [dict(pair) for pair in self.key_value_pairs]}
 
 
 class WMIQuerySourceType(SourceType):
@@ -349,6 +381,8 @@ class WMIQuerySourceType(SourceType):
     query (str): WMI query.
   """
 
+  __slots__ = ('base_object', 'query')
+
   TYPE_INDICATOR = definitions.TYPE_INDICATOR_WMI_QUERY
 
   def __init__(self, base_object=None, query=None):
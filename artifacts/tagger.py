@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""Tags the entries of listings with artifact definitions."""
+
+import abc
+import codecs
+import concurrent.futures
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from artifacts import reader
+from artifacts import registry
+
+
+def _TagFileShard(
+    listing_tagger, filename, start_offset, end_offset, encoding,
+    output_filename):
+  """Tags the entries in a shard of a listing in a worker process.
+
+  Args:
+    listing_tagger (ListingTagger): listing tagger.
+    filename (str): name of the listing.
+    start_offset (int): offset of the start of the shard.
+    end_offset (int): offset of the end of the shard or None to read up to
+        the end of the file.
+    encoding (str): encoding of the listing.
+    output_filename (str): name of the file to write the tagged entries to.
+
+  Returns:
+    tuple[int, int]: number of entries and number of tagged entries.
+  """
+  with open(output_filename, 'w', encoding='utf-8') as output_file_object:
+    return listing_tagger.TagFileShard(
+        filename, start_offset, end_offset, output_file_object,
+        encoding=encoding)
+
+
+class ListingTagger(object):
+  """Tags the entries of a listing with artifact definitions.
+
+  The listing is processed line by line, hence in constant memory, and every
+  entry is written as a JSON object on a separate line. Listings that start
+  with an UTF-16 byte-order mark, such as Windows Registry Editor exports,
+  are decoded as UTF-16, other listings as UTF-8.
+
+  With worker processes the listing is split into shards of lines, which are
+  tagged into temporary files that are copied to the output in the order of
+  the listing.
+  """
+
+  # Maximum number of bytes read at once to find the end of an UTF-16 line.
+  _UTF16_READ_SIZE = 1024
+
+  def __init__(self, definitions_path, matches_only=False, supported_os=None):
+    """Initializes a listing tagger.
+
+    Args:
+      definitions_path (str): path of the file or directory that contains
+          the artifact definitions.
+      matches_only (Optional[bool]): True if only entries that match an
+          artifact definition should be written.
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, such as "Windows", where None represents all.
+    """
+    super(ListingTagger, self).__init__()
+    self._definitions_path = definitions_path
+    self._matcher = None
+    self._matches_only = matches_only
+    self._supported_os = supported_os
+
+  def __getstate__(self):
+    """Retrieves the state of the listing tagger for pickling.
+
+    The matcher is not part of the state since building it in the worker
+    process is cheaper than transferring it.
+
+    Returns:
+      dict[str, object]: state of the listing tagger.
+    """
+    state = dict(self.__dict__)
+    state['_matcher'] = None
+    return state
+
+  @abc.abstractmethod
+  def _CreateMatcher(self):
+    """Creates the matcher.
+
+    Returns:
+      PathSegmentTrieMatcher: matcher.
+    """
+
+  def _GetEncoding(self, file_object):
+    """Determines the encoding of a listing from its byte-order mark.
+
+    Args:
+      file_object (file): binary file-like object of the listing, positioned
+          at the start.
+
+    Returns:
+      str: encoding of the listing, either "utf-16-be", "utf-16-le" or
+          "utf-8-sig".
+    """
+    if hasattr(file_object, 'peek'):
+      signature = file_object.peek(2)[:2]
+    else:
+      signature = file_object.read(2)
+      file_object.seek(-len(signature), os.SEEK_CUR)
+
+    if signature == codecs.BOM_UTF16_BE:
+      return 'utf-16-be'
+
+    if signature == codecs.BOM_UTF16_LE:
+      return 'utf-16-le'
+
+    return 'utf-8-sig'
+
+  def _GetFileShards(self, filename, encoding, number_of_shards):
+    """Splits a listing file into shards at line boundaries.
+
+    Args:
+      filename (str): name of the listing.
+      encoding (str): encoding of the listing.
+      number_of_shards (int): maximum number of shards.
+
+    Returns:
+      list[tuple[int, int]]: start and end offsets of the shards, where an end
+          offset of None represents the end of the file.
+    """
+    if encoding == 'utf-8-sig':
+      # The line boundaries of UTF-8 encoded listings are determined the same
+      # way as for artifact definitions stored as JSON Lines.
+      return reader.JsonLinesArtifactsReader().GetFileShards(
+          filename, number_of_shards)
+
+    # An UTF-16 end-of-line can span byte boundaries determined by size only,
+    # hence the shards start at the lines that follow these boundaries.
+    with io.open(filename, 'rb') as file_object:
+      file_size = os.fstat(file_object.fileno()).st_size
+      shard_size = file_size // number_of_shards
+
+      shard_offsets = [0]
+      for shard_index in range(1, number_of_shards):
+        split_offset = shard_index * shard_size
+        if not shard_size or split_offset <= shard_offsets[-1]:
+          continue
+
+        self._SeekShardStart(file_object, split_offset, encoding)
+
+        shard_offset = file_object.tell()
+        if shard_offset >= file_size:
+          break
+
+        if shard_offset > shard_offsets[-1]:
+          shard_offsets.append(shard_offset)
+
+    shard_offsets.append(None)
+    return list(zip(shard_offsets[:-1], shard_offsets[1:]))
+
+  def _GetMatcher(self):
+    """Retrieves the matcher.
+
+    Returns:
+      PathSegmentTrieMatcher: matcher.
+    """
+    if not self._matcher:
+      artifact_reader = reader.YamlArtifactsReader()
+      artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+      if os.path.isdir(self._definitions_path):
+        artifact_registry.ReadFromDirectory(
+            artifact_reader, self._definitions_path)
+      else:
+        artifact_registry.ReadFromFile(artifact_reader, self._definitions_path)
+
+      self._matcher = self._CreateMatcher()
+      self._matcher.AddSourcesFromRegistry(
+          artifact_registry, supported_os=self._supported_os)
+
+    return self._matcher
+
+  def _ReadLine(self, file_object, encoding):
+    """Reads an encoded line.
+
+    Args:
+      file_object (file): binary file-like object to read from, positioned
+          at the start of a line.
+      encoding (str): encoding of the listing.
+
+    Returns:
+      bytes: encoded line including the end-of-line or an empty byte string
+          at the end of the file.
+    """
+    if encoding == 'utf-8-sig':
+      return file_object.readline()
+
+    # The end-of-line of an UTF-16 encoded line is a 16-bit code unit, hence
+    # only matches at an even offset from the start of the line count.
+    end_of_line = '\n'.encode(encoding)
+
+    line_data = []
+    while True:
+      data = file_object.read(self._UTF16_READ_SIZE)
+      if not data:
+        break
+
+      line_end_offset = data.find(end_of_line)
+      while line_end_offset >= 0 and line_end_offset % 2:
+        line_end_offset = data.find(end_of_line, line_end_offset + 1)
+
+      if line_end_offset >= 0:
+        line_end_offset += 2
+        file_object.seek(line_end_offset - len(data), os.SEEK_CUR)
+        line_data.append(data[:line_end_offset])
+        break
+
+      line_data.append(data)
+
+    return b''.join(line_data)
+
+  def _ReadShardLines(self, file_object, start_offset, end_offset, encoding):
+    """Reads the lines of a shard.
+
+    A shard contains the lines that start at or after the start offset and
+    before the end offset.
+
+    Args:
+      file_object (file): binary file-like object to read from.
+      start_offset (int): offset of the start of the shard.
+      end_offset (int): offset of the end of the shard or None to read up to
+          the end of the file.
+      encoding (str): encoding of the listing.
+
+    Yields:
+      str: line.
+    """
+    self._SeekShardStart(file_object, start_offset, encoding)
+
+    # The byte-order mark is skipped and not stripped from every line.
+    line_encoding = encoding
+    if encoding == 'utf-8-sig':
+      line_encoding = 'utf-8'
+
+    while end_offset is None or file_object.tell() < end_offset:
+      line = self._ReadLine(file_object, encoding)
+      if not line:
+        break
+
+      yield line.decode(line_encoding, errors='surrogateescape')
+
+  def _SeekShardStart(self, file_object, start_offset, encoding):
+    """Seeks the start of the first line of a shard.
+
+    Args:
+      file_object (file): binary file-like object to read from.
+      start_offset (int): offset of the start of the shard.
+      encoding (str): encoding of the listing.
+    """
+    if encoding == 'utf-8-sig':
+      code_unit_size = 1
+      first_line_offset = 0
+    else:
+      # UTF-16 encoded lines start at an even offset after the byte-order
+      # mark.
+      code_unit_size = 2
+      first_line_offset = 2
+      start_offset += start_offset % 2
+
+    if start_offset > first_line_offset:
+      # A line starts at the start offset if the preceding code unit is the
+      # end of a line, otherwise the partial line belongs to the previous
+      # shard.
+      file_object.seek(start_offset - code_unit_size, os.SEEK_SET)
+      self._ReadLine(file_object, encoding)
+
+    elif first_line_offset:
+      file_object.seek(first_line_offset, os.SEEK_SET)
+
+    elif file_object.read(3) != codecs.BOM_UTF8:
+      file_object.seek(0, os.SEEK_SET)
+
+  @abc.abstractmethod
+  def _TagLines(self, lines, output_file_object):
+    """Tags the entries of a listing.
+
+    Args:
+      lines (iterable[str]): lines of the listing.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+
+  def _WriteEntry(self, output_file_object, entry):
+    """Writes a tagged entry.
+
+    Args:
+      output_file_object (file): text file-like object to write the tagged
+          entry to.
+      entry (dict[str, object]): tagged entry.
+    """
+    output_file_object.write(json.dumps(entry))
+    output_file_object.write('\n')
+
+  def TagFile(self, filename, output_file_object, number_of_workers=1):
+    """Tags the entries of a listing file.
+
+    Args:
+      filename (str): name of the listing.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+      number_of_workers (Optional[int]): number of worker processes, where
+          1 represents the listing is tagged in the current process and None
+          the number of CPUs.
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+    if number_of_workers is None:
+      number_of_workers = os.cpu_count() or 1
+
+    if number_of_workers <= 1:
+      with io.open(filename, 'rb') as file_object:
+        return self.TagFileObject(file_object, output_file_object)
+
+    with io.open(filename, 'rb') as file_object:
+      encoding = self._GetEncoding(file_object)
+
+    shards = self._GetFileShards(filename, encoding, number_of_workers)
+
+    number_of_entries = 0
+    number_of_tagged_entries = 0
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      executor = concurrent.futures.ProcessPoolExecutor(
+          max_workers=number_of_workers)
+      try:
+        shard_work = []
+        for shard_index, (start_offset, end_offset) in enumerate(shards):
+          output_filename = os.path.join(
+              temporary_directory, f'shard{shard_index:d}.jsonl')
+          future = executor.submit(
+              _TagFileShard, self, filename, start_offset, end_offset,
+              encoding, output_filename)
+          shard_work.append((future, output_filename))
+
+        for future, output_filename in shard_work:
+          shard_entries, shard_tagged_entries = future.result()
+          number_of_entries += shard_entries
+          number_of_tagged_entries += shard_tagged_entries
+
+          with open(output_filename, 'r', encoding='utf-8') as file_object:
+            shutil.copyfileobj(file_object, output_file_object)
+
+          os.remove(output_filename)
+
+      finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return number_of_entries, number_of_tagged_entries
+
+  def TagFileObject(self, file_object, output_file_object):
+    """Tags the entries of a listing from a file-like object.
+
+    Args:
+      file_object (file): binary file-like object of the listing.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+    encoding = self._GetEncoding(file_object)
+    if encoding != 'utf-8-sig':
+      # Skip the UTF-16 byte-order mark, which is not part of the first line.
+      file_object.read(2)
+
+    text_file_object = io.TextIOWrapper(
+        file_object, encoding=encoding, errors='surrogateescape',
+        newline='\n')
+    try:
+      return self._TagLines(text_file_object, output_file_object)
+    finally:
+      # Detach so that closing the text wrapper does not close the file-like
+      # object of the caller.
+      text_file_object.detach()
+
+  def TagFileShard(
+      self, filename, start_offset, end_offset, output_file_object,
+      encoding='utf-8-sig'):
+    """Tags the entries in a shard of a listing file.
+
+    Args:
+      filename (str): name of the listing.
+      start_offset (int): offset of the start of the shard.
+      end_offset (int): offset of the end of the shard or None to read up to
+          the end of the file.
+      output_file_object (file): text file-like object to write the tagged
+          entries to.
+      encoding (Optional[str]): encoding of the listing, either "utf-16-be",
+          "utf-16-le" or "utf-8-sig".
+
+    Returns:
+      tuple[int, int]: number of entries and number of tagged entries.
+    """
+    with io.open(filename, 'rb') as file_object:
+      return self._TagLines(
+          self._ReadShardLines(
+              file_object, start_offset, end_offset, encoding),
+          output_file_object)
+
+  def TagSource(self, source, output_path=None, number_of_workers=1):
+    """Tags the entries of a listing file or stdin.
+
+    Args:
+      source (str): name of the listing or "-" to read from stdin.
+      output_path (Optional[str]): path of the file to write the tagged
+          entries to, where None represents stdout.
+      number_of_workers (Optional[int]): number of worker processes, where
+          1 represents the listing is tagged in the current process and None
+          the number of CPUs. Worker processes are not used for stdin.
+
+    Returns:
+      str: description of the number of entries and the throughput.
+    """
+    output_file_object = sys.stdout
+    if output_path:
+      # pylint: disable=consider-using-with
+      output_file_object = open(output_path, 'w', encoding='utf-8')
+
+    start_time = time.perf_counter()
+
+    try:
+      if source == '-':
+        number_of_entries, number_of_tagged_entries = self.TagFileObject(
+            sys.stdin.buffer, output_file_object)
+        number_of_bytes = None
+      else:
+        number_of_entries, number_of_tagged_entries = self.TagFile(
+            source, output_file_object, number_of_workers=number_of_workers)
+        number_of_bytes = os.path.getsize(source)
+
+    finally:
+      if output_path:
+        output_file_object.close()
+
+    duration = time.perf_counter() - start_time
+    entries_per_second = number_of_entries / duration if duration else 0.0
+
+    description = (
+        f'entries: {number_of_entries:d} tagged: '
+        f'{number_of_tagged_entries:d} time: {duration:.3f}s throughput: '
+        f'{entries_per_second:.0f} entries/s')
+    if number_of_bytes is not None and duration:
+      megabytes_per_second = number_of_bytes / (duration * 1024 * 1024)
+      description = f'{description:s} {megabytes_per_second:.1f} MiB/s'
+
+    return description
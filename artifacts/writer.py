@@ -29,63 +29,329 @@ class BaseArtifactsWriter(object):
       filename (str): name of the file to write artifacts to.
     """
 
+  @abc.abstractmethod
+  def WriteArtifactsFileObject(self, artifacts, file_object):
+    """Writes artifact definitions to a file-like object.
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions to be
+          written.
+      file_object (file): text file-like object to write artifacts to.
+    """
+
 
 class ArtifactWriter(BaseArtifactsWriter):
-  """File artifacts writer."""
+  """File artifacts writer.
+
+  The artifact definitions are formatted and written one at a time, hence
+  the artifact definitions can be provided by a generator and the output is
+  written before the generator is exhausted.
+  """
 
   @abc.abstractmethod
+  def _FormatArtifactsIncrementally(self, artifacts):
+    """Formats artifacts to desired output format one at a time.
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions.
+
+    Yields:
+      str: formatted string of part of the artifact definitions.
+    """
+
   def FormatArtifacts(self, artifacts):
     """Formats artifacts to desired output format.
 
     Args:
-      artifacts (ArtifactDefinition|list[ArtifactDefinition]): artifact
-          definitions.
+      artifacts (iterable[ArtifactDefinition]): artifact definitions.
 
     Returns:
       str: formatted string of artifact definition.
     """
+    return ''.join(self._FormatArtifactsIncrementally(artifacts))
 
   def WriteArtifactsFile(self, artifacts, filename):
     """Writes artifact definitions to a file.
 
     Args:
-      artifacts (list[ArtifactDefinition]): artifact definitions to be written.
+      artifacts (iterable[ArtifactDefinition]): artifact definitions to be
+          written.
       filename (str): name of the file to write artifacts to.
     """
     with open(filename, 'w', encoding='utf-8') as file_object:
-      file_object.write(self.FormatArtifacts(artifacts))
+      self.WriteArtifactsFileObject(artifacts, file_object)
+
+  def WriteArtifactsFileObject(self, artifacts, file_object):
+    """Writes artifact definitions to a file-like object.
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions to be
+          written.
+      file_object (file): text file-like object to write artifacts to.
+    """
+    for formatted_string in self._FormatArtifactsIncrementally(artifacts):
+      file_object.write(formatted_string)
 
 
 class JsonArtifactsWriter(ArtifactWriter):
   """JSON artifacts writer interface."""
 
-  def FormatArtifacts(self, artifacts):
-    """Formats artifacts to desired output format.
+  def _FormatArtifactsIncrementally(self, artifacts):
+    """Formats artifacts to desired output format one at a time.
+
+    The output is the same as that of json.dumps() of a list of the artifact
+    definitions.
 
     Args:
-      artifacts (list[ArtifactDefinition]): artifact definitions.
+      artifacts (iterable[ArtifactDefinition]): artifact definitions.
 
-    Returns:
-      str: formatted string of artifact definition.
+    Yields:
+      str: formatted string of part of the artifact definitions.
     """
-    artifact_definitions = [artifact.AsDict() for artifact in artifacts]
-    json_data = json.dumps(artifact_definitions)
-    return json_data
+    yield '['
+    for index, artifact in enumerate(artifacts):
+      if index:
+        yield ', '
+      yield json.dumps(artifact.AsDict())
+    yield ']'
+
+
+class JsonLinesArtifactsWriter(ArtifactWriter):
+  """JSON Lines artifacts writer.
+
+  Every artifact definition is written as a JSON object on a separate line,
+  hence artifact definitions can be appended to an existing file.
+  """
+
+  def _FormatArtifactsIncrementally(self, artifacts):
+    """Formats artifacts to desired output format one at a time.
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions.
+
+    Yields:
+      str: formatted string of an artifact definition.
+    """
+    # Non-ASCII characters and control characters, such as end-of-line, are
+    # escaped by json.dumps() hence every definition is a single line.
+    for artifact in artifacts:
+      yield f'{json.dumps(artifact.AsDict()):s}\n'
+
+  def AppendArtifactsFile(self, artifacts, filename):
+    """Appends artifact definitions to a file.
+
+    The file is created if it does not exist.
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions to be
+          written.
+      filename (str): name of the file to append artifacts to.
+    """
+    with open(filename, 'a', encoding='utf-8') as file_object:
+      self.WriteArtifactsFileObject(artifacts, file_object)
 
 
 class YamlArtifactsWriter(ArtifactWriter):
-  """YAML artifacts writer interface."""
+  """YAML artifacts writer interface.
 
-  def FormatArtifacts(self, artifacts):
-    """Formats artifacts to desired output format.
+  The artifact definitions are written in a canonical layout that follows
+  the style guide in docs/sources/Format-specification.md, so that writing
+  artifact definitions that were read from a file produces minimal changes.
+
+  The writer uses the libyaml based C dumper when PyYAML was built with
+  libyaml support and falls back to the pure Python dumper otherwise. Both
+  dumpers produce the same output.
+
+  Attributes:
+    yaml_backend (str): YAML emitter backend, either "libyaml" or "python".
+  """
+
+  YAML_BACKEND_LIBYAML = 'libyaml'
+  YAML_BACKEND_PYTHON = 'python'
+
+  # Order of the artifact definition, source and key value pair keys.
+  _ATTRIBUTE_KEYS = ('args', 'cmd', 'query', 'base_object')
+  _DEFINITION_KEYS = (
+      'name', 'aliases', 'doc', 'sources', 'supported_os', 'urls')
+  _KEY_VALUE_PAIR_KEYS = ('key', 'value')
+  _SOURCE_KEYS = ('type', 'attributes', 'supported_os')
+
+  # Keys of lists that are always written in flow style.
+  _FLOW_STYLE_KEYS = frozenset(['aliases', 'args', 'supported_os'])
+
+  # Keys of values, such as paths and URLs, that are written single-quoted
+  # to avoid the need for escaping.
+  _SINGLE_QUOTED_KEYS = frozenset([
+      'args', 'base_object', 'key', 'keys', 'paths', 'separator', 'urls',
+      'value'])
+
+  _YAML_DUMPERS = {
+      YAML_BACKEND_LIBYAML: getattr(yaml, 'CSafeDumper', None),
+      YAML_BACKEND_PYTHON: yaml.SafeDumper}
+
+  # Width that prevents the emitter from breaking long lines.
+  _YAML_WIDTH = 2 ** 30
+
+  def __init__(self, use_libyaml=True):
+    """Initializes a YAML artifacts writer.
 
     Args:
-      artifacts (list[ArtifactDefinition]): artifact definitions.
+      use_libyaml (Optional[bool]): True if the libyaml based dumper should
+          be used when available.
+    """
+    super(YamlArtifactsWriter, self).__init__()
+    self.yaml_backend = self.YAML_BACKEND_PYTHON
+    if use_libyaml and self._YAML_DUMPERS[self.YAML_BACKEND_LIBYAML]:
+      self.yaml_backend = self.YAML_BACKEND_LIBYAML
+
+    self._yaml_dumper = self._YAML_DUMPERS[self.yaml_backend]
+
+  def _FormatArtifactsIncrementally(self, artifacts):
+    """Formats artifacts to desired output format one at a time.
+
+    Every artifact definition is a separate YAML document that starts with
+    an explicit document start marker ("---").
+
+    Args:
+      artifacts (iterable[ArtifactDefinition]): artifact definitions.
+
+    Yields:
+      str: formatted string of an artifact definition.
+    """
+    for artifact in artifacts:
+      yaml_node = self._GetDefinitionNode(artifact.AsDict())
+      yield yaml.serialize(
+          yaml_node, Dumper=self._yaml_dumper, allow_unicode=True,
+          explicit_start=True, width=self._YAML_WIDTH)
+
+  def _GetDefinitionNode(self, artifact_definition_values):
+    """Retrieves the YAML node of an artifact definition.
+
+    Args:
+      artifact_definition_values (dict[str, object]): artifact definition
+          values.
 
     Returns:
-      str: formatted string of artifact definition.
+      yaml.MappingNode: YAML node.
+    """
+    node_values = []
+    for key in self._GetOrderedKeys(
+        artifact_definition_values, self._DEFINITION_KEYS):
+      value = artifact_definition_values[key]
+
+      if key == 'doc' and '\n' in value:
+        value_node = self._GetScalarNode(value, style='|')
+      elif key == 'sources':
+        value_node = yaml.SequenceNode(
+            'tag:yaml.org,2002:seq', [
+                self._GetSourceNode(source_values) for source_values in value],
+            flow_style=False)
+      else:
+        value_node = self._GetValueNode(key, value)
+
+      node_values.append((self._GetScalarNode(key), value_node))
+
+    return yaml.MappingNode(
+        'tag:yaml.org,2002:map', node_values, flow_style=False)
+
+  def _GetOrderedKeys(self, values, ordered_keys):
+    """Retrieves the keys of a dictionary in canonical order.
+
+    Args:
+      values (dict[str, object]): dictionary.
+      ordered_keys (tuple[str]): keys in canonical order, keys that are not
+          part of the canonical order are put after these in sorted order.
+
+    Returns:
+      list[str]: keys of the dictionary.
+    """
+    keys = [key for key in ordered_keys if key in values]
+    keys.extend(sorted(set(values).difference(ordered_keys)))
+    return keys
+
+  def _GetScalarNode(self, value, style=None):
+    """Retrieves the YAML node of a scalar.
+
+    Args:
+      value (object): scalar value.
+      style (Optional[str]): preferred style of a string scalar, where None
+          represents the emitter should choose the style.
+
+    Returns:
+      yaml.ScalarNode: YAML node.
+    """
+    if not isinstance(value, str):
+      return yaml.representer.SafeRepresenter().represent_data(value)
+
+    return yaml.ScalarNode('tag:yaml.org,2002:str', value, style=style)
+
+  def _GetSourceNode(self, source_values):
+    """Retrieves the YAML node of a source.
+
+    Args:
+      source_values (dict[str, object]): source values.
+
+    Returns:
+      yaml.MappingNode: YAML node.
     """
-    # TODO: improve output formatting of yaml
-    artifact_definitions = [artifact.AsDict() for artifact in artifacts]
-    yaml_data = yaml.safe_dump_all(artifact_definitions)
-    return yaml_data
+    node_values = []
+    for key in self._GetOrderedKeys(source_values, self._SOURCE_KEYS):
+      value = source_values[key]
+      if key == 'attributes':
+        # An attribute with a single value uses the one-line {} form.
+        flow_style = len(value) == 1 and all(
+            not isinstance(attribute_value, (dict, list)) or
+            len(attribute_value) <= 1
+            for attribute_value in value.values())
+
+        value_node = self._GetValueNode(key, value, flow_style=flow_style)
+      else:
+        value_node = self._GetValueNode(key, value)
+
+      node_values.append((self._GetScalarNode(key), value_node))
+
+    return yaml.MappingNode(
+        'tag:yaml.org,2002:map', node_values, flow_style=False)
+
+  def _GetValueNode(self, key, value, flow_style=False):
+    """Retrieves the YAML node of a value.
+
+    Args:
+      key (str): key of the value, which determines the style of the value.
+      value (object): value.
+      flow_style (Optional[bool]): True if a mapping or list should be written
+          in flow style, lists with a single item are always written in flow
+          style.
+
+    Returns:
+      yaml.Node: YAML node.
+    """
+    if isinstance(value, dict):
+      if key == 'attributes':
+        mapping_keys = self._GetOrderedKeys(value, self._ATTRIBUTE_KEYS)
+      elif key == 'key_value_pairs':
+        mapping_keys = self._GetOrderedKeys(value, self._KEY_VALUE_PAIR_KEYS)
+      else:
+        mapping_keys = list(value)
+
+      node_values = [
+          (self._GetScalarNode(mapping_key), self._GetValueNode(
+              mapping_key, value[mapping_key], flow_style=flow_style))
+          for mapping_key in mapping_keys]
+      return yaml.MappingNode(
+          'tag:yaml.org,2002:map', node_values, flow_style=flow_style)
+
+    if isinstance(value, list):
+      # Items of a list, such as key value pairs, are written in flow style.
+      flow_style = bool(
+          flow_style or len(value) <= 1 or key in self._FLOW_STYLE_KEYS)
+      node_values = [
+          self._GetValueNode(key, list_value, flow_style=True)
+          for list_value in value]
+      return yaml.SequenceNode(
+          'tag:yaml.org,2002:seq', node_values, flow_style=flow_style)
+
+    style = None
+    if key in self._SINGLE_QUOTED_KEYS:
+      style = '\''
+    return self._GetScalarNode(value, style=style)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions cache."""
+
+import os
+import shutil
+import unittest
+
+from unittest import mock
+
+from artifacts import cache
+from artifacts import reader
+
+from tests import test_lib
+
+
+class ArtifactDefinitionsCacheTest(test_lib.BaseTestCase):
+  """Tests for the artifact definitions cache."""
+
+  # pylint: disable=protected-access
+
+  _DEFINITION_VALUES = [{
+      'doc': 'Test artifact definition.',
+      'name': 'TestFile',
+      'sources': [{'attributes': {'paths': ['/test']}, 'type': 'FILE'}]}]
+
+  def _WriteTestFile(self, path, data):
+    """Writes a test file.
+
+    Args:
+      path (str): path of the test file.
+      data (bytes): data to write.
+
+    Returns:
+      int: modification time of the test file in nanoseconds.
+    """
+    with open(path, 'wb') as file_object:
+      file_object.write(data)
+
+    return os.stat(path).st_mtime_ns
+
+  def testGetAndSetDefinitionValues(self):
+    """Tests the GetDefinitionValues and SetDefinitionValues functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      test_path = os.path.join(temporary_directory, 'test.yaml')
+      modification_time = self._WriteTestFile(test_path, b'data')
+
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertIsNone(definition_values)
+
+      result = definitions_cache.SetDefinitionValues(
+          'test', test_path, modification_time, b'data',
+          self._DEFINITION_VALUES)
+      self.assertTrue(result)
+
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertEqual(definition_values, self._DEFINITION_VALUES)
+
+      definition_values = definitions_cache.GetDefinitionValues(
+          'other', test_path)
+      self.assertIsNone(definition_values)
+
+      # Test that the cache persists once flushed.
+      definitions_cache.Flush()
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertEqual(definition_values, self._DEFINITION_VALUES)
+
+      # Test that a modification time change with the same content is a hit.
+      os.utime(test_path, ns=(0, 0))
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertEqual(definition_values, self._DEFINITION_VALUES)
+
+      # Test that a content change invalidates the entry.
+      self._WriteTestFile(test_path, b'changed')
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertIsNone(definition_values)
+      self.assertEqual(definitions_cache.number_of_entries, 0)
+
+  def testGetDefinitionValuesWithCorruptCache(self):
+    """Tests the GetDefinitionValues function with a corrupt cache."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      test_path = os.path.join(temporary_directory, 'test.yaml')
+      modification_time = self._WriteTestFile(test_path, b'data')
+
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+      definitions_cache.SetDefinitionValues(
+          'test', test_path, modification_time, b'data',
+          self._DEFINITION_VALUES)
+
+      for filename in os.listdir(cache_path):
+        if filename != 'index.json':
+          self._WriteTestFile(os.path.join(cache_path, filename), b'{bogus')
+
+      definition_values = definitions_cache.GetDefinitionValues(
+          'test', test_path)
+      self.assertIsNone(definition_values)
+
+      self._WriteTestFile(os.path.join(cache_path, 'index.json'), b'{bogus')
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+      self.assertEqual(definitions_cache.number_of_entries, 0)
+
+  def testSetDefinitionValuesWithEviction(self):
+    """Tests the SetDefinitionValues function with LRU eviction."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      definitions_cache = cache.ArtifactDefinitionsCache(
+          cache_path, maximum_number_of_entries=2)
+
+      test_paths = []
+      for index in range(3):
+        test_path = os.path.join(temporary_directory, f'test{index:d}.yaml')
+        test_data = f'data{index:d}'.encode('ascii')
+        modification_time = self._WriteTestFile(test_path, test_data)
+        test_paths.append(test_path)
+
+        definitions_cache.SetDefinitionValues(
+            'test', test_path, modification_time, test_data,
+            self._DEFINITION_VALUES)
+
+        if index == 1:
+          # Make the first entry the most recently used one.
+          definitions_cache.GetDefinitionValues('test', test_paths[0])
+
+      self.assertEqual(definitions_cache.number_of_entries, 2)
+      self.assertIsNotNone(
+          definitions_cache.GetDefinitionValues('test', test_paths[0]))
+      self.assertIsNone(
+          definitions_cache.GetDefinitionValues('test', test_paths[1]))
+      self.assertIsNotNone(
+          definitions_cache.GetDefinitionValues('test', test_paths[2]))
+
+      # The index file and 2 values files.
+      definitions_cache.Flush()
+      self.assertEqual(len(os.listdir(cache_path)), 3)
+
+  def testReadDirectoryWithCache(self):
+    """Tests the ReadDirectory function of a reader with a cache."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      data_path = os.path.join(temporary_directory, 'data')
+      shutil.copytree(self._TEST_DATA_PATH, data_path)
+
+      artifact_reader = reader.YamlArtifactsReader()
+      expected_artifact_definitions = [
+          artifact_definition.AsDict() for artifact_definition in
+          artifact_reader.ReadDirectory(data_path)]
+
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+      artifact_reader = reader.YamlArtifactsReader(cache=definitions_cache)
+      artifact_definitions = [
+          artifact_definition.AsDict() for artifact_definition in
+          artifact_reader.ReadDirectory(data_path)]
+      self.assertEqual(artifact_definitions, expected_artifact_definitions)
+      self.assertEqual(definitions_cache.number_of_entries, 1)
+
+      definitions_cache = cache.ArtifactDefinitionsCache(cache_path)
+      artifact_reader = reader.YamlArtifactsReader(cache=definitions_cache)
+      with mock.patch.object(
+          reader.yaml, 'load_all', side_effect=AssertionError):
+        with mock.patch.object(
+            definitions_cache, '_WriteIndex',
+            wraps=definitions_cache._WriteIndex) as write_index_mock:
+          artifact_definitions = [
+              artifact_definition.AsDict() for artifact_definition in
+              artifact_reader.ReadDirectory(data_path)]
+
+      self.assertEqual(artifact_definitions, expected_artifact_definitions)
+
+      # The index is written once per read, not once per cache hit.
+      self.assertEqual(write_index_mock.call_count, 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the console script to determine changes between definitions."""
+
+import json
+import os
+import unittest
+
+from artifacts.scripts import definitions_diff
+
+from tests import test_lib
+
+
+class DefinitionsDiffToolTest(test_lib.BaseTestCase):
+  """Class to test the definitions diff tool."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: WindowsRunKeys',
+      'doc: Windows Run keys.',
+      'sources:',
+      '- type: REGISTRY_VALUE',
+      '  attributes:',
+      '    key_value_pairs:',
+      '    - {key: \'HKEY_LOCAL_MACHINE\\Software\\Run\', value: \'A\'}',
+      'supported_os: [Windows]',
+      ''])
+
+  _TEST_OTHER_DEFINITIONS = '\n'.join([
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths:',
+      '    - \'%%users.homedir%%/.bash_history\'',
+      '    - \'%%users.homedir%%/.bash_history-*\'',
+      'supported_os: [Linux]',
+      '---',
+      'name: WindowsRunKeys',
+      'doc: Windows Run keys.',
+      'sources:',
+      '- type: REGISTRY_VALUE',
+      '  attributes:',
+      '    key_value_pairs:',
+      '    - {key: \'HKEY_LOCAL_MACHINE\\Software\\Run\', value: \'B\'}',
+      'supported_os: [Windows]',
+      ''])
+
+  def _Compare(self, temporary_directory, **kwargs):
+    """Compares the test definitions with the other test definitions.
+
+    Args:
+      temporary_directory (str): path of a temporary directory.
+      kwargs (dict[str, object]): keyword arguments of the definitions diff
+          tool.
+
+    Returns:
+      tuple[DefinitionsDiffTool, ArtifactDefinitionsChangeSet]: definitions
+          diff tool and change set.
+    """
+    paths = []
+    for name, test_definitions in (
+        ('old.yaml', self._TEST_DEFINITIONS),
+        ('new.yaml', self._TEST_OTHER_DEFINITIONS)):
+      path = os.path.join(temporary_directory, name)
+      with open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(test_definitions)
+
+      paths.append(path)
+
+    diff_tool = definitions_diff.DefinitionsDiffTool(**kwargs)
+    change_set = diff_tool.Compare(paths[0], paths[1])
+
+    return diff_tool, change_set
+
+  def testCompare(self):
+    """Tests the Compare function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      _, change_set = self._Compare(temporary_directory)
+
+    self.assertEqual(len(change_set.definition_changes), 2)
+
+    source_change = change_set.definition_changes[1].source_changes[0]
+    self.assertEqual(source_change.values_attribute, 'key_value_pairs')
+    self.assertEqual(source_change.added_values, [
+        {'key': 'HKEY_LOCAL_MACHINE\\Software\\Run', 'value': 'B'}])
+    self.assertEqual(source_change.removed_values, [
+        {'key': 'HKEY_LOCAL_MACHINE\\Software\\Run', 'value': 'A'}])
+
+    with test_lib.TempDirectory() as temporary_directory:
+      _, change_set = self._Compare(temporary_directory, supported_os='Linux')
+
+    self.assertEqual(len(change_set.definition_changes), 1)
+    self.assertEqual(change_set.definition_changes[0].name, 'BashHistory')
+
+  def testFormatChangeSet(self):
+    """Tests the FormatChangeSet function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      diff_tool, change_set = self._Compare(temporary_directory)
+
+    output_text = diff_tool.FormatChangeSet(change_set)
+
+    expected_output_text = '\n'.join([
+        '~ BashHistory',
+        '  ~ FILE',
+        '    + %%users.homedir%%/.bash_history-*',
+        '~ WindowsRunKeys',
+        '  ~ REGISTRY_VALUE',
+        '    + HKEY_LOCAL_MACHINE\\Software\\Run [B]',
+        '    - HKEY_LOCAL_MACHINE\\Software\\Run [A]',
+        'added: 0 changed: 2 removed: 0 unchanged: 0'])
+    self.assertEqual(output_text, expected_output_text)
+
+    output_text = diff_tool.FormatChangeSet(change_set, output_format='json')
+
+    change_set_dict = json.loads(output_text)
+    self.assertEqual(
+        change_set_dict['changed'], ['BashHistory', 'WindowsRunKeys'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions diff engine."""
+
+import io
+import os
+import unittest
+
+from artifacts import diff
+from artifacts import reader
+from artifacts import registry
+
+from tests import test_lib
+
+
+class ArtifactDefinitionsDifferTest(test_lib.BaseTestCase):
+  """Class to test the artifact definitions diff engine."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: SSHAuthorizedKeys',
+      'doc: SSH authorized keys.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths:',
+      '    - \'%%users.homedir%%/.ssh/authorized_keys\'',
+      '    - \'%%users.homedir%%/.ssh/authorized_keys2\'',
+      '- type: DIRECTORY',
+      '  attributes: {paths: [\'/etc/ssh\']}',
+      'supported_os: [Darwin, Linux]',
+      '---',
+      'name: WindowsRunKeys',
+      'doc: Windows Run keys.',
+      'sources:',
+      '- type: REGISTRY_KEY',
+      '  attributes:',
+      '    keys:',
+      '    - \'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\'
+      'CurrentVersion\\Run\\*\'',
+      'supported_os: [Windows]',
+      ''])
+
+  _TEST_OTHER_DEFINITIONS = '\n'.join([
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: SSHAuthorizedKeys',
+      'doc: SSH authorized keys files.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths:',
+      '    - \'%%users.homedir%%/.ssh/authorized_keys\'',
+      '    - \'/etc/ssh/authorized_keys/*\'',
+      '- type: DIRECTORY',
+      '  attributes: {paths: [\'/etc/ssh\']}',
+      '- type: COMMAND',
+      '  attributes: {cmd: /usr/bin/ssh-keygen, args: [-l]}',
+      'supported_os: [Darwin, Linux]',
+      '---',
+      'name: ZshHistory',
+      'doc: Zsh history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.zsh_history\']}',
+      'supported_os: [Darwin, Linux]',
+      ''])
+
+  def _CreateRegistry(self, test_definitions):
+    """Creates an artifact definitions registry.
+
+    Args:
+      test_definitions (str): artifact definitions in YAML.
+
+    Returns:
+      ArtifactDefinitionsRegistry: artifact definitions registry.
+    """
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=test_definitions)
+    artifact_registry.ReadFileObject(reader.YamlArtifactsReader(), file_object)
+
+    return artifact_registry
+
+  def testCompareDirectories(self):
+    """Tests the CompareDirectories function."""
+    differ = diff.ArtifactDefinitionsDiffer()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      paths = []
+      for name, test_definitions in (
+          ('old', self._TEST_DEFINITIONS),
+          ('new', self._TEST_OTHER_DEFINITIONS)):
+        path = os.path.join(temporary_directory, name)
+        os.mkdir(path)
+        with open(os.path.join(path, 'definitions.yaml'), 'w',
+                  encoding='utf-8') as file_object:
+          file_object.write(test_definitions)
+
+        paths.append(path)
+
+      change_set = differ.CompareDirectories(paths[0], paths[1])
+
+    change_set_dict = change_set.AsDict()
+    self.assertEqual(change_set_dict['added'], ['ZshHistory'])
+    self.assertEqual(change_set_dict['changed'], ['SSHAuthorizedKeys'])
+    self.assertEqual(change_set_dict['removed'], ['WindowsRunKeys'])
+    self.assertEqual(change_set_dict['number_of_unchanged_definitions'], 1)
+
+    # The same directory has no changes.
+    with test_lib.TempDirectory() as temporary_directory:
+      with open(os.path.join(temporary_directory, 'definitions.yaml'), 'w',
+                encoding='utf-8') as file_object:
+        file_object.write(self._TEST_DEFINITIONS)
+
+      change_set = differ.CompareDirectories(
+          temporary_directory, temporary_directory)
+
+    self.assertEqual(change_set.definition_changes, [])
+    self.assertEqual(change_set.number_of_unchanged_definitions, 3)
+
+  def testCompareRegistries(self):
+    """Tests the CompareRegistries function."""
+    differ = diff.ArtifactDefinitionsDiffer()
+
+    artifact_registry = self._CreateRegistry(self._TEST_DEFINITIONS)
+    other_artifact_registry = self._CreateRegistry(
+        self._TEST_OTHER_DEFINITIONS)
+
+    change_set = differ.CompareRegistries(
+        artifact_registry, other_artifact_registry)
+
+    self.assertEqual(change_set.number_of_unchanged_definitions, 1)
+    self.assertEqual(len(change_set.definition_changes), 3)
+
+    definition_change = change_set.definition_changes[0]
+    self.assertEqual(definition_change.name, 'SSHAuthorizedKeys')
+    self.assertEqual(definition_change.change, diff.CHANGE_CHANGED)
+    self.assertEqual(definition_change.changed_attributes, ['doc'])
+
+    # The unchanged directory source is skipped.
+    self.assertEqual(len(definition_change.source_changes), 2)
+
+    source_change = definition_change.source_changes[0]
+    self.assertEqual(source_change.change, diff.CHANGE_CHANGED)
+    self.assertEqual(source_change.type_indicator, 'FILE')
+    self.assertEqual(source_change.values_attribute, 'paths')
+    self.assertEqual(
+        source_change.added_values, ['/etc/ssh/authorized_keys/*'])
+    self.assertEqual(
+        source_change.removed_values,
+        ['%%users.homedir%%/.ssh/authorized_keys2'])
+    self.assertEqual(source_change.changed_attributes, [])
+
+    source_change = definition_change.source_changes[1]
+    self.assertEqual(source_change.change, diff.CHANGE_ADDED)
+    self.assertEqual(source_change.type_indicator, 'COMMAND')
+    self.assertIsNone(source_change.values_attribute)
+
+    definition_change = change_set.definition_changes[1]
+    self.assertEqual(definition_change.name, 'WindowsRunKeys')
+    self.assertEqual(definition_change.change, diff.CHANGE_REMOVED)
+
+    definition_change = change_set.definition_changes[2]
+    self.assertEqual(definition_change.name, 'ZshHistory')
+    self.assertEqual(definition_change.change, diff.CHANGE_ADDED)
+
+    expected_changed_values = {
+        'keys': [
+            'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\'
+            'CurrentVersion\\Run\\*'],
+        'paths': [
+            '/etc/ssh/authorized_keys/*',
+            '%%users.homedir%%/.ssh/authorized_keys2',
+            '%%users.homedir%%/.zsh_history']}
+    self.assertEqual(change_set.GetChangedValues(), expected_changed_values)
+
+    change_set_dict = change_set.AsDict()
+    self.assertEqual(change_set_dict['changes'][0]['sources'][0], {
+        'added': {'paths': ['/etc/ssh/authorized_keys/*']},
+        'attributes': {'paths': [
+            '%%users.homedir%%/.ssh/authorized_keys',
+            '/etc/ssh/authorized_keys/*']},
+        'change': 'changed',
+        'removed': {'paths': ['%%users.homedir%%/.ssh/authorized_keys2']},
+        'type': 'FILE'})
+
+    # The reverse comparison swaps the added and removed changes.
+    change_set = differ.CompareRegistries(
+        artifact_registry=other_artifact_registry,
+        other_artifact_registry=artifact_registry)
+
+    change_set_dict = change_set.AsDict()
+    self.assertEqual(change_set_dict['added'], ['WindowsRunKeys'])
+    self.assertEqual(change_set_dict['removed'], ['ZshHistory'])
+
+  def testCompareRegistriesWithReorderedValues(self):
+    """Tests the CompareRegistries function with only reordered values."""
+    differ = diff.ArtifactDefinitionsDiffer()
+
+    file_source = '\n'.join([
+        '- type: FILE',
+        '  attributes: {paths: [\'/etc/passwd\', \'/etc/shadow\']}'])
+    reordered_file_source = '\n'.join([
+        '- type: FILE',
+        '  attributes: {paths: [\'/etc/shadow\', \'/etc/passwd\']}'])
+    directory_source = '\n'.join([
+        '- type: DIRECTORY',
+        '  attributes: {paths: [\'/etc/ssh\']}'])
+
+    artifact_registry = self._CreateRegistry('\n'.join([
+        'name: LinuxAccounts',
+        'doc: Linux accounts.',
+        'sources:',
+        file_source,
+        directory_source,
+        '']))
+
+    # The paths of the file source are reordered.
+    other_artifact_registry = self._CreateRegistry('\n'.join([
+        'name: LinuxAccounts',
+        'doc: Linux accounts.',
+        'sources:',
+        reordered_file_source,
+        directory_source,
+        '']))
+
+    change_set = differ.CompareRegistries(
+        artifact_registry, other_artifact_registry)
+
+    self.assertEqual(len(change_set.definition_changes), 1)
+
+    definition_change = change_set.definition_changes[0]
+    self.assertEqual(definition_change.changed_attributes, [])
+    self.assertEqual(len(definition_change.source_changes), 1)
+
+    source_change = definition_change.source_changes[0]
+    self.assertEqual(source_change.change, diff.CHANGE_CHANGED)
+    self.assertEqual(source_change.changed_attributes, ['values_order'])
+    self.assertEqual(source_change.added_values, [])
+    self.assertEqual(source_change.removed_values, [])
+
+    # The sources are reordered.
+    other_artifact_registry = self._CreateRegistry('\n'.join([
+        'name: LinuxAccounts',
+        'doc: Linux accounts.',
+        'sources:',
+        directory_source,
+        file_source,
+        '']))
+
+    change_set = differ.CompareRegistries(
+        artifact_registry, other_artifact_registry)
+
+    self.assertEqual(len(change_set.definition_changes), 1)
+
+    definition_change = change_set.definition_changes[0]
+    self.assertEqual(definition_change.changed_attributes, ['sources_order'])
+    self.assertEqual(definition_change.source_changes, [])
+
+    # The supported operating systems of the directory source are reordered.
+    artifact_registry = self._CreateRegistry('\n'.join([
+        'name: LinuxAccounts',
+        'doc: Linux accounts.',
+        'sources:',
+        directory_source,
+        '  supported_os: [Darwin, Linux]',
+        'supported_os: [Darwin, Linux]',
+        '']))
+    other_artifact_registry = self._CreateRegistry('\n'.join([
+        'name: LinuxAccounts',
+        'doc: Linux accounts.',
+        'sources:',
+        directory_source,
+        '  supported_os: [Linux, Darwin]',
+        'supported_os: [Darwin, Linux]',
+        '']))
+
+    change_set = differ.CompareRegistries(
+        artifact_registry, other_artifact_registry)
+
+    source_change = change_set.definition_changes[0].source_changes[0]
+    self.assertEqual(source_change.changed_attributes, ['supported_os'])
+
+  def testCompareRegistriesWithDataDirectory(self):
+    """Tests the CompareRegistries function with the data directory."""
+    self._SkipIfPathNotExists(self._DATA_PATH)
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(artifact_reader, self._DATA_PATH)
+
+    differ = diff.ArtifactDefinitionsDiffer()
+
+    frozen_registry = artifact_registry.Freeze()
+    change_set = differ.CompareRegistries(frozen_registry, artifact_registry)
+
+    number_of_definitions = len(list(artifact_registry.GetDefinitions()))
+    self.assertEqual(change_set.definition_changes, [])
+    self.assertEqual(
+        change_set.number_of_unchanged_definitions, number_of_definitions)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions index."""
+
+import os
+import shutil
+import unittest
+
+from unittest import mock
+
+from artifacts import index
+from artifacts import reader
+
+from tests import test_lib
+
+
+class ArtifactDefinitionsIndexTest(test_lib.BaseTestCase):
+  """Tests for the artifact definitions index."""
+
+  def testScanDirectory(self):
+    """Tests the ScanDirectory function."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    definitions_index = index.ArtifactDefinitionsIndex()
+    locations = definitions_index.ScanDirectory(
+        artifact_reader, self._TEST_DATA_PATH)
+
+    names = [location.name for location in locations]
+    expected_names = [
+        artifact_definition.name for artifact_definition in
+        artifact_reader.ReadDirectory(self._TEST_DATA_PATH)]
+    self.assertEqual(names, expected_names)
+
+  def testScanDirectoryWithPersistedIndex(self):
+    """Tests the ScanDirectory function with a persisted index."""
+    with test_lib.TempDirectory() as temporary_directory:
+      data_path = os.path.join(temporary_directory, 'data')
+      shutil.copytree(self._TEST_DATA_PATH, data_path)
+
+      index_path = os.path.join(temporary_directory, 'index.json')
+      artifact_reader = reader.YamlArtifactsReader()
+
+      definitions_index = index.ArtifactDefinitionsIndex(path=index_path)
+      expected_locations = definitions_index.ScanDirectory(
+          artifact_reader, data_path)
+      self.assertTrue(os.path.exists(index_path))
+
+      # Test that unchanged files are not scanned again.
+      definitions_index = index.ArtifactDefinitionsIndex(path=index_path)
+      with mock.patch.object(
+          artifact_reader, 'ScanFile', side_effect=AssertionError):
+        locations = definitions_index.ScanDirectory(artifact_reader, data_path)
+
+      self.assertEqual(
+          [location.__dict__ for location in locations],
+          [location.__dict__ for location in expected_locations])
+
+      # Test that changed files are scanned again.
+      test_path = os.path.join(data_path, 'definitions.yaml')
+      with open(test_path, 'a', encoding='utf-8') as file_object:
+        file_object.write('\n'.join([
+            '---',
+            'name: AppendedTest',
+            'doc: Appended test.',
+            'sources:',
+            '- type: FILE',
+            '  attributes: {paths: [\'/test\']}',
+            '']))
+
+      definitions_index = index.ArtifactDefinitionsIndex(path=index_path)
+      locations = definitions_index.ScanDirectory(artifact_reader, data_path)
+      self.assertEqual(len(locations), len(expected_locations) + 1)
+      self.assertEqual(locations[-1].name, 'AppendedTest')
+
+      # Test that a corrupt index results in an empty index.
+      with open(index_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('{bogus')
+
+      definitions_index = index.ArtifactDefinitionsIndex(path=index_path)
+      locations = definitions_index.ScanDirectory(artifact_reader, data_path)
+      self.assertEqual(locations[-1].name, 'AppendedTest')
+
+
+if __name__ == '__main__':
+  unittest.main()
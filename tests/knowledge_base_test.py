@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the knowledge base and parameter expansion."""
+
+import unittest
+
+from unittest import mock
+
+from artifacts import knowledge_base
+from artifacts import source_type
+
+from tests import test_lib
+
+
+class KnowledgeBaseTest(test_lib.BaseTestCase):
+  """Class to test the knowledge base."""
+
+  def testFingerprint(self):
+    """Tests the fingerprint property."""
+    test_knowledge_base = knowledge_base.KnowledgeBase(
+        environment_variables={'SystemRoot': 'C:\\Windows'})
+
+    fingerprint = test_knowledge_base.fingerprint
+    self.assertEqual(len(fingerprint), 64)
+    self.assertEqual(test_knowledge_base.fingerprint, fingerprint)
+
+    test_knowledge_base.AddUserAccount(
+        knowledge_base.UserAccount(username='user'))
+    self.assertNotEqual(test_knowledge_base.fingerprint, fingerprint)
+
+    other_knowledge_base = knowledge_base.KnowledgeBase(
+        environment_variables={'systemroot': 'C:\\Windows'},
+        user_accounts=[knowledge_base.UserAccount(username='user')])
+    self.assertEqual(
+        other_knowledge_base.fingerprint, test_knowledge_base.fingerprint)
+
+  def testGetEnvironmentVariable(self):
+    """Tests the GetEnvironmentVariable function."""
+    test_knowledge_base = knowledge_base.KnowledgeBase(
+        environment_variables={'SystemRoot': 'C:\\Windows'})
+
+    self.assertEqual(
+        test_knowledge_base.GetEnvironmentVariable('SYSTEMROOT'),
+        'C:\\Windows')
+    self.assertIsNone(test_knowledge_base.GetEnvironmentVariable('WinDir'))
+
+
+class ParameterExpanderTest(test_lib.BaseTestCase):
+  """Class to test the parameter expander."""
+
+  # pylint: disable=protected-access
+
+  def _CreateKnowledgeBase(self):
+    """Creates a knowledge base with two user accounts.
+
+    Returns:
+      KnowledgeBase: knowledge base.
+    """
+    return knowledge_base.KnowledgeBase(
+        environment_variables={
+            'AllUsersProfile': 'C:\\ProgramData',
+            'ProgramFiles(x86)': 'C:\\Program Files (x86)',
+            'SystemRoot': 'C:\\Windows'},
+        user_accounts=[
+            knowledge_base.UserAccount(
+                homedir='C:\\Users\\user1', sid='S-1-5-21-1001',
+                username='user1'),
+            knowledge_base.UserAccount(
+                appdata='D:\\Profiles\\user2\\Roaming',
+                homedir='C:\\Users\\user2', username='user2')])
+
+  def testExpandPattern(self):
+    """Tests the ExpandPattern function."""
+    test_knowledge_base = self._CreateKnowledgeBase()
+    parameter_expander = knowledge_base.ParameterExpander()
+
+    expansion = parameter_expander.ExpandPattern(
+        '%%environ_systemroot%%\\System32\\config\\SAM', test_knowledge_base)
+    self.assertEqual(list(expansion), ['C:\\Windows\\System32\\config\\SAM'])
+    self.assertEqual(expansion.unresolved_parameters, frozenset())
+
+    # Fallback of %%environ_windir%% to %%environ_systemroot%%.
+    expansion = parameter_expander.ExpandPattern(
+        '%%environ_windir%%\\Tasks\\*.job', test_knowledge_base)
+    self.assertEqual(list(expansion), ['C:\\Windows\\Tasks\\*.job'])
+
+    # Fallback of %%environ_programdata%% to %%environ_allusersprofile%%.
+    expansion = parameter_expander.ExpandPattern(
+        '%%ENVIRON_PROGRAMDATA%%\\Microsoft', test_knowledge_base)
+    self.assertEqual(list(expansion), [
+        'C:\\ProgramData\\Application Data\\Microsoft'])
+
+    # Decomposition of %%users.appdata%% for the user account without the
+    # appdata attribute.
+    expansion = parameter_expander.ExpandPattern(
+        '%%users.appdata%%\\Microsoft\\*', test_knowledge_base)
+    self.assertEqual(list(expansion), [
+        'C:\\Users\\user1\\AppData\\Roaming\\Microsoft\\*',
+        'C:\\Users\\user1\\Application Data\\Microsoft\\*',
+        'D:\\Profiles\\user2\\Roaming\\Microsoft\\*'])
+    self.assertEqual(expansion.number_of_expansions, 3)
+
+    expansion = parameter_expander.ExpandPattern(
+        '%%users.temp%%\\*.tmp', test_knowledge_base)
+    self.assertEqual(expansion.number_of_expansions, 4)
+    self.assertIn(
+        'C:\\Users\\user2\\Local Settings\\Application Data\\Temp\\*.tmp',
+        list(expansion))
+
+    # Cartesian product of multiple users parameters per user account.
+    expansion = parameter_expander.ExpandPattern(
+        'HKEY_USERS\\%%users.sid%%\\%%users.username%%', test_knowledge_base)
+    self.assertEqual(list(expansion), ['HKEY_USERS\\S-1-5-21-1001\\user1'])
+    self.assertEqual(expansion.unresolved_parameters, frozenset(['users.sid']))
+
+    # The name of the environment variable of %%environ_programfilesx86%%.
+    expansion = parameter_expander.ExpandPattern(
+        '%%environ_programfilesx86%%\\Redis', test_knowledge_base)
+    self.assertEqual(list(expansion), ['C:\\Program Files (x86)\\Redis'])
+
+    expansion = parameter_expander.ExpandPattern(
+        '%%environ_temp%%\\*.exe', test_knowledge_base)
+    self.assertEqual(list(expansion), [])
+    self.assertEqual(
+        expansion.unresolved_parameters, frozenset(['environ_temp']))
+
+    expansion = parameter_expander.ExpandPattern(
+        '/etc/passwd', test_knowledge_base)
+    self.assertEqual(list(expansion), ['/etc/passwd'])
+
+  def testExpandPatternCache(self):
+    """Tests the ExpandPattern function caches per knowledge base."""
+    test_knowledge_base = self._CreateKnowledgeBase()
+    parameter_expander = knowledge_base.ParameterExpander()
+
+    expansion = parameter_expander.ExpandPattern(
+        '%%users.homedir%%\\NTUSER.DAT', test_knowledge_base)
+    self.assertIs(parameter_expander.ExpandPattern(
+        '%%users.homedir%%\\NTUSER.DAT', test_knowledge_base), expansion)
+    self.assertEqual(expansion.number_of_expansions, 2)
+
+    test_knowledge_base.AddUserAccount(
+        knowledge_base.UserAccount(userprofile='C:\\Users\\user3'))
+
+    other_expansion = parameter_expander.ExpandPattern(
+        '%%users.homedir%%\\NTUSER.DAT', test_knowledge_base)
+    self.assertIsNot(other_expansion, expansion)
+    self.assertEqual(list(other_expansion), [
+        'C:\\Users\\user1\\NTUSER.DAT', 'C:\\Users\\user2\\NTUSER.DAT',
+        'C:\\Users\\user3\\NTUSER.DAT'])
+
+  def testExpandPatternCacheEviction(self):
+    """Tests the ExpandPattern function evicts the least recently used."""
+    test_knowledge_base = self._CreateKnowledgeBase()
+    parameter_expander = knowledge_base.ParameterExpander()
+
+    with mock.patch.object(
+        parameter_expander, '_MAXIMUM_NUMBER_OF_CACHED_EXPANSIONS', 2):
+      expansion = parameter_expander.ExpandPattern(
+          '%%environ_systemroot%%\\a', test_knowledge_base)
+      parameter_expander.ExpandPattern(
+          '%%environ_systemroot%%\\b', test_knowledge_base)
+
+      # Make the first expansion the most recently used one.
+      self.assertIs(parameter_expander.ExpandPattern(
+          '%%environ_systemroot%%\\a', test_knowledge_base), expansion)
+
+      parameter_expander.ExpandPattern(
+          '%%environ_systemroot%%\\c', test_knowledge_base)
+      self.assertIs(parameter_expander.ExpandPattern(
+          '%%environ_systemroot%%\\a', test_knowledge_base), expansion)
+
+      lookup_keys = [
+          pattern for pattern, _ in parameter_expander._expansions.keys()]
+      self.assertEqual(lookup_keys, [
+          '%%environ_systemroot%%\\c', '%%environ_systemroot%%\\a'])
+
+  def testExpandPatternWithoutUserAccounts(self):
+    """Tests the ExpandPattern function without user accounts."""
+    parameter_expander = knowledge_base.ParameterExpander()
+
+    expansion = parameter_expander.ExpandPattern(
+        '%%users.homedir%%/.bash_history', knowledge_base.KnowledgeBase())
+    self.assertEqual(list(expansion), [])
+    self.assertEqual(
+        expansion.unresolved_parameters, frozenset(['users.homedir']))
+
+  def testExpandSource(self):
+    """Tests the ExpandSource function."""
+    test_knowledge_base = self._CreateKnowledgeBase()
+    parameter_expander = knowledge_base.ParameterExpander()
+
+    test_source = source_type.WindowsRegistryValueSourceType(key_value_pairs=[
+        {'key': 'HKEY_USERS\\%%users.sid%%\\Environment', 'value': 'Path'}])
+
+    expansions = parameter_expander.ExpandSource(
+        test_source, test_knowledge_base)
+    self.assertEqual(len(expansions), 1)
+    self.assertEqual(list(expansions[0]), [
+        'HKEY_USERS\\S-1-5-21-1001\\Environment'])
+
+    test_source = source_type.CommandSourceType(args=[], cmd='/bin/ls')
+    expansions = parameter_expander.ExpandSource(
+        test_source, test_knowledge_base)
+    self.assertEqual(expansions, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions path matcher."""
+
+import io
+import unittest
+
+from artifacts import matcher
+from artifacts import reader
+from artifacts import registry
+
+from tests import test_lib
+
+
+class PathMatcherTest(test_lib.BaseTestCase):
+  """Class to test the artifact definitions path matcher."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: WindowsEventLogs',
+      'doc: Windows Event logs.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths:',
+      '    - \'%%environ_systemroot%%\\System32\\winevt\\Logs\\*.evtx\'',
+      '    - \'%%environ_systemroot%%\\System32\\config\\Sys?vent.Evt\'',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: RecycleBin',
+      'doc: Recycle Bin.',
+      'sources:',
+      '- type: DIRECTORY',
+      '  attributes:',
+      '    paths: [\'\\$Recycle.Bin\\**2\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: LogFiles',
+      'doc: Log files.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'/var/log/syslog*\', \'/var/log/*\']}',
+      '- type: COMMAND',
+      '  attributes: {cmd: /bin/dmesg, args: []}',
+      'supported_os: [Linux]',
+      ''])
+
+  def _CreateTestMatcher(self, supported_os=None, variables=None):
+    """Creates a path matcher with the test artifact definitions.
+
+    Args:
+      supported_os (Optional[str]): supported operating system the sources
+          must apply to, where None represents all.
+      variables (Optional[dict[str, list[str]]]): values per parameter name.
+
+    Returns:
+      PathMatcher: path matcher.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    path_matcher = matcher.PathMatcher(variables=variables)
+    path_matcher.AddSourcesFromRegistry(
+        artifact_registry, supported_os=supported_os)
+
+    return path_matcher
+
+  def _Match(self, path_matcher, path, separator='/'):
+    """Matches a path.
+
+    Args:
+      path_matcher (PathMatcher): path matcher.
+      path (str): path.
+      separator (Optional[str]): path segment separator of the path.
+
+    Returns:
+      list[tuple[str, str]]: artifact definition names and source paths of
+          the matches, in sorted order.
+    """
+    return sorted([
+        (artifact_definition.name, source_path)
+        for artifact_definition, _, source_path in path_matcher.Match(
+            path, separator=separator)])
+
+  def testAddSourcesFromRegistry(self):
+    """Tests the AddSourcesFromRegistry function."""
+    path_matcher = self._CreateTestMatcher()
+    self.assertEqual(path_matcher.number_of_paths, 10)
+
+    path_matcher = self._CreateTestMatcher(supported_os='Linux')
+    self.assertEqual(path_matcher.number_of_paths, 5)
+
+  def testMatch(self):
+    """Tests the Match function."""
+    path_matcher = self._CreateTestMatcher()
+
+    matches = self._Match(
+        path_matcher, 'C:\\Windows\\System32\\winevt\\Logs\\Security.evtx',
+        separator='\\')
+    self.assertEqual(matches, [(
+        'WindowsEventLogs',
+        '%%environ_systemroot%%\\System32\\winevt\\Logs\\*.evtx')])
+
+    # Test case-insensitive matching of Windows paths.
+    matches = self._Match(
+        path_matcher, '/WINNT/system32/CONFIG/sysevent.evt')
+    self.assertEqual(matches, [(
+        'WindowsEventLogs',
+        '%%environ_systemroot%%\\System32\\config\\Sys?vent.Evt')])
+
+    matches = self._Match(
+        path_matcher, '/Windows/System32/winevt/Logs/Security.evt')
+    self.assertEqual(matches, [])
+
+    # Test case-sensitive matching of POSIX paths.
+    matches = self._Match(path_matcher, '/home/user/.bash_history')
+    self.assertEqual(matches, [
+        ('BashHistory', '%%users.homedir%%/.bash_history')])
+
+    matches = self._Match(path_matcher, '/HOME/user/.bash_history')
+    self.assertEqual(matches, [])
+
+    matches = self._Match(path_matcher, '/var/log/syslog.1')
+    self.assertEqual(matches, [
+        ('LogFiles', '/var/log/*'), ('LogFiles', '/var/log/syslog*')])
+
+    matches = self._Match(path_matcher, '/var/log/auth.log')
+    self.assertEqual(matches, [('LogFiles', '/var/log/*')])
+
+    matches = self._Match(path_matcher, '/var/log')
+    self.assertEqual(matches, [])
+
+  def testMatchWithGlobstar(self):
+    """Tests the Match function with a globstar."""
+    path_matcher = self._CreateTestMatcher()
+
+    matches = self._Match(path_matcher, '/$Recycle.Bin/S-1-5-18')
+    self.assertEqual(matches, [('RecycleBin', '\\$Recycle.Bin\\**2')])
+
+    matches = self._Match(path_matcher, '/$Recycle.Bin/S-1-5-18/$IABC.txt')
+    self.assertEqual(matches, [('RecycleBin', '\\$Recycle.Bin\\**2')])
+
+    matches = self._Match(path_matcher, '/$Recycle.Bin')
+    self.assertEqual(matches, [])
+
+    matches = self._Match(path_matcher, '/$Recycle.Bin/S-1-5-18/a/b')
+    self.assertEqual(matches, [])
+
+  def testMatchWithVariables(self):
+    """Tests the Match function with parameter values."""
+    path_matcher = self._CreateTestMatcher(
+        variables={'users.homedir': ['/export/home/*']})
+
+    matches = self._Match(path_matcher, '/export/home/user/.bash_history')
+    self.assertEqual(matches, [
+        ('BashHistory', '%%users.homedir%%/.bash_history')])
+
+    matches = self._Match(path_matcher, '/home/user/.bash_history')
+    self.assertEqual(matches, [])
+
+
+
+class WindowsRegistryKeyMatcherTest(test_lib.BaseTestCase):
+  """Class to test the Windows Registry key path matcher."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: RunKeys',
+      'doc: Run keys.',
+      'sources:',
+      '- type: REGISTRY_KEY',
+      '  attributes:',
+      '    keys:',
+      '    - \'HKEY_USERS\\%%users.sid%%\\Software\\Run\\*\'',
+      '    - \'HKEY_LOCAL_MACHINE\\Software\\Run\\*\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: TimeZone',
+      'doc: Time zone.',
+      'sources:',
+      '- type: REGISTRY_VALUE',
+      '  attributes:',
+      '    key_value_pairs:',
+      '    - {key: \'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\'
+      'Control\\TimeZoneInformation\', value: \'TimeZoneKeyName\'}',
+      '    - {key: \'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\'
+      'Control\\TimeZoneInformation\', value: \'Bias*\'}',
+      'supported_os: [Windows]',
+      ''])
+
+  def _CreateTestMatcher(self):
+    """Creates a Windows Registry key path matcher.
+
+    Returns:
+      WindowsRegistryKeyMatcher: Windows Registry key path matcher.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    key_matcher = matcher.WindowsRegistryKeyMatcher()
+    key_matcher.AddSourcesFromRegistry(artifact_registry)
+
+    return key_matcher
+
+  def _Match(self, key_matcher, key_path, value_name=None):
+    """Matches a key path.
+
+    Args:
+      key_matcher (WindowsRegistryKeyMatcher): Windows Registry key path
+          matcher.
+      key_path (str): key path.
+      value_name (Optional[str]): value name.
+
+    Returns:
+      list[tuple[str, str]]: artifact definition names and value names of
+          the matches, in sorted order.
+    """
+    return sorted([
+        (artifact_definition.name, source_value_name or '')
+        for artifact_definition, _, _, source_value_name in key_matcher.Match(
+            key_path, value_name=value_name)])
+
+  def testAddSourcesFromRegistry(self):
+    """Tests the AddSourcesFromRegistry function."""
+    key_matcher = self._CreateTestMatcher()
+    self.assertEqual(key_matcher.number_of_paths, 5)
+
+  def testMatch(self):
+    """Tests the Match function."""
+    key_matcher = self._CreateTestMatcher()
+
+    matches = self._Match(
+        key_matcher, 'HKEY_LOCAL_MACHINE\\SOFTWARE\\Run\\Subkey')
+    self.assertEqual(matches, [('RunKeys', '')])
+
+    matches = self._Match(
+        key_matcher, 'HKEY_LOCAL_MACHINE\\Software\\Run', value_name='Test')
+    self.assertEqual(matches, [('RunKeys', '')])
+
+    matches = self._Match(key_matcher, 'HKEY_LOCAL_MACHINE\\Software\\Run')
+    self.assertEqual(matches, [])
+
+    # Test matching %%users.sid%% and HKEY_CURRENT_USER.
+    matches = self._Match(
+        key_matcher, 'HKEY_USERS\\S-1-5-21-7623811015-3361044348-030300820-'
+        '1013\\Software\\Run\\Subkey')
+    self.assertEqual(matches, [('RunKeys', '')])
+
+    matches = self._Match(
+        key_matcher, 'HKEY_USERS\\.DEFAULT\\Software\\Run\\Subkey')
+    self.assertEqual(matches, [])
+
+    matches = self._Match(
+        key_matcher, 'HKEY_CURRENT_USER\\Software\\Run\\Subkey')
+    self.assertEqual(matches, [('RunKeys', '')])
+
+  def testMatchWithValueName(self):
+    """Tests the Match function with a value name."""
+    key_matcher = self._CreateTestMatcher()
+
+    key_path = (
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Control\\'
+        'TimeZoneInformation')
+
+    matches = self._Match(key_matcher, key_path)
+    self.assertEqual(matches, [
+        ('TimeZone', 'Bias*'), ('TimeZone', 'TimeZoneKeyName')])
+
+    matches = self._Match(key_matcher, key_path, value_name='ActiveTimeBias')
+    self.assertEqual(matches, [])
+
+    matches = self._Match(key_matcher, key_path, value_name='biasx')
+    self.assertEqual(matches, [('TimeZone', 'Bias*')])
+
+    matches = self._Match(
+        key_matcher, key_path.replace('ControlSet001', 'CurrentControlSet'),
+        value_name='TimeZoneKeyName')
+    self.assertEqual(matches, [('TimeZone', 'TimeZoneKeyName')])
+
+    matches = self._Match(
+        key_matcher, key_path.replace('ControlSet001', 'ControlSet1'),
+        value_name='TimeZoneKeyName')
+    self.assertEqual(matches, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions glob overlap analysis."""
+
+import unittest
+
+from artifacts import overlap
+
+from tests import test_lib
+
+
+class GlobOverlapAnalyzerTest(test_lib.BaseTestCase):
+  """Class to test the glob subsumption and overlap analyzer."""
+
+  def testCompare(self):
+    """Tests the Compare function."""
+    analyzer = overlap.GlobOverlapAnalyzer()
+
+    test_patterns = [
+        ('/var/log/**', '/var/log/apt/*.log', overlap.RELATION_SUBSUMES),
+        ('/var/log/apt/*.log', '/var/log/**', overlap.RELATION_SUBSUMED),
+        ('/var/log/*', '/var/log/*', overlap.RELATION_EQUIVALENT),
+        ('/var/log/*.log', '/var/log/syslog*', overlap.RELATION_OVERLAPS),
+        ('/var/log/**2', '/var/log/a/b/c', None),
+        ('/var/log/*.log', '/var/log/*.gz', None),
+        ('/etc/*', '/var/*', None),
+        ('%%users.homedir%%/*', '%%users.homedir%%/.bashrc',
+         overlap.RELATION_SUBSUMES),
+        ('%%users.homedir%%/.bashrc', '/root/.bashrc', None)]
+
+    for path, other_path, expected_relation in test_patterns:
+      pattern = overlap.GlobPattern(path)
+      other_pattern = overlap.GlobPattern(other_path)
+      relation = analyzer.Compare(pattern, other_pattern)
+      self.assertEqual(
+          relation, expected_relation, msg=f'{path:s} and {other_path:s}')
+
+    pattern = overlap.GlobPattern(
+        'C:\\Windows\\*', separator='\\', case_insensitive=True)
+    other_pattern = overlap.GlobPattern(
+        'c:\\windows\\notepad.exe', separator='\\', case_insensitive=True)
+    self.assertEqual(
+        analyzer.Compare(pattern, other_pattern), overlap.RELATION_SUBSUMES)
+
+    # A case-sensitive glob does not subsume a case-insensitive glob.
+    pattern = overlap.GlobPattern('/Library/*')
+    other_pattern = overlap.GlobPattern(
+        '/library/Caches', case_insensitive=True)
+    self.assertEqual(
+        analyzer.Compare(pattern, other_pattern), overlap.RELATION_OVERLAPS)
+
+    # Globs with different separators are not compared.
+    pattern = overlap.GlobPattern('/Windows/*')
+    other_pattern = overlap.GlobPattern(
+        '\\Windows\\notepad.exe', separator='\\')
+    self.assertIsNone(analyzer.Compare(pattern, other_pattern))
+
+  def testGetOverlaps(self):
+    """Tests the GetOverlaps function."""
+    analyzer = overlap.GlobOverlapAnalyzer()
+
+    paths = [
+        '/var/log/**', '/var/log/apt/history.log', '/etc/passwd',
+        '/etc/*', '/etc/shadow', '/*/passwd']
+    patterns = {}
+    for path in paths:
+      pattern = overlap.GlobPattern(path)
+      patterns[path] = pattern
+      analyzer.AddPattern(pattern)
+
+    overlaps = sorted(
+        (pattern.path, other_pattern.path, relation)
+        for pattern, other_pattern, relation in analyzer.GetOverlaps())
+
+    self.assertEqual(overlaps, [
+        ('/*/passwd', '/etc/*', overlap.RELATION_OVERLAPS),
+        ('/*/passwd', '/etc/passwd', overlap.RELATION_SUBSUMES),
+        ('/etc/*', '/etc/passwd', overlap.RELATION_SUBSUMES),
+        ('/etc/*', '/etc/shadow', overlap.RELATION_SUBSUMES),
+        ('/var/log/**', '/var/log/apt/history.log',
+         overlap.RELATION_SUBSUMES)])
+
+    # The pairs with glob-free paths in different directories are not
+    # compared.
+    self.assertEqual(analyzer.number_of_comparisons, 8)
+
+    subsuming_paths = sorted(
+        pattern.path for pattern in analyzer.GetSubsumingPatterns(
+            patterns['/etc/passwd']))
+    self.assertEqual(subsuming_paths, ['/*/passwd', '/etc/*'])
+
+  def testOverlaps(self):
+    """Tests the Overlaps function."""
+    analyzer = overlap.GlobOverlapAnalyzer()
+
+    pattern = overlap.GlobPattern('/home/**3/.ssh/*')
+    other_pattern = overlap.GlobPattern('/home/user/.*/authorized_keys')
+    self.assertTrue(analyzer.Overlaps(pattern, other_pattern))
+
+    other_pattern = overlap.GlobPattern('/home/a/b/c/d/.ssh/id_rsa')
+    self.assertFalse(analyzer.Overlaps(pattern, other_pattern))
+
+    other_pattern = overlap.GlobPattern('/home/**/id_rsa')
+    self.assertTrue(analyzer.Overlaps(pattern, other_pattern))
+
+  def testSubsumes(self):
+    """Tests the Subsumes function."""
+    analyzer = overlap.GlobOverlapAnalyzer()
+
+    pattern = overlap.GlobPattern('/var/**3')
+    other_pattern = overlap.GlobPattern('/var/log/**2')
+    self.assertTrue(analyzer.Subsumes(pattern, other_pattern))
+
+    other_pattern = overlap.GlobPattern('/var/log/**')
+    self.assertFalse(analyzer.Subsumes(pattern, other_pattern))
+
+    pattern = overlap.GlobPattern('/var/log/*.log')
+    other_pattern = overlap.GlobPattern('/var/log/[ab]*.log')
+    self.assertFalse(analyzer.Subsumes(pattern, other_pattern))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the file system listing tagger."""
+
+import io
+import json
+import os
+import unittest
+
+from artifacts.scripts import path_tagger
+
+from tests import test_lib
+
+
+class PathTaggerTest(test_lib.BaseTestCase):
+  """Class to test the file system listing tagger."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: WindowsSystemRegistryFiles',
+      'doc: Windows system Registry files.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths: [\'%%environ_systemroot%%\\System32\\config\\SAM\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      ''])
+
+  def _TagListing(self, temporary_directory, listing, **kwargs):
+    """Tags a file system listing.
+
+    Args:
+      temporary_directory (str): path of a temporary directory.
+      listing (str): file system listing.
+      kwargs (dict[str, object]): keyword arguments of the path tagger.
+
+    Returns:
+      tuple[list[dict[str, object]], int, int]: tagged entries, number of
+          entries and number of tagged entries.
+    """
+    definitions_path = os.path.join(temporary_directory, 'definitions.yaml')
+    with open(definitions_path, 'w', encoding='utf-8') as file_object:
+      file_object.write(self._TEST_DEFINITIONS)
+
+    tagger = path_tagger.PathTagger(definitions_path, **kwargs)
+
+    file_object = io.BytesIO(listing.encode('utf-8'))
+    output_file_object = io.StringIO()
+    number_of_entries, number_of_tagged_entries = tagger.TagFileObject(
+        file_object, output_file_object)
+
+    entries = [
+        json.loads(line)
+        for line in output_file_object.getvalue().splitlines()]
+
+    return entries, number_of_entries, number_of_tagged_entries
+
+  def testTagFileObject(self):
+    """Tests the TagFileObject function."""
+    listing = '\n'.join([
+        '/home/user/.bash_history',
+        'C:/WINDOWS/system32/config/SAM',
+        '/etc/passwd',
+        ''])
+
+    with test_lib.TempDirectory() as temporary_directory:
+      entries, number_of_entries, number_of_tagged_entries = self._TagListing(
+          temporary_directory, listing)
+
+    self.assertEqual(number_of_entries, 3)
+    self.assertEqual(number_of_tagged_entries, 2)
+    self.assertEqual(entries, [
+        {'artifacts': ['BashHistory'], 'path': '/home/user/.bash_history'},
+        {'artifacts': ['WindowsSystemRegistryFiles'],
+         'path': 'C:/WINDOWS/system32/config/SAM'},
+        {'artifacts': [], 'path': '/etc/passwd'}])
+
+  def testTagFileObjectWithBodyfile(self):
+    """Tests the TagFileObject function with a bodyfile."""
+    listing = '\n'.join([
+        '0|/home/user/.bash_history|12|r/rrw-------|1000|1000|5|1|2|3|4',
+        '0|/home/user/a|b|13|r/rrw-------|1000|1000|5|1|2|3|4',
+        '0|/home/user/link -> .bash_history|14|l/lrwxrwxrwx|0|0|5|1|2|3|4',
+        '0|/home/user/.bash_history ($FILE_NAME)|15|r/rrw-------|0|0|5|1|2|3|4',
+        'invalid',
+        ''])
+
+    with test_lib.TempDirectory() as temporary_directory:
+      entries, number_of_entries, number_of_tagged_entries = self._TagListing(
+          temporary_directory, listing, input_format='bodyfile',
+          matches_only=True)
+
+    self.assertEqual(number_of_entries, 4)
+    self.assertEqual(number_of_tagged_entries, 2)
+
+    paths = [entry['path'] for entry in entries]
+    self.assertEqual(
+        paths, ['/home/user/.bash_history', '/home/user/.bash_history'])
+
+    self.assertEqual(entries[0]['entry'], (
+        '0|/home/user/.bash_history|12|r/rrw-------|1000|1000|5|1|2|3|4'))
+
+  def testTagFileObjectWithFind(self):
+    """Tests the TagFileObject function with find output."""
+    listing = '5\t1700000000.0\t/root/.bash_history\n'
+
+    with test_lib.TempDirectory() as temporary_directory:
+      entries, _, _ = self._TagListing(
+          temporary_directory, listing, input_format='find')
+
+    self.assertEqual(entries, [{
+        'artifacts': ['BashHistory'], 'entry': listing.rstrip('\n'),
+        'path': '/root/.bash_history'}])
+
+  def testTagFileWithWorkers(self):
+    """Tests the TagFile function with worker processes."""
+    listing = ''.join([
+        f'/home/user{index:d}/.bash_history\n/tmp/file{index:d}\n'
+        for index in range(1000)])
+
+    with test_lib.TempDirectory() as temporary_directory:
+      definitions_path = os.path.join(temporary_directory, 'definitions.yaml')
+      with open(definitions_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._TEST_DEFINITIONS)
+
+      listing_path = os.path.join(temporary_directory, 'listing.txt')
+      with open(listing_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(listing)
+
+      tagger = path_tagger.PathTagger(definitions_path)
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFile(listing_path, output_file_object)
+      expected_output = output_file_object.getvalue()
+
+      self.assertEqual(result, (2000, 1000))
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFile(
+          listing_path, output_file_object, number_of_workers=2)
+      self.assertEqual(result, (2000, 1000))
+      self.assertEqual(output_file_object.getvalue(), expected_output)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions collection planner."""
+
+import io
+import unittest
+
+from artifacts import knowledge_base
+from artifacts import planner
+from artifacts import reader
+from artifacts import registry
+
+from tests import test_lib
+
+
+class CollectionPlannerTest(test_lib.BaseTestCase):
+  """Class to test the artifact definitions collection planner."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: LinuxLogFiles',
+      'doc: Log files.',
+      'sources:',
+      '- type: PATH',
+      '  attributes: {paths: [\'/var/log/**\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: AptLogFiles',
+      'doc: APT log files.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths: [\'/var/log/apt/*.log\', \'/var/log/apt/history.log\']',
+      'supported_os: [Linux]',
+      '---',
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      '- type: COMMAND',
+      '  attributes: {cmd: /usr/bin/history, args: []}',
+      'supported_os: [Linux]',
+      '---',
+      'name: LinuxGroup',
+      'doc: Linux group.',
+      'sources:',
+      '- type: ARTIFACT_GROUP',
+      '  attributes: {names: [LinuxLogFiles, AptLogFiles, BashHistory]}',
+      'supported_os: [Linux]',
+      '---',
+      'name: WindowsEventLogs',
+      'doc: Windows Event logs.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths: [\'%%environ_systemroot%%\\System32\\winevt\\Logs\\*.evtx\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: WindowsSystemEventLog',
+      'doc: Windows System Event log.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths:',
+      '    - \'%%environ_systemroot%%\\system32\\WINEVT\\logs\\System.evtx\'',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: WindowsEventLogsCopy',
+      'doc: Windows Event logs.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths: [\'%%environ_systemroot%%\\SYSTEM32\\winevt\\Logs\\*.EVTX\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      ''])
+
+  def _CreateTestPlanner(self):
+    """Creates a collection planner with the test artifact definitions.
+
+    Returns:
+      CollectionPlanner: collection planner.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    return planner.CollectionPlanner(artifact_registry)
+
+  def testCreatePlan(self):
+    """Tests the CreatePlan function."""
+    collection_planner = self._CreateTestPlanner()
+
+    collection_plan = collection_planner.CreatePlan(
+        ['LinuxGroup'], supported_os='Linux')
+
+    self.assertEqual(collection_plan.number_of_source_paths, 4)
+    self.assertEqual(collection_plan.number_of_duplicate_paths, 0)
+    self.assertEqual(collection_plan.number_of_subsumed_paths, 2)
+    self.assertEqual(collection_plan.undefined_artifacts, [])
+
+    self.assertEqual(collection_plan.GetProvenance(), {
+        '/var/log/**': ['AptLogFiles', 'LinuxLogFiles'],
+        '%%users.homedir%%/.bash_history': ['BashHistory']})
+
+    self.assertEqual(collection_plan.patterns[0].source_paths, [
+        ('LinuxLogFiles', '/var/log/**'),
+        ('AptLogFiles', '/var/log/apt/*.log'),
+        ('AptLogFiles', '/var/log/apt/history.log')])
+
+    pattern = collection_plan.patterns[0]
+    subsumed_paths = [
+        subsumed_pattern.path for subsumed_pattern in pattern.subsumed_patterns]
+    self.assertEqual(
+        subsumed_paths, ['/var/log/apt/*.log', '/var/log/apt/history.log'])
+
+    directories = [
+        work_unit.directory for work_unit in collection_plan.work_units]
+    self.assertEqual(directories, ['/var/log', '%%users.homedir%%'])
+
+    self.assertEqual(collection_plan.GetReductionDescription(), (
+        'source paths: 4 duplicates: 0 subsumed: 2 patterns: 2 work units: 2'))
+
+  def testCreatePlanWithCaseInsensitivePaths(self):
+    """Tests the CreatePlan function with case-insensitive paths."""
+    collection_planner = self._CreateTestPlanner()
+
+    collection_plan = collection_planner.CreatePlan([
+        'WindowsSystemEventLog', 'WindowsEventLogs', 'WindowsEventLogsCopy',
+        'Undefined'], supported_os='Windows')
+
+    self.assertEqual(collection_plan.number_of_source_paths, 3)
+    self.assertEqual(collection_plan.number_of_duplicate_paths, 1)
+    self.assertEqual(collection_plan.number_of_subsumed_paths, 1)
+    self.assertEqual(collection_plan.undefined_artifacts, ['Undefined'])
+
+    self.assertEqual(collection_plan.GetProvenance(), {
+        '%%environ_systemroot%%\\System32\\winevt\\Logs\\*.evtx': [
+            'WindowsEventLogs', 'WindowsEventLogsCopy',
+            'WindowsSystemEventLog']})
+
+    self.assertEqual(len(collection_plan.work_units), 1)
+    self.assertEqual(
+        collection_plan.work_units[0].directory,
+        '%%environ_systemroot%%\\System32\\winevt\\Logs')
+
+  def testCreatePlanWithKnowledgeBase(self):
+    """Tests the CreatePlan function with a knowledge base."""
+    collection_planner = self._CreateTestPlanner()
+
+    test_knowledge_base = knowledge_base.KnowledgeBase(user_accounts=[
+        knowledge_base.UserAccount(homedir='/home/user'),
+        knowledge_base.UserAccount(homedir='/root'),
+        knowledge_base.UserAccount(username='nobody')])
+
+    collection_plan = collection_planner.CreatePlan(
+        ['BashHistory', 'AptLogFiles'], knowledge_base=test_knowledge_base)
+
+    self.assertEqual(collection_plan.number_of_source_paths, 4)
+    self.assertEqual(collection_plan.number_of_subsumed_paths, 1)
+    self.assertEqual(
+        collection_plan.unresolved_parameters, set(['users.homedir']))
+
+    directories = [
+        work_unit.directory for work_unit in collection_plan.work_units]
+    self.assertEqual(directories, ['/home/user', '/root', '/var/log/apt'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,9 +2,15 @@
 """Tests for the artifact definitions readers."""
 
 import io
+import json
+import os
 import unittest
+
+from unittest import mock
+
 import yaml
 
+from artifacts import cache
 from artifacts import definitions
 from artifacts import errors
 from artifacts import reader
@@ -15,6 +21,8 @@ from tests import test_lib
 class YamlArtifactsReaderTest(test_lib.BaseTestCase):
   """YAML artifacts reader tests."""
 
+  # pylint: disable=protected-access
+
   _DEFINITION_INVALID_SUPPORTED_OS_1 = """\
 name: BadSupportedOS
 doc: supported_os should be an array of strings.
@@ -95,6 +103,190 @@ doc: must have one sources.
 supported_os: [Windows]
 """
 
+  _DEFINITION_TEMPLATE = """\
+---
+name: Test{0:04d}
+doc: Test definition.
+sources:
+- type: FILE
+  attributes: {{paths: ['/test/{0:04d}']}}
+supported_os: [Linux]
+"""
+
+  _DEFINITION_WITH_COMPACT_FLOW_MAPPING = """\
+name: CompactFlowMapping
+doc: flow mapping without a space after the colon.
+sources:
+- type: FILE
+  attributes: {paths:['/etc/passwd']}
+supported_os: [Linux]
+"""
+
+  _DEFINITION_WITH_INVALID_MARKUP = """\
+name: InvalidMarkup
+doc: flow sequence that is not terminated.
+sources:
+- type: FILE
+  attributes: {paths: ['/etc/passwd']
+"""
+
+  def _WriteTestDefinitionsFile(self, path, number_of_definitions):
+    """Writes a test artifact definitions file.
+
+    Args:
+      path (str): path of the test artifact definitions file.
+      number_of_definitions (int): number of artifact definitions.
+    """
+    with open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write('# Test artifact definitions.\n')
+      for index in range(number_of_definitions):
+        file_object.write(self._DEFINITION_TEMPLATE.format(index))
+
+  def testGetDocumentOffsets(self):
+    """Tests the _GetDocumentOffsets function."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    document_offsets = artifact_reader._GetDocumentOffsets(
+        b'---\na: 1\n--- \nb: "---"\n---x: 2\n  ---\n---\r\nc: 3\n---')
+    self.assertEqual(document_offsets, [0, 9, 37, 47])
+
+    document_offsets = artifact_reader._GetDocumentOffsets(
+        b'# Comment.\na: 1\n---\nb: 2\n')
+    self.assertEqual(document_offsets, [16])
+
+    document_offsets = artifact_reader._GetDocumentOffsets(
+        b'%YAML 1.1\n---\na: 1\n---\nb: 2\n')
+    self.assertEqual(document_offsets, [])
+
+  def testGetFileRanges(self):
+    """Tests the _GetFileRanges function."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_file = os.path.join(temporary_directory, 'test.yaml')
+      self._WriteTestDefinitionsFile(test_file, 2000)
+
+      file_ranges = artifact_reader._GetFileRanges(test_file, 1)
+      self.assertEqual(file_ranges, [(0, None)])
+
+      file_ranges = artifact_reader._GetFileRanges(test_file, 4)
+      self.assertEqual(len(file_ranges), 4)
+      self.assertEqual(file_ranges[0][0], 0)
+      self.assertIsNone(file_ranges[-1][1])
+
+      with open(test_file, 'rb') as file_object:
+        file_data = file_object.read()
+
+      for range_index, (start_offset, _) in enumerate(file_ranges):
+        if range_index > 0:
+          self.assertEqual(file_data[start_offset:start_offset + 4], b'---\n')
+          self.assertEqual(start_offset, file_ranges[range_index - 1][1])
+
+  def testReadFileWithWorkers(self):
+    """Tests the ReadFile function with worker processes."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    test_file = os.path.join(self._DATA_PATH, 'windows.yaml')
+    expected_artifact_definitions = [
+        artifact_definition.AsDict()
+        for artifact_definition in artifact_reader.ReadFile(test_file)]
+
+    artifact_definitions = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadFile(test_file, number_of_workers=4)]
+
+    self.assertEqual(artifact_definitions, expected_artifact_definitions)
+
+  def testReadFileWithWorkersAndCache(self):
+    """Tests the ReadFile function with worker processes and a cache."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_file = os.path.join(temporary_directory, 'test.yaml')
+      self._WriteTestDefinitionsFile(test_file, 2000)
+
+      definitions_cache = cache.ArtifactDefinitionsCache(
+          os.path.join(temporary_directory, 'cache'))
+      artifact_reader = reader.YamlArtifactsReader(cache=definitions_cache)
+
+      # Values parsed from data that differs from the content read for the
+      # cache, as if the file changed during the read, are not cached.
+      modification_time, file_data = artifact_reader._ReadFileData(test_file)
+      with mock.patch.object(
+          reader.YamlArtifactsReader, '_ReadFileData',
+          return_value=(modification_time, file_data.replace(b'doc', b'dox'))):
+        artifact_definitions = list(
+            artifact_reader.ReadFile(test_file, number_of_workers=4))
+
+      self.assertEqual(len(artifact_definitions), 2000)
+      self.assertEqual(definitions_cache.number_of_entries, 0)
+
+      artifact_definitions = list(
+          artifact_reader.ReadFile(test_file, number_of_workers=4))
+
+      self.assertEqual(len(artifact_definitions), 2000)
+      self.assertEqual(definitions_cache.number_of_entries, 1)
+
+  def testReadFileWithWorkersAndSingleRange(self):
+    """Tests the ReadFile function with workers and a single file range."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    test_file = self._GetTestFilePath(['definitions.yaml'])
+    self._SkipIfPathNotExists(test_file)
+
+    self.assertEqual(len(artifact_reader._GetFileRanges(test_file, 4)), 1)
+
+    # No worker processes are started for a file that cannot be split.
+    with mock.patch.object(
+        reader.concurrent.futures, 'ProcessPoolExecutor',
+        side_effect=AssertionError):
+      artifact_definitions = list(
+          artifact_reader.ReadFile(test_file, number_of_workers=4))
+
+    self.assertEqual(len(artifact_definitions), 7)
+
+  def testReadFileWithWorkersAndFormatError(self):
+    """Tests the ReadFile function with workers and a format error."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_file = os.path.join(temporary_directory, 'test.yaml')
+      self._WriteTestDefinitionsFile(test_file, 2000)
+
+      file_ranges = artifact_reader._GetFileRanges(test_file, 4)
+      start_offset = file_ranges[2][0]
+
+      # Corrupt the first definition of the third range.
+      with open(test_file, 'r+b') as file_object:
+        file_object.seek(start_offset + 19)
+        file_object.write(b'dox')
+
+      error_messages = []
+      for number_of_workers in (1, 4):
+        with self.assertRaises(errors.FormatError) as context:
+          _ = list(artifact_reader.ReadFile(
+              test_file, number_of_workers=number_of_workers))
+
+        error_messages.append(str(context.exception))
+
+      self.assertEqual(error_messages[0], error_messages[1])
+      self.assertRegex(error_messages[0], r'^After: Test\d{4} Undefined keys')
+
+      # Invalidate the YAML markup of the first definition of the third range.
+      with open(test_file, 'r+b') as file_object:
+        file_object.seek(start_offset + 19)
+        file_object.write(b'[oc')
+
+      error_messages = []
+      for number_of_workers in (1, 4):
+        with self.assertRaises(errors.FormatError) as context:
+          _ = list(artifact_reader.ReadFile(
+              test_file, number_of_workers=number_of_workers))
+
+        error_messages.append(str(context.exception))
+
+      self.assertEqual(error_messages[0], error_messages[1])
+      self.assertRegex(
+          error_messages[0], r'^After: Test\d{4} Invalid YAML markup')
+
   def testReadFileObject(self):
     """Tests the ReadFileObject function."""
     test_file = self._GetTestFilePath(['definitions.yaml'])
@@ -270,6 +462,252 @@ supported_os: [Windows]
     with self.assertRaises(errors.FormatError):
       _ = list(artifact_reader.ReadFileObject(file_object))
 
+  def testReadFileObjectWithCompactFlowMapping(self):
+    """Tests the ReadFileObject function on a compact flow mapping."""
+    for use_libyaml in (False, True):
+      artifact_reader = reader.YamlArtifactsReader(use_libyaml=use_libyaml)
+
+      file_object = io.StringIO(
+          initial_value=self._DEFINITION_WITH_COMPACT_FLOW_MAPPING)
+      artifact_definitions = list(artifact_reader.ReadFileObject(file_object))
+
+      self.assertEqual(len(artifact_definitions), 1)
+      source_type = artifact_definitions[0].sources[0]
+      self.assertEqual(source_type.paths, ('/etc/passwd',))
+
+  def testReadFileObjectWithInvalidMarkup(self):
+    """Tests the ReadFileObject function on a definition with invalid markup."""
+    error_messages = []
+    for use_libyaml in (False, True):
+      artifact_reader = reader.YamlArtifactsReader(use_libyaml=use_libyaml)
+
+      file_object = io.StringIO(
+          initial_value=self._DEFINITION_WITH_INVALID_MARKUP)
+      with self.assertRaises(errors.FormatError) as context:
+        _ = list(artifact_reader.ReadFileObject(file_object))
+
+      error_messages.append(str(context.exception))
+
+    self.assertEqual(error_messages[0], error_messages[1])
+    self.assertTrue(error_messages[0].startswith('At start Invalid YAML'))
+
+  _SUPPORTED_OS_TEST_DATA = '\n'.join([
+      'name: WindowsTest',
+      'aliases: [WindowsAliasTest]',
+      'doc: Windows test.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'C:\\Test\']}',
+      'supported_os: [Windows]',
+      '---',
+      'name: LinuxTest',
+      'doc: Linux test.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'/test\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: GroupTest',
+      'doc: Group test.',
+      'sources:',
+      '- type: ARTIFACT_GROUP',
+      '  attributes: {names: [LinuxTest, WindowsTest, UndefinedTest]}',
+      '---',
+      'name: MixedTest',
+      'doc: Mixed test.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'/test\']}',
+      '  supported_os: [Darwin, Linux]',
+      '- type: FILE',
+      '  attributes: {paths: [\'C:\\Test\']}',
+      '  supported_os: [Windows]',
+      'supported_os: [Darwin, Linux, Windows]',
+      ''])
+
+  def testReadFileObjectWithSupportedOS(self):
+    """Tests the ReadFileObject function with supported OS filter."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    file_object = io.StringIO(initial_value=self._SUPPORTED_OS_TEST_DATA)
+    artifact_definitions = list(artifact_reader.ReadFileObject(file_object))
+    self.assertEqual(len(artifact_definitions), 4)
+    self.assertEqual(artifact_reader.filtered_artifact_names, set())
+
+    file_object = io.StringIO(initial_value=self._SUPPORTED_OS_TEST_DATA)
+    artifact_definitions = list(artifact_reader.ReadFileObject(
+        file_object, supported_os=['Linux']))
+
+    names = [
+        artifact_definition.name
+        for artifact_definition in artifact_definitions]
+    self.assertEqual(names, ['LinuxTest', 'GroupTest', 'MixedTest'])
+
+    # Test that the Windows specific source was removed.
+    self.assertEqual(len(artifact_definitions[2].sources), 1)
+    self.assertEqual(artifact_definitions[2].sources[0].paths, ('/test',))
+
+    self.assertEqual(
+        artifact_reader.filtered_artifact_names,
+        set(['WindowsTest', 'WindowsAliasTest']))
+
+    file_object = io.StringIO(initial_value=self._SUPPORTED_OS_TEST_DATA)
+    artifact_definitions = list(artifact_reader.ReadFileObject(
+        file_object, supported_os=['ESXi']))
+
+    names = [
+        artifact_definition.name
+        for artifact_definition in artifact_definitions]
+    self.assertEqual(names, ['GroupTest'])
+
+    # The names filtered by a previous read are not retained.
+    self.assertEqual(
+        artifact_reader.filtered_artifact_names,
+        set(['LinuxTest', 'MixedTest', 'WindowsTest', 'WindowsAliasTest']))
+
+    file_object = io.StringIO(initial_value=self._SUPPORTED_OS_TEST_DATA)
+    _ = list(artifact_reader.ReadFileObject(file_object))
+    self.assertEqual(artifact_reader.filtered_artifact_names, set())
+
+  def testReadFileWithSupportedOS(self):
+    """Tests the ReadFile function with supported OS filter."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_path = os.path.join(temporary_directory, 'test.yaml')
+      with open(test_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._SUPPORTED_OS_TEST_DATA)
+
+      artifact_reader = reader.YamlArtifactsReader()
+      expected_definition_values = [
+          artifact_definition.AsDict() for artifact_definition in
+          artifact_reader.ReadFile(test_path, supported_os=['Windows'])]
+      self.assertEqual(len(expected_definition_values), 3)
+
+      definition_values = [
+          artifact_definition.AsDict() for artifact_definition in
+          artifact_reader.ReadFile(
+              test_path, number_of_workers=2, supported_os=['Windows'])]
+      self.assertEqual(definition_values, expected_definition_values)
+      self.assertEqual(
+          artifact_reader.filtered_artifact_names, set(['LinuxTest']))
+
+      # Artifact definitions that do not apply are skipped before they are
+      # built in a file range read by a worker process.
+      with mock.patch.object(
+          artifact_reader, 'ReadArtifactDefinitionValues',
+          wraps=artifact_reader.ReadArtifactDefinitionValues) as read_mock:
+        definition_values, error_message, _, filtered_artifact_names = (
+            artifact_reader._ReadFileRange(
+                test_path, 0, None, supported_os=['Windows']))
+
+      self.assertEqual(definition_values, expected_definition_values)
+      self.assertIsNone(error_message)
+      self.assertEqual(filtered_artifact_names, set(['LinuxTest']))
+      self.assertEqual(read_mock.call_count, 3)
+
+      definitions_cache = cache.ArtifactDefinitionsCache(
+          os.path.join(temporary_directory, 'cache'))
+      artifact_reader = reader.YamlArtifactsReader(cache=definitions_cache)
+
+      # A read with supported operating systems does not fill the cache,
+      # since only the artifact definitions that apply are built.
+      list(artifact_reader.ReadFile(test_path, supported_os=['Windows']))
+      self.assertEqual(definitions_cache.number_of_entries, 0)
+
+      list(artifact_reader.ReadFile(test_path))
+      self.assertEqual(definitions_cache.number_of_entries, 1)
+
+      # Reads with supported operating systems use the cache.
+      for _ in range(2):
+        definition_values = [
+            artifact_definition.AsDict() for artifact_definition in
+            artifact_reader.ReadFile(test_path, supported_os=['Windows'])]
+        self.assertEqual(definition_values, expected_definition_values)
+        self.assertEqual(
+            artifact_reader.filtered_artifact_names, set(['LinuxTest']))
+
+  def testScanFile(self):
+    """Tests the ScanFile and ReadArtifactDefinitionAtLocation functions."""
+    test_file = self._GetTestFilePath(['definitions.yaml'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.YamlArtifactsReader()
+
+    expected_artifact_definitions = list(artifact_reader.ReadFile(test_file))
+
+    locations = artifact_reader.ScanFile(test_file)
+    self.assertEqual(len(locations), len(expected_artifact_definitions))
+
+    for location, expected_artifact_definition in zip(
+        locations, expected_artifact_definitions):
+      self.assertEqual(location.name, expected_artifact_definition.name)
+      self.assertEqual(location.aliases, expected_artifact_definition.aliases)
+
+      artifact_definition = artifact_reader.ReadArtifactDefinitionAtLocation(
+          location)
+      self.assertEqual(
+          artifact_definition.AsDict(), expected_artifact_definition.AsDict())
+
+    location = locations[1]
+    location.offset = locations[2].offset
+    with self.assertRaises(errors.FormatError):
+      artifact_reader.ReadArtifactDefinitionAtLocation(location)
+
+  def testScanFileWithFormatError(self):
+    """Tests the ScanFile function with format errors."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_path = os.path.join(temporary_directory, 'test.yaml')
+      with open(test_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('\n'.join([
+            '# Test.',
+            '---',
+            'name: Test',
+            'aliases:',
+            '- OtherTest',
+            'doc: Test.',
+            'sources: [{type: FILE, attributes: {paths: [\'/test\']}}]',
+            '---',
+            'doc: Missing name.',
+            '']))
+
+      with self.assertRaisesRegex(errors.FormatError, 'at line: 8'):
+        artifact_reader.ScanFile(test_path)
+
+      with open(test_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('%YAML 1.1\n---\nname: Test\n')
+
+      with self.assertRaises(errors.FormatError):
+        artifact_reader.ScanFile(test_path)
+
+  def testYamlBackend(self):
+    """Tests the yaml_backend attribute."""
+    artifact_reader = reader.YamlArtifactsReader(use_libyaml=False)
+    self.assertEqual(
+        artifact_reader.yaml_backend,
+        reader.YamlArtifactsReader.YAML_BACKEND_PYTHON)
+
+    artifact_reader = reader.YamlArtifactsReader()
+    if yaml.__with_libyaml__:
+      expected_yaml_backend = reader.YamlArtifactsReader.YAML_BACKEND_LIBYAML
+    else:
+      expected_yaml_backend = reader.YamlArtifactsReader.YAML_BACKEND_PYTHON
+    self.assertEqual(artifact_reader.yaml_backend, expected_yaml_backend)
+
+  def testReadDirectoryWithYamlBackends(self):
+    """Tests the ReadDirectory function with the different YAML backends."""
+    artifact_reader = reader.YamlArtifactsReader(use_libyaml=False)
+    python_artifact_definitions = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadDirectory(self._DATA_PATH)]
+
+    artifact_reader = reader.YamlArtifactsReader(use_libyaml=True)
+    libyaml_artifact_definitions = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadDirectory(self._DATA_PATH)]
+
+    self.assertEqual(python_artifact_definitions, libyaml_artifact_definitions)
+
   def testReadYamlFile(self):
     """Tests the ReadFile function."""
     test_file = self._GetTestFilePath(['definitions.yaml'])
@@ -288,6 +726,41 @@ supported_os: [Windows]
     artifact_definitions = list(artifact_reader.ReadDirectory(test_file))
     self.assertEqual(len(artifact_definitions), 7)
 
+  def testReadDirectoryWithWorkers(self):
+    """Tests the ReadDirectory function with worker processes."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    expected_artifact_definitions = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadDirectory(self._DATA_PATH)]
+
+    artifact_definitions = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadDirectory(self._DATA_PATH, number_of_workers=2)]
+
+    self.assertEqual(artifact_definitions, expected_artifact_definitions)
+
+  def testReadDirectoryWithWorkersAndFormatError(self):
+    """Tests the ReadDirectory function with workers and a format error."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      for filename, data in (
+          ('a.yaml', self._DEFINITION_WITH_COMPACT_FLOW_MAPPING),
+          ('b.yaml', self._DEFINITION_WITHOUT_DOC)):
+        path = os.path.join(temporary_directory, filename)
+        with open(path, 'w', encoding='utf-8') as file_object:
+          file_object.write(data)
+
+      generator = artifact_reader.ReadDirectory(
+          temporary_directory, number_of_workers=2)
+
+      artifact_definition = next(generator)
+      self.assertEqual(artifact_definition.name, 'CompactFlowMapping')
+
+      with self.assertRaises(errors.FormatError):
+        next(generator)
+
   def testArtifactAsDict(self):
     """Tests the AsDict function."""
     test_file = self._GetTestFilePath(['definitions.yaml'])
@@ -317,9 +790,161 @@ supported_os: [Windows]
       last_artifact_definition = artifact_definition
 
 
+class ShortReadBytesIO(io.BytesIO):
+  """Bytes file-like object of which a read returns at most 1 byte."""
+
+  def read(self, size=-1):
+    """Reads at most 1 byte.
+
+    Args:
+      size (Optional[int]): number of bytes to read.
+
+    Returns:
+      bytes: data read.
+    """
+    if size is None or size < 0 or size > 1:
+      size = 1
+    return super(ShortReadBytesIO, self).read(size)
+
+
 class JsonArtifactsReaderTest(test_lib.BaseTestCase):
   """JSON artifacts reader tests."""
 
+  # pylint: disable=protected-access
+
+  @mock.patch.object(reader.JsonArtifactsReader, '_READ_BUFFER_SIZE', 16)
+  def testReadFileObject(self):
+    """Tests the ReadFileObject function."""
+    test_file = self._GetTestFilePath(['definitions.json'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonArtifactsReader()
+
+    with open(test_file, 'rb') as file_object:
+      generator = artifact_reader.ReadFileObject(file_object)
+
+      artifact_definition = next(generator)
+      self.assertEqual(artifact_definition.name, 'SecurityEventLogEvtx')
+
+      # Only the data of the first artifact definition should have been read.
+      file_size = os.fstat(file_object.fileno()).st_size
+      self.assertLess(file_object.tell(), file_size // 2)
+
+      artifact_definitions = list(generator)
+
+    self.assertEqual(len(artifact_definitions), 6)
+
+    with open(test_file, 'r', encoding='utf-8') as file_object:
+      expected_definition_values = json.load(file_object)
+
+    file_object = io.BytesIO(
+        json.dumps(expected_definition_values).encode('utf-16'))
+    definition_values = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadFileObject(file_object)]
+
+    self.assertEqual(definition_values, expected_definition_values)
+
+  @mock.patch.object(reader.JsonArtifactsReader, '_READ_BUFFER_SIZE', 16)
+  def testReadFileObjectWithEncodings(self):
+    """Tests the ReadFileObject function with encoded data."""
+    artifact_reader = reader.JsonArtifactsReader()
+
+    expected_definition_values = [{
+        'doc': '\u20ac caf\u00e9 \U0001f600.',
+        'name': 'TestEncoding',
+        'sources': [{'attributes': {'paths': ['/caf\u00e9']}, 'type': 'FILE'}]}]
+    json_string = json.dumps(expected_definition_values, ensure_ascii=False)
+
+    encoded_data = json_string.encode('utf-8')
+    # Make sure a multi-byte character is split at the buffer boundary.
+    encoded_data = b''.join([
+        b' ' * (15 - encoded_data.index('\u20ac'.encode('utf-8'))),
+        encoded_data])
+
+    for file_object in (
+        io.BytesIO(encoded_data), ShortReadBytesIO(encoded_data),
+        io.BytesIO(json_string.encode('utf-16')),
+        ShortReadBytesIO(json_string.encode('utf-16')),
+        ShortReadBytesIO(json_string.encode('utf-16-le'))):
+      definition_values = [
+          artifact_definition.AsDict() for artifact_definition in
+          artifact_reader.ReadFileObject(file_object)]
+
+      self.assertEqual(definition_values, expected_definition_values)
+
+    for data in (b'[{"name": "\xff"}]', b'["\xe2\x82'):
+      file_object = ShortReadBytesIO(data)
+      with self.assertRaises(errors.FormatError):
+        _ = list(artifact_reader.ReadFileObject(file_object))
+
+  def testReadFileObjectWithInvalidData(self):
+    """Tests the ReadFileObject function with invalid JSON data."""
+    artifact_reader = reader.JsonArtifactsReader()
+
+    for data in (
+        '', '{}', '[', '[{"name": "Test"}', '[] []', '[{},]', '[{} {}]', '[1]'):
+      file_object = io.StringIO(initial_value=data)
+      with self.assertRaises(errors.FormatError):
+        _ = list(artifact_reader.ReadFileObject(file_object))
+
+    file_object = io.StringIO(initial_value=' [ ] ')
+    artifact_definitions = list(artifact_reader.ReadFileObject(file_object))
+    self.assertEqual(artifact_definitions, [])
+
+  def testScanFile(self):
+    """Tests the ScanFile and ReadArtifactDefinitionAtLocation functions."""
+    test_file = self._GetTestFilePath(['definitions.json'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonArtifactsReader()
+
+    expected_artifact_definitions = list(artifact_reader.ReadFile(test_file))
+
+    locations = artifact_reader.ScanFile(test_file)
+    self.assertEqual(len(locations), len(expected_artifact_definitions))
+
+    for location, expected_artifact_definition in zip(
+        locations, expected_artifact_definitions):
+      self.assertEqual(location.name, expected_artifact_definition.name)
+      self.assertEqual(location.aliases, expected_artifact_definition.aliases)
+
+      artifact_definition = artifact_reader.ReadArtifactDefinitionAtLocation(
+          location)
+      self.assertEqual(
+          artifact_definition.AsDict(), expected_artifact_definition.AsDict())
+
+    location = locations[1]
+    location.offset = locations[2].offset
+    with self.assertRaises(errors.FormatError):
+      artifact_reader.ReadArtifactDefinitionAtLocation(location)
+
+  def testScanFileWithFormatError(self):
+    """Tests the ScanFile function with format errors."""
+    artifact_reader = reader.JsonArtifactsReader()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_path = os.path.join(temporary_directory, 'test.json')
+
+      for data in (
+          '', '{}', '[', '[{"name": "Test"}', '[] []', '[{"name": "Test"},]',
+          '[{"doc": "Missing name."}]', '[{"name": "Test"} {}]'):
+        with open(test_path, 'w', encoding='utf-8') as file_object:
+          file_object.write(data)
+
+        with self.assertRaises(errors.FormatError):
+          artifact_reader.ScanFile(test_path)
+
+      with open(test_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(
+            '\ufeff[\n{"name": "Caf\u00e9"},\n  {"name": "Test"}]\n')
+
+      locations = artifact_reader.ScanFile(test_path)
+      self.assertEqual(
+          [(location.name, location.offset, location.line_offset)
+           for location in locations],
+          [('Caf\u00e9', 5, 1), ('Test', 26, 2)])
+
   def testReadJsonFile(self):
     """Tests the ReadFile function."""
     test_file = self._GetTestFilePath(['definitions.json'])
@@ -332,5 +957,151 @@ class JsonArtifactsReaderTest(test_lib.BaseTestCase):
     self.assertEqual(len(artifact_definitions), 7)
 
 
+class JsonLinesArtifactsReaderTest(test_lib.BaseTestCase):
+  """JSON Lines artifacts reader tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetFileShards(self):
+    """Tests the GetFileShards function."""
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    shards = artifact_reader.GetFileShards(test_file, 1)
+    self.assertEqual(shards, [(0, None)])
+
+    shards = artifact_reader.GetFileShards(test_file, 4)
+    self.assertEqual(len(shards), 4)
+
+    with open(test_file, 'rb') as file_object:
+      file_data = file_object.read()
+
+    for start_offset, _ in shards[1:]:
+      self.assertEqual(file_data[start_offset - 1:start_offset], b'\n')
+
+    # Test that a file is not split into more shards than it has lines.
+    shards = artifact_reader.GetFileShards(test_file, 100)
+    self.assertEqual(len(shards), 7)
+
+    with self.assertRaises(ValueError):
+      artifact_reader.GetFileShards(test_file, 0)
+
+  def testReadFileShard(self):
+    """Tests the ReadFileShard function."""
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    expected_names = [
+        artifact_definition.name for artifact_definition in
+        artifact_reader.ReadFile(test_file)]
+    self.assertEqual(len(expected_names), 7)
+
+    names = []
+    for start_offset, end_offset in artifact_reader.GetFileShards(
+        test_file, 3):
+      names.extend([
+          artifact_definition.name for artifact_definition in
+          artifact_reader.ReadFileShard(test_file, start_offset, end_offset)])
+
+    self.assertEqual(names, expected_names)
+
+    # Test that shards that do not start at line boundaries contain every
+    # line exactly once.
+    file_size = os.stat(test_file).st_size
+    for shard_size in (1, 100, 333):
+      names = []
+      for start_offset in range(0, file_size, shard_size):
+        names.extend([
+            artifact_definition.name for artifact_definition in
+            artifact_reader.ReadFileShard(
+                test_file, start_offset, start_offset + shard_size)])
+
+      self.assertEqual(names, expected_names)
+
+  def testReadFileShardWithFormatError(self):
+    """Tests the ReadFileShard function with a format error."""
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    with open(test_file, 'rb') as file_object:
+      lines = file_object.readlines()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_path = os.path.join(temporary_directory, 'invalid.jsonl')
+      with open(test_path, 'wb') as file_object:
+        file_object.write(b''.join(lines[:5] + [b'{bogus\n'] + lines[5:]))
+
+      start_offset = len(b''.join(lines[:3])) + 1
+      with self.assertRaisesRegex(
+          errors.FormatError, 'After: .* at line: 6: '):
+        _ = list(artifact_reader.ReadFileShard(test_path, start_offset))
+
+      with self.assertRaisesRegex(
+          errors.FormatError, 'After: .* at line: 6: '):
+        _ = list(artifact_reader.ReadFile(test_path))
+
+  def testScanFile(self):
+    """Tests the ScanFile and ReadArtifactDefinitionAtLocation functions."""
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    expected_artifact_definitions = list(artifact_reader.ReadFile(test_file))
+
+    locations = artifact_reader.ScanFile(test_file)
+    self.assertEqual(len(locations), len(expected_artifact_definitions))
+
+    for location, expected_artifact_definition in zip(
+        locations, expected_artifact_definitions):
+      self.assertEqual(location.name, expected_artifact_definition.name)
+
+      artifact_definition = artifact_reader.ReadArtifactDefinitionAtLocation(
+          location)
+      self.assertEqual(
+          artifact_definition.AsDict(), expected_artifact_definition.AsDict())
+
+  def testReadFileObjectWithInvalidData(self):
+    """Tests the ReadFileObject function with invalid JSON data."""
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    for data in ('{', '[]', '[{"name": "Test"}]', '{} {}', '1'):
+      file_object = io.StringIO(initial_value=data)
+      with self.assertRaises(errors.FormatError):
+        _ = list(artifact_reader.ReadFileObject(file_object))
+
+    file_object = io.StringIO(initial_value='\n \n')
+    artifact_definitions = list(artifact_reader.ReadFileObject(file_object))
+    self.assertEqual(artifact_definitions, [])
+
+  @mock.patch.object(
+      reader.JsonLinesArtifactsReader, '_MINIMUM_RANGE_SIZE', 256)
+  def testReadFileWithWorkers(self):
+    """Tests the ReadFile function with worker processes."""
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonLinesArtifactsReader()
+
+    ranges = artifact_reader._GetFileRanges(test_file, 4)
+    self.assertEqual(len(ranges), 4)
+
+    expected_definition_values = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadFile(test_file)]
+
+    definition_values = [
+        artifact_definition.AsDict() for artifact_definition in
+        artifact_reader.ReadFile(test_file, number_of_workers=4)]
+
+    self.assertEqual(definition_values, expected_definition_values)
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the Windows Registry listing tagger."""
+
+import io
+import json
+import os
+import unittest
+
+from artifacts.scripts import registry_tagger
+
+from tests import test_lib
+
+
+class RegistryTaggerTest(test_lib.BaseTestCase):
+  """Class to test the Windows Registry listing tagger."""
+
+  # pylint: disable=protected-access
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: WindowsRunKeys',
+      'doc: Windows Run and RunOnce keys.',
+      'sources:',
+      '- type: REGISTRY_KEY',
+      '  attributes:',
+      '    keys:',
+      '    - \'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\'
+      'CurrentVersion\\Run\\*\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: WindowsTimezone',
+      'doc: Timezone settings.',
+      'sources:',
+      '- type: REGISTRY_VALUE',
+      '  attributes:',
+      '    key_value_pairs:',
+      '    - key: \'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Control\\'
+      'TimeZoneInformation\'',
+      '      value: \'TimeZoneKeyName\'',
+      'supported_os: [Windows]',
+      ''])
+
+  def _CreateTagger(self, temporary_directory, **kwargs):
+    """Creates a Windows Registry tagger.
+
+    Args:
+      temporary_directory (str): path of a temporary directory.
+      kwargs (dict[str, object]): keyword arguments of the Windows Registry
+          tagger.
+
+    Returns:
+      RegistryTagger: Windows Registry tagger.
+    """
+    definitions_path = os.path.join(temporary_directory, 'definitions.yaml')
+    with open(definitions_path, 'w', encoding='utf-8') as file_object:
+      file_object.write(self._TEST_DEFINITIONS)
+
+    return registry_tagger.RegistryTagger(definitions_path, **kwargs)
+
+  def _ParseOutput(self, output_file_object):
+    """Parses the tagged entries.
+
+    Args:
+      output_file_object (io.StringIO): tagged entries.
+
+    Returns:
+      list[dict[str, object]]: tagged entries.
+    """
+    return [
+        json.loads(line)
+        for line in output_file_object.getvalue().splitlines()]
+
+  def testTagFile(self):
+    """Tests the TagFile function."""
+    test_file_path = self._GetTestFilePath(['registry.reg'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      tagger = self._CreateTagger(temporary_directory, matches_only=True)
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFile(test_file_path, output_file_object)
+
+    self.assertEqual(result, (11, 4))
+
+    run_key_path = (
+        'HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run')
+    timezone_key_path = (
+        'HKEY_LOCAL_MACHINE\\SYSTEM\\ControlSet001\\Control\\'
+        'TimeZoneInformation')
+
+    self.assertEqual(self._ParseOutput(output_file_object), [
+        {'artifacts': ['WindowsRunKeys'], 'key': run_key_path,
+         'value': 'SecurityHealth'},
+        {'artifacts': ['WindowsRunKeys'], 'key': run_key_path,
+         'value': 'Quoted "name"'},
+        {'artifacts': ['WindowsTimezone'], 'key': timezone_key_path},
+        {'artifacts': ['WindowsTimezone'], 'key': timezone_key_path,
+         'value': 'TimeZoneKeyName'}])
+
+  def testTagFileObjectWithUTF16(self):
+    """Tests the TagFileObject function with an UTF-16 encoded listing."""
+    test_file_path = self._GetTestFilePath(['registry.reg'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    file_object = io.BytesIO(data.decode('utf-8').encode('utf-16'))
+
+    with test_lib.TempDirectory() as temporary_directory:
+      tagger = self._CreateTagger(temporary_directory)
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFileObject(file_object, output_file_object)
+
+    self.assertEqual(result, (11, 4))
+
+    entries = self._ParseOutput(output_file_object)
+    self.assertEqual(len(entries), 11)
+    self.assertEqual(entries[6], {
+        'artifacts': [], 'key': (
+            'HKEY_LOCAL_MACHINE\\SYSTEM\\ControlSet001\\Control\\'
+            'TimeZoneInformation'), 'value': ''})
+
+  def testTagFileObjectWithText(self):
+    """Tests the TagFileObject function with a text listing."""
+    listing = '\n'.join([
+        '\\Microsoft\\Windows\\CurrentVersion\\Run\tOneDrive',
+        '\\Microsoft\\Windows\\CurrentVersion\\Run',
+        ''])
+
+    with test_lib.TempDirectory() as temporary_directory:
+      tagger = self._CreateTagger(
+          temporary_directory, input_format='text',
+          key_path_prefix='HKEY_LOCAL_MACHINE\\Software\\')
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFileObject(
+          io.BytesIO(listing.encode('utf-8')), output_file_object)
+
+    self.assertEqual(result, (2, 1))
+
+    key_path = (
+        'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\CurrentVersion\\Run')
+    self.assertEqual(self._ParseOutput(output_file_object), [
+        {'artifacts': ['WindowsRunKeys'], 'key': key_path,
+         'value': 'OneDrive'},
+        {'artifacts': [], 'key': key_path}])
+
+  def testTagFileWithWorkers(self):
+    """Tests the TagFile function with worker processes."""
+    test_file_path = self._GetTestFilePath(['registry.reg'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'r', encoding='utf-8', newline='') as file_object:
+      header, _, keys = file_object.read().partition('\r\n')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      listing_path = os.path.join(temporary_directory, 'registry.reg')
+      with open(listing_path, 'w', encoding='utf-8', newline='') as file_object:
+        file_object.write(header)
+        file_object.write('\r\n')
+        for _ in range(200):
+          file_object.write(keys)
+
+      tagger = self._CreateTagger(temporary_directory)
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFile(listing_path, output_file_object)
+      expected_output = output_file_object.getvalue()
+
+      self.assertEqual(result, (2200, 800))
+
+      output_file_object = io.StringIO()
+      result = tagger.TagFile(
+          listing_path, output_file_object, number_of_workers=3)
+      self.assertEqual(result, (2200, 800))
+      self.assertEqual(output_file_object.getvalue(), expected_output)
+
+  def testTagFileWithWorkersAndUTF16(self):
+    """Tests the TagFile function with worker processes and UTF-16."""
+    test_file_path = self._GetTestFilePath(['registry.reg'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'r', encoding='utf-8', newline='') as file_object:
+      header, _, keys = file_object.read().partition('\r\n')
+
+    # The UTF-16 little-endian encoding of U+0A41 U+0100 contains an
+    # end-of-line at an odd offset.
+    keys = keys.replace('"1.0"', '"1.0 \u0a41\u0100"')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      tagger = self._CreateTagger(temporary_directory)
+
+      for encoding in ('utf-16-be', 'utf-16-le'):
+        listing_path = os.path.join(temporary_directory, 'registry.reg')
+        with open(listing_path, 'w', encoding=encoding,
+                  newline='') as file_object:
+          file_object.write('\ufeff')
+          file_object.write(header)
+          file_object.write('\r\n')
+          for _ in range(200):
+            file_object.write(keys)
+
+        output_file_object = io.StringIO()
+        result = tagger.TagFile(listing_path, output_file_object)
+        expected_output = output_file_object.getvalue()
+
+        self.assertEqual(result, (2200, 800))
+
+        output_file_object = io.StringIO()
+        result = tagger.TagFile(
+            listing_path, output_file_object, number_of_workers=3)
+        self.assertEqual(result, (2200, 800))
+        self.assertEqual(output_file_object.getvalue(), expected_output)
+
+        shards = tagger._GetFileShards(listing_path, encoding, 3)
+        self.assertEqual(len(shards), 3)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 """Tests for the artifact definitions registry."""
 
+import gc
 import io
+import json
+import os
+import shutil
+import sys
 import unittest
 
 from artifacts import errors
 from artifacts import reader
 from artifacts import registry
+from artifacts import source_type
 
 from tests import test_lib
 
@@ -16,6 +22,73 @@ class ArtifactDefinitionsRegistryTest(test_lib.BaseTestCase):
 
   # pylint: disable=protected-access
 
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: WindowsTest',
+      'doc: Windows test.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'C:\\Test\']}',
+      '- type: REGISTRY_KEY',
+      '  attributes: {keys: [\'HKEY_LOCAL_MACHINE\\Test\']}',
+      'supported_os: [Windows]',
+      '---',
+      'name: MixedTest',
+      'doc: Mixed test.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'/test\']}',
+      '  supported_os: [Linux]',
+      '- type: COMMAND',
+      '  attributes: {cmd: /bin/test, args: []}',
+      'supported_os: [Darwin, Linux]',
+      '---',
+      'name: GroupTest',
+      'doc: Group test.',
+      'sources:',
+      '- type: ARTIFACT_GROUP',
+      '  attributes: {names: [WindowsTest, MixedTest]}',
+      ''])
+
+  def _CreateTestRegistry(self):
+    """Creates a registry with the test artifact definitions.
+
+    Returns:
+      ArtifactDefinitionsRegistry: artifact definitions registry.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    return artifact_registry
+
+  def _GetObjectsSize(self, objects):
+    """Determines the size of objects including the objects they reference.
+
+    Objects that are referenced more than once are counted once.
+
+    Args:
+      objects (list[object]): objects.
+
+    Returns:
+      int: size of the objects in bytes.
+    """
+    object_identifiers = set()
+    objects_size = 0
+
+    objects = list(objects)
+    while objects:
+      value = objects.pop()
+      if isinstance(value, type) or id(value) in object_identifiers:
+        continue
+
+      object_identifiers.add(id(value))
+      objects_size += sys.getsizeof(value)
+      objects.extend(gc.get_referents(value))
+
+    return objects_size
+
   def testArtifactDefinitionsRegistry(self):
     """Tests the ArtifactDefinitionsRegistry functions."""
     test_file = self._GetTestFilePath(['definitions.yaml'])
@@ -75,6 +148,616 @@ class ArtifactDefinitionsRegistryTest(test_lib.BaseTestCase):
     with self.assertRaises(errors.FormatError):
       next(generator)
 
+  def testFreeze(self):
+    """Tests the Freeze function."""
+    artifact_registry = self._CreateTestRegistry()
+
+    frozen_registry = artifact_registry.Freeze()
+    self.assertIsInstance(
+        frozen_registry, registry.FrozenArtifactDefinitionsRegistry)
+    self.assertIs(frozen_registry.Freeze(), frozen_registry)
+
+    names = [
+        artifact_definition.name
+        for artifact_definition in frozen_registry.GetDefinitions()]
+    self.assertEqual(names, ['WindowsTest', 'MixedTest', 'GroupTest'])
+
+    artifact_definition = frozen_registry.GetDefinitionByName('MixedTest')
+    self.assertIsNot(
+        artifact_definition, artifact_registry.GetDefinitionByName(
+            'MixedTest'))
+    self.assertEqual(artifact_definition.sources[0].paths, ('/test',))
+    self.assertEqual(artifact_definition.sources[0].supported_os, ('Linux',))
+    self.assertEqual(
+        artifact_definition.AsDict(),
+        artifact_registry.GetDefinitionByName('MixedTest').AsDict())
+
+    sources = [
+        (artifact_definition.name, source.type_indicator)
+        for artifact_definition, source in frozen_registry.GetExpandedSources(
+            'GroupTest', supported_os='Linux')]
+    self.assertEqual(sources, [('MixedTest', 'FILE'), ('MixedTest', 'COMMAND')])
+
+    sources = list(frozen_registry.GetSourcesByTypeIndicator(
+        'FILE', supported_os='Darwin'))
+    self.assertEqual(sources, [])
+
+    self.assertEqual(frozen_registry.GetUndefinedArtifacts(), set())
+
+    with self.assertRaises(TypeError):
+      frozen_registry.DeregisterDefinition(artifact_definition)
+
+    with self.assertRaises(TypeError):
+      frozen_registry.RegisterDefinition(artifact_definition)
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    with self.assertRaises(TypeError):
+      frozen_registry.ReadFileObject(reader.YamlArtifactsReader(), file_object)
+
+    with self.assertRaises(AttributeError):
+      artifact_definition.sources.append(artifact_definition.sources[0])
+
+    # The shared copies of the artifact definitions and sources are frozen.
+    with self.assertRaises(TypeError):
+      artifact_definition.description = 'Changed mixed test.'
+
+    with self.assertRaises(TypeError):
+      artifact_definition.sources[0].paths = ('/changed',)
+
+    with self.assertRaises(TypeError):
+      del artifact_definition.sources[0].supported_os
+
+    self.assertEqual(artifact_definition.description, 'Mixed test.')
+    self.assertIsInstance(
+        artifact_definition.sources[0], source_type.FileSourceType)
+
+  def testFreezeWithKeyValuePairs(self):
+    """Tests the Freeze function with Windows Registry value sources."""
+    test_data = '\n'.join([
+        'name: WindowsValueTest',
+        'doc: Windows value test.',
+        'sources:',
+        '- type: REGISTRY_VALUE',
+        '  attributes:',
+        '    key_value_pairs:',
+        '    - {key: \'HKEY_LOCAL_MACHINE\\Test\', value: \'Test\'}',
+        'supported_os: [Windows]',
+        ''])
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=test_data)
+    artifact_registry.ReadFileObject(reader.YamlArtifactsReader(), file_object)
+
+    frozen_registry = artifact_registry.Freeze()
+
+    artifact_definition = frozen_registry.GetDefinitionByName(
+        'WindowsValueTest')
+    key_value_pair = artifact_definition.sources[0].key_value_pairs[0]
+    self.assertEqual(key_value_pair['key'], 'HKEY_LOCAL_MACHINE\\Test')
+
+    with self.assertRaises(TypeError):
+      key_value_pair['value'] = 'Changed'
+
+    self.assertEqual(
+        artifact_definition.AsDict(),
+        artifact_registry.GetDefinitionByName('WindowsValueTest').AsDict())
+
+  def testFreezeWithFilteredArtifacts(self):
+    """Tests that snapshots with different filtered artifacts differ."""
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(
+        artifact_reader, file_object, supported_os=['Windows'])
+
+    self.assertEqual(
+        artifact_registry.GetFilteredArtifacts(), set(['MixedTest']))
+
+    other_artifact_registry = self._CreateTestRegistry()
+    other_artifact_registry.DeregisterDefinition(
+        other_artifact_registry.GetDefinitionByName('MixedTest'))
+
+    frozen_registry = artifact_registry.Freeze()
+    other_frozen_registry = other_artifact_registry.Freeze()
+
+    self.assertEqual(
+        frozen_registry.GetDefinitionDigest('GroupTest'),
+        other_frozen_registry.GetDefinitionDigest('GroupTest'))
+    self.assertNotEqual(
+        frozen_registry.GetUndefinedArtifacts(),
+        other_frozen_registry.GetUndefinedArtifacts())
+    self.assertNotEqual(frozen_registry, other_frozen_registry)
+
+  def testFreezeStructuralSharing(self):
+    """Tests that snapshots share artifact definitions and sources."""
+    frozen_registry = self._CreateTestRegistry().Freeze()
+    other_frozen_registry = self._CreateTestRegistry().Freeze()
+
+    self.assertEqual(frozen_registry, other_frozen_registry)
+    self.assertEqual(hash(frozen_registry), hash(other_frozen_registry))
+    self.assertEqual(len(set([frozen_registry, other_frozen_registry])), 1)
+
+    for artifact_definition in frozen_registry.GetDefinitions():
+      self.assertIs(
+          other_frozen_registry.GetDefinitionByName(artifact_definition.name),
+          artifact_definition)
+
+    artifact_registry = self._CreateTestRegistry()
+    artifact_definition = artifact_registry.GetDefinitionByName('WindowsTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+    artifact_definition.description = 'Changed Windows test.'
+    artifact_registry.RegisterDefinition(artifact_definition)
+
+    other_frozen_registry = artifact_registry.Freeze()
+    self.assertNotEqual(frozen_registry, other_frozen_registry)
+    self.assertNotEqual(
+        frozen_registry.fingerprint, other_frozen_registry.fingerprint)
+
+    self.assertEqual(
+        frozen_registry.GetDefinitionDigest('MixedTest'),
+        other_frozen_registry.GetDefinitionDigest('mixedtest'))
+    self.assertNotEqual(
+        frozen_registry.GetDefinitionDigest('WindowsTest'),
+        other_frozen_registry.GetDefinitionDigest('WindowsTest'))
+    self.assertIsNone(frozen_registry.GetDefinitionDigest('Bogus'))
+
+    # The changed definition is copied but its sources are shared.
+    artifact_definition = frozen_registry.GetDefinitionByName('WindowsTest')
+    other_artifact_definition = other_frozen_registry.GetDefinitionByName(
+        'WindowsTest')
+    self.assertIsNot(artifact_definition, other_artifact_definition)
+    self.assertIs(
+        artifact_definition.sources[0], other_artifact_definition.sources[0])
+
+  def testGetDefinitionsBySupportedOS(self):
+    """Tests the GetDefinitionsBySupportedOS function."""
+    artifact_registry = self._CreateTestRegistry()
+
+    names = [
+        artifact_definition.name for artifact_definition in
+        artifact_registry.GetDefinitionsBySupportedOS('Windows')]
+    self.assertEqual(names, ['WindowsTest'])
+
+    names = [
+        artifact_definition.name for artifact_definition in
+        artifact_registry.GetDefinitionsBySupportedOS('Darwin')]
+    self.assertEqual(names, ['MixedTest'])
+
+    names = list(artifact_registry.GetDefinitionsBySupportedOS('ESXi'))
+    self.assertEqual(names, [])
+
+    artifact_definition = artifact_registry.GetDefinitionByName('WindowsTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    names = list(artifact_registry.GetDefinitionsBySupportedOS('Windows'))
+    self.assertEqual(names, [])
+
+    artifact_registry.RegisterDefinition(artifact_definition)
+
+    names = [
+        artifact_definition.name for artifact_definition in
+        artifact_registry.GetDefinitionsBySupportedOS('Windows')]
+    self.assertEqual(names, ['WindowsTest'])
+
+  def testGetReferencingGroups(self):
+    """Tests the GetReferencingGroups function."""
+    test_definitions = '\n'.join([
+        'name: NestedGroupTest',
+        'doc: Nested group test.',
+        'sources:',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [GroupTest, MixedTest]}',
+        ''])
+
+    artifact_registry = self._CreateTestRegistry()
+    artifact_reader = reader.YamlArtifactsReader()
+
+    file_object = io.StringIO(initial_value=test_definitions)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    group_names = artifact_registry.GetReferencingGroups('WindowsTest')
+    self.assertEqual(group_names, set(['GroupTest']))
+
+    group_names = artifact_registry.GetReferencingGroups(
+        'WindowsTest', transitive=True)
+    self.assertEqual(group_names, set(['GroupTest', 'NestedGroupTest']))
+
+    group_names = artifact_registry.GetReferencingGroups('MixedTest')
+    self.assertEqual(group_names, set(['GroupTest', 'NestedGroupTest']))
+
+    group_names = artifact_registry.GetReferencingGroups('NestedGroupTest')
+    self.assertEqual(group_names, set())
+
+    # Test that deregistering an artifact group retires its references.
+    artifact_definition = artifact_registry.GetDefinitionByName('GroupTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    group_names = artifact_registry.GetReferencingGroups(
+        'WindowsTest', transitive=True)
+    self.assertEqual(group_names, set())
+
+    group_names = artifact_registry.GetReferencingGroups('MixedTest')
+    self.assertEqual(group_names, set(['NestedGroupTest']))
+
+    undefined_artifacts = artifact_registry.GetUndefinedArtifacts()
+    self.assertEqual(undefined_artifacts, set(['GroupTest']))
+
+    artifact_definition = artifact_registry.GetDefinitionByName(
+        'NestedGroupTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    undefined_artifacts = artifact_registry.GetUndefinedArtifacts()
+    self.assertEqual(undefined_artifacts, set())
+
+  def testGetSourcesBySupportedOS(self):
+    """Tests the GetSourcesBySupportedOS function."""
+    artifact_registry = self._CreateTestRegistry()
+
+    sources = [
+        (artifact_definition.name, source.type_indicator)
+        for artifact_definition, source in
+        artifact_registry.GetSourcesBySupportedOS('Linux')]
+    self.assertEqual(sources, [('MixedTest', 'FILE'), ('MixedTest', 'COMMAND')])
+
+    # Test that a source without supported_os uses that of the definition.
+    sources = [
+        (artifact_definition.name, source.type_indicator)
+        for artifact_definition, source in
+        artifact_registry.GetSourcesBySupportedOS('Darwin')]
+    self.assertEqual(sources, [('MixedTest', 'COMMAND')])
+
+    artifact_definition = artifact_registry.GetDefinitionByName('MixedTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    sources = list(artifact_registry.GetSourcesBySupportedOS('Linux'))
+    self.assertEqual(sources, [])
+
+  def testGetExpandedDefinitions(self):
+    """Tests the GetExpandedDefinitions function."""
+    artifact_registry = self._CreateTestRegistry()
+
+    names = [
+        artifact_definition.name for artifact_definition in
+        artifact_registry.GetExpandedDefinitions('GroupTest')]
+    self.assertEqual(names, ['WindowsTest', 'MixedTest'])
+
+    names = [
+        artifact_definition.name for artifact_definition in
+        artifact_registry.GetExpandedDefinitions(
+            'GroupTest', supported_os='Linux')]
+    self.assertEqual(names, ['MixedTest'])
+
+    names = list(artifact_registry.GetExpandedDefinitions('Bogus'))
+    self.assertEqual(names, [])
+
+  def testGetExpandedSources(self):
+    """Tests the GetExpandedSources function."""
+    test_definitions = '\n'.join([
+        'name: NestedGroupTest',
+        'doc: Nested group test.',
+        'sources:',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [GroupTest, MixedTest, LateTest]}',
+        ''])
+
+    artifact_registry = self._CreateTestRegistry()
+    artifact_reader = reader.YamlArtifactsReader()
+
+    file_object = io.StringIO(initial_value=test_definitions)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    sources = [
+        (artifact_definition.name, source.type_indicator)
+        for artifact_definition, source in
+        artifact_registry.GetExpandedSources('NestedGroupTest')]
+    self.assertEqual(sources, [
+        ('WindowsTest', 'FILE'), ('WindowsTest', 'REGISTRY_KEY'),
+        ('MixedTest', 'FILE'), ('MixedTest', 'COMMAND')])
+
+    sources = [
+        (artifact_definition.name, source.type_indicator)
+        for artifact_definition, source in
+        artifact_registry.GetExpandedSources(
+            'NestedGroupTest', supported_os='Darwin')]
+    self.assertEqual(sources, [('MixedTest', 'COMMAND')])
+
+    self.assertIn(
+        'nestedgrouptest', artifact_registry._expanded_sources_by_name)
+    self.assertIn('grouptest', artifact_registry._expanded_sources_by_name)
+
+    # Test that registering a referenced definition invalidates only the
+    # expansions that depend on it.
+    test_definitions = '\n'.join([
+        'name: LateTest',
+        'doc: Late test.',
+        'sources:',
+        '- type: PATH',
+        '  attributes: {paths: [/late]}',
+        'supported_os: [Linux]',
+        ''])
+
+    file_object = io.StringIO(initial_value=test_definitions)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    self.assertNotIn(
+        'nestedgrouptest', artifact_registry._expanded_sources_by_name)
+    self.assertIn('grouptest', artifact_registry._expanded_sources_by_name)
+
+    sources = [
+        artifact_definition.name for artifact_definition, _ in
+        artifact_registry.GetExpandedSources(
+            'NestedGroupTest', supported_os='Linux')]
+    self.assertEqual(sources, ['MixedTest', 'MixedTest', 'LateTest'])
+
+    # Test that deregistering a referenced definition invalidates the
+    # expansions that depend on it.
+    artifact_definition = artifact_registry.GetDefinitionByName('WindowsTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    self.assertNotIn('grouptest', artifact_registry._expanded_sources_by_name)
+
+    sources = [
+        artifact_definition.name for artifact_definition, _ in
+        artifact_registry.GetExpandedSources('NestedGroupTest')]
+    self.assertEqual(sources, ['MixedTest', 'MixedTest', 'LateTest'])
+
+    # Test that register and deregister cycles do not accumulate dependents.
+    dependents_by_name = artifact_registry._expansion_dependents_by_name
+    expected_dependents_by_name = {
+        name: set(dependents) for name, dependents in
+        dependents_by_name.items()}
+
+    artifact_definition = artifact_registry.GetDefinitionByName('LateTest')
+    for _ in range(3):
+      artifact_registry.DeregisterDefinition(artifact_definition)
+      self.assertNotIn(
+          'nestedgrouptest', artifact_registry._expanded_sources_by_name)
+      for dependents in dependents_by_name.values():
+        self.assertNotIn('nestedgrouptest', dependents)
+
+      artifact_registry.RegisterDefinition(artifact_definition)
+      _ = list(artifact_registry.GetExpandedSources('NestedGroupTest'))
+
+    self.assertEqual(dependents_by_name, expected_dependents_by_name)
+
+  def testGetExpandedSourcesWithCycle(self):
+    """Tests the GetExpandedSources function with a cycle."""
+    test_definitions = '\n'.join([
+        'name: CycleTest1',
+        'doc: Cycle test.',
+        'sources:',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [CycleTest2]}',
+        '---',
+        'name: CycleTest2',
+        'doc: Cycle test.',
+        'sources:',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [MixedTest, CycleTest1]}',
+        ''])
+
+    artifact_registry = self._CreateTestRegistry()
+    artifact_reader = reader.YamlArtifactsReader()
+
+    file_object = io.StringIO(initial_value=test_definitions)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    with self.assertRaisesRegex(
+        errors.CyclicDependencyError,
+        'CycleTest1 -> CycleTest2 -> CycleTest1'):
+      list(artifact_registry.GetExpandedSources('CycleTest1'))
+
+  def testGetSourcesByTypeIndicator(self):
+    """Tests the GetSourcesByTypeIndicator function."""
+    artifact_registry = self._CreateTestRegistry()
+
+    sources = [
+        artifact_definition.name for artifact_definition, _ in
+        artifact_registry.GetSourcesByTypeIndicator('FILE')]
+    self.assertEqual(sources, ['WindowsTest', 'MixedTest'])
+
+    sources = [
+        artifact_definition.name for artifact_definition, _ in
+        artifact_registry.GetSourcesByTypeIndicator(
+            'FILE', supported_os='Linux')]
+    self.assertEqual(sources, ['MixedTest'])
+
+    sources = list(artifact_registry.GetSourcesByTypeIndicator(
+        'FILE', supported_os='Darwin'))
+    self.assertEqual(sources, [])
+
+    sources = list(artifact_registry.GetSourcesByTypeIndicator('WMI'))
+    self.assertEqual(sources, [])
+
+    artifact_definition = artifact_registry.GetDefinitionByName('WindowsTest')
+    artifact_registry.DeregisterDefinition(artifact_definition)
+
+    sources = [
+        artifact_definition.name for artifact_definition, _ in
+        artifact_registry.GetSourcesByTypeIndicator('FILE')]
+    self.assertEqual(sources, ['MixedTest'])
+
+    sources = list(artifact_registry.GetSourcesByTypeIndicator('REGISTRY_KEY'))
+    self.assertEqual(sources, [])
+
+  def testReadFromDirectoryMemoryFootprint(self):
+    """Tests the memory footprint of ReadFromDirectory."""
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_definitions = list(artifact_reader.ReadDirectory(self._DATA_PATH))
+
+    # The dictionaries and lists of the JSON representation, without shared
+    # strings, are the baseline footprint. Both are measured in the same run
+    # so that the footprint does not depend on the version of Python.
+    definition_values = json.loads(json.dumps([
+        artifact_definition.AsDict()
+        for artifact_definition in artifact_definitions]))
+
+    definitions_footprint = self._GetObjectsSize(artifact_definitions)
+    baseline_footprint = self._GetObjectsSize(definition_values)
+
+    # The footprint is about 65 percent of the baseline footprint.
+    self.assertLess(definitions_footprint, baseline_footprint * 0.75)
+
+    artifact_definition = artifact_definitions[0]
+    self.assertFalse(hasattr(artifact_definition, '__dict__'))
+    self.assertFalse(hasattr(artifact_definition.sources[0], '__dict__'))
+
+    # Identical paths of different definitions are shared.
+    paths = {}
+    for artifact_definition in artifact_definitions:
+      for source in artifact_definition.sources:
+        for path in getattr(source, 'paths', None) or []:
+          self.assertIs(paths.setdefault(path, path), path)
+
+  def testReadFromDirectoryWithWorkers(self):
+    """Tests the ReadFromDirectory function with worker processes."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(artifact_reader, self._DATA_PATH)
+    expected_names = [
+        artifact_definition.name
+        for artifact_definition in artifact_registry.GetDefinitions()]
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(
+        artifact_reader, self._DATA_PATH, number_of_workers=2)
+    names = [
+        artifact_definition.name
+        for artifact_definition in artifact_registry.GetDefinitions()]
+
+    self.assertEqual(names, expected_names)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_file = self._GetTestFilePath(['definitions.yaml'])
+      for filename in ('a.yaml', 'b.yaml', 'c.yaml'):
+        shutil.copy(test_file, os.path.join(temporary_directory, filename))
+
+      artifact_registry = registry.ArtifactDefinitionsRegistry()
+      with self.assertRaisesRegex(KeyError, 'SecurityEventLogEvtxFile'):
+        artifact_registry.ReadFromDirectory(
+            artifact_reader, temporary_directory, number_of_workers=3)
+
+      # The definitions of the first file are registered before the error.
+      definitions = list(artifact_registry.GetDefinitions())
+      self.assertEqual(len(definitions), 7)
+
+  def testReadIndexFromDirectory(self):
+    """Tests the ReadIndexFromDirectory function."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(artifact_reader, self._DATA_PATH)
+    expected_definition_values = sorted([
+        artifact_definition.AsDict()
+        for artifact_definition in artifact_registry.GetDefinitions()],
+        key=lambda definition_values: definition_values['name'])
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadIndexFromDirectory(artifact_reader, self._DATA_PATH)
+
+    # pylint: disable=protected-access
+    self.assertEqual(len(artifact_registry._artifact_definitions_by_name), 0)
+
+    artifact_definition = artifact_registry.GetDefinitionByName(
+        'WindowsRunKeys')
+    self.assertIsNotNone(artifact_definition)
+    self.assertEqual(artifact_definition.name, 'WindowsRunKeys')
+
+    artifact_definition = artifact_registry.GetDefinitionByAlias(
+        'windowsmsofficeautosave')
+    self.assertIsNotNone(artifact_definition)
+    self.assertEqual(artifact_definition.name, 'MicrosoftOfficeAutosave')
+
+    self.assertIsNone(artifact_registry.GetDefinitionByName('Bogus'))
+    self.assertEqual(len(artifact_registry._artifact_definitions_by_name), 2)
+
+    with self.assertRaises(KeyError):
+      artifact_registry.ReadIndexFromDirectory(
+          artifact_reader, self._DATA_PATH)
+
+    test_artifact_definition = artifact_reader.ReadArtifactDefinitionValues({
+        'name': 'WindowsRunKeys',
+        'doc': 'Test.',
+        'sources': [{'type': 'FILE', 'attributes': {'paths': ['/test']}}]})
+    with self.assertRaises(KeyError):
+      artifact_registry.RegisterDefinition(test_artifact_definition)
+
+    self.assertEqual(artifact_registry.GetUndefinedArtifacts(), set())
+
+    definition_values = sorted([
+        artifact_definition.AsDict()
+        for artifact_definition in artifact_registry.GetDefinitions()],
+        key=lambda definition_values: definition_values['name'])
+    self.assertEqual(definition_values, expected_definition_values)
+
+  def testReadFromDirectoryWithSupportedOS(self):
+    """Tests the ReadFromDirectory function with supported OS filter."""
+    artifact_reader = reader.YamlArtifactsReader()
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    artifact_registry.ReadFromDirectory(
+        artifact_reader, self._DATA_PATH, supported_os=['Linux'])
+
+    for artifact_definition in artifact_registry.GetDefinitions():
+      if artifact_definition.supported_os:
+        self.assertIn('Linux', artifact_definition.supported_os)
+
+      for source in artifact_definition.sources:
+        if source.supported_os:
+          self.assertIn('Linux', source.supported_os)
+
+    self.assertEqual(artifact_registry.GetUndefinedArtifacts(), set())
+    self.assertNotEqual(artifact_registry.GetFilteredArtifacts(), set())
+
+  def testReadFileObjectWithSupportedOS(self):
+    """Tests the ReadFileObject function with supported OS filter."""
+    test_data = '\n'.join([
+        'name: WindowsTest',
+        'doc: Windows test.',
+        'sources:',
+        '- type: FILE',
+        '  attributes: {paths: [\'C:\\Test\']}',
+        'supported_os: [Windows]',
+        '---',
+        'name: GroupTest',
+        'doc: Group test.',
+        'sources:',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [WindowsTest, UndefinedTest]}',
+        ''])
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=test_data)
+    artifact_registry.ReadFileObject(
+        artifact_reader, file_object, supported_os=['Linux'])
+
+    self.assertIsNone(artifact_registry.GetDefinitionByName('WindowsTest'))
+    self.assertIsNotNone(artifact_registry.GetDefinitionByName('GroupTest'))
+
+    self.assertEqual(
+        artifact_registry.GetUndefinedArtifacts(), set(['UndefinedTest']))
+    self.assertEqual(
+        artifact_registry.GetFilteredArtifacts(), set(['WindowsTest']))
+
+    # The names filtered by a previous read of the reader are not carried
+    # into another registry.
+    test_data = '\n'.join(test_data.split('\n')[7:])
+
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=test_data)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    self.assertEqual(
+        artifact_registry.GetUndefinedArtifacts(),
+        set(['UndefinedTest', 'WindowsTest']))
+    self.assertEqual(artifact_registry.GetFilteredArtifacts(), set())
+
   def testSourceTypeFunctions(self):
     """Tests the source type functions."""
     number_of_source_types = len(
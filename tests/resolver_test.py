@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the artifact definitions file system resolver."""
+
+import io
+import os
+import unittest
+
+from artifacts import reader
+from artifacts import registry
+from artifacts import resolver
+
+from tests import test_lib
+
+
+class FileSystemResolverTest(test_lib.BaseTestCase):
+  """Class to test the artifact definitions file system resolver."""
+
+  _TEST_DEFINITIONS = '\n'.join([
+      'name: WindowsSystemRegistryFiles',
+      'doc: Windows system Registry files.',
+      'sources:',
+      '- type: FILE',
+      '  attributes:',
+      '    paths: [\'%%environ_systemroot%%\\System32\\config\\SAM\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: RecycleBin',
+      'doc: Recycle Bin.',
+      'sources:',
+      '- type: PATH',
+      '  attributes:',
+      '    paths: [\'\\$Recycle.Bin\\**2\']',
+      '    separator: \'\\\'',
+      'supported_os: [Windows]',
+      '---',
+      'name: BashHistory',
+      'doc: Bash history.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'%%users.homedir%%/.bash_history\']}',
+      'supported_os: [Linux]',
+      '---',
+      'name: AptHistoryLog',
+      'doc: APT history log.',
+      'sources:',
+      '- type: FILE',
+      '  attributes: {paths: [\'/var/log/apt/history.log*\']}',
+      'supported_os: [Linux]',
+      ''])
+
+  _TEST_FILES = [
+      '$Recycle.Bin/S-1-5-21-1001/$IABC.txt',
+      '$Recycle.Bin/S-1-5-21-1001/$RABC/nested.txt',
+      'WINDOWS/System32/CONFIG/SAM',
+      'WINDOWS/System32/CONFIG/SYSTEM',
+      'home/user1/.bash_history',
+      'home/user1/.profile',
+      'home/user2/.bash_history',
+      'proc/1/status',
+      'var/log/apt/history.log',
+      'var/log/apt/history.log.1.gz',
+      'var/log/apt/term.log',
+      'var/log/syslog']
+
+  def _CreateTestResolver(self):
+    """Creates a file system resolver with the test artifact definitions.
+
+    Returns:
+      FileSystemResolver: file system resolver.
+    """
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+
+    file_object = io.StringIO(initial_value=self._TEST_DEFINITIONS)
+    artifact_registry.ReadFileObject(artifact_reader, file_object)
+
+    file_system_resolver = resolver.FileSystemResolver()
+    file_system_resolver.AddSourcesFromRegistry(artifact_registry)
+
+    return file_system_resolver
+
+  def _CreateTestFiles(self, root_path):
+    """Creates the test files.
+
+    Args:
+      root_path (str): path of the root of the file system.
+    """
+    for relative_path in self._TEST_FILES:
+      path = os.path.join(root_path, *relative_path.split('/'))
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+      with open(path, 'wb'):
+        pass
+
+  def _Resolve(self, root_path, number_of_workers=1):
+    """Resolves the paths of the test artifact definitions.
+
+    Args:
+      root_path (str): path of the root of the file system.
+      number_of_workers (Optional[int]): number of worker threads.
+
+    Returns:
+      tuple[FileSystemResolver, list[tuple[str, str]]]: file system resolver
+          and path relative to the root and artifact definition name of the
+          resolved paths.
+    """
+    file_system_resolver = self._CreateTestResolver()
+    resolved_paths = file_system_resolver.Resolve(
+        root_path, number_of_workers=number_of_workers)
+
+    resolved_paths = [
+        (os.path.relpath(path, root_path).replace(os.sep, '/'),
+         artifact_definition.name)
+        for path, artifact_definition, _, _ in resolved_paths]
+
+    return file_system_resolver, resolved_paths
+
+  def testResolve(self):
+    """Tests the Resolve function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      self._CreateTestFiles(temporary_directory)
+
+      file_system_resolver, resolved_paths = self._Resolve(
+          temporary_directory)
+
+    self.assertEqual(resolved_paths, [
+        ('$Recycle.Bin/S-1-5-21-1001', 'RecycleBin'),
+        ('$Recycle.Bin/S-1-5-21-1001/$IABC.txt', 'RecycleBin'),
+        ('$Recycle.Bin/S-1-5-21-1001/$RABC', 'RecycleBin'),
+        ('WINDOWS/System32/CONFIG/SAM', 'WindowsSystemRegistryFiles'),
+        ('home/user1/.bash_history', 'BashHistory'),
+        ('home/user2/.bash_history', 'BashHistory'),
+        ('var/log/apt/history.log', 'AptHistoryLog'),
+        ('var/log/apt/history.log.1.gz', 'AptHistoryLog')])
+
+    self.assertEqual(file_system_resolver.number_of_matched_entries, 8)
+
+    # The proc directory and the $RABC directory, which is deeper than the
+    # globstar, are pruned.
+    self.assertEqual(file_system_resolver.number_of_pruned_directories, 2)
+
+    # The entries in the user and log directories are looked up instead of
+    # listed, hence .profile and syslog are not visited.
+    self.assertEqual(file_system_resolver.number_of_visited_entries, 21)
+
+  def testResolveWithWorkers(self):
+    """Tests the Resolve function with worker threads."""
+    with test_lib.TempDirectory() as temporary_directory:
+      self._CreateTestFiles(temporary_directory)
+
+      _, expected_resolved_paths = self._Resolve(temporary_directory)
+
+      file_system_resolver, resolved_paths = self._Resolve(
+          temporary_directory, number_of_workers=3)
+
+    self.assertEqual(resolved_paths, expected_resolved_paths)
+    self.assertEqual(file_system_resolver.number_of_matched_entries, 8)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -32,6 +32,34 @@ class ArtifactDefinitionsValidatorTest(test_lib.BaseTestCase):
           f'Artifacts group referencing undefined artifacts: '
           f'{undefined_artifacts:s}'))
 
+  def testCheckRedundantPaths(self):
+    """Tests the CheckRedundantPaths function."""
+    validator_object = validator.ArtifactDefinitionsValidator()
+
+    with test_lib.TempDirectory() as temporary_directory:
+      definitions_file = os.path.join(temporary_directory, 'test.yaml')
+      with open(definitions_file, 'w', encoding='utf-8') as file_object:
+        file_object.write('\n'.join([
+            'name: AptLogFiles',
+            'doc: APT log files.',
+            'sources:',
+            '- type: FILE',
+            '  attributes: {paths: [\'/var/log/apt/*.log\']}',
+            'supported_os: [Linux]',
+            '---',
+            'name: LinuxLogFiles',
+            'doc: Log files.',
+            'sources:',
+            '- type: FILE',
+            '  attributes: {paths: [\'/var/log/**\', \'/var/log/*.log\']}',
+            'supported_os: [Linux]']))
+
+      result = validator_object.CheckFile(definitions_file)
+      self.assertTrue(result)
+
+    number_of_redundant_paths = validator_object.CheckRedundantPaths()
+    self.assertEqual(number_of_redundant_paths, 1)
+
   # TODO: add tests that deliberately provide invalid definitions to see
   # if the validator works correctly.
 
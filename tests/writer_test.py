@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Tests for the artifact definitions readers."""
 
+import io
+import json
 import os
 import unittest
 
@@ -46,6 +48,197 @@ class ArtifactsWriterTest(test_lib.BaseTestCase):
     self._TestArtifactsConversion(
         artifact_reader, artifact_writer, 'definitions.json')
 
+  def testJsonLinesWriter(self):
+    """Tests conversion with the JsonLinesArtifactsWriter."""
+    artifact_reader = reader.JsonLinesArtifactsReader()
+    artifact_writer = writer.JsonLinesArtifactsWriter()
+    self._TestArtifactsConversion(
+        artifact_reader, artifact_writer, 'definitions.jsonl')
+
+  def testJsonLinesWriterAppend(self):
+    """Tests appending with the JsonLinesArtifactsWriter."""
+    test_file = self._GetTestFilePath(['definitions.jsonl'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_reader = reader.JsonLinesArtifactsReader()
+    artifact_writer = writer.JsonLinesArtifactsWriter()
+
+    artifact_definitions = list(artifact_reader.ReadFile(test_file))
+
+    with test_lib.TempDirectory() as temporary_directory:
+      output_file = os.path.join(temporary_directory, 'definitions.jsonl')
+
+      artifact_writer.AppendArtifactsFile(artifact_definitions[:3], output_file)
+      artifact_writer.AppendArtifactsFile(artifact_definitions[3:], output_file)
+
+      appended_artifact_definitions = list(
+          artifact_reader.ReadFile(output_file))
+
+    self.assertEqual(
+        [artifact.AsDict() for artifact in artifact_definitions],
+        [artifact.AsDict() for artifact in appended_artifact_definitions])
+
+  def _GenerateArtifactDefinitions(
+      self, artifact_definitions, file_object, output_sizes):
+    """Generates artifact definitions and tracks the size of the output.
+
+    Args:
+      artifact_definitions (list[ArtifactDefinition]): artifact definitions.
+      file_object (io.StringIO): file-like object the output is written to.
+      output_sizes (list[int]): sizes of the output before each artifact
+          definition was generated.
+
+    Yields:
+      ArtifactDefinition: an artifact definition.
+    """
+    for artifact_definition in artifact_definitions:
+      output_sizes.append(len(file_object.getvalue()))
+      yield artifact_definition
+
+  def testWriteArtifactsFileObjectWithGenerator(self):
+    """Tests the WriteArtifactsFileObject function with a generator."""
+    test_file = self._GetTestFilePath(['definitions.yaml'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_definitions = list(
+        reader.YamlArtifactsReader().ReadFile(test_file))
+
+    for artifact_reader, artifact_writer in (
+        (reader.JsonArtifactsReader(), writer.JsonArtifactsWriter()),
+        (reader.JsonLinesArtifactsReader(), writer.JsonLinesArtifactsWriter()),
+        (reader.YamlArtifactsReader(), writer.YamlArtifactsWriter())):
+      file_object = io.StringIO()
+      output_sizes = []
+
+      artifact_writer.WriteArtifactsFileObject(
+          self._GenerateArtifactDefinitions(
+              artifact_definitions, file_object, output_sizes),
+          file_object)
+
+      # Test that the output is written before the generator is exhausted.
+      self.assertEqual(len(output_sizes), len(artifact_definitions))
+      self.assertEqual(sorted(set(output_sizes)), output_sizes)
+
+      output_data = file_object.getvalue()
+      self.assertEqual(
+          output_data, artifact_writer.FormatArtifacts(artifact_definitions))
+
+      file_object = io.StringIO(output_data)
+      converted_artifact_definitions = list(
+          artifact_reader.ReadFileObject(file_object))
+
+      self.assertEqual(
+          [artifact.AsDict() for artifact in artifact_definitions],
+          [artifact.AsDict() for artifact in converted_artifact_definitions])
+
+  def testJsonWriterFormat(self):
+    """Tests that the JsonArtifactsWriter output is a JSON array."""
+    test_file = self._GetTestFilePath(['definitions.json'])
+    self._SkipIfPathNotExists(test_file)
+
+    artifact_definitions = list(
+        reader.JsonArtifactsReader().ReadFile(test_file))
+
+    artifact_writer = writer.JsonArtifactsWriter()
+    self.assertEqual(artifact_writer.FormatArtifacts([]), '[]')
+    self.assertEqual(
+        artifact_writer.FormatArtifacts(artifact_definitions),
+        json.dumps([artifact.AsDict() for artifact in artifact_definitions]))
+
+  def testYamlWriterFormat(self):
+    """Tests the canonical output of the YamlArtifactsWriter."""
+    test_data = '\n'.join([
+        'urls: [\'https://example.com/test\']',
+        'supported_os: [Windows]',
+        'sources:',
+        '- attributes:',
+        '    key_value_pairs:',
+        '    - {value: \'Test\', key: \'HKEY_LOCAL_MACHINE\\Test\'}',
+        '    - {key: \'HKEY_LOCAL_MACHINE\\Other\', value: \'Other\'}',
+        '  type: REGISTRY_VALUE',
+        '- type: FILE',
+        '  attributes:',
+        '    paths: [\'%%environ_systemroot%%\\Test.log\']',
+        '    separator: \'\\\'',
+        '- type: ARTIFACT_GROUP',
+        '  attributes: {names: [Test1, Test2]}',
+        '- type: COMMAND',
+        '  attributes:',
+        '    cmd: /sbin/iptables',
+        '    args:',
+        '    - -L',
+        '    - -n',
+        'doc: |',
+        '  Test.',
+        '',
+        '  Longer description.',
+        'aliases: [OtherTest]',
+        'name: Test',
+        ''])
+
+    expected_data = '\n'.join([
+        '---',
+        'name: Test',
+        'aliases: [OtherTest]',
+        'doc: |',
+        '  Test.',
+        '',
+        '  Longer description.',
+        'sources:',
+        '- type: REGISTRY_VALUE',
+        '  attributes:',
+        '    key_value_pairs:',
+        '    - {key: \'HKEY_LOCAL_MACHINE\\Test\', value: \'Test\'}',
+        '    - {key: \'HKEY_LOCAL_MACHINE\\Other\', value: \'Other\'}',
+        '- type: FILE',
+        '  attributes:',
+        '    paths: [\'%%environ_systemroot%%\\Test.log\']',
+        '    separator: \'\\\'',
+        '- type: ARTIFACT_GROUP',
+        '  attributes:',
+        '    names:',
+        '    - Test1',
+        '    - Test2',
+        '- type: COMMAND',
+        '  attributes:',
+        '    args: [\'-L\', \'-n\']',
+        '    cmd: /sbin/iptables',
+        'supported_os: [Windows]',
+        'urls: [\'https://example.com/test\']',
+        ''])
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_definitions = list(artifact_reader.ReadFileObject(
+        io.StringIO(test_data)))
+
+    for use_libyaml in (False, True):
+      artifact_writer = writer.YamlArtifactsWriter(use_libyaml=use_libyaml)
+      output_data = artifact_writer.FormatArtifacts(artifact_definitions)
+      self.assertEqual(output_data, expected_data)
+
+  def testYamlWriterWithDefinitionsData(self):
+    """Tests the YamlArtifactsWriter with the artifact definitions data."""
+    self._SkipIfPathNotExists(self._DATA_PATH)
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_definitions = list(artifact_reader.ReadDirectory(
+        self._DATA_PATH))
+
+    artifact_writer = writer.YamlArtifactsWriter(use_libyaml=False)
+    expected_output_data = artifact_writer.FormatArtifacts(
+        artifact_definitions)
+
+    artifact_writer = writer.YamlArtifactsWriter()
+    output_data = artifact_writer.FormatArtifacts(artifact_definitions)
+    self.assertEqual(output_data, expected_output_data)
+
+    converted_artifact_definitions = list(artifact_reader.ReadFileObject(
+        io.StringIO(output_data)))
+
+    self.assertEqual(
+        [artifact.AsDict() for artifact in artifact_definitions],
+        [artifact.AsDict() for artifact in converted_artifact_definitions])
+
   def testYamlWriter(self):
     """Tests conversion with the YamlArtifactsWriter."""
     artifact_reader = reader.YamlArtifactsReader()
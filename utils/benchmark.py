@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Script to benchmark artifact definitions processing."""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+# Change PYTHONPATH to include artifacts.
+sys.path.insert(0, '.')
+
+# pylint: disable=wrong-import-position
+from artifacts import knowledge_base
+from artifacts import definitions
+from artifacts import matcher
+from artifacts import overlap
+from artifacts import planner
+from artifacts import reader
+from artifacts import registry
+from artifacts import resolver
+from artifacts import writer
+
+
+class Benchmark(object):
+  """Benchmark of artifact definitions processing."""
+
+  _DEFAULT_DATA_PATH = os.path.join('artifacts', 'data')
+
+  _GLOB_RE = re.compile(r'\*\*[0-9]*|\*|\?|\[!?(.)[^]]*\]')
+
+  def __init__(self, number_of_repeats=3):
+    """Initializes a benchmark.
+
+    Args:
+      number_of_repeats (Optional[int]): number of times each measurement is
+          repeated, the fastest measurement is reported.
+    """
+    super(Benchmark, self).__init__()
+    self._number_of_repeats = number_of_repeats
+
+  def _CreateMergedCorpus(self, paths, corpus_path):
+    """Creates a merged corpus of artifact definitions files.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+      corpus_path (str): path of the directory of the merged corpus.
+
+    Returns:
+      int: number of files in the merged corpus.
+    """
+    number_of_files = 0
+    for directory_index, path in enumerate(paths):
+      for filename in sorted(os.listdir(path)):
+        if not filename.endswith('.yaml'):
+          continue
+
+        destination_filename = f'{directory_index:02d}_{filename:s}'
+        shutil.copyfile(
+            os.path.join(path, filename),
+            os.path.join(corpus_path, destination_filename))
+        number_of_files += 1
+
+    return number_of_files
+
+  def _CompareAllPatterns(self, overlap_analyzer, patterns):
+    """Compares every pair of globs.
+
+    Args:
+      overlap_analyzer (GlobOverlapAnalyzer): glob overlap analyzer.
+      patterns (list[GlobPattern]): globs.
+
+    Returns:
+      int: number of pairs of globs that overlap.
+    """
+    number_of_overlaps = 0
+    for index, pattern in enumerate(patterns):
+      for other_pattern in patterns[index + 1:]:
+        if overlap_analyzer.Compare(pattern, other_pattern):
+          number_of_overlaps += 1
+
+    return number_of_overlaps
+
+  def _CreateFileSystem(self, sample_paths, root_path):
+    """Creates a file system with sample paths and unrelated files.
+
+    Args:
+      sample_paths (list[str]): sample paths with "/" as separator.
+      root_path (str): path of the root of the file system.
+
+    Returns:
+      int: number of entries in the file system.
+    """
+    # Unrelated files, such as installed packages, make up most of a file
+    # system.
+    paths = list(sample_paths)
+    for index in range(2000):
+      paths.append(f'/usr/share/doc/package{index:d}/copyright')
+      paths.append(f'/Windows/WinSxS/component{index:d}/file.dll')
+
+    for path in sorted(set(paths)):
+      path = os.path.join(root_path, *path.strip('/').split('/'))
+      try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb'):
+          pass
+      except OSError:
+        # A sample path can be the parent directory of another sample path.
+        pass
+
+    number_of_entries = 0
+    for _, directory_names, filenames in os.walk(root_path):
+      number_of_entries += len(directory_names) + len(filenames)
+
+    return number_of_entries
+
+  def _CreateKnowledgeBase(self, number_of_user_accounts):
+    """Creates a Windows knowledge base with user accounts.
+
+    Args:
+      number_of_user_accounts (int): number of user accounts.
+
+    Returns:
+      KnowledgeBase: knowledge base.
+    """
+    user_accounts = [
+        knowledge_base.UserAccount(
+            homedir=f'C:\\Users\\user{index:d}',
+            sid=f'S-1-5-21-1-2-3-{index + 1000:d}', username=f'user{index:d}')
+        for index in range(number_of_user_accounts)]
+
+    return knowledge_base.KnowledgeBase(
+        environment_variables={
+            'AllUsersProfile': 'C:\\ProgramData',
+            'ProgramData': 'C:\\ProgramData',
+            'ProgramFiles': 'C:\\Program Files',
+            'SystemDrive': 'C:',
+            'SystemRoot': 'C:\\Windows'},
+        user_accounts=user_accounts)
+
+  def _ExpandPatterns(
+      self, parameter_expander, patterns, knowledge_base_object):
+    """Expands patterns.
+
+    Args:
+      parameter_expander (ParameterExpander): parameter expander.
+      patterns (list[str]): patterns.
+      knowledge_base_object (KnowledgeBase): knowledge base.
+
+    Returns:
+      list[ParameterExpansion]: expansions of the patterns.
+    """
+    return [
+        parameter_expander.ExpandPattern(pattern, knowledge_base_object)
+        for pattern in patterns]
+
+  def _GetGlobPatterns(self, artifact_registry):
+    """Retrieves the path and key path globs of the sources.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+
+    Returns:
+      list[GlobPattern]: globs of the paths of the directory, file and path
+          sources and the key paths of the Windows Registry key sources.
+    """
+    patterns = []
+    for artifact_definition in artifact_registry.GetDefinitions():
+      for source in artifact_definition.sources:
+        if source.type_indicator in (
+            definitions.TYPE_INDICATOR_DIRECTORY,
+            definitions.TYPE_INDICATOR_FILE,
+            definitions.TYPE_INDICATOR_PATH):
+          supported_os = (
+              source.supported_os or artifact_definition.supported_os or [])
+          case_insensitive = (
+              source.separator == '\\' or
+              definitions.SUPPORTED_OS_WINDOWS in supported_os)
+
+          for path in source.paths:
+            patterns.append(overlap.GlobPattern(
+                path, separator=source.separator,
+                case_insensitive=case_insensitive))
+
+        elif source.type_indicator == (
+            definitions.TYPE_INDICATOR_WINDOWS_REGISTRY_KEY):
+          for key_path in source.keys:
+            patterns.append(overlap.GlobPattern(
+                key_path, separator='\\', case_insensitive=True))
+
+    return patterns
+
+  def _GetOverlaps(self, patterns):
+    """Determines the pairs of globs that overlap with a prefix trie.
+
+    Args:
+      patterns (list[GlobPattern]): globs.
+
+    Returns:
+      tuple[int, int]: number of pairs of globs that overlap and number of
+          pairs of globs that were compared.
+    """
+    overlap_analyzer = overlap.GlobOverlapAnalyzer()
+    for pattern in patterns:
+      overlap_analyzer.AddPattern(pattern)
+
+    number_of_overlaps = len(list(overlap_analyzer.GetOverlaps()))
+
+    return number_of_overlaps, overlap_analyzer.number_of_comparisons
+
+  def _GetSamplePaths(self, path_matcher, artifact_registry):
+    """Retrieves sample paths that match the paths of the sources.
+
+    Every sample path is paired with a path that does not match.
+
+    Args:
+      path_matcher (PathMatcher): path matcher.
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+
+    Returns:
+      list[str]: sample paths with "/" as separator.
+    """
+    sample_paths = []
+    for artifact_definition in artifact_registry.GetDefinitions():
+      for source in artifact_definition.sources:
+        for path in getattr(source, 'paths', None) or []:
+          # pylint: disable=protected-access
+          for path_segments in path_matcher._ExpandPath(
+              path, source.separator):
+            path_segments = [
+                self._GLOB_RE.sub(
+                    lambda match: match.group(1) or 'sample', path_segment)
+                for path_segment in path_segments]
+            sample_path = '/'.join([''] + path_segments)
+            sample_paths.append(sample_path)
+            sample_paths.append(f'/nonexistent{sample_path:s}')
+
+    return sample_paths
+
+  def _GetSampleKeyPaths(self, artifact_registry):
+    """Retrieves sample key paths that match the key paths of the sources.
+
+    Every sample key path is paired with a key path that does not match.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+
+    Returns:
+      list[str]: sample key paths.
+    """
+    sample_key_paths = []
+    for artifact_definition in artifact_registry.GetDefinitions():
+      for source in artifact_definition.sources:
+        key_paths = getattr(source, 'keys', None) or [
+            key_value_pair['key'] for key_value_pair in getattr(
+                source, 'key_value_pairs', None) or []]
+
+        for key_path in key_paths:
+          key_path = key_path.replace(
+              '%%users.sid%%', 'S-1-5-21-1-2-3-1001').replace(
+                  'CurrentControlSet', 'ControlSet001')
+          key_path = self._GLOB_RE.sub(
+              lambda match: match.group(1) or 'sample', key_path)
+          sample_key_paths.append(key_path)
+          sample_key_paths.append(f'HKEY_NONEXISTENT\\{key_path:s}')
+
+    return sample_key_paths
+
+  def _GetWindowsPatterns(self, artifact_registry):
+    """Retrieves the patterns of the sources that apply to Windows.
+
+    Args:
+      artifact_registry (ArtifactDefinitionsRegistry): artifact definitions
+          registry.
+
+    Returns:
+      list[str]: patterns of the sources.
+    """
+    parameter_expander = knowledge_base.ParameterExpander()
+    empty_knowledge_base = knowledge_base.KnowledgeBase()
+
+    patterns = []
+    for _, source in artifact_registry.GetSourcesBySupportedOS('Windows'):
+      for expansion in parameter_expander.ExpandSource(
+          source, empty_knowledge_base):
+        patterns.append(expansion.pattern)
+
+    return patterns
+
+  def _MatchPaths(self, path_matcher, paths):
+    """Matches paths.
+
+    Args:
+      path_matcher (PathSegmentTrieMatcher): path or Windows Registry key
+          path matcher.
+      paths (list[str]): paths with "/" as separator or key paths.
+
+    Returns:
+      int: number of paths that match at least one source.
+    """
+    number_of_matches = 0
+    for path in paths:
+      if path_matcher.Match(path):
+        number_of_matches += 1
+
+    return number_of_matches
+
+  def _ReplaceParameters(self, patterns, knowledge_base_object):
+    """Expands patterns by replacing parameters per user account.
+
+    Args:
+      patterns (list[str]): patterns.
+      knowledge_base_object (KnowledgeBase): knowledge base.
+
+    Returns:
+      int: number of expanded patterns.
+    """
+    number_of_expansions = 0
+    for pattern in patterns:
+      for user_account in knowledge_base_object.user_accounts:
+        expanded_pattern = pattern
+        for name in knowledge_base.UserAccount.ATTRIBUTE_NAMES:
+          value = getattr(user_account, name) or ''
+          expanded_pattern = expanded_pattern.replace(
+              f'%%users.{name:s}%%', value)
+
+        for name in ('AllUsersProfile', 'ProgramData', 'ProgramFiles',
+                     'SystemDrive', 'SystemRoot'):
+          value = knowledge_base_object.GetEnvironmentVariable(name) or ''
+          expanded_pattern = expanded_pattern.replace(
+              f'%%environ_{name.lower():s}%%', value)
+
+        number_of_expansions += 1
+
+    return number_of_expansions
+
+  def _Measure(self, function, *args, **kwargs):
+    """Measures the fastest duration of a function.
+
+    Args:
+      function (function): function to measure.
+      args (list[object]): positional arguments of the function.
+      kwargs (dict[str, object]): keyword arguments of the function.
+
+    Returns:
+      tuple[float, object]: fastest duration in seconds and the result of
+          the function.
+    """
+    fastest_duration = None
+    result = None
+    for _ in range(self._number_of_repeats):
+      start_time = time.perf_counter()
+      result = function(*args, **kwargs)
+      duration = time.perf_counter() - start_time
+
+      if fastest_duration is None or duration < fastest_duration:
+        fastest_duration = duration
+
+    return fastest_duration, result
+
+  def _MatchFileSystem(self, path_matcher, root_path):
+    """Matches all entries of a file system.
+
+    Args:
+      path_matcher (PathMatcher): path matcher.
+      root_path (str): path of the root of the file system.
+
+    Returns:
+      int: number of entries that match at least one source.
+    """
+    number_of_matches = 0
+    for directory_path, directory_names, filenames in os.walk(root_path):
+      relative_path = os.path.relpath(directory_path, root_path)
+      for name in directory_names + filenames:
+        path = os.path.normpath(os.path.join(relative_path, name))
+        path = path.replace(os.sep, '/')
+        if path_matcher.Match(path):
+          number_of_matches += 1
+
+    return number_of_matches
+
+  def _ReadDirectory(self, artifact_reader, path, number_of_workers):
+    """Reads artifact definitions from a directory.
+
+    Args:
+      artifact_reader (ArtifactsReader): artifacts reader.
+      path (str): path of the directory to read from.
+      number_of_workers (int): number of worker processes.
+
+    Returns:
+      int: number of artifact definitions read.
+    """
+    return len(list(artifact_reader.ReadDirectory(
+        path, number_of_workers=number_of_workers)))
+
+  def BenchmarkExpandParameters(self, paths, number_of_user_accounts):
+    """Benchmarks expanding the parameters in the patterns of the sources.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+      number_of_user_accounts (int): number of user accounts in the
+          knowledge base.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    for path in paths:
+      artifact_registry.ReadFromDirectory(artifact_reader, path)
+
+    patterns = self._GetWindowsPatterns(artifact_registry)
+    knowledge_base_object = self._CreateKnowledgeBase(number_of_user_accounts)
+
+    print(f'Windows patterns: {len(patterns):d} from: {", ".join(paths):s} '
+          f'user accounts: {number_of_user_accounts:d}')
+
+    duration, expansions = self._Measure(
+        lambda: self._ExpandPatterns(
+            knowledge_base.ParameterExpander(), patterns,
+            knowledge_base_object))
+
+    number_of_expansions = sum(
+        expansion.number_of_expansions for expansion in expansions)
+    print(f'expand uncached: {duration * 1000:.1f}ms expanded patterns: '
+          f'{number_of_expansions:d}')
+
+    parameter_expander = knowledge_base.ParameterExpander()
+    self._ExpandPatterns(parameter_expander, patterns, knowledge_base_object)
+
+    duration, _ = self._Measure(
+        self._ExpandPatterns, parameter_expander, patterns,
+        knowledge_base_object)
+    print(f'expand cached: {duration * 1000:.1f}ms')
+
+    duration, _ = self._Measure(
+        lambda: sum(1 for expansion in expansions for _ in expansion))
+    throughput = number_of_expansions / duration
+    print(f'generate: {duration * 1000:.1f}ms throughput: {throughput:.0f} '
+          f'patterns/s')
+
+    duration, _ = self._Measure(
+        self._ReplaceParameters, patterns, knowledge_base_object)
+    print(f'replace per user account: {duration * 1000:.1f}ms')
+
+  def BenchmarkMatchPaths(self, paths):
+    """Benchmarks matching paths against the paths of the sources.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    for path in paths:
+      artifact_registry.ReadFromDirectory(artifact_reader, path)
+
+    path_matcher = matcher.PathMatcher()
+    duration, _ = self._Measure(
+        path_matcher.AddSourcesFromRegistry, artifact_registry)
+
+    path_matcher = matcher.PathMatcher()
+    path_matcher.AddSourcesFromRegistry(artifact_registry)
+
+    print(f'Compiled {path_matcher.number_of_paths:d} paths from: '
+          f'{", ".join(paths):s} time: {duration:.3f}s')
+
+    sample_paths = self._GetSamplePaths(path_matcher, artifact_registry)
+
+    duration, number_of_matches = self._Measure(
+        self._MatchPaths, path_matcher, sample_paths)
+
+    throughput = len(sample_paths) / duration
+    print(f'paths: {len(sample_paths):d} matches: {number_of_matches:d} '
+          f'time: {duration:.3f}s throughput: {throughput:.0f} paths/s')
+
+    key_matcher = matcher.WindowsRegistryKeyMatcher()
+    key_matcher.AddSourcesFromRegistry(artifact_registry)
+
+    sample_key_paths = self._GetSampleKeyPaths(artifact_registry)
+
+    duration, number_of_matches = self._Measure(
+        self._MatchPaths, key_matcher, sample_key_paths)
+
+    throughput = len(sample_key_paths) / duration
+    print(f'key paths: {len(sample_key_paths):d} matches: '
+          f'{number_of_matches:d} time: {duration:.3f}s throughput: '
+          f'{throughput:.0f} key paths/s')
+
+  def BenchmarkOverlaps(self, paths, compare_all_pairs=False):
+    """Benchmarks analyzing the subsumption and overlap of the sources.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+      compare_all_pairs (Optional[bool]): True if every pair of globs should
+          also be compared, as baseline, which takes considerably longer.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    for path in paths:
+      artifact_registry.ReadFromDirectory(artifact_reader, path)
+
+    patterns = self._GetGlobPatterns(artifact_registry)
+    number_of_pairs = len(patterns) * (len(patterns) - 1) // 2
+    print(f'Globs: {len(patterns):d} pairs: {number_of_pairs:d} from: '
+          f'{", ".join(paths):s}')
+
+    duration, (number_of_overlaps, number_of_comparisons) = self._Measure(
+        self._GetOverlaps, patterns)
+    print(f'prefix trie: overlaps: {number_of_overlaps:d} comparisons: '
+          f'{number_of_comparisons:d} time: {duration:.3f}s')
+
+    if compare_all_pairs:
+      start_time = time.perf_counter()
+      number_of_overlaps = self._CompareAllPatterns(
+          overlap.GlobOverlapAnalyzer(), patterns)
+      duration = time.perf_counter() - start_time
+      print(f'all pairs: overlaps: {number_of_overlaps:d} comparisons: '
+            f'{number_of_pairs:d} time: {duration:.3f}s')
+
+    artifact_names = [
+        artifact_definition.name
+        for artifact_definition in artifact_registry.GetDefinitions()]
+
+    collection_planner = planner.CollectionPlanner(artifact_registry)
+    duration, collection_plan = self._Measure(
+        collection_planner.CreatePlan, artifact_names)
+    print(f'collection plan: {collection_plan.GetReductionDescription():s} '
+          f'time: {duration:.3f}s')
+
+  def BenchmarkReadDirectory(self, paths, numbers_of_workers):
+    """Benchmarks reading a merged corpus of artifact definitions files.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+      numbers_of_workers (list[int]): numbers of worker processes to
+          benchmark.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    with tempfile.TemporaryDirectory() as corpus_path:
+      number_of_files = self._CreateMergedCorpus(paths, corpus_path)
+      print(f'Merged corpus of {number_of_files:d} files from: '
+            f'{", ".join(paths):s}')
+
+      for use_libyaml in (False, True):
+        artifact_reader = reader.YamlArtifactsReader(use_libyaml=use_libyaml)
+
+        baseline_duration = None
+        for number_of_workers in numbers_of_workers:
+          duration, number_of_definitions = self._Measure(
+              self._ReadDirectory, artifact_reader, corpus_path,
+              number_of_workers)
+
+          if baseline_duration is None:
+            baseline_duration = duration
+
+          speedup = baseline_duration / duration
+          print(f'backend: {artifact_reader.yaml_backend:<7s} workers: '
+                f'{number_of_workers:2d} definitions: '
+                f'{number_of_definitions:d} time: {duration:.3f}s speedup: '
+                f'{speedup:.2f}x')
+
+  def BenchmarkResolvePaths(self, paths, numbers_of_workers):
+    """Benchmarks resolving the paths of the sources in a file system.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+      numbers_of_workers (list[int]): numbers of worker threads to
+          benchmark.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_registry = registry.ArtifactDefinitionsRegistry()
+    for path in paths:
+      artifact_registry.ReadFromDirectory(artifact_reader, path)
+
+    path_matcher = matcher.PathMatcher()
+    path_matcher.AddSourcesFromRegistry(artifact_registry)
+
+    file_system_resolver = resolver.FileSystemResolver()
+    file_system_resolver.AddSourcesFromRegistry(artifact_registry)
+
+    sample_paths = self._GetSamplePaths(path_matcher, artifact_registry)
+
+    with tempfile.TemporaryDirectory() as root_path:
+      number_of_entries = self._CreateFileSystem(sample_paths, root_path)
+      print(f'File system entries: {number_of_entries:d} paths: '
+            f'{path_matcher.number_of_paths:d} from: {", ".join(paths):s}')
+
+      duration, number_of_matches = self._Measure(
+          self._MatchFileSystem, path_matcher, root_path)
+      print(f'walk and match: matches: {number_of_matches:d} visited: '
+            f'{number_of_entries:d} time: {duration:.3f}s')
+
+      for number_of_workers in numbers_of_workers:
+        duration, _ = self._Measure(
+            file_system_resolver.Resolve, root_path,
+            number_of_workers=number_of_workers)
+        print(f'resolve workers: {number_of_workers:2d} matches: '
+              f'{file_system_resolver.number_of_matched_entries:d} visited: '
+              f'{file_system_resolver.number_of_visited_entries:d} pruned '
+              f'directories: '
+              f'{file_system_resolver.number_of_pruned_directories:d} time: '
+              f'{duration:.3f}s')
+
+  def BenchmarkWriteArtifacts(self, paths):
+    """Benchmarks writing artifact definitions as YAML.
+
+    Args:
+      paths (list[str]): paths of directories that contain artifact
+          definitions files.
+    """
+    paths = paths or [self._DEFAULT_DATA_PATH]
+
+    artifact_reader = reader.YamlArtifactsReader()
+    artifact_definitions = []
+    for path in paths:
+      artifact_definitions.extend(artifact_reader.ReadDirectory(path))
+
+    print(f'Read {len(artifact_definitions):d} definitions from: '
+          f'{", ".join(paths):s}')
+
+    baseline_duration = None
+    for use_libyaml in (False, True):
+      artifact_writer = writer.YamlArtifactsWriter(use_libyaml=use_libyaml)
+
+      duration, _ = self._Measure(
+          artifact_writer.FormatArtifacts, artifact_definitions)
+
+      if baseline_duration is None:
+        baseline_duration = duration
+
+      speedup = baseline_duration / duration
+      print(f'backend: {artifact_writer.yaml_backend:<7s} time: '
+            f'{duration:.3f}s speedup: {speedup:.2f}x')
+
+
+def Main():
+  """Entry point of script to benchmark artifact definitions processing.
+
+  Returns:
+    int: exit code that is provided to sys.exit().
+  """
+  argument_parser = argparse.ArgumentParser(
+      description='Benchmarks artifact definitions processing.')
+
+  argument_parser.add_argument(
+      '--repeats', dest='number_of_repeats', type=int, action='store',
+      default=3, metavar='NUMBER', help=(
+          'number of times each measurement is repeated, the fastest '
+          'measurement is reported.'))
+
+  subparsers = argument_parser.add_subparsers(dest='benchmark')
+
+  expand_parser = subparsers.add_parser(
+      'expand', help=(
+          'benchmark expanding the parameters in artifact definition '
+          'sources with a knowledge base.'))
+  expand_parser.add_argument(
+      '--users', dest='number_of_user_accounts', type=int, action='store',
+      default=500, metavar='NUMBER', help=(
+          'number of user accounts in the knowledge base.'))
+  expand_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files, by default '
+          'artifacts/data.'))
+
+  match_parser = subparsers.add_parser(
+      'match', help=(
+          'benchmark matching paths and Windows Registry key paths against '
+          'artifact definitions.'))
+  match_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files, by default '
+          'artifacts/data.'))
+
+  overlap_parser = subparsers.add_parser(
+      'overlap', help=(
+          'benchmark analyzing the subsumption and overlap of the paths and '
+          'Windows Registry key paths of artifact definitions.'))
+  overlap_parser.add_argument(
+      '--all_pairs', '--all-pairs', dest='compare_all_pairs',
+      action='store_true', default=False, help=(
+          'also compare every pair of paths, as baseline.'))
+  overlap_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files, by default '
+          'artifacts/data.'))
+
+  read_parser = subparsers.add_parser(
+      'read', help='benchmark reading artifact definitions files.')
+  read_parser.add_argument(
+      '--workers', dest='numbers_of_workers', type=str, action='store',
+      default='1,2,4', metavar='NUMBERS', help=(
+          'comma separated numbers of worker processes to benchmark, where '
+          'the first is used as the baseline.'))
+  read_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files that are '
+          'merged into one corpus, by default artifacts/data.'))
+
+  resolve_parser = subparsers.add_parser(
+      'resolve', help=(
+          'benchmark resolving the paths of artifact definitions in a '
+          'generated file system.'))
+  resolve_parser.add_argument(
+      '--workers', dest='numbers_of_workers', type=str, action='store',
+      default='1,4', metavar='NUMBERS', help=(
+          'comma separated numbers of worker threads to benchmark.'))
+  resolve_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files, by default '
+          'artifacts/data.'))
+
+  write_parser = subparsers.add_parser(
+      'write', help='benchmark writing artifact definitions as YAML.')
+  write_parser.add_argument(
+      'paths', nargs='*', action='store', metavar='PATH', default=None, help=(
+          'paths of directories with artifact definitions files, by default '
+          'artifacts/data.'))
+
+  options = argument_parser.parse_args()
+
+  benchmark = Benchmark(number_of_repeats=options.number_of_repeats)
+
+  if options.benchmark == 'expand':
+    benchmark.BenchmarkExpandParameters(
+        options.paths, options.number_of_user_accounts)
+
+  elif options.benchmark == 'match':
+    benchmark.BenchmarkMatchPaths(options.paths)
+
+  elif options.benchmark == 'overlap':
+    benchmark.BenchmarkOverlaps(
+        options.paths, compare_all_pairs=options.compare_all_pairs)
+
+  elif options.benchmark == 'read':
+    numbers_of_workers = [
+        int(number_of_workers, 10)
+        for number_of_workers in options.numbers_of_workers.split(',')]
+    benchmark.BenchmarkReadDirectory(options.paths, numbers_of_workers)
+
+  elif options.benchmark == 'resolve':
+    numbers_of_workers = [
+        int(number_of_workers, 10)
+        for number_of_workers in options.numbers_of_workers.split(',')]
+    benchmark.BenchmarkResolvePaths(options.paths, numbers_of_workers)
+
+  elif options.benchmark == 'write':
+    benchmark.BenchmarkWriteArtifacts(options.paths)
+
+  else:
+    argument_parser.print_help()
+    return 1
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())